@@ -15,6 +15,8 @@ from datetime import datetime, timedelta
 import time
 import importlib
 
+from utils.api_broker import get_api_broker, PRIORITY_UPCOMING
+
 # Configuration du logging
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
@@ -144,14 +146,15 @@ class DataIntegrationHub:
             # Tester un endpoint basique de l'API Football
             url = f"https://{self.football_api_host}/status"
             
-            response = requests.get(url, headers=self.football_api_headers)
+            # Via le courtier : chaque instanciation du hub ne consomme pas une requête du quota
+            data = get_api_broker().get_json('api-sports', url, headers=self.football_api_headers,
+                                             priority=PRIORITY_UPCOMING, ttl=300)
             
-            if response.status_code == 200:
-                data = response.json()
+            if data is not None:
                 logger.info(f"API Football accessible. Réponse: {data}")
                 return True
             else:
-                logger.warning(f"Erreur lors de la vérification de l'API Football. Code: {response.status_code}")
+                logger.warning("Erreur lors de la vérification de l'API Football (échec ou quota épuisé)")
                 return False
                 
         except Exception as e:
@@ -328,12 +331,7 @@ class DataIntegrationHub:
         if not self.time_module:
             return matches
         
-        enhanced_matches = []
-        for match in matches:
-            enhanced_match = self.time_module.enhance_match_data_with_time_info(match)
-            enhanced_matches.append(enhanced_match)
-        
-        return enhanced_matches
+        return self.time_module.enhance_matches_with_time_info(matches)
     
     def group_matches_by_time_windows(self, matches):
         """
@@ -464,10 +462,10 @@ class DataIntegrationHub:
         
         Args:
             data (dict/list): Données à exporter
-            format (str): Format d'exportation ('json', 'compact')
+            format (str): Format d'exportation ('json', 'compact', 'binary')
             
         Returns:
-            str: Données exportées au format demandé
+            str/bytes: Données exportées au format demandé (octets pour 'binary')
         """
         if hasattr(self, 'cross_platform_adapter') and self.cross_platform_adapter:
             try:
@@ -622,6 +620,8 @@ class DataIntegrationHub:
         logger.info(f"Récupération des statistiques pour {home_team} vs {away_team}")
         
         # Essayer d'utiliser l'API Football si disponible
+        # (_get_team_stats_from_api est encore simulé : il ne passe pas par le courtier,
+        # pour ne consommer aucun quota ni partager des données aléatoires comme des données API)
         if self.sources_status['football_api']:
             try:
                 stats = self._get_team_stats_from_api(home_team, away_team, league_id)
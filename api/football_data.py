@@ -4,10 +4,16 @@ Ce module centralise toutes les requêtes à l'API pour éviter la duplication d
 """
 
 import os
-import requests
 from datetime import datetime, timedelta
 import streamlit as st
 
+from utils.api_broker import (
+    get_api_broker,
+    PRIORITY_LIVE,
+    PRIORITY_UPCOMING,
+    PRIORITY_BACKFILL
+)
+
 def get_api_key():
     """
     Récupère la clé API Football depuis les variables d'environnement.
@@ -61,10 +67,10 @@ def get_upcoming_matches(days_ahead=3, leagues=None):
                 "timezone": "Europe/Paris"
             }
             
-            response = requests.get(url, headers=headers, params=params)
+            data = get_api_broker().get_json("api-football", url, params=params, headers=headers,
+                                             priority=PRIORITY_UPCOMING)
             
-            if response.status_code == 200:
-                data = response.json()
+            if data is not None:
                 if data["results"] > 0:
                     for match in data["response"]:
                         # Extraction des informations pertinentes
@@ -80,7 +86,7 @@ def get_upcoming_matches(days_ahead=3, leagues=None):
                         }
                         all_matches.append(match_info)
             else:
-                st.warning(f"Erreur lors de la récupération des matchs pour la ligue {league_id}: {response.status_code}")
+                st.warning(f"Erreur lors de la récupération des matchs pour la ligue {league_id}")
         
         # Tri des matchs par date
         all_matches.sort(key=lambda x: x["date"])
@@ -121,10 +127,10 @@ def get_live_matches(leagues=None):
             "live": "all"
         }
         
-        response = requests.get(url, headers=headers, params=params)
+        data = get_api_broker().get_json("api-football", url, params=params, headers=headers,
+                                         priority=PRIORITY_LIVE)
         
-        if response.status_code == 200:
-            data = response.json()
+        if data is not None:
             if data["results"] > 0:
                 for match in data["response"]:
                     # Vérifier si le match appartient à une des ligues spécifiées
@@ -149,7 +155,7 @@ def get_live_matches(leagues=None):
                     live_matches.append(match_info)
             return live_matches
         else:
-            st.warning(f"Erreur lors de la récupération des matchs en direct: {response.status_code}")
+            st.warning("Erreur lors de la récupération des matchs en direct")
             return []
             
     except Exception as e:
@@ -190,16 +196,16 @@ def get_team_statistics(team_id, league_id, season=None):
             "season": season
         }
         
-        response = requests.get(url, headers=headers, params=params)
+        data = get_api_broker().get_json("api-football", url, params=params, headers=headers,
+                                         priority=PRIORITY_UPCOMING)
         
-        if response.status_code == 200:
-            data = response.json()
+        if data is not None:
             if "response" in data:
                 return data["response"]
             else:
                 return {}
         else:
-            st.warning(f"Erreur lors de la récupération des statistiques: {response.status_code}")
+            st.warning("Erreur lors de la récupération des statistiques")
             return {}
             
     except Exception as e:
@@ -233,10 +239,10 @@ def get_h2h_matches(team1_id, team2_id, limit=10):
             "last": limit
         }
         
-        response = requests.get(url, headers=headers, params=params)
+        data = get_api_broker().get_json("api-football", url, params=params, headers=headers,
+                                         priority=PRIORITY_BACKFILL)
         
-        if response.status_code == 200:
-            data = response.json()
+        if data is not None:
             if data["results"] > 0:
                 h2h_matches = []
                 for match in data["response"]:
@@ -255,7 +261,7 @@ def get_h2h_matches(team1_id, team2_id, limit=10):
             else:
                 return []
         else:
-            st.warning(f"Erreur lors de la récupération des confrontations directes: {response.status_code}")
+            st.warning("Erreur lors de la récupération des confrontations directes")
             return []
             
     except Exception as e:
@@ -288,10 +294,10 @@ def get_team_last_matches(team_id, limit=10):
             "last": limit
         }
         
-        response = requests.get(url, headers=headers, params=params)
+        data = get_api_broker().get_json("api-football", url, params=params, headers=headers,
+                                         priority=PRIORITY_BACKFILL)
         
-        if response.status_code == 200:
-            data = response.json()
+        if data is not None:
             if data["results"] > 0:
                 matches = []
                 for match in data["response"]:
@@ -311,7 +317,7 @@ def get_team_last_matches(team_id, limit=10):
             else:
                 return []
         else:
-            st.warning(f"Erreur lors de la récupération des derniers matchs: {response.status_code}")
+            st.warning("Erreur lors de la récupération des derniers matchs")
             return []
             
     except Exception as e:
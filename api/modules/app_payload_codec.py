@@ -0,0 +1,330 @@
+"""
+Codec binaire colonnaire pour les données envoyées à l'application mobile d'ArcanShadow.
+Les matchs préparés par le CrossPlatformAdapter sont aplatis (chemins 'app_ui.priority'),
+rangés par colonnes typées, et toutes les chaînes (équipes, ligues, dates...) sont
+remplacées par des indices dans un dictionnaire commun. Le format est auto-descriptif :
+un en-tête JSON compact décrit le schéma, suivi d'un bloc binaire par colonne.
+
+Structure d'un payload :
+    MAGIC (4 octets) | drapeaux (1 octet) | corps (compressé zlib si drapeau 1)
+    corps = longueur en-tête (uint32) | en-tête JSON | [longueur (uint32) | bloc] * colonnes
+
+Chaque colonne peut être partielle (payloads delta) : un bitmap de présence précède
+alors les valeurs des seules cellules présentes.
+"""
+
+import json
+import logging
+import struct
+import zlib
+from array import array
+from typing import Dict, List, Optional, Tuple
+
+# Configuration du logging
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+MAGIC = b'ASC1'
+FLAG_COMPRESSED = 1
+
+# Sentinelle des indices de chaîne
+NULL_STRING = 0xFFFFFFFF
+
+# Champs recalculés par le client à partir de l'identifiant du match
+DERIVED_FIELDS = ('app_navigation',)
+
+_MISSING = object()
+
+
+def flatten_item(item: Dict, prefix: str = '') -> Dict:
+    """
+    Aplatit un dictionnaire imbriqué en chemins séparés par des points
+
+    Args:
+        item: Dictionnaire à aplatir
+        prefix: Préfixe des chemins
+
+    Returns:
+        Dictionnaire {chemin: valeur scalaire ou liste}
+    """
+    flat = {}
+    for key, value in item.items():
+        path = f"{prefix}{key}"
+        if isinstance(value, dict) and value:
+            flat.update(flatten_item(value, f"{path}."))
+        else:
+            flat[path] = value
+    return flat
+
+
+def unflatten_item(flat: Dict) -> Dict:
+    """
+    Reconstruit un dictionnaire imbriqué à partir de chemins séparés par des points
+
+    Args:
+        flat: Dictionnaire {chemin: valeur}
+
+    Returns:
+        Dictionnaire imbriqué
+    """
+    item = {}
+    for path, value in flat.items():
+        node = item
+        parts = path.split('.')
+        for part in parts[:-1]:
+            node = node.setdefault(part, {})
+        node[parts[-1]] = value
+    return item
+
+
+def derive_fields(item: Dict) -> Dict:
+    """
+    Recalcule les champs dérivés omis du payload binaire
+
+    Args:
+        item: Match décodé
+
+    Returns:
+        Match complété
+    """
+    if 'id' in item and 'app_navigation' not in item:
+        item['app_navigation'] = {
+            "detail_route": f"/match/{item['id']}",
+            "share_url": f"arcanapp://match/{item['id']}"
+        }
+    return item
+
+
+def _column_type(values: List) -> str:
+    """Détermine le type d'une colonne à partir de ses valeurs présentes"""
+    # Types exacts : une colonne mélangeant bool, int et float passe en 'any' (JSON)
+    # pour que chaque valeur soit décodée avec son type d'origine
+    kinds = {type(value) for value in values}
+    if kinds == {bool}:
+        return 'bool'
+    if kinds == {int}:
+        return 'int'
+    if kinds == {float}:
+        return 'float'
+    if kinds and kinds <= {str, type(None)}:
+        return 'str'
+    return 'any'
+
+
+def _pack_bitmap(present: List[bool]) -> bytes:
+    """Empaquette une liste de booléens en bitmap (bit i = ligne i)"""
+    bitmap = bytearray((len(present) + 7) // 8)
+    for i, flag in enumerate(present):
+        if flag:
+            bitmap[i >> 3] |= 1 << (i & 7)
+    return bytes(bitmap)
+
+
+def _unpack_bitmap(bitmap: bytes, count: int) -> List[bool]:
+    """Dépaquette un bitmap produit par _pack_bitmap"""
+    return [bool(bitmap[i >> 3] & (1 << (i & 7))) for i in range(count)]
+
+
+class _StringTable:
+    """Dictionnaire de chaînes partagé par toutes les colonnes d'un payload"""
+
+    def __init__(self):
+        self.strings = []
+        self._ids = {}
+
+    def id_for(self, value: str) -> int:
+        string_id = self._ids.get(value)
+        if string_id is None:
+            string_id = self._ids[value] = len(self.strings)
+            self.strings.append(value)
+        return string_id
+
+
+def _encode_column(values: List, column_type: str, strings: _StringTable) -> bytes:
+    """Encode les valeurs présentes d'une colonne"""
+    if column_type == 'bool':
+        return bytes(1 if value else 0 for value in values)
+    if column_type == 'int':
+        return array('q', values).tobytes()
+    if column_type == 'float':
+        return array('d', values).tobytes()
+    if column_type == 'str':
+        return array('I', (NULL_STRING if value is None else strings.id_for(value) for value in values)).tobytes()
+    # Valeurs hétérogènes ou composites : JSON compact, lui aussi dédupliqué
+    return array('I', (strings.id_for(json.dumps(value, separators=(',', ':'), default=str)) for value in values)).tobytes()
+
+
+def _decode_column(blob: bytes, column_type: str, strings: List[str]) -> List:
+    """Décode les valeurs présentes d'une colonne"""
+    if column_type == 'bool':
+        return [bool(b) for b in blob]
+    if column_type in ('int', 'float'):
+        values = array('q' if column_type == 'int' else 'd')
+        values.frombytes(blob)
+        return values.tolist()
+    ids = array('I')
+    ids.frombytes(blob)
+    if column_type == 'str':
+        return [None if i == NULL_STRING else strings[i] for i in ids]
+    return [json.loads(strings[i]) for i in ids]
+
+
+def encode_rows(rows: List[Dict], meta: Optional[Dict] = None, compress: bool = True,
+                omit_derived: bool = True) -> bytes:
+    """
+    Encode une liste d'éléments (complets ou partiels) en payload binaire colonnaire
+
+    Args:
+        rows: Éléments à encoder (dictionnaires, éventuellement imbriqués)
+        meta: Métadonnées libres ajoutées à l'en-tête
+        compress: Compresser le corps avec zlib
+        omit_derived: Omettre les champs recalculables par le client (DERIVED_FIELDS)
+
+    Returns:
+        Payload binaire
+    """
+    flat_rows = []
+    for row in rows:
+        if omit_derived:
+            row = {key: value for key, value in row.items() if key not in DERIVED_FIELDS}
+        flat_rows.append(flatten_item(row))
+
+    # Ordre des colonnes : ordre de première apparition
+    paths = list(dict.fromkeys(path for flat in flat_rows for path in flat))
+
+    strings = _StringTable()
+    columns = []
+    blobs = []
+    for path in paths:
+        cells = [flat.get(path, _MISSING) for flat in flat_rows]
+        present = [cell is not _MISSING for cell in cells]
+        values = [cell for cell in cells if cell is not _MISSING]
+        column_type = _column_type(values)
+
+        blob = _encode_column(values, column_type, strings)
+        partial = not all(present)
+        if partial:
+            blob = _pack_bitmap(present) + blob
+        columns.append([path, column_type, int(partial)])
+        blobs.append(blob)
+
+    header = json.dumps({
+        "n": len(flat_rows),
+        "columns": columns,
+        "strings": strings.strings,
+        "derived": list(DERIVED_FIELDS) if omit_derived else [],
+        "meta": meta or {}
+    }, separators=(',', ':'), ensure_ascii=False, default=str).encode('utf-8')
+
+    parts = [struct.pack('<I', len(header)), header]
+    for blob in blobs:
+        parts.append(struct.pack('<I', len(blob)))
+        parts.append(blob)
+    body = b''.join(parts)
+
+    if compress:
+        return MAGIC + bytes([FLAG_COMPRESSED]) + zlib.compress(body, 6)
+    return MAGIC + bytes([0]) + body
+
+
+def decode_rows(payload: bytes) -> Tuple[Dict, List[Dict]]:
+    """
+    Décode un payload produit par encode_rows
+
+    Args:
+        payload: Payload binaire
+
+    Returns:
+        Tuple (métadonnées, éléments) ; les cellules absentes d'un payload partiel
+        sont simplement omises des éléments
+    """
+    if payload[:4] != MAGIC:
+        raise ValueError("Payload binaire ArcanShadow invalide")
+    body = payload[5:]
+    if payload[4] & FLAG_COMPRESSED:
+        body = zlib.decompress(body)
+
+    (header_length,) = struct.unpack_from('<I', body, 0)
+    header = json.loads(body[4:4 + header_length].decode('utf-8'))
+    count = header["n"]
+    strings = header["strings"]
+
+    flat_rows = [{} for _ in range(count)]
+    position = 4 + header_length
+    for path, column_type, partial in header["columns"]:
+        (length,) = struct.unpack_from('<I', body, position)
+        blob = body[position + 4:position + 4 + length]
+        position += 4 + length
+
+        if partial:
+            bitmap_length = (count + 7) // 8
+            rows_present = [i for i, flag in enumerate(_unpack_bitmap(blob[:bitmap_length], count)) if flag]
+            blob = blob[bitmap_length:]
+        else:
+            rows_present = range(count)
+
+        for row_index, value in zip(rows_present, _decode_column(blob, column_type, strings)):
+            flat_rows[row_index][path] = value
+
+    rows = [unflatten_item(flat) for flat in flat_rows]
+    if header.get("derived"):
+        rows = [derive_fields(row) for row in rows]
+    return header.get("meta", {}), rows
+
+
+def diff_rows(previous: Dict[str, Dict], rows: List[Dict], key: str = 'id') -> Tuple[List[Dict], List[str]]:
+    """
+    Calcule les changements d'une liste d'éléments par rapport à un état précédent
+
+    Args:
+        previous: État précédent {identifiant: élément aplati}
+        rows: Nouveaux éléments (imbriqués)
+        key: Champ identifiant
+
+    Returns:
+        Tuple (éléments nouveaux ou modifiés, réduits aux champs changés plus l'identifiant ;
+        identifiants supprimés)
+    """
+    changed = []
+    seen = set()
+    for row in rows:
+        row_id = str(row.get(key))
+        seen.add(row_id)
+        flat = flatten_item(row)
+        old = previous.get(row_id)
+        if old is None:
+            changed.append(row)
+            continue
+        delta = {path: value for path, value in flat.items() if old.get(path, _MISSING) != value}
+        # Les champs disparus sont transmis à None
+        delta.update({path: None for path in old if path not in flat})
+        if delta:
+            delta[key] = row.get(key)
+            changed.append(unflatten_item(delta))
+
+    removed = [row_id for row_id in previous if row_id not in seen]
+    return changed, removed
+
+
+def apply_delta(state: Dict[str, Dict], meta: Dict, rows: List[Dict], key: str = 'id') -> Dict[str, Dict]:
+    """
+    Applique un payload delta décodé à l'état client (référence d'implémentation)
+
+    Args:
+        state: État courant {identifiant: élément aplati}
+        meta: Métadonnées du payload delta
+        rows: Éléments du payload delta
+        key: Champ identifiant
+
+    Returns:
+        Nouvel état {identifiant: élément aplati}
+    """
+    state = {} if meta.get("full") else dict(state)
+    for row_id in meta.get("removed", []):
+        state.pop(row_id, None)
+    for row in rows:
+        row_id = str(row.get(key))
+        merged = dict(state.get(row_id, {}))
+        merged.update(flatten_item(row))
+        state[row_id] = merged
+    return state
@@ -5,14 +5,33 @@ pour différents formats d'affichage et en optimisant les flux de données.
 """
 
 import logging
+import hashlib
 import json
+import threading
+import time
+from collections import OrderedDict
 from datetime import datetime, timedelta
 from typing import Dict, List, Any, Union, Optional
 
+from api.modules.app_payload_codec import encode_rows, diff_rows, flatten_item
+
 # Configuration du logging
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
+# Nombre de versions conservées par flux comme bases possibles d'un export delta
+DELTA_HISTORY = 8
+
+# Nombre maximal de flux delta suivis (les moins récemment exportés sont oubliés)
+MAX_EXPORT_STREAMS = 64
+
+
+def _state_version(state: Dict) -> str:
+    """Identifiant de version d'un état exporté (empreinte de son contenu)"""
+    canonical = json.dumps(state, sort_keys=True, separators=(',', ':'), default=str)
+    return hashlib.sha1(canonical.encode('utf-8')).hexdigest()[:16]
+
+
 class CrossPlatformAdapter:
     """
     Adapter pour faciliter la transition des données entre l'application web et mobile.
@@ -44,6 +63,10 @@ class CrossPlatformAdapter:
                 "batch_size": 5
             }
         }
+        # États récents par flux pour les exports delta
+        # {flux: {'items': dernière liste, 'version': version, 'states': {version: {id: match aplati}}}}
+        self._export_streams = OrderedDict()
+        self._export_lock = threading.Lock()
         logger.info("Adaptateur cross-platform initialisé")
         
     def optimize_data_for_platform(self, data: Union[Dict, List], platform: str = "web") -> Union[Dict, List]:
@@ -279,22 +302,119 @@ class CrossPlatformAdapter:
             
         return config
         
-    def export_data_for_app(self, data: Dict, format: str = "json") -> str:
+    def export_data_for_app(self, data: Union[Dict, List], format: str = "json") -> Union[str, bytes]:
         """
         Exporte les données dans un format adapté pour l'application
         
         Args:
-            data: Données à exporter
-            format: Format d'exportation ('json' ou 'compact')
+            data: Données à exporter (liste d'éléments, ou dictionnaire dont la clé
+                'data' contient la liste d'éléments pour le format binaire)
+            format: Format d'exportation ('json', 'compact' ou 'binary')
             
         Returns:
-            Données exportées au format demandé
+            Données exportées au format demandé (octets pour le format 'binary')
         """
         if format == "json":
             return json.dumps(data)
         elif format == "compact":
             # Version compacte pour minimiser la taille
             return json.dumps(data, separators=(',', ':'))
+        elif format == "binary":
+            # Colonnes typées et dictionnaire de chaînes (voir app_payload_codec)
+            if isinstance(data, list):
+                return encode_rows(data)
+            meta = {key: value for key, value in data.items() if key != "data"}
+            return encode_rows(data.get("data") or [], meta=meta)
         else:
             logger.warning(f"Format inconnu: {format}, utilisation de JSON par défaut")
-            return json.dumps(data)
\ No newline at end of file
+            return json.dumps(data)
+
+    def export_delta_for_app(self, items: List[Dict], stream: str = "matches", key: str = "id",
+                             since_version: Optional[str] = None) -> bytes:
+        """
+        Exporte au format binaire les changements depuis la version détenue par un client
+        
+        Chaque état exporté reçoit une version dérivée de son contenu, et les
+        DELTA_HISTORY dernières versions d'un flux sont conservées (pour au plus
+        MAX_EXPORT_STREAMS flux, les moins récents étant oubliés). Si 'since_version'
+        en fait partie, le payload ne contient que les éléments nouveaux, les champs
+        modifiés et les identifiants supprimés depuis cette version ; sinon (premier
+        appel, version inconnue ou trop ancienne) il contient l'état complet. Plusieurs
+        clients peuvent ainsi suivre le même flux à des versions différentes.
+        
+        Args:
+            items: Éléments préparés (ex: sortie de prepare_matches_for_app)
+            stream: Nom du flux (ex: 'matches:mobile')
+            key: Champ identifiant des éléments
+            since_version: Version détenue par le client ('version' de son dernier payload)
+            
+        Returns:
+            Payload binaire du delta
+        """
+        with self._export_lock:
+            entry = self._export_streams.setdefault(stream, {"items": None, "version": None, "states": OrderedDict()})
+            self._export_streams.move_to_end(stream)
+            while len(self._export_streams) > MAX_EXPORT_STREAMS:
+                self._export_streams.popitem(last=False)
+            # La même liste (ex: snapshot de l'API) n'est aplatie qu'une fois
+            if entry["items"] is not items:
+                state = {str(item.get(key)): flatten_item(item) for item in items}
+                entry["items"] = items
+                entry["version"] = _state_version(state)
+                entry["states"][entry["version"]] = state
+                entry["states"].move_to_end(entry["version"])
+                while len(entry["states"]) > DELTA_HISTORY:
+                    entry["states"].popitem(last=False)
+            version = entry["version"]
+            base = entry["states"].get(since_version) if since_version else None
+
+        if base is None:
+            changed, removed = list(items), []
+        else:
+            changed, removed = diff_rows(base, items, key)
+
+        meta = {
+            "stream": stream,
+            "version": version,
+            "base_version": since_version if base is not None else None,
+            "full": base is None,
+            "removed": removed,
+            "total": len(items)
+        }
+        return encode_rows(changed, meta=meta)
+
+    def reset_delta_stream(self, stream: str) -> None:
+        """
+        Oublie les versions d'un flux delta
+        
+        Les clients de ce flux reçoivent un export complet à leur prochaine demande.
+        
+        Args:
+            stream: Nom du flux
+        """
+        with self._export_lock:
+            self._export_streams.pop(stream, None)
+
+    def measure_export_formats(self, data: Union[Dict, List], repeat: int = 5) -> Dict:
+        """
+        Mesure la taille et le temps d'encodage de chaque format d'export
+        
+        Args:
+            data: Données à exporter
+            repeat: Nombre d'encodages par format (le meilleur temps est retenu)
+            
+        Returns:
+            Dictionnaire {format: {"bytes": taille, "encode_ms": temps}}
+        """
+        results = {}
+        for export_format in ("json", "compact", "binary"):
+            best = None
+            payload = b""
+            for _ in range(max(1, repeat)):
+                started = time.perf_counter()
+                payload = self.export_data_for_app(data, export_format)
+                elapsed = time.perf_counter() - started
+                best = elapsed if best is None else min(best, elapsed)
+            size = len(payload) if isinstance(payload, bytes) else len(payload.encode('utf-8'))
+            results[export_format] = {"bytes": size, "encode_ms": round(best * 1000, 3)}
+        return results
@@ -5,8 +5,9 @@ de calcul des fenêtres temporelles pour tous les modules de l'application.
 """
 
 import logging
+import numpy as np
 import pytz
-from datetime import datetime, timedelta, time
+from datetime import date, datetime, timedelta, time
 import calendar
 from typing import List, Dict, Optional, Tuple, Union
 
@@ -14,6 +15,12 @@ from typing import List, Dict, Optional, Tuple, Union
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
+SECONDS_PER_DAY = 86400
+# Le 1er janvier 1970 était un jeudi (weekday() == 3)
+EPOCH_WEEKDAY = 3
+EPOCH_ORDINAL = date(1970, 1, 1).toordinal()
+MAJOR_LEAGUES = [39, 140, 61, 78, 135, 2]  # Premier League, La Liga, etc.
+
 class TimeWindow:
     """Classe représentant une fenêtre temporelle utilisée pour les matchs"""
     
@@ -130,6 +137,118 @@ class TimeModule:
                 if window.category not in self.time_windows_by_category:
                     self.time_windows_by_category[window.category] = []
                 self.time_windows_by_category[window.category].append((day, window))
+        
+        self._build_window_index()
+    
+    def _build_window_index(self):
+        """
+        Construit la table des bornes de fenêtres, exprimées en secondes depuis le début
+        de la semaine (lundi 00:00), triée pour une classification par recherche dichotomique.
+        """
+        self._windows = []
+        starts, ends = [], []
+        for day in sorted(self.standard_time_windows):
+            for window in sorted(self.standard_time_windows[day], key=lambda w: w.start_time.time()):
+                start, end = window.start_time.time(), window.end_time.time()
+                starts.append(day * SECONDS_PER_DAY + start.hour * 3600 + start.minute * 60 + start.second)
+                ends.append(day * SECONDS_PER_DAY + end.hour * 3600 + end.minute * 60 + end.second)
+                self._windows.append(window)
+        
+        self._window_starts = np.array(starts, dtype=np.int64)
+        self._window_ends = np.array(ends, dtype=np.int64)
+        self._window_categories = [window.category for window in self._windows] + ["other"]
+        self._window_is_prime = np.array(["prime" in category for category in self._window_categories])
+    
+    def _classify_week_seconds(self, week_seconds: np.ndarray) -> np.ndarray:
+        """
+        Classe des instants (secondes depuis lundi 00:00, heure locale) dans les fenêtres standard
+        
+        Args:
+            week_seconds: Tableau int64 des instants
+            
+        Returns:
+            Tableau des indices de fenêtres (-1 si aucune fenêtre ne correspond)
+        """
+        # Dernière fenêtre commençant avant l'instant ; en cas de borne partagée
+        # (fin d'une fenêtre = début de la suivante), la première fenêtre l'emporte
+        idx = np.searchsorted(self._window_starts, week_seconds, side='right') - 1
+        prev = idx - 1
+        use_prev = (prev >= 0) & (self._window_ends[np.maximum(prev, 0)] >= week_seconds)
+        idx = np.where(use_prev, prev, idx)
+        
+        safe = np.maximum(idx, 0)
+        inside = (idx >= 0) & (self._window_starts[safe] <= week_seconds) & (week_seconds <= self._window_ends[safe])
+        return np.where(inside, idx, -1)
+    
+    def _to_local(self, value) -> Optional[datetime]:
+        """
+        Convertit une date (datetime ou chaîne ISO) en datetime du fuseau horaire du module
+        
+        Args:
+            value: Date à convertir
+            
+        Returns:
+            datetime localisé ou None si la date est invalide
+        """
+        if not isinstance(value, datetime):
+            try:
+                value = datetime.fromisoformat(value.replace('Z', '+00:00'))
+            except Exception:
+                return None
+        
+        if value.tzinfo is None:
+            return self.timezone.localize(value)
+        return value.astimezone(self.timezone)
+    
+    def index_matches(self, matches: List[Dict]) -> Dict:
+        """
+        Analyse une seule fois les dates d'une liste de matchs et classe chaque match
+        dans sa fenêtre temporelle
+        
+        Les dates identiques (fréquentes sur une même journée) ne sont converties qu'une fois.
+        
+        Args:
+            matches: Liste de dictionnaires représentant des matchs
+            
+        Returns:
+            Dictionnaire de tableaux alignés sur la liste des matchs :
+            valid (bool), epoch (int64, UTC), local_day (int64, jours depuis 1970 en heure locale),
+            window (int, -1 si aucune fenêtre), ainsi que la liste des datetime locaux
+        """
+        count = len(matches)
+        valid = np.zeros(count, dtype=bool)
+        epoch = np.zeros(count, dtype=np.int64)
+        local_seconds = np.zeros(count, dtype=np.int64)
+        local_datetimes = [None] * count
+        
+        parsed = {}
+        for i, match in enumerate(matches):
+            raw = match.get('date')
+            if raw is None:
+                continue
+            key = raw if isinstance(raw, str) else id(raw)
+            if key not in parsed:
+                parsed[key] = self._to_local(raw)
+            local_dt = parsed[key]
+            if local_dt is None:
+                continue
+            valid[i] = True
+            local_datetimes[i] = local_dt
+            epoch[i] = int(local_dt.timestamp())
+            local_seconds[i] = epoch[i] + int(local_dt.utcoffset().total_seconds())
+        
+        local_day = local_seconds // SECONDS_PER_DAY
+        weekday = (local_day + EPOCH_WEEKDAY) % 7
+        week_seconds = weekday * SECONDS_PER_DAY + local_seconds % SECONDS_PER_DAY
+        window = np.where(valid, self._classify_week_seconds(week_seconds), -1)
+        
+        return {
+            "valid": valid,
+            "epoch": epoch,
+            "local_day": local_day,
+            "window": window,
+            "local_datetimes": local_datetimes
+        }
     
     def update_current_time(self):
         """Met à jour l'heure actuelle"""
@@ -163,33 +282,19 @@ class TimeModule:
         Returns:
             TimeWindow ou None si aucune fenêtre ne correspond
         """
-        if not isinstance(match_datetime, datetime):
-            try:
-                match_datetime = datetime.fromisoformat(match_datetime.replace('Z', '+00:00'))
-            except:
-                logger.error(f"Format de date invalide: {match_datetime}")
-                return None
-        
-        # S'assurer que la date est dans le bon fuseau horaire
-        if match_datetime.tzinfo is None:
-            match_datetime = self.timezone.localize(match_datetime)
-        elif match_datetime.tzinfo != self.timezone:
-            match_datetime = match_datetime.astimezone(self.timezone)
-        
-        # Obtenir le jour de la semaine (0 = lundi, 6 = dimanche)
-        weekday = match_datetime.weekday()
-        
-        # Vérifier chaque fenêtre temporelle pour ce jour
-        if weekday in self.standard_time_windows:
-            match_time = match_datetime.time()
-            for window in self.standard_time_windows[weekday]:
-                window_start_time = window.start_time.time()
-                window_end_time = window.end_time.time()
-                
-                if window_start_time <= match_time <= window_end_time:
-                    return window
+        local_datetime = self._to_local(match_datetime)
+        if local_datetime is None:
+            logger.error(f"Format de date invalide: {match_datetime}")
+            return None
         
-        return None
+        return self._window_for_local(local_datetime)
+    
+    def _window_for_local(self, local_datetime: datetime) -> Optional[TimeWindow]:
+        """Renvoie la fenêtre temporelle d'un datetime déjà exprimé dans le fuseau du module"""
+        week_seconds = (local_datetime.weekday() * SECONDS_PER_DAY + local_datetime.hour * 3600 +
+                        local_datetime.minute * 60 + local_datetime.second)
+        idx = int(self._classify_week_seconds(np.array([week_seconds], dtype=np.int64))[0])
+        return self._windows[idx] if idx >= 0 else None
     
     def format_match_time(self, match_datetime: Union[datetime, str], format_type: str = None) -> str:
         """
@@ -202,27 +307,22 @@ class TimeModule:
         Returns:
             Chaîne formatée de l'heure du match
         """
+        local_datetime = self._to_local(match_datetime)
+        if local_datetime is None:
+            return match_datetime  # Retourner la chaîne originale en cas d'erreur
+        
+        return self._format_local_time(local_datetime, format_type)
+    
+    def _format_local_time(self, local_datetime: datetime, format_type: str = None) -> str:
+        """Formate l'heure d'un datetime déjà exprimé dans le fuseau du module"""
         if format_type is None:
             format_type = self.user_preferences["display_format"]
         
-        # Convertir en datetime si nécessaire
-        if isinstance(match_datetime, str):
-            try:
-                match_datetime = datetime.fromisoformat(match_datetime.replace('Z', '+00:00'))
-            except:
-                return match_datetime  # Retourner la chaîne originale en cas d'erreur
-        
-        # S'assurer que la date est dans le bon fuseau horaire
-        if match_datetime.tzinfo is None:
-            match_datetime = self.timezone.localize(match_datetime)
-        elif match_datetime.tzinfo != self.timezone:
-            match_datetime = match_datetime.astimezone(self.timezone)
-        
         # Formater selon les préférences
         if format_type == "12h":
-            return match_datetime.strftime("%I:%M %p")
+            return local_datetime.strftime("%I:%M %p")
         else:  # 24h par défaut
-            return match_datetime.strftime("%H:%M")
+            return local_datetime.strftime("%H:%M")
     
     def get_day_name(self, date: Union[datetime, str], short: bool = False) -> str:
         """
@@ -304,23 +404,17 @@ class TimeModule:
         Returns:
             Chaîne formatée de la date du match
         """
-        # Convertir en datetime si nécessaire
-        if isinstance(match_datetime, str):
-            try:
-                match_datetime = datetime.fromisoformat(match_datetime.replace('Z', '+00:00'))
-            except:
-                return match_datetime
-        
-        # S'assurer que la date est dans le bon fuseau horaire
-        if match_datetime.tzinfo is None:
-            match_datetime = self.timezone.localize(match_datetime)
-        elif match_datetime.tzinfo != self.timezone:
-            match_datetime = match_datetime.astimezone(self.timezone)
+        local_datetime = self._to_local(match_datetime)
+        if local_datetime is None:
+            return match_datetime
         
-        # Vérifier si c'est aujourd'hui, demain ou après-demain
-        today = datetime.now(self.timezone).date()
+        return self._format_local_date(local_datetime, format_type, datetime.now(self.timezone).date())
+    
+    def _format_local_date(self, match_datetime: datetime, format_type: str, today: date) -> str:
+        """Formate la date d'un datetime déjà exprimé dans le fuseau du module"""
         match_date = match_datetime.date()
         
+        # Vérifier si c'est aujourd'hui, demain ou après-demain
         if match_date == today:
             day_text = "Aujourd'hui"
         elif match_date == today + timedelta(days=1):
@@ -395,35 +489,25 @@ class TimeModule:
         Returns:
             Dictionnaire avec les créneaux horaires comme clés et les matchs comme valeurs
         """
-        grouped_matches = {}
+        index = self.index_matches(matches)
+        today = datetime.now(self.timezone).date()
         
-        for match in matches:
-            # Obtenir la date/heure du match
-            match_datetime = None
-            if 'date' in match:
-                try:
-                    match_datetime = datetime.fromisoformat(match['date'].replace('Z', '+00:00'))
-                except:
-                    # Essayer un autre format si nécessaire
-                    continue
-            
-            if not match_datetime:
-                continue
-            
-            # Déterminer la fenêtre temporelle
-            time_window = self.get_match_time_window(match_datetime)
-            time_slot = time_window.category if time_window else "other"
-            
-            # Ajouter le match au créneau horaire
-            if time_slot not in grouped_matches:
-                grouped_matches[time_slot] = []
+        # Regrouper les indices par catégorie (-1 -> "other") en conservant l'ordre des matchs
+        valid_positions = np.flatnonzero(index["valid"])
+        category_ids = index["window"][valid_positions]
+        
+        grouped_matches = {}
+        for position, category_id in zip(valid_positions, category_ids):
+            match = matches[position]
+            local_datetime = index["local_datetimes"][position]
+            time_slot = self._window_categories[category_id]
             
             # Ajouter des informations temporelles au match
             match['time_slot'] = time_slot
-            match['formatted_time'] = self.format_match_time(match_datetime)
-            match['formatted_date'] = self.format_match_date(match_datetime, "compact")
+            match['formatted_time'] = self._format_local_time(local_datetime)
+            match['formatted_date'] = self._format_local_date(local_datetime, "compact", today)
             
-            grouped_matches[time_slot].append(match)
+            grouped_matches.setdefault(time_slot, []).append(match)
         
         return grouped_matches
     
@@ -437,21 +521,9 @@ class TimeModule:
         Returns:
             Liste des matchs en prime time
         """
-        prime_time_matches = []
-        
-        for match in matches:
-            # Obtenir la date/heure du match
-            if 'date' in match:
-                try:
-                    match_datetime = datetime.fromisoformat(match['date'].replace('Z', '+00:00'))
-                    time_window = self.get_match_time_window(match_datetime)
-                    
-                    if time_window and "prime" in time_window.category:
-                        prime_time_matches.append(match)
-                except:
-                    continue
-        
-        return prime_time_matches
+        index = self.index_matches(matches)
+        prime = index["valid"] & self._window_is_prime[index["window"]]
+        return [matches[i] for i in np.flatnonzero(prime)]
     
     def get_best_matches_by_day(self, matches: List[Dict], top_n: int = 3) -> Dict[str, List[Dict]]:
         """
@@ -464,37 +536,34 @@ class TimeModule:
         Returns:
             Dictionnaire avec les dates comme clés et les meilleurs matchs comme valeurs
         """
-        # Regrouper par jour
-        matches_by_day = {}
-        
-        for match in matches:
-            if 'date' in match:
-                try:
-                    match_datetime = datetime.fromisoformat(match['date'].replace('Z', '+00:00'))
-                    day_str = match_datetime.date().isoformat()
-                    
-                    if day_str not in matches_by_day:
-                        matches_by_day[day_str] = []
-                    
-                    matches_by_day[day_str].append(match)
-                except:
-                    continue
-        
-        # Sélectionner les meilleurs matchs par jour
-        # Critères: ligue majeure, prime time, etc.
+        index = self.index_matches(matches)
+        positions = np.flatnonzero(index["valid"])
+        if len(positions) == 0:
+            return {}
+        
+        days = index["local_day"][positions]
+        
+        # Critères: ligue majeure, prime time, derby, puis les autres que les value bets
+        major = np.isin(np.array([matches[i].get('league_id') for i in positions], dtype=object), MAJOR_LEAGUES)
+        prime = self._window_is_prime[index["window"][positions]]
+        derby = np.array([bool(matches[i].get('is_derby', False)) for i in positions])
+        not_value_bet = np.array([not matches[i].get('is_value_bet', False) for i in positions])
+        
+        # Tri stable : jour, puis critères par ordre d'importance décroissante
+        order = np.lexsort((~not_value_bet, ~derby, ~prime, ~major, days))
+        sorted_days = days[order]
+        
+        # Rang de chaque match dans sa journée, pour garder les top_n premiers
+        group_starts = np.flatnonzero(np.r_[True, sorted_days[1:] != sorted_days[:-1]])
+        ranks = np.arange(len(order)) - np.repeat(group_starts, np.diff(np.r_[group_starts, len(order)]))
+        selected = order[ranks < top_n]
+        
+        # Conserver l'ordre d'apparition des jours dans la liste d'origine
+        unique_days, first_seen = np.unique(days, return_index=True)
         best_matches = {}
-        major_leagues = [39, 140, 61, 78, 135, 2]  # Premier League, La Liga, etc.
-        
-        for day, day_matches in matches_by_day.items():
-            # Trier les matchs par importance
-            sorted_matches = sorted(day_matches, key=lambda m: (
-                m.get('league_id') in major_leagues,  # D'abord les ligues majeures
-                self.get_match_time_window(m.get('date')) and "prime" in self.get_match_time_window(m.get('date')).category,  # Puis le prime time
-                m.get('is_derby', False),  # Puis les derbys
-                not m.get('is_value_bet', False)  # Puis les value bets
-            ), reverse=True)
-            
-            best_matches[day] = sorted_matches[:top_n]
+        for day in unique_days[np.argsort(first_seen)]:
+            day_str = date.fromordinal(EPOCH_ORDINAL + int(day)).isoformat()
+            best_matches[day_str] = [matches[positions[i]] for i in selected[days[selected] == day]]
         
         return best_matches
     
@@ -508,19 +577,14 @@ class TimeModule:
         Returns:
             Dictionnaire avec les catégories de fenêtres comme clés et le nombre de matchs comme valeurs
         """
-        distribution = {}
+        index = self.index_matches(matches)
+        windows = index["window"][index["valid"] & (index["window"] >= 0)]
+        counts = np.bincount(windows, minlength=len(self._windows))
         
-        for match in matches:
-            if 'date' in match:
-                try:
-                    match_datetime = datetime.fromisoformat(match['date'].replace('Z', '+00:00'))
-                    time_window = self.get_match_time_window(match_datetime)
-                    
-                    if time_window:
-                        category = time_window.category
-                        distribution[category] = distribution.get(category, 0) + 1
-                except:
-                    continue
+        distribution = {}
+        for window_id in np.flatnonzero(counts):
+            category = self._window_categories[window_id]
+            distribution[category] = distribution.get(category, 0) + int(counts[window_id])
         
         return distribution
     
@@ -534,34 +598,52 @@ class TimeModule:
         Returns:
             Match enrichi avec des informations temporelles
         """
-        if 'date' not in match:
-            return match
+        return self.enhance_matches_with_time_info([match])[0]
+    
+    def enhance_matches_with_time_info(self, matches: List[Dict]) -> List[Dict]:
+        """
+        Enrichit une liste de matchs avec des informations temporelles en une seule passe
         
-        try:
-            match_datetime = datetime.fromisoformat(match['date'].replace('Z', '+00:00'))
-            
-            # Ajouter les informations temporelles
-            match['formatted_time'] = self.format_match_time(match_datetime)
-            match['formatted_date'] = self.format_match_date(match_datetime)
-            match['day_name'] = self.get_day_name(match_datetime)
-            match['is_today'] = match_datetime.date() == datetime.now(self.timezone).date()
-            match['is_tomorrow'] = match_datetime.date() == (datetime.now(self.timezone).date() + timedelta(days=1))
-            
-            # Obtenir la fenêtre temporelle
-            time_window = self.get_match_time_window(match_datetime)
-            if time_window:
-                match['time_window'] = time_window.to_dict()
-                match['time_slot'] = time_window.category
-                match['is_prime_time'] = "prime" in time_window.category
-            
-            # Ajouter des informations sur l'heure locale
-            match['local_time'] = match_datetime.strftime('%H:%M')
-            match['timezone'] = str(self.timezone)
+        Args:
+            matches: Liste de dictionnaires représentant des matchs
             
-        except Exception as e:
-            logger.error(f"Erreur lors de l'enrichissement des données temporelles: {e}")
+        Returns:
+            Matchs enrichis avec des informations temporelles
+        """
+        index = self.index_matches(matches)
+        today = datetime.now(self.timezone).date()
+        tomorrow = today + timedelta(days=1)
+        timezone_name = str(self.timezone)
+        
+        for position in np.flatnonzero(index["valid"]):
+            match = matches[position]
+            try:
+                local_datetime = index["local_datetimes"][position]
+                match_date = local_datetime.date()
+                
+                # Ajouter les informations temporelles
+                match['formatted_time'] = self._format_local_time(local_datetime)
+                match['formatted_date'] = self._format_local_date(local_datetime, "full", today)
+                match['day_name'] = self.get_day_name(local_datetime)
+                match['is_today'] = match_date == today
+                match['is_tomorrow'] = match_date == tomorrow
+                
+                # Obtenir la fenêtre temporelle
+                window_id = index["window"][position]
+                if window_id >= 0:
+                    time_window = self._windows[window_id]
+                    match['time_window'] = time_window.to_dict()
+                    match['time_slot'] = time_window.category
+                    match['is_prime_time'] = bool(self._window_is_prime[window_id])
+                
+                # Ajouter des informations sur l'heure locale
+                match['local_time'] = local_datetime.strftime('%H:%M')
+                match['timezone'] = timezone_name
+                
+            except Exception as e:
+                logger.error(f"Erreur lors de l'enrichissement des données temporelles: {e}")
         
-        return match
+        return matches
     
     def format_countdown(self, target_datetime: Union[datetime, str]) -> str:
         """
@@ -9,19 +9,18 @@ import pandas as pd
 import requests
 from datetime import datetime
 import os
-import json
 
 # Importer nos adaptateurs
 from api.transfermarkt_integration import is_transfermarkt_available, get_team_players, get_player_profile
 from api.soccerdata_integration import is_soccerdata_available, get_soccer_data_integration
+from utils.player_data_store import get_player_data_store
 
 # Configuration du logging
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
-# Chemins pour le stockage de données en cache
+# Ancien répertoire de cache (un fichier JSON par entité), importé dans le magasin partagé
 CACHE_DIR = os.path.join(os.getcwd(), 'data', 'player_data_cache')
-os.makedirs(CACHE_DIR, exist_ok=True)
 
 # Structure des données pour les joueurs (inspirée de sofascore)
 PLAYER_DATA_STRUCTURE = {
@@ -84,6 +83,8 @@ class PlayerDataEnrichment:
         """Initialise le système d'enrichissement de données."""
         self.sources_available = self._check_sources_availability()
         self.cache_expiration = 86400  # 24 heures en secondes
+        self.store = get_player_data_store()
+        self._import_legacy_cache()
     
     def _check_sources_availability(self):
         """
@@ -119,25 +120,10 @@ class PlayerDataEnrichment:
         Returns:
             dict: Données en cache ou None si non disponibles
         """
-        cache_file = os.path.join(CACHE_DIR, f"{cache_type}_{entity_id}.json")
-        
-        if os.path.exists(cache_file):
-            try:
-                with open(cache_file, 'r', encoding='utf-8') as f:
-                    data = json.load(f)
-                
-                # Vérifier l'expiration du cache
-                if 'last_updated' in data:
-                    last_updated = datetime.fromisoformat(data['last_updated'])
-                    now = datetime.now()
-                    
-                    if (now - last_updated).total_seconds() < self.cache_expiration:
-                        logger.info(f"Données de {cache_type} {entity_id} chargées depuis le cache")
-                        return data
-            except Exception as e:
-                logger.error(f"Erreur lors du chargement du cache pour {cache_type} {entity_id}: {e}")
-        
-        return None
+        data = self.store.get(cache_type, entity_id)
+        if data is not None:
+            logger.info(f"Données de {cache_type} {entity_id} chargées depuis le cache")
+        return data
     
     def _save_to_cache(self, cache_type, entity_id, data):
         """
@@ -148,15 +134,35 @@ class PlayerDataEnrichment:
             entity_id (str): Identifiant de l'entité
             data (dict): Données à mettre en cache
         """
-        cache_file = os.path.join(CACHE_DIR, f"{cache_type}_{entity_id}.json")
-        
-        try:
-            with open(cache_file, 'w', encoding='utf-8') as f:
-                json.dump(data, f, ensure_ascii=False, indent=2)
-            
+        if self.store.set(cache_type, entity_id, data, self.cache_expiration):
             logger.info(f"Données de {cache_type} {entity_id} sauvegardées dans le cache")
-        except Exception as e:
-            logger.error(f"Erreur lors de la sauvegarde du cache pour {cache_type} {entity_id}: {e}")
+        else:
+            logger.error(f"Erreur lors de la sauvegarde du cache pour {cache_type} {entity_id}")
+    
+    def _import_legacy_cache(self):
+        """
+        Importe une seule fois les anciens fichiers JSON de CACHE_DIR dans le magasin partagé.
+        """
+        entries = self.store.get_stats().get('entries_by_namespace', {})
+        if entries.get('players') or entries.get('managers'):
+            return
+        self.store.import_json_directory(CACHE_DIR, self.cache_expiration)
+    
+    def _player_cache_key(self, player_name, team_name=None):
+        """
+        Construit la clé de cache d'un joueur ou d'un manager.
+        
+        Args:
+            player_name (str): Nom du joueur ou du manager
+            team_name (str, optional): Nom de l'équipe
+        
+        Returns:
+            str: Clé de cache
+        """
+        cache_key = self._clean_player_name(player_name)
+        if team_name:
+            cache_key += f"_{self._clean_player_name(team_name)}"
+        return cache_key
     
     def _clean_player_name(self, name):
         """
@@ -198,9 +204,7 @@ class PlayerDataEnrichment:
             dict: Données détaillées sur le joueur
         """
         # Créer une clé de cache basée sur le nom du joueur (et l'équipe si disponible)
-        cache_key = self._clean_player_name(player_name)
-        if team_name:
-            cache_key += f"_{self._clean_player_name(team_name)}"
+        cache_key = self._player_cache_key(player_name, team_name)
         
         # Vérifier le cache
         cached_data = self._load_from_cache('players', cache_key)
@@ -520,6 +524,37 @@ class PlayerDataEnrichment:
         except Exception as e:
             logger.error(f"Erreur lors de l'enrichissement avec les données SoFIFA: {e}")
     
+    def get_detailed_squad_data(self, players, team_name=None):
+        """
+        Récupère des données détaillées sur tout un effectif.
+        
+        Les joueurs déjà en cache sont chargés en une seule lecture du magasin ;
+        seuls les joueurs manquants sont enrichis individuellement.
+        
+        Args:
+            players (list): Liste de tuples (nom du joueur, ID Transfermarkt ou None)
+            team_name (str, optional): Nom de l'équipe
+        
+        Returns:
+            list: Données détaillées des joueurs, dans l'ordre de la liste fournie
+        """
+        cache_keys = [self._player_cache_key(player_name, team_name) for player_name, _ in players]
+        cached = self.store.get_many('players', cache_keys)
+        
+        squad = []
+        for (player_name, player_id), cache_key in zip(players, cache_keys):
+            detailed_player = cached.get(cache_key)
+            if detailed_player is None:
+                detailed_player = self.get_detailed_player_data(
+                    player_name=player_name,
+                    team_name=team_name,
+                    player_id=player_id
+                )
+            squad.append(detailed_player)
+        
+        logger.info(f"Effectif {team_name}: {len(cached)}/{len(players)} joueurs servis depuis le cache")
+        return squad
+    
     def get_detailed_manager_data(self, manager_name, team_name=None):
         """
         Récupère des données détaillées sur un manager en combinant plusieurs sources.
@@ -532,9 +567,7 @@ class PlayerDataEnrichment:
             dict: Données détaillées sur le manager
         """
         # Créer une clé de cache basée sur le nom du manager (et l'équipe si disponible)
-        cache_key = self._clean_player_name(manager_name)
-        if team_name:
-            cache_key += f"_{self._clean_player_name(team_name)}"
+        cache_key = self._player_cache_key(manager_name, team_name)
         
         # Vérifier le cache
         cached_data = self._load_from_cache('managers', cache_key)
@@ -734,19 +767,14 @@ def enrich_team_with_player_data(team_data):
                 team_players = get_team_players(tm_team_id)
                 
                 if team_players and 'players' in team_players:
-                    for tm_player in team_players['players']:
-                        player_name = tm_player.get('name')
-                        player_id = tm_player.get('id')
-                        
-                        if player_name and player_id:
-                            # Récupérer des données détaillées sur le joueur
-                            detailed_player = enrichment.get_detailed_player_data(
-                                player_name=player_name,
-                                team_name=team_name,
-                                player_id=player_id
-                            )
-                            
-                            players.append(detailed_player)
+                    squad = [
+                        (tm_player.get('name'), tm_player.get('id'))
+                        for tm_player in team_players['players']
+                        if tm_player.get('name') and tm_player.get('id')
+                    ]
+                    
+                    # Récupérer des données détaillées sur l'effectif
+                    players = enrichment.get_detailed_squad_data(squad, team_name)
             except Exception as e:
                 logger.error(f"Erreur lors de l'enrichissement de l'équipe {team_name} avec des données de joueur: {e}")
     
@@ -763,18 +791,15 @@ def enrich_team_with_player_data(team_data):
                         source=source
                     )
                     
-                    if not team_players.empty:
-                        for _, player_row in team_players.iterrows():
-                            player_name = player_row.get('player_name')
-                            
-                            if player_name:
-                                # Récupérer des données détaillées sur le joueur
-                                detailed_player = enrichment.get_detailed_player_data(
-                                    player_name=player_name,
-                                    team_name=team_name
-                                )
-                                
-                                players.append(detailed_player)
+                    if not team_players.empty and 'player_name' in team_players.columns:
+                        squad = [
+                            (player_name, None)
+                            for player_name in team_players['player_name']
+                            if player_name
+                        ]
+                        
+                        # Récupérer des données détaillées sur l'effectif
+                        players = enrichment.get_detailed_squad_data(squad, team_name)
                         
                         # Si des joueurs ont été trouvés, sortir de la boucle
                         if players:
@@ -5,10 +5,12 @@ Fournit les endpoints API pour la future application mobile.
 
 import logging
 import json
-from flask import Blueprint, jsonify, request
+from flask import Blueprint, Response, jsonify, request
 from datetime import datetime, timedelta
 import os
 
+from api.snapshot_store import Snapshot, SnapshotStore
+
 # Configuration du logging
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
@@ -26,6 +28,170 @@ except Exception as e:
     logger.error(f"Erreur lors de l'initialisation du hub d'intégration: {e}")
     DATA_HUB_AVAILABLE = False
 
+# Snapshots pré-sérialisés des réponses, reconstruits une fois par cycle de rafraîchissement
+snapshot_store = SnapshotStore()
+
+# Taille de page maximale acceptée via le paramètre 'limit'
+MAX_PAGE_SIZE = 100
+
+# Paramètres par défaut si l'adaptateur cross-platform n'est pas disponible
+DEFAULT_PLATFORM_SETTINGS = {"data_freshness": 600, "batch_size": 10}
+
+# Valeurs acceptées des paramètres servant de clés aux snapshots : une plateforme
+# inconnue est servie comme 'web' (comme dans l'adaptateur), l'horizon est borné
+KNOWN_PLATFORMS = ('web', 'mobile', 'watch')
+MAX_DAYS_AHEAD = 14
+
+# Dernières prédictions construites par snapshot (plateforme connue, horizon borné), par
+# match : reprises pour les matchs dont la reconstruction échoue
+_last_predictions = {}
+
+# Prédictions de base jointes aux réponses de détail d'un match
+DEFAULT_MATCH_PREDICTIONS = {
+    'home_win': 0.45,
+    'draw': 0.30,
+    'away_win': 0.25,
+    'confidence': 0.75,
+    'value_detected': False
+}
+
+def _request_platform():
+    """Renvoie la plateforme demandée, ramenée à une plateforme connue"""
+    platform = request.args.get('platform', default='mobile')
+    return platform if platform in KNOWN_PLATFORMS else 'web'
+
+def _request_days(default):
+    """Renvoie l'horizon demandé en jours, borné à [1, MAX_DAYS_AHEAD]"""
+    days_ahead = request.args.get('days', default=default, type=int)
+    return max(1, min(days_ahead, MAX_DAYS_AHEAD))
+
+def _platform_settings(platform):
+    """Renvoie les paramètres de rafraîchissement et de pagination d'une plateforme"""
+    adapter = getattr(data_hub, 'cross_platform_adapter', None) if DATA_HUB_AVAILABLE else None
+    if adapter:
+        return adapter.platform_settings.get(platform, adapter.platform_settings['web'])
+    return DEFAULT_PLATFORM_SETTINGS
+
+def _prepare_all_for_app(items, platform):
+    """
+    Prépare une liste complète pour l'application.
+    L'adaptateur tronque chaque appel à la taille de lot de la plateforme :
+    la liste est donc traitée lot par lot pour être entièrement matérialisée.
+    """
+    batch_size = _platform_settings(platform)['batch_size']
+    prepared = []
+    for start in range(0, len(items), batch_size):
+        prepared.extend(data_hub.prepare_matches_for_app(items[start:start + batch_size], platform))
+    return prepared
+
+def _serve_payload(payload, max_age):
+    """
+    Sert un corps pré-sérialisé avec ETag, réponse 304 et compression gzip si acceptée
+    
+    Args:
+        payload (SerializedPayload): Corps de réponse matérialisé
+        max_age (int): Durée de validité restante du snapshot en secondes
+    """
+    if request.if_none_match.contains(payload.etag):
+        response = Response(status=304)
+    elif 'gzip' in request.accept_encodings:
+        response = Response(payload.gzipped, mimetype='application/json')
+        response.headers['Content-Encoding'] = 'gzip'
+    else:
+        response = Response(payload.raw, mimetype='application/json')
+    
+    response.set_etag(payload.etag)
+    response.headers['Vary'] = 'Accept-Encoding'
+    response.headers['Cache-Control'] = f"public, max-age={max_age}"
+    return response
+
+def _serve_page(snapshot):
+    """Sert la page désignée par les paramètres 'cursor' et 'limit' de la requête"""
+    limit = request.args.get('limit', default=None, type=int)
+    if limit is not None:
+        limit = max(1, min(limit, MAX_PAGE_SIZE))
+    
+    payload = snapshot.page(request.args.get('cursor'), limit)
+    if payload is None:
+        return jsonify({"error": "Curseur invalide ou expiré"}), 400
+    
+    return _serve_payload(payload, snapshot.max_age)
+
+def _matches_snapshot(platform, days_ahead, leagues):
+    """Renvoie le snapshot des matchs à venir pour une plateforme"""
+    def build():
+        settings = _platform_settings(platform)
+        matches = data_hub.get_upcoming_matches(days_ahead=days_ahead, leagues=leagues)
+        return Snapshot(
+            _prepare_all_for_app(matches, platform),
+            meta={"platform": platform},
+            page_size=settings['batch_size'],
+            ttl=settings['data_freshness'],
+            with_details=True,
+            detail_extra={'detailed': True, 'predictions': DEFAULT_MATCH_PREDICTIONS}
+        )
+    
+    key = ('matches', platform, days_ahead, tuple(leagues) if leagues else None)
+    return snapshot_store.get(key, build)
+
+def _build_prediction(match):
+    """Construit la prédiction d'un match à partir du moteur de prédiction du hub"""
+    result = data_hub.get_match_predictions(match.get('home_team'), match.get('away_team'), match.get('league_id'))
+    probs = {
+        'home_win': round(result['probabilities']['home'] / 100, 2),
+        'draw': round(result['probabilities']['draw'] / 100, 2),
+        'away_win': round(result['probabilities']['away'] / 100, 2)
+    }
+    
+    # Valeur détectée si une cote du marché dépasse le juste prix du modèle
+    market_odds = match.get('odds') if isinstance(match.get('odds'), dict) else {}
+    value_detected = any(
+        isinstance(market_odds.get(side), (int, float)) and probs[outcome] * market_odds[side] > 1.05
+        for outcome, side in (('home_win', 'home'), ('draw', 'draw'), ('away_win', 'away'))
+    )
+    
+    return {
+        'match_id': match.get('id'),
+        'home_team': match.get('home_team'),
+        'away_team': match.get('away_team'),
+        'date': match.get('date'),
+        'league_id': match.get('league_id'),
+        'league_name': match.get('league_name'),
+        'probabilities': probs,
+        'recommended_bet': max(probs, key=probs.get),
+        'confidence': result['confidence'],
+        'value_detected': value_detected
+    }
+
+def _predictions_snapshot(platform, days_ahead):
+    """Renvoie le snapshot des prédictions pour une plateforme"""
+    def build():
+        settings = _platform_settings(platform)
+        matches = data_hub.get_upcoming_matches(days_ahead=days_ahead)
+        previous = _last_predictions.get((platform, days_ahead), {})
+        built = {}
+        for match in matches:
+            match_id = match.get('id')
+            try:
+                built[match_id] = _build_prediction(match)
+            except Exception as e:
+                # Un match en échec ne fait pas échouer le snapshot : on garde sa dernière prédiction
+                if match_id in previous:
+                    built[match_id] = previous[match_id]
+                logger.warning(f"Prédiction du match {match_id} non reconstruite "
+                               f"({'entrée précédente conservée' if match_id in built else 'match ignoré'}): {e}")
+        _last_predictions[(platform, days_ahead)] = built
+        predictions = list(built.values())
+        return Snapshot(
+            _prepare_all_for_app(predictions, platform),
+            meta={"platform": platform},
+            page_size=settings['batch_size'],
+            ttl=settings['data_freshness'],
+            id_field='match_id'
+        )
+    
+    return snapshot_store.get(('predictions', platform, days_ahead), build)
+
 @api_blueprint.route('/status', methods=['GET'])
 def api_status():
     """Endpoint pour vérifier le statut de l'API"""
@@ -64,33 +230,47 @@ def get_matches():
     
     try:
         # Récupérer les paramètres de la requête
-        days_ahead = request.args.get('days', default=3, type=int)
+        days_ahead = _request_days(3)
         leagues = request.args.get('leagues', default=None)
-        platform = request.args.get('platform', default='mobile')
+        platform = _request_platform()
         
         # Convertir les leagues en liste si spécifié
         if leagues:
-            leagues = [int(l) for l in leagues.split(',')]
+            leagues = sorted(int(l) for l in leagues.split(','))
         
-        # Récupérer les matchs via le hub d'intégration
-        matches = data_hub.get_upcoming_matches(days_ahead=days_ahead, leagues=leagues)
+        # Servir la page demandée depuis le snapshot des matchs préparés pour l'application
+        return _serve_page(_matches_snapshot(platform, days_ahead, leagues))
         
-        # Préparer les données pour l'application
-        matches_for_app = data_hub.prepare_matches_for_app(matches, platform)
+    except Exception as e:
+        logger.error(f"Erreur lors de la récupération des matchs: {e}")
+        return jsonify({"error": "Erreur serveur", "message": str(e)}), 500
+
+@api_blueprint.route('/matches/delta', methods=['GET'])
+def get_matches_delta():
+    """Endpoint binaire pour récupérer les changements des matchs depuis la version 'since' du client"""
+    adapter = getattr(data_hub, 'cross_platform_adapter', None) if DATA_HUB_AVAILABLE else None
+    if adapter is None:
+        return jsonify({"error": "Service non disponible"}), 503
+    
+    try:
+        days_ahead = _request_days(3)
+        leagues = request.args.get('leagues', default=None)
+        platform = _request_platform()
         
-        # Ajouter des métadonnées
-        response = {
-            "count": len(matches_for_app),
-            "platform": platform,
-            "timestamp": datetime.now().isoformat(),
-            "expires": (datetime.now() + timedelta(minutes=10)).isoformat(),
-            "data": matches_for_app
-        }
+        if leagues:
+            leagues = sorted(int(l) for l in leagues.split(','))
+        
+        # Même snapshot que /matches ; export complet si la version du client est inconnue
+        snapshot = _matches_snapshot(platform, days_ahead, leagues)
+        stream = f"matches:{platform}:{days_ahead}:{','.join(map(str, leagues)) if leagues else 'all'}"
+        payload = adapter.export_delta_for_app(snapshot.rows, stream=stream, since_version=request.args.get('since'))
         
-        return jsonify(response)
+        response = Response(payload, mimetype='application/octet-stream')
+        response.headers['Cache-Control'] = 'no-cache'
+        return response
         
     except Exception as e:
-        logger.error(f"Erreur lors de la récupération des matchs: {e}")
+        logger.error(f"Erreur lors de l'export delta des matchs: {e}")
         return jsonify({"error": "Erreur serveur", "message": str(e)}), 500
 
 @api_blueprint.route('/match/<match_id>', methods=['GET'])
@@ -100,38 +280,17 @@ def get_match_details(match_id):
         return jsonify({"error": "Service non disponible"}), 503
     
     try:
-        platform = request.args.get('platform', default='mobile')
+        platform = _request_platform()
         
-        # Simuler la récupération d'un match spécifique
-        # Dans une implémentation réelle, cela appellerait une méthode du hub
-        # pour récupérer les détails du match via son ID
-        
-        # Pour l'instant, générer des données simulées
         if DATA_HUB_AVAILABLE and data_hub.sources_status.get('football_api', False):
-            # Récupérer le match via l'API Football
-            matches = data_hub.get_upcoming_matches(days_ahead=7)
-            match = next((m for m in matches if str(m.get('id')) == str(match_id)), None)
+            # Accès direct au match via l'index du snapshot des 7 prochains jours
+            snapshot = _matches_snapshot(platform, 7, None)
+            payload = snapshot.detail(match_id)
             
-            if not match:
+            if payload is None:
                 return jsonify({"error": "Match non trouvé"}), 404
-                
-            # Enrichir les données du match
-            # Ici, nous aurions plus de détails comme les statistiques, etc.
-            match['detailed'] = True
-            
-            # Préparer pour l'application
-            match_for_app = data_hub.prepare_matches_for_app([match], platform)[0]
             
-            # Ajouter des prédictions
-            match_for_app['predictions'] = {
-                'home_win': 0.45,
-                'draw': 0.30,
-                'away_win': 0.25,
-                'confidence': 0.75,
-                'value_detected': False
-            }
-            
-            return jsonify(match_for_app)
+            return _serve_payload(payload, snapshot.max_age)
         else:
             return jsonify({"error": "Données non disponibles"}), 503
             
@@ -147,59 +306,11 @@ def get_predictions():
     
     try:
         # Récupérer les paramètres
-        days_ahead = request.args.get('days', default=1, type=int)
-        platform = request.args.get('platform', default='mobile')
-        
-        # Récupérer les matchs
-        matches = data_hub.get_upcoming_matches(days_ahead=days_ahead)
-        
-        # Préparer une liste de prédictions
-        predictions = []
-        
-        for match in matches:
-            # Dans une implémentation réelle, nous utiliserions le moteur de prédiction XGBoost
-            # Pour l'instant, générer des données simulées
-            prediction = {
-                'match_id': match.get('id'),
-                'home_team': match.get('home_team'),
-                'away_team': match.get('away_team'),
-                'date': match.get('date'),
-                'league_id': match.get('league_id'),
-                'league_name': match.get('league_name'),
-                'probabilities': {
-                    'home_win': round(0.4 + 0.2 * (random.random() - 0.5), 2),
-                    'draw': round(0.3 + 0.15 * (random.random() - 0.5), 2),
-                    'away_win': round(0.3 + 0.15 * (random.random() - 0.5), 2)
-                },
-                'recommended_bet': None,
-                'confidence': round(0.6 + 0.3 * random.random(), 2),
-                'value_detected': random.random() > 0.8
-            }
-            
-            # Déterminer le pari recommandé
-            probs = prediction['probabilities']
-            max_prob = max(probs.values())
-            if max_prob == probs['home_win']:
-                prediction['recommended_bet'] = 'home_win'
-            elif max_prob == probs['draw']:
-                prediction['recommended_bet'] = 'draw'
-            else:
-                prediction['recommended_bet'] = 'away_win'
-                
-            predictions.append(prediction)
-        
-        # Préparer les données pour l'application
-        predictions_for_app = data_hub.prepare_matches_for_app(predictions, platform)
-        
-        # Réponse complète
-        response = {
-            "count": len(predictions_for_app),
-            "platform": platform,
-            "timestamp": datetime.now().isoformat(),
-            "data": predictions_for_app
-        }
+        days_ahead = _request_days(1)
+        platform = _request_platform()
         
-        return jsonify(response)
+        # Servir la page demandée depuis le snapshot des prédictions
+        return _serve_page(_predictions_snapshot(platform, days_ahead))
         
     except Exception as e:
         logger.error(f"Erreur lors de la récupération des prédictions: {e}")
@@ -0,0 +1,271 @@
+"""
+Module de snapshots pré-sérialisés pour l'API mobile d'ArcanShadow.
+Les réponses des endpoints de listes (matchs, prédictions) sont matérialisées une
+seule fois par cycle de rafraîchissement : chaque élément est sérialisé en JSON
+compact, les pages sont assemblées par concaténation d'octets et compressées
+une fois, et un index identifiant -> position permet de servir un match précis
+ou de reprendre une pagination par curseur sans parcourir la liste.
+"""
+
+import base64
+import gzip
+import hashlib
+import json
+import logging
+import threading
+import time
+from collections import OrderedDict
+from datetime import datetime
+
+# Configuration du logging
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+# Nombre maximal de pages à taille non standard mémorisées par snapshot
+MAX_CUSTOM_PAGES = 256
+
+# Nombre maximal de snapshots conservés (les moins récemment servis sont évincés)
+MAX_SNAPSHOTS = 64
+
+
+def _dumps(data):
+    """Sérialise en JSON compact (octets UTF-8)."""
+    return json.dumps(data, separators=(',', ':'), ensure_ascii=False, default=str).encode('utf-8')
+
+
+def encode_cursor(item_id):
+    """
+    Encode l'identifiant du prochain élément en curseur opaque.
+
+    Args:
+        item_id (str): Identifiant du premier élément de la page suivante
+
+    Returns:
+        str: Curseur URL-safe
+    """
+    return base64.urlsafe_b64encode(str(item_id).encode('utf-8')).decode('ascii').rstrip('=')
+
+
+def decode_cursor(cursor):
+    """
+    Décode un curseur produit par encode_cursor.
+
+    Args:
+        cursor (str): Curseur opaque
+
+    Returns:
+        str: Identifiant de l'élément, ou None si le curseur est invalide
+    """
+    try:
+        padded = cursor + '=' * (-len(cursor) % 4)
+        return base64.urlsafe_b64decode(padded.encode('ascii')).decode('utf-8')
+    except Exception:
+        return None
+
+
+class SerializedPayload:
+    """Corps de réponse pré-sérialisé, sa version compressée et son ETag."""
+
+    __slots__ = ('raw', 'gzipped', 'etag')
+
+    def __init__(self, raw):
+        self.raw = raw
+        self.gzipped = gzip.compress(raw, compresslevel=6, mtime=0)
+        self.etag = hashlib.blake2b(raw, digest_size=12).hexdigest()
+
+
+class Snapshot:
+    """
+    Liste d'éléments matérialisée pour une plateforme, avec index par identifiant.
+    """
+
+    def __init__(self, items, meta, page_size, ttl, id_field='id', with_details=False, detail_extra=None):
+        """
+        Matérialise un snapshot.
+
+        Args:
+            items (list): Éléments déjà préparés pour la plateforme
+            meta (dict): Métadonnées ajoutées à chaque page (platform...)
+            page_size (int): Taille de page par défaut
+            ttl (int): Durée de validité en secondes
+            id_field (str): Champ identifiant des éléments
+            with_details (bool): Matérialiser aussi une réponse de détail par élément
+            detail_extra (dict, optional): Champs ajoutés aux réponses de détail
+        """
+        now = datetime.now()
+        self.created_at = time.time()
+        self.expires_at = self.created_at + ttl
+        self.page_size = max(1, int(page_size))
+        self.meta = dict(meta)
+        self.meta['timestamp'] = now.isoformat()
+        self.meta['expires'] = datetime.fromtimestamp(self.expires_at).isoformat()
+
+        self.ids = [str(item.get(id_field)) for item in items]
+        self.index = {item_id: offset for offset, item_id in enumerate(self.ids)}
+        self.items = [_dumps(item) for item in items]
+        self._rows = None
+
+        self._pages = {}
+        self._custom_pages = OrderedDict()
+        self._lock = threading.Lock()
+
+        # Pages par défaut compressées dès la construction
+        for offset in range(0, max(len(self.items), 1), self.page_size):
+            self._pages[offset] = self._build_page(offset, self.page_size)
+
+        # Réponses de détail : corps de l'élément complété sans re-sérialisation
+        self.details = None
+        if with_details:
+            extra = _dumps(detail_extra)[1:-1] if detail_extra else b''
+            self.details = [SerializedPayload(self._extend(item, extra)) for item in self.items]
+
+    @staticmethod
+    def _extend(item, extra):
+        """Ajoute des champs déjà sérialisés à un objet JSON sérialisé."""
+        if not extra:
+            return item
+        if item == b'{}':
+            return b'{' + extra + b'}'
+        return item[:-1] + b',' + extra + b'}'
+
+    @property
+    def rows(self):
+        """Éléments décodés, calculés une fois (exports binaires de l'application)."""
+        with self._lock:
+            if self._rows is None:
+                self._rows = [json.loads(item) for item in self.items]
+            return self._rows
+
+    @property
+    def expired(self):
+        """Indique si le snapshot doit être reconstruit."""
+        return time.time() >= self.expires_at
+
+    @property
+    def max_age(self):
+        """Durée de validité restante en secondes (pour Cache-Control)."""
+        return max(0, int(self.expires_at - time.time()))
+
+    def _build_page(self, offset, limit):
+        """Assemble une page par concaténation des éléments déjà sérialisés."""
+        chunk = self.items[offset:offset + limit]
+        next_offset = offset + limit
+        meta = dict(self.meta)
+        meta['count'] = len(chunk)
+        meta['total'] = len(self.items)
+        meta['next_cursor'] = encode_cursor(self.ids[next_offset]) if next_offset < len(self.ids) else None
+        return SerializedPayload(_dumps(meta)[:-1] + b',"data":[' + b','.join(chunk) + b']}')
+
+    def page(self, cursor=None, limit=None):
+        """
+        Renvoie une page du snapshot.
+
+        Args:
+            cursor (str, optional): Curseur renvoyé par la page précédente
+            limit (int, optional): Taille de page (taille par défaut si None)
+
+        Returns:
+            SerializedPayload: Page demandée, ou None si le curseur est inconnu
+        """
+        offset = 0
+        if cursor:
+            offset = self.index.get(decode_cursor(cursor))
+            if offset is None:
+                return None
+
+        limit = self.page_size if not limit or limit <= 0 else int(limit)
+        if limit == self.page_size and offset in self._pages:
+            return self._pages[offset]
+
+        key = (offset, limit)
+        with self._lock:
+            payload = self._custom_pages.get(key)
+            if payload is None:
+                payload = self._build_page(offset, limit)
+                self._custom_pages[key] = payload
+                while len(self._custom_pages) > MAX_CUSTOM_PAGES:
+                    self._custom_pages.popitem(last=False)
+            else:
+                self._custom_pages.move_to_end(key)
+        return payload
+
+    def detail(self, item_id):
+        """
+        Renvoie la réponse de détail d'un élément.
+
+        Args:
+            item_id (str): Identifiant de l'élément
+
+        Returns:
+            SerializedPayload: Détail de l'élément, ou None s'il est absent
+        """
+        offset = self.index.get(str(item_id))
+        if offset is None or self.details is None:
+            return None
+        return self.details[offset]
+
+
+class SnapshotStore:
+    """
+    Registre des snapshots, reconstruits à l'expiration par un seul thread à la fois
+    (les requêtes concurrentes attendent le même calcul) et bornés en nombre (LRU) :
+    leurs clés viennent des paramètres des requêtes.
+    """
+
+    def __init__(self, max_snapshots=MAX_SNAPSHOTS):
+        """
+        Initialise le registre de snapshots.
+
+        Args:
+            max_snapshots (int): Nombre maximal de snapshots conservés
+        """
+        self.max_snapshots = max(1, int(max_snapshots))
+        self._snapshots = OrderedDict()
+        self._build_locks = {}
+        self._lock = threading.Lock()
+
+    def get(self, key, builder):
+        """
+        Renvoie le snapshot courant d'une clé, en le reconstruisant s'il a expiré.
+
+        Args:
+            key (tuple): Clé du snapshot (type, plateforme, paramètres)
+            builder (callable): Fonction sans argument renvoyant un nouveau Snapshot
+
+        Returns:
+            Snapshot: Snapshot valide
+        """
+        with self._lock:
+            snapshot = self._snapshots.get(key)
+            if snapshot is not None and not snapshot.expired:
+                self._snapshots.move_to_end(key)
+                return snapshot
+            build_lock = self._build_locks.setdefault(key, threading.Lock())
+
+        with build_lock:
+            with self._lock:
+                snapshot = self._snapshots.get(key)
+            if snapshot is None or snapshot.expired:
+                started = time.time()
+                snapshot = builder()
+                logger.info(f"Snapshot {key} matérialisé ({len(snapshot.items)} éléments) "
+                            f"en {time.time() - started:.3f}s")
+            with self._lock:
+                self._snapshots[key] = snapshot
+                self._snapshots.move_to_end(key)
+                while len(self._snapshots) > self.max_snapshots:
+                    evicted, _ = self._snapshots.popitem(last=False)
+                    self._build_locks.pop(evicted, None)
+        return snapshot
+
+    def invalidate(self, kind=None):
+        """
+        Invalide les snapshots (tous, ou ceux d'un type donné).
+
+        Args:
+            kind (str, optional): Type de snapshot ('matches', 'predictions'...)
+        """
+        with self._lock:
+            for key in [k for k in self._snapshots if kind is None or k[0] == kind]:
+                del self._snapshots[key]
+                self._build_locks.pop(key, None)
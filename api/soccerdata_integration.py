@@ -18,8 +18,15 @@ Sources disponibles:
 import logging
 import pandas as pd
 import os
+import re
+import time
+import threading
+import functools
+from collections import OrderedDict
 from datetime import datetime
 
+from utils.team_ratings import get_team_rating_engine
+
 # Importer soccerdata
 try:
     import soccerdata as sd
@@ -27,6 +34,17 @@ try:
 except ImportError:
     SOCCERDATA_AVAILABLE = False
 
+# Parquet nécessite pyarrow (ou fastparquet) ; à défaut, les DataFrames sont mis en cache en pickle
+try:
+    import pyarrow  # noqa: F401
+    PARQUET_AVAILABLE = True
+except ImportError:
+    try:
+        import fastparquet  # noqa: F401
+        PARQUET_AVAILABLE = True
+    except ImportError:
+        PARQUET_AVAILABLE = False
+
 # Configuration du logging
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
@@ -43,6 +61,25 @@ COMPETITION_MAPPING = {
     "ELC": "Championship",  # EFL Championship
 }
 
+# Ligues suivies par ArcanShadow (parcourues par défaut et préchargées au démarrage)
+FOLLOWED_LEAGUES = ["EPL", "1. Bundesliga", "La Liga", "Serie A", "Ligue 1"]
+
+# Noms des classes soccerdata par source
+SCRAPER_CLASSES = {
+    'fbref': 'FBref',
+    'espn': 'ESPN',
+    'fotmob': 'FotMob',
+    'sofascore': 'SofaScore',
+    'understat': 'Understat',
+    'whoscored': 'WhoScored',
+    'sofifa': 'SoFIFA',
+    'footballdata': 'FootballData',
+    'clubelo': 'ClubElo'
+}
+
+# Durée de validité des DataFrames analysés mis en cache (en secondes)
+FRAME_CACHE_TTL = 6 * 60 * 60
+
 # Instances singleton des scrappers
 _scrapers = {
     'fbref': None,
@@ -56,6 +93,208 @@ _scrapers = {
     'footballdata': None
 }
 
+class FrameCache:
+    """
+    Cache des DataFrames analysés par les scrapers soccerdata.
+    Niveau mémoire borné (LRU) puis fichiers Parquet (pickle si Parquet indisponible).
+    """
+    
+    def __init__(self, cache_dir, ttl=FRAME_CACHE_TTL, max_memory_frames=64):
+        """
+        Initialise le cache de DataFrames.
+        
+        Args:
+            cache_dir (str): Répertoire des fichiers de cache
+            ttl (int): Durée de validité en secondes
+            max_memory_frames (int): Nombre maximal de DataFrames gardés en mémoire
+        """
+        self.cache_dir = cache_dir
+        self.ttl = ttl
+        self.max_memory_frames = max_memory_frames
+        self._memory = OrderedDict()
+        self._lock = threading.Lock()
+        os.makedirs(self.cache_dir, exist_ok=True)
+    
+    def _path(self, key, extension):
+        """Chemin du fichier de cache d'une clé."""
+        safe_key = re.sub(r'[^A-Za-z0-9_.-]+', '_', key)
+        return os.path.join(self.cache_dir, f"{safe_key}.{extension}")
+    
+    def _read_disk(self, key):
+        """Lit un DataFrame depuis le disque s'il est encore valide."""
+        for extension, reader in (('parquet', pd.read_parquet), ('pkl', pd.read_pickle)):
+            if extension == 'parquet' and not PARQUET_AVAILABLE:
+                continue
+            path = self._path(key, extension)
+            if os.path.exists(path) and time.time() - os.path.getmtime(path) < self.ttl:
+                try:
+                    return reader(path)
+                except Exception as e:
+                    logger.warning(f"Cache de DataFrame illisible {path}: {e}")
+        return None
+    
+    def _write_disk(self, key, frame):
+        """Écrit un DataFrame sur disque (Parquet, ou pickle pour les structures non supportées)."""
+        if PARQUET_AVAILABLE:
+            try:
+                frame.to_parquet(self._path(key, 'parquet'))
+                return
+            except Exception:
+                # Colonnes MultiIndex ou types mixtes non supportés par Parquet
+                pass
+        try:
+            frame.to_pickle(self._path(key, 'pkl'))
+        except Exception as e:
+            logger.warning(f"Impossible de mettre en cache le DataFrame {key}: {e}")
+    
+    def get_or_read(self, key, reader):
+        """
+        Renvoie le DataFrame en cache ou le lit via le scraper.
+        
+        Args:
+            key (str): Clé du DataFrame
+            reader (callable): Fonction sans argument lisant le DataFrame
+            
+        Returns:
+            pd.DataFrame: Copie du DataFrame (les appelants peuvent la modifier)
+        """
+        now = time.time()
+        with self._lock:
+            entry = self._memory.get(key)
+            if entry is not None and now - entry[1] < self.ttl:
+                self._memory.move_to_end(key)
+                return entry[0].copy()
+        
+        frame = self._read_disk(key)
+        if frame is None:
+            frame = reader()
+            if isinstance(frame, pd.DataFrame) and not frame.empty:
+                self._write_disk(key, frame)
+        
+        if isinstance(frame, pd.DataFrame):
+            with self._lock:
+                self._memory[key] = (frame, now)
+                self._memory.move_to_end(key)
+                while len(self._memory) > self.max_memory_frames:
+                    self._memory.popitem(last=False)
+            return frame.copy()
+        return frame
+
+
+class CachedScraper:
+    """
+    Enveloppe d'un scraper soccerdata partagée entre threads.
+    Les lectures de tableaux analysés passent par le FrameCache ; les autres
+    attributs sont délégués au scraper sous-jacent.
+    """
+    
+    CACHED_READERS = ('read_league_table', 'read_schedule', 'read_player_season_stats', 'read_team_season_stats')
+    
+    def __init__(self, scraper, cache_key, frame_cache):
+        """
+        Initialise l'enveloppe.
+        
+        Args:
+            scraper: Instance soccerdata
+            cache_key (str): Préfixe de clé (source, ligues, saison)
+            frame_cache (FrameCache): Cache des DataFrames
+        """
+        self._scraper = scraper
+        self._cache_key = cache_key
+        self._frame_cache = frame_cache
+        # Les scrapers soccerdata ne sont pas garantis thread-safe
+        self._lock = threading.Lock()
+    
+    def __getattr__(self, name):
+        attr = getattr(self._scraper, name)
+        if name in self.CACHED_READERS and callable(attr):
+            return functools.partial(self._cached_read, name, attr)
+        if callable(attr):
+            return functools.partial(self._locked_call, attr)
+        return attr
+    
+    def _locked_call(self, method, *args, **kwargs):
+        """Appelle une méthode du scraper sous son verrou."""
+        with self._lock:
+            return method(*args, **kwargs)
+    
+    def _cached_read(self, name, method, *args, **kwargs):
+        """Lit un tableau analysé via le cache de DataFrames."""
+        arguments = '_'.join([str(a) for a in args] + [f"{k}-{v}" for k, v in sorted(kwargs.items())])
+        key = f"{self._cache_key}_{name}_{arguments}" if arguments else f"{self._cache_key}_{name}"
+        return self._frame_cache.get_or_read(key, lambda: self._locked_call(method, *args, **kwargs))
+
+
+class ScraperPool:
+    """
+    Pool borné d'instances de scrapers soccerdata, indexé par (source, ligues, saison).
+    Évite de reconstruire un scraper (et de relire son cache) à chaque alternance de ligue.
+    """
+    
+    def __init__(self, frame_cache, max_size=24):
+        """
+        Initialise le pool.
+        
+        Args:
+            frame_cache (FrameCache): Cache des DataFrames partagé par les scrapers
+            max_size (int): Nombre maximal de scrapers conservés
+        """
+        self.frame_cache = frame_cache
+        self.max_size = max_size
+        self._pool = OrderedDict()
+        self._lock = threading.Lock()
+        self._creation_locks = {}
+    
+    @staticmethod
+    def _create_scraper(source, leagues, season):
+        """Construit un scraper soccerdata."""
+        scraper_class = getattr(sd, SCRAPER_CLASSES.get(source, source.capitalize()))
+        if source == 'clubelo':
+            return scraper_class()
+        return scraper_class(leagues=list(leagues), seasons=[season])
+    
+    def get(self, source, leagues, season):
+        """
+        Récupère (ou crée une seule fois) le scraper d'une combinaison source/ligues/saison.
+        
+        Args:
+            source (str): Nom de la source
+            leagues (list): Ligues soccerdata
+            season (str): Saison au format de la source
+            
+        Returns:
+            CachedScraper: Scraper partagé
+        """
+        key = (source, tuple(sorted(leagues)), str(season))
+        with self._lock:
+            scraper = self._pool.get(key)
+            if scraper is not None:
+                self._pool.move_to_end(key)
+                return scraper
+            creation_lock = self._creation_locks.setdefault(key, threading.Lock())
+        
+        # Un seul thread construit le scraper d'une clé donnée
+        with creation_lock:
+            with self._lock:
+                scraper = self._pool.get(key)
+                if scraper is not None:
+                    return scraper
+            
+            cache_key = f"{source}_{'-'.join(key[1])}_{key[2]}"
+            scraper = CachedScraper(self._create_scraper(source, key[1], key[2]), cache_key, self.frame_cache)
+            
+            with self._lock:
+                self._pool[key] = scraper
+                while len(self._pool) > self.max_size:
+                    evicted_key, _ = self._pool.popitem(last=False)
+                    self._creation_locks.pop(evicted_key, None)
+                self._creation_locks.pop(key, None)
+            return scraper
+    
+    def __len__(self):
+        return len(self._pool)
+
+
 class SoccerDataIntegration:
     """
     Classe principale pour l'intégration de soccerdata dans ArcanShadow.
@@ -69,6 +308,9 @@ class SoccerDataIntegration:
         # Chemin de mise en cache des données
         self.cache_dir = os.path.join(os.getcwd(), 'data', 'soccerdata_cache')
         os.makedirs(self.cache_dir, exist_ok=True)
+        # Pool de scrapers partagé et cache Parquet des DataFrames analysés
+        self.scraper_pool = ScraperPool(FrameCache(os.path.join(self.cache_dir, 'frames')))
+        self._warm_up_thread = None
     
     def _check_sources_availability(self):
         """
@@ -177,6 +419,64 @@ class SoccerDataIntegration:
         
         return _scrapers.get(source)
     
+    def warm_up(self, leagues=None, season=None, sources=('fbref',)):
+        """
+        Précharge les scrapers et les tableaux principaux (classement, calendrier)
+        des ligues suivies, pour que les premiers onglets servent des données chaudes.
+        
+        Args:
+            leagues (list, optional): Ligues soccerdata à précharger (FOLLOWED_LEAGUES par défaut)
+            season (str, optional): Saison (ex: "2023/2024"). Par défaut, saison actuelle.
+            sources (tuple): Sources à précharger
+            
+        Returns:
+            int: Nombre de tableaux préchargés
+        """
+        if not SOCCERDATA_AVAILABLE:
+            return 0
+        
+        if not season:
+            current_year = datetime.now().year
+            if datetime.now().month >= 7:
+                season = f"{current_year}/{current_year+1}"
+            else:
+                season = f"{current_year-1}/{current_year}"
+        
+        loaded = 0
+        for source in sources:
+            if not self.sources_available.get(source, False):
+                continue
+            sd_season = season if source in ['footballdata'] else season.split('/')[1]
+            for league in leagues or FOLLOWED_LEAGUES:
+                try:
+                    scraper = self.scraper_pool.get(source, [league], sd_season)
+                    for reader in ('read_league_table', 'read_schedule'):
+                        if hasattr(scraper, reader):
+                            getattr(scraper, reader)()
+                            loaded += 1
+                except Exception as e:
+                    logger.warning(f"Préchargement impossible pour {league} via {source}: {e}")
+        
+        logger.info(f"Préchargement soccerdata terminé: {loaded} tableaux en cache")
+        return loaded
+    
+    def start_warm_up(self, **kwargs):
+        """
+        Lance le préchargement en arrière-plan (une seule fois).
+        
+        Args:
+            **kwargs: Arguments transmis à warm_up
+            
+        Returns:
+            threading.Thread: Thread de préchargement
+        """
+        if self._warm_up_thread is None:
+            self._warm_up_thread = threading.Thread(
+                target=self.warm_up, kwargs=kwargs, name='soccerdata-warm-up', daemon=True
+            )
+            self._warm_up_thread.start()
+        return self._warm_up_thread
+    
     def get_league_standings(self, league_code, season=None, source='fbref'):
         """
         Récupère le classement d'une ligue spécifique.
@@ -223,19 +523,12 @@ class SoccerDataIntegration:
                 # La plupart des sources utilisent juste l'année de fin
                 sd_season = season.split('/')[1]
             
-            # Récupérer ou créer le scraper
-            if _scrapers[source] is None or sd_league not in _scrapers[source].leagues or sd_season not in _scrapers[source].seasons:
-                if source == 'footballdata':
-                    _scrapers[source] = sd.FootballData(leagues=[sd_league], seasons=[sd_season])
-                elif source == 'clubelo':
-                    _scrapers[source] = sd.ClubElo()
-                else:
-                    scraper_class = getattr(sd, source.capitalize())
-                    _scrapers[source] = scraper_class(leagues=[sd_league], seasons=[sd_season])
+            # Récupérer le scraper partagé de cette ligue et saison
+            scraper = self.scraper_pool.get(source, [sd_league], sd_season)
             
             # Récupérer les données
             if source in ['fbref', 'espn', 'fotmob', 'sofascore', 'understat', 'whoscored']:
-                standings = _scrapers[source].read_league_table()
+                standings = scraper.read_league_table()
                 
                 # Normaliser les colonnes pour ArcanShadow
                 if not standings.empty:
@@ -320,20 +613,16 @@ class SoccerDataIntegration:
             
             # Pour cette fonction, nous devons d'abord trouver la ligue de l'équipe
             # Parcourir les ligues principales
-            leagues = ["EPL", "1. Bundesliga", "La Liga", "Serie A", "Ligue 1"]
+            leagues = FOLLOWED_LEAGUES
             
             players_df = pd.DataFrame()
             
             for league in leagues:
                 try:
-                    # Créer un scraper pour cette ligue
-                    if source == 'footballdata':
-                        scraper = sd.FootballData(leagues=[league], seasons=[sd_season])
-                    elif source == 'clubelo':
+                    # Récupérer le scraper partagé de cette ligue
+                    if source == 'clubelo':
                         continue  # ClubElo n'a pas d'informations sur les joueurs
-                    else:
-                        scraper_class = getattr(sd, source.capitalize())
-                        scraper = scraper_class(leagues=[league], seasons=[sd_season])
+                    scraper = self.scraper_pool.get(source, [league], sd_season)
                     
                     # Vérifier si l'équipe est dans cette ligue
                     if source in ['fbref', 'sofifa', 'sofascore', 'fotmob']:
@@ -453,20 +742,18 @@ class SoccerDataIntegration:
                 sd_league = COMPETITION_MAPPING.get(league_code, league_code)
                 leagues_to_check = [sd_league]
             else:
-                leagues_to_check = ["EPL", "1. Bundesliga", "La Liga", "Serie A", "Ligue 1"]
+                leagues_to_check = FOLLOWED_LEAGUES
             
             match_stats = {}
             
             for league in leagues_to_check:
                 try:
-                    # Créer un scraper pour cette ligue
+                    # Récupérer le scraper partagé de cette ligue
                     if source == 'footballdata':
                         continue  # FootballData n'a pas d'informations détaillées sur les matchs
                     elif source == 'clubelo':
                         continue  # ClubElo n'a pas d'informations sur les matchs
-                    else:
-                        scraper_class = getattr(sd, source.capitalize())
-                        scraper = scraper_class(leagues=[league], seasons=[sd_season])
+                    scraper = self.scraper_pool.get(source, [league], sd_season)
                     
                     # Récupérer les statistiques de match selon la source
                     if source in ['fotmob', 'sofascore', 'whoscored', 'fbref']:
@@ -612,18 +899,14 @@ class SoccerDataIntegration:
                 sd_league = COMPETITION_MAPPING.get(league_code, league_code)
                 leagues_to_check = [sd_league]
             else:
-                leagues_to_check = ["EPL", "1. Bundesliga", "La Liga", "Serie A", "Ligue 1"]
+                leagues_to_check = FOLLOWED_LEAGUES
             
             for league in leagues_to_check:
                 try:
-                    # Créer un scraper pour cette ligue
-                    if source == 'footballdata':
-                        scraper = sd.FootballData(leagues=[league], seasons=[sd_season])
-                    elif source == 'clubelo':
+                    # Récupérer le scraper partagé de cette ligue
+                    if source == 'clubelo':
                         continue  # ClubElo n'a pas d'informations sur les matchs
-                    else:
-                        scraper_class = getattr(sd, source.capitalize())
-                        scraper = scraper_class(leagues=[league], seasons=[sd_season])
+                    scraper = self.scraper_pool.get(source, [league], sd_season)
                     
                     # Récupérer le calendrier des matchs
                     if source in ['fbref', 'fotmob', 'sofascore']:
@@ -683,16 +966,26 @@ class SoccerDataIntegration:
             logger.error(f"Erreur lors de la récupération de la forme de {team_name}: {e}")
             return pd.DataFrame()
     
-    def get_team_elo_rating(self, team_name):
+    def get_team_elo_rating(self, team_name, match_date=None):
         """
         Récupère le classement Elo d'une équipe spécifique.
+        Le classement local (calculé depuis l'archive de résultats) est utilisé en
+        priorité ; ClubElo n'est interrogé que pour les équipes absentes de l'archive.
         
         Args:
             team_name (str): Nom de l'équipe
+            match_date (date|str, optional): Date à laquelle le classement est demandé
             
         Returns:
             float: Classement Elo de l'équipe ou None si non disponible
         """
+        try:
+            rating = get_team_rating_engine().get_rating(team_name, match_date)
+            if rating is not None:
+                return rating['elo']
+        except Exception as e:
+            logger.warning(f"Classement local indisponible pour {team_name}: {e}")
+        
         if not SOCCERDATA_AVAILABLE:
             logger.warning("Bibliothèque soccerdata non disponible")
             return None
@@ -773,18 +1066,16 @@ class SoccerDataIntegration:
                 sd_league = COMPETITION_MAPPING.get(league_code, league_code)
                 leagues_to_check = [sd_league]
             else:
-                leagues_to_check = ["EPL", "1. Bundesliga", "La Liga", "Serie A", "Ligue 1"]
+                leagues_to_check = FOLLOWED_LEAGUES
             
             for league in leagues_to_check:
                 try:
-                    # Créer un scraper pour cette ligue
+                    # Récupérer le scraper partagé de cette ligue
                     if source == 'footballdata':
                         continue  # FootballData n'a pas d'informations détaillées sur les équipes
                     elif source == 'clubelo':
                         continue  # ClubElo n'a pas d'informations détaillées sur les équipes
-                    else:
-                        scraper_class = getattr(sd, source.capitalize())
-                        scraper = scraper_class(leagues=[league], seasons=[sd_season])
+                    scraper = self.scraper_pool.get(source, [league], sd_season)
                     
                     # Récupérer les statistiques d'équipe selon la source
                     if source == 'fbref':
@@ -976,18 +1267,16 @@ class SoccerDataIntegration:
                 sd_league = COMPETITION_MAPPING.get(league_code, league_code)
                 leagues_to_check = [sd_league]
             else:
-                leagues_to_check = ["EPL", "1. Bundesliga", "La Liga", "Serie A", "Ligue 1"]
+                leagues_to_check = FOLLOWED_LEAGUES
             
             for league in leagues_to_check:
                 try:
-                    # Créer un scraper pour cette ligue
+                    # Récupérer le scraper partagé de cette ligue
                     if source == 'footballdata':
                         continue  # FootballData n'a pas d'informations sur les joueurs
                     elif source == 'clubelo':
                         continue  # ClubElo n'a pas d'informations sur les joueurs
-                    else:
-                        scraper_class = getattr(sd, source.capitalize())
-                        scraper = scraper_class(leagues=[league], seasons=[sd_season])
+                    scraper = self.scraper_pool.get(source, [league], sd_season)
                     
                     # Récupérer les statistiques du joueur selon la source
                     if source == 'fbref':
@@ -1083,10 +1372,13 @@ class SoccerDataIntegration:
 # Créer une instance singleton pour l'accès global
 _soccer_data_integration = None
 
-def get_soccer_data_integration():
+def get_soccer_data_integration(warm_up=True):
     """
     Récupère l'instance singleton d'intégration soccerdata.
     
+    Args:
+        warm_up (bool): Si True, précharge en arrière-plan les ligues suivies à la création
+    
     Returns:
         SoccerDataIntegration: Instance d'intégration soccerdata
     """
@@ -1095,6 +1387,8 @@ def get_soccer_data_integration():
     if _soccer_data_integration is None:
         logger.info("Initialisation de l'intégration soccerdata globale")
         _soccer_data_integration = SoccerDataIntegration()
+        if warm_up:
+            _soccer_data_integration.start_warm_up()
         
     return _soccer_data_integration
 
@@ -1175,17 +1469,16 @@ def enhance_match_data_with_soccerdata(match_data):
                 enhanced_data['away_team_form'] = away_form.to_dict()
                 logger.info(f"Forme récente récupérée pour {away_team}")
             
-            # Essayer de récupérer le classement Elo des équipes
-            if integration.is_source_available('clubelo'):
-                home_elo = integration.get_team_elo_rating(home_team)
-                if home_elo:
-                    enhanced_data['home_team_elo'] = home_elo
-                    logger.info(f"Classement Elo récupéré pour {home_team}: {home_elo}")
-                
-                away_elo = integration.get_team_elo_rating(away_team)
-                if away_elo:
-                    enhanced_data['away_team_elo'] = away_elo
-                    logger.info(f"Classement Elo récupéré pour {away_team}: {away_elo}")
+            # Récupérer le classement Elo des équipes (local, puis ClubElo)
+            home_elo = integration.get_team_elo_rating(home_team, match_date)
+            if home_elo:
+                enhanced_data['home_team_elo'] = home_elo
+                logger.info(f"Classement Elo récupéré pour {home_team}: {home_elo}")
+            
+            away_elo = integration.get_team_elo_rating(away_team, match_date)
+            if away_elo:
+                enhanced_data['away_team_elo'] = away_elo
+                logger.info(f"Classement Elo récupéré pour {away_team}: {away_elo}")
     
     except Exception as e:
         logger.error(f"Erreur lors de l'enrichissement des données avec soccerdata: {e}")
@@ -7,7 +7,8 @@ la qualité des analyses, en particulier pour YouthImpactAnalyzer et autres modu
 import os
 import requests
 import logging
-from datetime import datetime
+
+from utils.player_data_store import get_player_data_store
 
 # Configuration du logging
 logging.basicConfig(level=logging.INFO)
@@ -23,13 +24,8 @@ class TransfermarktAdapter:
     def __init__(self):
         """Initialise l'adaptateur Transfermarkt."""
         self.base_url = "https://www.transfermarkt.com"
-        # Mise en cache pour éviter les appels répétés
-        self.cache = {
-            'clubs': {},
-            'players': {},
-            'competitions': {},
-            'cache_time': {}
-        }
+        # Mise en cache pour éviter les appels répétés (magasin partagé avec l'enrichissement joueurs)
+        self.store = get_player_data_store()
         self.cache_expiration = 3600  # 1 heure en secondes
         
         # Headers pour simuler un navigateur (nécessaire pour l'extraction)
@@ -76,19 +72,10 @@ class TransfermarktAdapter:
         Returns:
             dict: Élément du cache ou None s'il n'existe pas ou est expiré
         """
-        cache_key = f"{cache_type}_{item_id}"
-        
-        if cache_key in self.cache[cache_type]:
-            # Vérifier l'expiration du cache
-            if cache_key in self.cache['cache_time']:
-                cache_time = self.cache['cache_time'][cache_key]
-                current_time = datetime.now().timestamp()
-                
-                if current_time - cache_time < self.cache_expiration:
-                    logger.info(f"Récupération de {cache_type} {item_id} depuis le cache")
-                    return self.cache[cache_type][cache_key]
-        
-        return None
+        data = self.store.get(f"transfermarkt_{cache_type}", item_id)
+        if data is not None:
+            logger.info(f"Récupération de {cache_type} {item_id} depuis le cache")
+        return data
     
     def _save_to_cache(self, cache_type, item_id, data):
         """
@@ -99,9 +86,7 @@ class TransfermarktAdapter:
             item_id (str): Identifiant de l'élément
             data (dict): Données à mettre en cache
         """
-        cache_key = f"{cache_type}_{item_id}"
-        self.cache[cache_type][cache_key] = data
-        self.cache['cache_time'][cache_key] = datetime.now().timestamp()
+        self.store.set(f"transfermarkt_{cache_type}", item_id, data, self.cache_expiration)
     
     def search_club(self, club_name):
         """
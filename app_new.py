@@ -12,6 +12,7 @@ import random
 
 # Importer notre nouveau module pour les prédictions
 from predictions_tab import display_predictions_tab
+from profiling_tab import add_profiling_tab
 
 # Fonction pour charger le CSS personnalisé
 def load_custom_css():
@@ -164,8 +165,10 @@ st.markdown(f"### {t('welcome_message')}")
 # Créer les onglets pour la nouvelle version d'ArcanShadow
 tabs = st.tabs([
     "🔮 Prédictions",
+    "⏱️ Profilage",
 ])
 
-# Pour l'instant, nous n'avons qu'un seul onglet - Prédictions
 with tabs[0]:
-    display_predictions_tab()
\ No newline at end of file
+    display_predictions_tab()
+
+add_profiling_tab(tabs[1])
\ No newline at end of file
@@ -0,0 +1,3 @@
+"""
+Benchmarks reproductibles du pipeline de prédiction d'ArcanShadow (voir run_benchmarks.py).
+"""
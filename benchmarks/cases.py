@@ -0,0 +1,149 @@
+"""
+Chemins critiques mesurés par les benchmarks.
+
+Chaque cas définit une préparation (instanciation des modules, résultats amont non
+chronométrés), une adaptation éventuelle des matchs ('prepare', non chronométrée), une
+exécution, soit par match ('fixture'), soit sur la slate entière ('slate'), une
+vérification du résultat ('check' : un résultat vide compte comme une erreur, pour ne
+pas chronométrer un chemin qui échoue sans rien produire) et une libération éventuelle
+des ressources ('teardown'). Les imports sont faits dans la préparation pour qu'un cas
+dont les dépendances manquent soit simplement signalé comme ignoré.
+"""
+
+from benchmarks.slates import as_analysis_input, as_combo_input
+
+
+def _setup_arcan_x(slate):
+    from modules.arcanx import ArcanX
+    return ArcanX()
+
+
+def _setup_shadow_odds(slate):
+    from modules.shadow_odds import ShadowOdds
+    return ShadowOdds()
+
+
+def _setup_convergence(slate):
+    from modules.arcanx import ArcanX
+    from modules.shadow_odds import ShadowOdds
+    from modules.convergence import Convergence
+    arcan_x, shadow_odds = ArcanX(), ShadowOdds()
+    upstream = {}
+    for match in map(as_analysis_input, slate):
+        upstream[match['id']] = (arcan_x.analyze_match(match), shadow_odds.analyze_match(match))
+    return Convergence(), upstream
+
+
+def _run_convergence(state, match):
+    convergence, upstream = state
+    arcan_x_results, shadow_odds_results = upstream[match['id']]
+    return convergence.generate_prediction(match, arcan_x_results, shadow_odds_results)
+
+
+def _setup_arcan_brain(slate):
+    from modules.arcan_brain import ArcanBrain
+    return ArcanBrain()
+
+
+def _setup_meta_systems(slate):
+    from modules.meta_systems import MetaSystems
+    return MetaSystems()
+
+
+def _setup_advanced_prediction_engine(slate):
+    from xgboost_predictions_tab import AdvancedPredictionEngine
+    return AdvancedPredictionEngine()
+
+
+def _setup_betting_combo_generator(slate):
+    from utils.betting_combo_generator import BettingComboGenerator
+    return BettingComboGenerator()
+
+
+def _setup_daily_combos(slate):
+    from utils.daily_combo import get_daily_combos
+    return get_daily_combos
+
+
+def _setup_daily_combo_stakes(slate):
+    from utils.daily_combo import get_daily_combos, get_daily_combo_stakes
+    return get_daily_combo_stakes, get_daily_combos(slate)
+
+
+CASES = {
+    'arcan_x.analyze_match': {
+        'kind': 'fixture',
+        'prepare': as_analysis_input,
+        'setup': _setup_arcan_x,
+        'run': lambda module, match: module.analyze_match(match),
+        'check': lambda result: bool(result.get('factors'))
+    },
+    'shadow_odds.analyze_match': {
+        'kind': 'fixture',
+        'prepare': as_analysis_input,
+        'setup': _setup_shadow_odds,
+        'run': lambda module, match: module.analyze_match(match),
+        'check': lambda result: bool(result.get('factors'))
+    },
+    'convergence.generate_prediction': {
+        'kind': 'fixture',
+        'prepare': as_analysis_input,
+        'setup': _setup_convergence,
+        'run': _run_convergence,
+        'check': lambda result: bool(result.get('outcome'))
+    },
+    'arcan_brain.analyze_match': {
+        'kind': 'fixture',
+        'prepare': as_analysis_input,
+        'setup': _setup_arcan_brain,
+        'run': lambda module, match: module.analyze_match(match),
+        'check': lambda result: bool(result.get('analysis_id'))
+    },
+    'meta_systems.update_system': {
+        'kind': 'fixture',
+        'prepare': as_analysis_input,
+        'setup': _setup_meta_systems,
+        'run': lambda module, match: module.update_system(match),
+        'check': lambda result: bool(result.get('active_modules')),
+        'teardown': lambda module: module.close()
+    },
+    'advanced_prediction_engine.predict': {
+        'kind': 'fixture',
+        'setup': _setup_advanced_prediction_engine,
+        'run': lambda module, match: module.predict(match),
+        'check': lambda result: bool(result)
+    },
+    'betting_combo_generator.generate_daily_combo': {
+        'kind': 'slate',
+        'prepare': as_combo_input,
+        'setup': _setup_betting_combo_generator,
+        'run': lambda module, slate: module.generate_daily_combo(matches=slate),
+        'check': lambda result: bool(result.get('selections'))
+    },
+    'betting_combo_generator.generate_combo_profiles': {
+        'kind': 'slate',
+        'prepare': as_combo_input,
+        'setup': _setup_betting_combo_generator,
+        'run': lambda module, slate: module.generate_combo_profiles(matches=slate),
+        'check': lambda result: any(profile.get('selections') for profile in result.values())
+    },
+    'betting_combo_generator.generate_staking_plan': {
+        'kind': 'slate',
+        'prepare': as_combo_input,
+        'setup': _setup_betting_combo_generator,
+        'run': lambda module, slate: module.generate_staking_plan(matches=slate, seed=0),
+        'check': lambda result: bool(result.get('bets'))
+    },
+    'daily_combo.get_daily_combos': {
+        'kind': 'slate',
+        'setup': _setup_daily_combos,
+        'run': lambda get_daily_combos, slate: get_daily_combos(slate),
+        'check': lambda result: any(result.values())
+    },
+    'daily_combo.get_daily_combo_stakes': {
+        'kind': 'slate',
+        'setup': _setup_daily_combo_stakes,
+        'run': lambda state, slate: state[0](state[1], slate, seed=0),
+        'check': lambda result: bool(result.get('bets'))
+    }
+}
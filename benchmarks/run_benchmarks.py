@@ -0,0 +1,377 @@
+"""
+Suite de benchmarks reproductibles du pipeline de prédiction d'ArcanShadow.
+
+Chaque chemin critique (voir benchmarks/cases.py) est mesuré sur des slates
+synthétiques déterministes de 100, 1 000 et 10 000 matchs. Chaque couple
+(chemin, taille) s'exécute dans un sous-processus dédié, ce qui isole le pic de
+mémoire résidente (RSS). Le réseau est coupé, sauf avec --allow-network, et le cache
+de prédictions est désactivé, sauf avec --with-cache, afin de mesurer le calcul
+lui-même. Un second passage sous tracemalloc mesure le pic de mémoire allouée et
+les principaux sites d'allocation.
+
+Les résultats sont écrits en JSON dans benchmarks/results/ et comparés à une base
+de référence (benchmarks/baseline.json). Toute régression au-delà des seuils donne
+un code de sortie non nul, ce qui permet de bloquer un déploiement.
+
+Usage :
+    python -m benchmarks.run_benchmarks
+    python -m benchmarks.run_benchmarks --sizes 100 1000 --cases arcan_x.analyze_match
+    python -m benchmarks.run_benchmarks --save-baseline
+"""
+
+import argparse
+import json
+import logging
+import os
+import platform
+import random
+import socket
+import subprocess
+import sys
+import tempfile
+import time
+import tracemalloc
+from datetime import datetime
+
+import numpy as np
+
+try:
+    import resource
+    RESOURCE_AVAILABLE = True
+except ImportError:
+    RESOURCE_AVAILABLE = False
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if REPO_ROOT not in sys.path:
+    sys.path.insert(0, REPO_ROOT)
+
+from benchmarks.cases import CASES
+from benchmarks.slates import DEFAULT_SEED, generate_slate
+
+logger = logging.getLogger('benchmarks')
+
+DEFAULT_SIZES = [100, 1000, 10000]
+DEFAULT_RESULTS_DIR = os.path.join(REPO_ROOT, 'benchmarks', 'results')
+DEFAULT_BASELINE = os.path.join(REPO_ROOT, 'benchmarks', 'baseline.json')
+DEFAULT_TIME_THRESHOLD = 0.20
+DEFAULT_MEMORY_THRESHOLD = 0.25
+MEMORY_SAMPLE_FIXTURES = 100
+SLATE_REPEATS = 3
+
+
+def _disable_network():
+    """Coupe toute connexion réseau sortante du processus courant."""
+    def refuse(*args, **kwargs):
+        raise OSError("Réseau désactivé pendant les benchmarks (--allow-network pour l'autoriser)")
+
+    socket.socket.connect = refuse
+    socket.socket.connect_ex = refuse
+    socket.create_connection = refuse
+    socket.getaddrinfo = refuse
+
+
+def _peak_rss_mb():
+    """Pic de mémoire résidente du processus en Mo (None si indisponible)."""
+    if not RESOURCE_AVAILABLE:
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # Octets sous macOS, kilo-octets sous Linux
+    return round(peak / (1024 * 1024) if sys.platform == 'darwin' else peak / 1024, 2)
+
+
+def _seed(seed):
+    """Fixe les générateurs aléatoires utilisés par les modules."""
+    random.seed(seed)
+    np.random.seed(seed % (2 ** 32))
+
+
+def _summarize(durations):
+    """Statistiques d'une liste de durées (secondes) en millisecondes."""
+    values = np.asarray(durations) * 1000.0
+    p50, p95 = np.percentile(values, [50, 95])
+    return {
+        'mean': round(float(values.mean()), 4),
+        'p50': round(float(p50), 4),
+        'p95': round(float(p95), 4),
+        'max': round(float(values.max()), 4)
+    }
+
+
+def run_case(case_name, size, seed=DEFAULT_SEED, with_cache=False, time_budget=None):
+    """
+    Mesure un chemin critique sur une slate (dans le processus courant).
+
+    Args:
+        case_name (str): Nom du cas (clé de CASES)
+        size (int): Taille de la slate
+        seed (int): Graine de la slate et des générateurs aléatoires
+        with_cache (bool): Laisser le cache de prédictions actif
+        time_budget (float, optional): Durée maximale du passage chronométré (secondes)
+
+    Returns:
+        dict: Résultat du benchmark
+    """
+    case = CASES[case_name]
+    result = {'case': case_name, 'size': size, 'kind': case['kind'], 'seed': seed, 'status': 'ok'}
+    slate = generate_slate(size, seed)
+
+    if not with_cache:
+        try:
+            from utils.prediction_cache import get_prediction_cache
+            get_prediction_cache().enabled = False
+        except Exception as e:
+            logger.warning(f"Cache de prédictions non désactivé: {e}")
+
+    _seed(seed)
+    started = time.perf_counter()
+    try:
+        state = case['setup'](slate)
+    except ImportError as e:
+        result.update(status='skipped', reason=f"Dépendance manquante: {e}")
+        return result
+    except Exception as e:
+        result.update(status='error', reason=f"Préparation impossible: {type(e).__name__}: {e}")
+        return result
+    result['setup_s'] = round(time.perf_counter() - started, 4)
+
+    # Passage chronométré (sans tracemalloc)
+    _seed(seed)
+    durations, errors, first_error = [], 0, None
+    deadline = None if time_budget is None else time.perf_counter() + time_budget
+    if 'prepare' in case:
+        slate = [case['prepare'](match) for match in slate]
+    items = slate if case['kind'] == 'fixture' else [slate] * SLATE_REPEATS
+    for item in items:
+        started = time.perf_counter()
+        try:
+            output = case['run'](state, item)
+            if 'check' in case and not case['check'](output):
+                errors += 1
+                first_error = first_error or "Résultat vide"
+        except Exception as e:
+            errors += 1
+            first_error = first_error or f"{type(e).__name__}: {e}"
+        durations.append(time.perf_counter() - started)
+        if deadline is not None and time.perf_counter() > deadline:
+            break
+
+    total = sum(durations)
+    processed = len(durations) if case['kind'] == 'fixture' else size
+    result.update({
+        'runs': len(durations),
+        'fixtures': processed,
+        'complete': len(durations) == len(items),
+        'total_s': round(total, 4),
+        'latency_ms': _summarize(durations),
+        'throughput_per_s': round(processed / total, 2) if total > 0 else None,
+        'errors': errors
+    })
+    if first_error:
+        result['first_error'] = first_error
+
+    # Passage mémoire sous tracemalloc (échantillon de matchs ou une exécution de slate)
+    _seed(seed)
+    sample = slate[:MEMORY_SAMPLE_FIXTURES] if case['kind'] == 'fixture' else [slate]
+    tracemalloc.start(10)
+    try:
+        for item in sample:
+            try:
+                case['run'](state, item)
+            except Exception:
+                pass
+        _, peak = tracemalloc.get_traced_memory()
+        snapshot = tracemalloc.take_snapshot()
+    finally:
+        tracemalloc.stop()
+    statistics = snapshot.statistics('lineno')
+    result['tracemalloc'] = {
+        'sample_runs': len(sample),
+        'peak_mb': round(peak / (1024 * 1024), 3),
+        'live_blocks': sum(stat.count for stat in statistics),
+        'top_sites': [
+            {'site': f"{os.path.relpath(stat.traceback[0].filename, REPO_ROOT)}:{stat.traceback[0].lineno}",
+             'kb': round(stat.size / 1024, 1), 'blocks': stat.count}
+            for stat in statistics[:5]
+        ]
+    }
+    result['peak_rss_mb'] = _peak_rss_mb()
+
+    if 'teardown' in case:
+        try:
+            case['teardown'](state)
+        except Exception as e:
+            logger.warning(f"Libération des ressources de {case_name} impossible: {e}")
+    return result
+
+
+def _run_isolated(case_name, size, args):
+    """Exécute un cas dans un sous-processus et renvoie son résultat."""
+    with tempfile.NamedTemporaryFile(suffix='.json', delete=False) as handle:
+        result_file = handle.name
+    command = [sys.executable, '-m', 'benchmarks.run_benchmarks', '--worker', case_name, str(size),
+               '--result-file', result_file, '--seed', str(args.seed)]
+    if args.with_cache:
+        command.append('--with-cache')
+    if args.allow_network:
+        command.append('--allow-network')
+    if args.time_budget:
+        command += ['--time-budget', str(args.time_budget)]
+
+    try:
+        completed = subprocess.run(command, cwd=REPO_ROOT, stdout=subprocess.DEVNULL, stderr=subprocess.PIPE,
+                                   timeout=args.timeout, text=True)
+        if completed.returncode != 0:
+            tail = (completed.stderr or '').strip().splitlines()[-3:]
+            return {'case': case_name, 'size': size, 'status': 'error',
+                    'reason': f"Sous-processus terminé avec le code {completed.returncode}: {' | '.join(tail)}"}
+        with open(result_file, 'r', encoding='utf-8') as f:
+            return json.load(f)
+    except subprocess.TimeoutExpired:
+        return {'case': case_name, 'size': size, 'status': 'error', 'reason': f"Délai dépassé ({args.timeout}s)"}
+    finally:
+        if os.path.exists(result_file):
+            os.remove(result_file)
+
+
+def _git_commit():
+    """Commit courant du dépôt (None hors dépôt git)."""
+    try:
+        return subprocess.run(['git', 'rev-parse', '--short', 'HEAD'], cwd=REPO_ROOT,
+                              capture_output=True, text=True, timeout=10).stdout.strip() or None
+    except Exception:
+        return None
+
+
+def compare_with_baseline(results, baseline, time_threshold=DEFAULT_TIME_THRESHOLD,
+                          memory_threshold=DEFAULT_MEMORY_THRESHOLD):
+    """
+    Compare des résultats à une base de référence.
+
+    Args:
+        results (dict): Résultats courants ({'results': {clé: résultat}})
+        baseline (dict): Base de référence au même format
+        time_threshold (float): Hausse relative tolérée de la latence p50
+        memory_threshold (float): Hausse relative tolérée du pic tracemalloc
+
+    Returns:
+        list: Comparaisons {'key', 'metric', 'baseline', 'current', 'change', 'regression'}
+    """
+    comparisons = []
+    for key, current in results['results'].items():
+        reference = baseline.get('results', {}).get(key)
+        if not reference or current.get('status') != 'ok' or reference.get('status') != 'ok':
+            continue
+        metrics = [
+            ('latency_p50_ms', current['latency_ms']['p50'], reference['latency_ms']['p50'], time_threshold),
+            ('tracemalloc_peak_mb', current['tracemalloc']['peak_mb'], reference['tracemalloc']['peak_mb'],
+             memory_threshold)
+        ]
+        for metric, value, reference_value, threshold in metrics:
+            change = (value - reference_value) / reference_value if reference_value else 0.0
+            comparisons.append({
+                'key': key,
+                'metric': metric,
+                'baseline': reference_value,
+                'current': value,
+                'change': round(change, 4),
+                'regression': change > threshold
+            })
+    return comparisons
+
+
+def _print_summary(results, comparisons):
+    """Affiche un tableau récapitulatif."""
+    print(f"{'cas':<48} {'taille':>7} {'statut':>8} {'p50 ms':>10} {'p95 ms':>10} {'débit/s':>10} "
+          f"{'trace Mo':>9} {'RSS Mo':>8}")
+    for key, result in results['results'].items():
+        if result.get('status') != 'ok':
+            print(f"{result['case']:<48} {result['size']:>7} {result['status']:>8}  {result.get('reason', '')}")
+            continue
+        print(f"{result['case']:<48} {result['size']:>7} {'ok':>8} {result['latency_ms']['p50']:>10.3f} "
+              f"{result['latency_ms']['p95']:>10.3f} {result['throughput_per_s'] or 0:>10.1f} "
+              f"{result['tracemalloc']['peak_mb']:>9.2f} {result['peak_rss_mb'] or 0:>8.1f}")
+
+    regressions = [c for c in comparisons if c['regression']]
+    if comparisons:
+        print(f"\nComparaison à la base de référence : {len(comparisons)} mesures, {len(regressions)} régression(s)")
+        for comparison in regressions:
+            print(f"  RÉGRESSION {comparison['key']} {comparison['metric']}: "
+                  f"{comparison['baseline']} -> {comparison['current']} ({comparison['change']:+.1%})")
+
+
+def main(argv=None):
+    """Point d'entrée en ligne de commande."""
+    parser = argparse.ArgumentParser(description="Benchmarks du pipeline de prédiction ArcanShadow")
+    parser.add_argument('--cases', nargs='+', choices=sorted(CASES), default=list(CASES))
+    parser.add_argument('--sizes', nargs='+', type=int, default=DEFAULT_SIZES)
+    parser.add_argument('--seed', type=int, default=DEFAULT_SEED)
+    parser.add_argument('--with-cache', action='store_true', help="Laisser le cache de prédictions actif")
+    parser.add_argument('--allow-network', action='store_true', help="Autoriser les accès réseau")
+    parser.add_argument('--time-budget', type=float, default=None,
+                        help="Durée maximale du passage chronométré par cas (secondes)")
+    parser.add_argument('--timeout', type=float, default=3600, help="Délai maximal par sous-processus")
+    parser.add_argument('--no-isolate', action='store_true', help="Exécuter tous les cas dans ce processus")
+    parser.add_argument('--output', default=None, help="Fichier JSON des résultats")
+    parser.add_argument('--baseline', default=DEFAULT_BASELINE, help="Base de référence à comparer")
+    parser.add_argument('--save-baseline', action='store_true', help="Enregistrer les résultats comme référence")
+    parser.add_argument('--time-threshold', type=float, default=DEFAULT_TIME_THRESHOLD)
+    parser.add_argument('--memory-threshold', type=float, default=DEFAULT_MEMORY_THRESHOLD)
+    parser.add_argument('--worker', nargs=2, metavar=('CAS', 'TAILLE'), help=argparse.SUPPRESS)
+    parser.add_argument('--result-file', help=argparse.SUPPRESS)
+    args = parser.parse_args(argv)
+
+    if not args.allow_network:
+        _disable_network()
+
+    if args.worker:
+        case_name, size = args.worker[0], int(args.worker[1])
+        result = run_case(case_name, size, args.seed, args.with_cache, args.time_budget)
+        with open(args.result_file, 'w', encoding='utf-8') as f:
+            json.dump(result, f)
+        return 0
+
+    results = {
+        'meta': {
+            'timestamp': datetime.now().isoformat(),
+            'git_commit': _git_commit(),
+            'python': platform.python_version(),
+            'platform': platform.platform(),
+            'cpu_count': os.cpu_count(),
+            'seed': args.seed,
+            'with_cache': args.with_cache,
+            'network': args.allow_network
+        },
+        'results': {}
+    }
+    for case_name in args.cases:
+        for size in args.sizes:
+            print(f"-> {case_name} ({size} matchs)", file=sys.stderr)
+            if args.no_isolate:
+                result = run_case(case_name, size, args.seed, args.with_cache, args.time_budget)
+            else:
+                result = _run_isolated(case_name, size, args)
+            results['results'][f"{case_name}@{size}"] = result
+
+    output = args.output or os.path.join(
+        DEFAULT_RESULTS_DIR, f"benchmark_{datetime.now().strftime('%Y%m%d_%H%M%S')}.json"
+    )
+    os.makedirs(os.path.dirname(os.path.abspath(output)), exist_ok=True)
+    comparisons = []
+    if os.path.exists(args.baseline) and not args.save_baseline:
+        with open(args.baseline, 'r', encoding='utf-8') as f:
+            comparisons = compare_with_baseline(results, json.load(f), args.time_threshold, args.memory_threshold)
+        results['comparison'] = comparisons
+    with open(output, 'w', encoding='utf-8') as f:
+        json.dump(results, f, indent=2)
+
+    if args.save_baseline:
+        with open(args.baseline, 'w', encoding='utf-8') as f:
+            json.dump(results, f, indent=2)
+
+    _print_summary(results, comparisons)
+    print(f"\nRésultats : {output}")
+    return 1 if any(c['regression'] for c in comparisons) else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,165 @@
+"""
+Génération de slates de matchs synthétiques et déterministes pour les benchmarks.
+Une même taille et une même graine produisent toujours les mêmes matchs (équipes,
+cotes, forme, historique), avec des dates relatives au jour de référence afin que
+les filtres "prochains jours" des générateurs de combinés les retiennent.
+"""
+
+import random
+from datetime import date, datetime, timedelta
+
+DEFAULT_SEED = 20240601
+
+LEAGUES = [
+    (39, 'Premier League', 'England'),
+    (140, 'La Liga', 'Spain'),
+    (135, 'Serie A', 'Italy'),
+    (78, 'Bundesliga', 'Germany'),
+    (61, 'Ligue 1', 'France'),
+    (88, 'Eredivisie', 'Netherlands'),
+    (94, 'Primeira Liga', 'Portugal'),
+    (2, 'Champions League', 'Europe')
+]
+
+TEAM_PREFIXES = ['Real', 'Atletico', 'Sporting', 'Racing', 'Dynamo', 'Olympique', 'Union', 'Athletic',
+                 'Inter', 'United', 'City', 'Rovers', 'Stade', 'FC', 'AC', 'SV']
+TEAM_CITIES = ['Madrid', 'Lyon', 'Milano', 'Porto', 'Berlin', 'Leeds', 'Sevilla', 'Napoli', 'Lille',
+               'Bremen', 'Torino', 'Bilbao', 'Lisboa', 'Marseille', 'Hamburg', 'Valencia', 'Roma',
+               'Eindhoven', 'Nantes', 'Dortmund', 'Genova', 'Braga', 'Bordeaux', 'Liverpool']
+FORMATIONS = ['4-4-2', '4-3-3', '3-5-2', '4-2-3-1', '3-4-3', '5-3-2']
+KICKOFF_TIMES = ['12:30', '14:00', '15:00', '16:30', '18:00', '19:00', '20:00', '20:45', '21:00']
+
+
+def _odds_from_probabilities(rng, home, draw, away, margin=0.06):
+    """Convertit des probabilités en cotes décimales avec une marge bookmaker."""
+    scale = 1.0 + margin + rng.uniform(-0.01, 0.01)
+    return tuple(round(max(1.01, 1.0 / (p * scale)), 2) for p in (home, draw, away))
+
+
+def generate_slate(size, seed=DEFAULT_SEED, reference_date=None):
+    """
+    Génère une slate de matchs synthétiques.
+
+    Args:
+        size (int): Nombre de matchs
+        seed (int): Graine du générateur
+        reference_date (date, optional): Jour de référence (aujourd'hui par défaut)
+
+    Returns:
+        list: Matchs au format attendu par les modules d'analyse et les générateurs de combinés
+    """
+    rng = random.Random(seed * 1000003 + size)
+    reference_date = reference_date or date.today()
+    teams = [f"{prefix} {city}" for prefix in TEAM_PREFIXES for city in TEAM_CITIES]
+    strengths = {team: rng.uniform(0.6, 1.6) for team in teams}
+
+    slate = []
+    for index in range(size):
+        league_id, league, country = LEAGUES[index % len(LEAGUES)]
+        home_team, away_team = rng.sample(teams, 2)
+        ratio = strengths[home_team] * 1.15 / strengths[away_team]
+        home_prob = min(0.85, max(0.08, 0.45 * ratio / (0.55 + 0.45 * ratio)))
+        draw_prob = min(0.32, max(0.18, 0.30 - abs(home_prob - 0.45) * 0.3))
+        away_prob = max(0.05, 1.0 - home_prob - draw_prob)
+        home_odds, draw_odds, away_odds = _odds_from_probabilities(rng, home_prob, draw_prob, away_prob)
+
+        match_date = reference_date + timedelta(days=index % 4)
+        history = []
+        for h in range(rng.randint(0, 6)):
+            home_score, away_score = rng.randint(0, 4), rng.randint(0, 3)
+            history.append({
+                'date': (reference_date - timedelta(days=180 * (h + 1))).isoformat(),
+                'home_team': home_team if h % 2 == 0 else away_team,
+                'away_team': away_team if h % 2 == 0 else home_team,
+                'home_score': home_score,
+                'away_score': away_score,
+                'result': 'H' if home_score > away_score else 'A' if away_score > home_score else 'D'
+            })
+
+        slate.append({
+            'id': f"bench_{size}_{index}",
+            'sport': 'Football',
+            'league': league,
+            'league_name': league,
+            'league_id': league_id,
+            'country': country,
+            'home_team': home_team,
+            'away_team': away_team,
+            'date': match_date.isoformat(),
+            'time': rng.choice(KICKOFF_TIMES),
+            'stadium': f"Stadium {away_team.split()[-1] if index % 7 == 0 else home_team.split()[-1]}",
+            'venue': f"Stadium {home_team.split()[-1]}",
+            'odds': {'1': home_odds, 'X': draw_odds, '2': away_odds,
+                     'home': home_odds, 'draw': draw_odds, 'away': away_odds},
+            'home_odds': home_odds,
+            'draw_odds': draw_odds,
+            'away_odds': away_odds,
+            'home_prob': round(home_prob, 4),
+            'draw_prob': round(draw_prob, 4),
+            'away_prob': round(away_prob, 4),
+            'home_form': ''.join(rng.choice('WWDLL' if strengths[home_team] < 1 else 'WWWDL') for _ in range(5)),
+            'away_form': ''.join(rng.choice('WWDLL' if strengths[away_team] < 1 else 'WWWDL') for _ in range(5)),
+            'home_formation': rng.choice(FORMATIONS),
+            'away_formation': rng.choice(FORMATIONS),
+            'home_goals_per_match': round(1.0 + strengths[home_team] * 0.6, 2),
+            'away_goals_per_match': round(0.8 + strengths[away_team] * 0.6, 2),
+            'home_goals_conceded_per_match': round(1.8 - strengths[home_team] * 0.5, 2),
+            'away_goals_conceded_per_match': round(1.9 - strengths[away_team] * 0.5, 2),
+            'home_value': int(strengths[home_team] * 300_000_000),
+            'away_value': int(strengths[away_team] * 300_000_000),
+            'historical_matchups': history
+        })
+    return slate
+
+
+def as_analysis_input(match):
+    """
+    Adapte un match de la slate au format des modules d'analyse (dates en datetime).
+
+    Args:
+        match (dict): Match de la slate
+
+    Returns:
+        dict: Copie du match avec une date datetime (heure de coup d'envoi incluse),
+            y compris pour les confrontations directes
+    """
+    prepared = dict(match)
+    prepared['date'] = datetime.fromisoformat(f"{match['date']}T{match.get('time', '00:00')}")
+    prepared['historical_matchups'] = [
+        {**h2h, 'date': datetime.fromisoformat(h2h['date'])} for h2h in match['historical_matchups']
+    ]
+    return prepared
+
+
+FORM_SCORES = {'W': (2, 1), 'D': (1, 1), 'L': (0, 1)}
+
+
+def _form_matches(team, form):
+    """Convertit une forme 'WWDLW' en matchs récents {'result', 'score', 'home_team'}."""
+    matches = []
+    for result in form:
+        goals_for, goals_against = FORM_SCORES[result]
+        matches.append({'result': result, 'home_team': team, 'score': f"{goals_for}-{goals_against}"})
+    return matches
+
+
+def as_combo_input(match):
+    """
+    Adapte un match de la slate au format des générateurs de combinés : forme en liste
+    de matchs récents et confrontations directes avec un score texte ("2-1").
+
+    Args:
+        match (dict): Match de la slate
+
+    Returns:
+        dict: Copie du match au format de BettingComboGenerator
+    """
+    prepared = dict(match)
+    prepared['home_form'] = _form_matches(match['home_team'], match['home_form'])
+    prepared['away_form'] = _form_matches(match['away_team'], match['away_form'])
+    prepared['head_to_head'] = [
+        {'home_team': h2h['home_team'], 'away_team': h2h['away_team'], 'date': h2h['date'],
+         'score': f"{h2h['home_score']}-{h2h['away_score']}"}
+        for h2h in match['historical_matchups']
+    ]
+    return prepared
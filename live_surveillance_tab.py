@@ -4,74 +4,54 @@ en utilisant exclusivement des données réelles de l'API Football.
 """
 import streamlit as st
 import random
-import os
-import requests
 from datetime import datetime, timedelta
 import time
 import pandas as pd
 import numpy as np
 import matplotlib.pyplot as plt
 
+from utils.live_feed import get_live_feed
+
 def get_real_football_matches():
     """
-    Récupère les matchs en direct depuis l'API Football.
+    Récupère les matchs en direct depuis le flux partagé de l'API Football.
     
     Returns:
         list: Liste des matchs en direct
     """
     try:
-        # Récupérer la clé API
-        api_key = os.environ.get('FOOTBALL_API_KEY')
+        # Le flux partagé interroge l'API une seule fois pour toutes les sessions
+        snapshot = get_live_feed().get_snapshot()
         
-        if not api_key:
+        if snapshot is None or snapshot['status'] == 'no_api_key':
             print("Clé API Football non trouvée")
             return []
         
-        # Préparer la requête
-        headers = {
-            'X-RapidAPI-Key': api_key,
-            'X-RapidAPI-Host': 'api-football-v1.p.rapidapi.com'
-        }
-        
-        # Récupérer les matchs en direct
-        url = "https://api-football-v1.p.rapidapi.com/v3/fixtures"
-        params = {"live": "all"}
-        
-        # Exécuter la requête
-        response = requests.get(url, headers=headers, params=params)
-        data = response.json()
-        
-        if not data.get('response'):
-            print("Aucun match en direct trouvé via l'API")
-            return []
+        if snapshot['status'] == 'error':
+            print(f"Erreur lors de la récupération des matchs en direct: {snapshot['error']}")
         
         # Transformer les données
         formatted_matches = []
         
-        for idx, fixture in enumerate(data.get('response', [])):
-            fixture_data = fixture.get('fixture', {})
-            teams = fixture.get('teams', {})
-            goals = fixture.get('goals', {})
-            league = fixture.get('league', {})
-            
-            # Calculer la minute actuelle
-            status = fixture_data.get('status', {})
-            minute = status.get('elapsed', 0)
-            
-            match_data = {
-                "id": idx + 1,
-                "home": teams.get('home', {}).get('name', ''),
-                "away": teams.get('away', {}).get('name', ''),
-                "league": league.get('name', ''),
-                "time": datetime.now().strftime("%H:%M"),
-                "status": "En direct",
-                "minute": f"{minute}'",
-                "score": f"{goals.get('home', 0)}-{goals.get('away', 0)}"
-            }
+        if snapshot['matches']:
+            print(f"Récupéré {len(snapshot['matches'])} matchs en direct depuis l'API Football")
             
-            formatted_matches.append(match_data)
+            for idx, match in enumerate(snapshot['matches']):
+                match_data = {
+                    "id": idx + 1,
+                    "home": match['home_team'],
+                    "away": match['away_team'],
+                    "league": match['league'],
+                    "time": datetime.now().strftime("%H:%M"),
+                    "status": "En direct",
+                    "minute": f"{match['minute']}'",
+                    "score": f"{match['home_score']}-{match['away_score']}"
+                }
+                
+                formatted_matches.append(match_data)
+        else:
+            print("Aucun match en direct trouvé via l'API")
         
-        print(f"Récupéré {len(formatted_matches)} matchs en direct depuis l'API Football")
         return formatted_matches
         
     except Exception as e:
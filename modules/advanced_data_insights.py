@@ -101,8 +101,11 @@ class AdvancedDataInsights:
             'confidence_metrics': {}
         }
         
-        # Enrichir les données du match si le hub est disponible
-        if DATA_HUB_AVAILABLE:
+        # Enrichir les données du match si le hub est disponible, sauf si la table
+        # d'enrichissement du programme (utils.enrichment_planner) l'a déjà jointe
+        if match_data.get('slate_enriched'):
+            enhanced_match = match_data
+        elif DATA_HUB_AVAILABLE:
             try:
                 enhanced_match = enhance_match_data(match_data)
             except Exception as e:
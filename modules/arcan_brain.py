@@ -14,6 +14,7 @@ import math
 import hashlib
 import uuid
 import copy
+import threading
 from collections import deque
 from utils.translations import get_text
 
@@ -48,6 +49,9 @@ class ArcanBrain:
         self.long_term_memory = {}  # Persistent pattern storage
         self.associative_memory = {}  # Related concepts and patterns
         
+        # Guards the learned state: event handlers run on the event bus dispatcher thread
+        self._state_lock = threading.RLock()
+        
         # Load trained models and weights if available
         self._load_neural_weights()
         
@@ -197,65 +201,66 @@ class ArcanBrain:
             'insight_development': 0.0
         }
         
-        if patterns:
-            # Update pattern confidence based on outcome
-            for pattern in patterns:
-                pattern_id = pattern.get('id', '')
-                if pattern_id in self.long_term_memory:
-                    # Update existing pattern
-                    stored_pattern = self.long_term_memory[pattern_id]
+        with self._state_lock:
+            if patterns:
+                # Update pattern confidence based on outcome
+                for pattern in patterns:
+                    pattern_id = pattern.get('id', '')
+                    if pattern_id in self.long_term_memory:
+                        # Update existing pattern
+                        stored_pattern = self.long_term_memory[pattern_id]
                     
-                    if was_correct:
-                        # Strengthen pattern confidence
-                        new_confidence = stored_pattern['confidence'] + self.learning_rate * (1 - stored_pattern['confidence'])
-                        stored_pattern['correct_count'] = stored_pattern.get('correct_count', 0) + 1
-                    else:
-                        # Weaken pattern confidence
-                        new_confidence = stored_pattern['confidence'] - self.learning_rate * stored_pattern['confidence']
-                        stored_pattern['incorrect_count'] = stored_pattern.get('incorrect_count', 0) + 1
+                        if was_correct:
+                            # Strengthen pattern confidence
+                            new_confidence = stored_pattern['confidence'] + self.learning_rate * (1 - stored_pattern['confidence'])
+                            stored_pattern['correct_count'] = stored_pattern.get('correct_count', 0) + 1
+                        else:
+                            # Weaken pattern confidence
+                            new_confidence = stored_pattern['confidence'] - self.learning_rate * stored_pattern['confidence']
+                            stored_pattern['incorrect_count'] = stored_pattern.get('incorrect_count', 0) + 1
                     
-                    stored_pattern['confidence'] = max(0.1, min(0.95, new_confidence))
-                    stored_pattern['last_updated'] = datetime.now().isoformat()
-                    report['patterns_updated'] += 1
-                else:
-                    # Store new pattern
-                    self.long_term_memory[pattern_id] = {
-                        'id': pattern_id,
-                        'type': pattern.get('type', 'unknown'),
-                        'features': pattern.get('features', {}),
-                        'confidence': 0.6 if was_correct else 0.4,
-                        'correct_count': 1 if was_correct else 0,
-                        'incorrect_count': 0 if was_correct else 1,
-                        'first_seen': datetime.now().isoformat(),
-                        'last_updated': datetime.now().isoformat()
-                    }
-                    report['patterns_updated'] += 1
+                        stored_pattern['confidence'] = max(0.1, min(0.95, new_confidence))
+                        stored_pattern['last_updated'] = datetime.now().isoformat()
+                        report['patterns_updated'] += 1
+                    else:
+                        # Store new pattern
+                        self.long_term_memory[pattern_id] = {
+                            'id': pattern_id,
+                            'type': pattern.get('type', 'unknown'),
+                            'features': pattern.get('features', {}),
+                            'confidence': 0.6 if was_correct else 0.4,
+                            'correct_count': 1 if was_correct else 0,
+                            'incorrect_count': 0 if was_correct else 1,
+                            'first_seen': datetime.now().isoformat(),
+                            'last_updated': datetime.now().isoformat()
+                        }
+                        report['patterns_updated'] += 1
         
-        # Create associative connections between patterns
-        if len(patterns) > 1:
-            for i in range(len(patterns)):
-                for j in range(i+1, len(patterns)):
-                    connection_id = f"{patterns[i].get('id', '')}_{patterns[j].get('id', '')}"
+            # Create associative connections between patterns
+            if len(patterns) > 1:
+                for i in range(len(patterns)):
+                    for j in range(i+1, len(patterns)):
+                        connection_id = f"{patterns[i].get('id', '')}_{patterns[j].get('id', '')}"
                     
-                    if connection_id not in self.associative_memory:
-                        self.associative_memory[connection_id] = {
-                            'patterns': [patterns[i].get('id', ''), patterns[j].get('id', '')],
-                            'strength': 0.5,
-                            'co_occurrence': 1,
-                            'correct_together': 1 if was_correct else 0,
-                            'first_seen': datetime.now().isoformat()
-                        }
-                        report['new_connections'] += 1
-                    else:
-                        # Strengthen existing connection
-                        connection = self.associative_memory[connection_id]
-                        connection['co_occurrence'] += 1
-                        if was_correct:
-                            connection['correct_together'] += 1
+                        if connection_id not in self.associative_memory:
+                            self.associative_memory[connection_id] = {
+                                'patterns': [patterns[i].get('id', ''), patterns[j].get('id', '')],
+                                'strength': 0.5,
+                                'co_occurrence': 1,
+                                'correct_together': 1 if was_correct else 0,
+                                'first_seen': datetime.now().isoformat()
+                            }
+                            report['new_connections'] += 1
+                        else:
+                            # Strengthen existing connection
+                            connection = self.associative_memory[connection_id]
+                            connection['co_occurrence'] += 1
+                            if was_correct:
+                                connection['correct_together'] += 1
                         
-                        # Update connection strength
-                        success_rate = connection['correct_together'] / connection['co_occurrence']
-                        connection['strength'] = 0.5 + (success_rate - 0.5) * min(1.0, connection['co_occurrence'] / 10)
+                            # Update connection strength
+                            success_rate = connection['correct_together'] / connection['co_occurrence']
+                            connection['strength'] = 0.5 + (success_rate - 0.5) * min(1.0, connection['co_occurrence'] / 10)
         
         # Update insight level based on learning
         insight_gain = self.learning_rate * (1 if was_correct else 0.2)
@@ -329,7 +334,9 @@ class ArcanBrain:
         
         # Look for strong associative connections
         strong_connections = []
-        for connection_id, connection in self.associative_memory.items():
+        with self._state_lock:
+            connections = list(self.associative_memory.items())
+        for connection_id, connection in connections:
             if connection.get('co_occurrence', 0) >= 3 and connection.get('strength', 0) > 0.7:
                 strong_connections.append({
                     'id': connection_id,
@@ -432,7 +439,9 @@ class ArcanBrain:
         
         # Generate edge data for connections
         edges = []
-        for connection_id, connection in self.associative_memory.items():
+        with self._state_lock:
+            connections = list(self.associative_memory.items())
+        for connection_id, connection in connections:
             # Only include stronger connections for clarity
             if connection.get('strength', 0) > 0.6:
                 edges.append({
@@ -2783,61 +2792,62 @@ class ArcanBrain:
         
         total_confidence_delta = 0.0
         
-        for pattern_id in patterns_to_recalibrate:
-            if pattern_id not in self.long_term_memory:
-                continue
+        with self._state_lock:
+            for pattern_id in patterns_to_recalibrate:
+                if pattern_id not in self.long_term_memory:
+                    continue
                 
-            pattern = self.long_term_memory[pattern_id]
+                pattern = self.long_term_memory[pattern_id]
             
-            # Skip patterns with insufficient data
-            correct_count = pattern.get('correct_count', 0)
-            incorrect_count = pattern.get('incorrect_count', 0)
+                # Skip patterns with insufficient data
+                correct_count = pattern.get('correct_count', 0)
+                incorrect_count = pattern.get('incorrect_count', 0)
             
-            if correct_count + incorrect_count < 3:
-                continue
+                if correct_count + incorrect_count < 3:
+                    continue
                 
-            # Calculate success ratio
-            success_ratio = correct_count / (correct_count + incorrect_count)
+                # Calculate success ratio
+                success_ratio = correct_count / (correct_count + incorrect_count)
             
-            # Current confidence
-            current_confidence = pattern.get('confidence', 0.5)
+                # Current confidence
+                current_confidence = pattern.get('confidence', 0.5)
             
-            # Calculate ideal confidence based on performance
-            ideal_confidence = 0.5 + (success_ratio - 0.5) * 0.8
+                # Calculate ideal confidence based on performance
+                ideal_confidence = 0.5 + (success_ratio - 0.5) * 0.8
             
-            # Apply smoothing to avoid extreme values
-            ideal_confidence = max(0.2, min(0.95, ideal_confidence))
+                # Apply smoothing to avoid extreme values
+                ideal_confidence = max(0.2, min(0.95, ideal_confidence))
             
-            # Calculate confidence adjustment factor 
-            # (higher for patterns with more data, lower for newer patterns)
-            adjustment_factor = min(0.7, (correct_count + incorrect_count) / 20)
+                # Calculate confidence adjustment factor 
+                # (higher for patterns with more data, lower for newer patterns)
+                adjustment_factor = min(0.7, (correct_count + incorrect_count) / 20)
             
-            # Calculate new confidence
-            new_confidence = current_confidence * (1 - adjustment_factor) + ideal_confidence * adjustment_factor
+                # Calculate new confidence
+                new_confidence = current_confidence * (1 - adjustment_factor) + ideal_confidence * adjustment_factor
             
-            # Apply the new confidence
-            confidence_delta = new_confidence - current_confidence
-            pattern['confidence'] = new_confidence
-            pattern['last_recalibrated'] = datetime.now().isoformat()
+                # Apply the new confidence
+                confidence_delta = new_confidence - current_confidence
+                pattern['confidence'] = new_confidence
+                pattern['last_recalibrated'] = datetime.now().isoformat()
             
-            recalibration_report['patterns_recalibrated'] += 1
-            total_confidence_delta += abs(confidence_delta)
+                recalibration_report['patterns_recalibrated'] += 1
+                total_confidence_delta += abs(confidence_delta)
             
-            if confidence_delta > 0.01:
-                recalibration_report['patterns_strengthened'] += 1
-            elif confidence_delta < -0.01:
-                recalibration_report['patterns_weakened'] += 1
+                if confidence_delta > 0.01:
+                    recalibration_report['patterns_strengthened'] += 1
+                elif confidence_delta < -0.01:
+                    recalibration_report['patterns_weakened'] += 1
                 
-            # Store details for the report
-            recalibration_report['details'].append({
-                'pattern_id': pattern_id,
-                'pattern_type': pattern.get('type', 'unknown'),
-                'old_confidence': current_confidence,
-                'new_confidence': new_confidence,
-                'delta': confidence_delta,
-                'success_ratio': success_ratio,
-                'data_points': correct_count + incorrect_count
-            })
+                # Store details for the report
+                recalibration_report['details'].append({
+                    'pattern_id': pattern_id,
+                    'pattern_type': pattern.get('type', 'unknown'),
+                    'old_confidence': current_confidence,
+                    'new_confidence': new_confidence,
+                    'delta': confidence_delta,
+                    'success_ratio': success_ratio,
+                    'data_points': correct_count + incorrect_count
+                })
         
         # Calculate average confidence delta
         if recalibration_report['patterns_recalibrated'] > 0:
@@ -3197,8 +3207,12 @@ class ArcanBrain:
                 )
             """)
             
+            with self._state_lock:
+                synapse_strength = dict(self.synapse_strength)
+                long_term_memory = {pattern_id: dict(pattern) for pattern_id, pattern in self.long_term_memory.items()}
+            
             # Save synapse strengths
-            for layer, weights in self.synapse_strength.items():
+            for layer, weights in synapse_strength.items():
                 weights_json = json.dumps(weights)
                 cursor.execute("""
                     INSERT OR REPLACE INTO neural_weights
@@ -3207,7 +3221,7 @@ class ArcanBrain:
                 """, (layer, weights_json, datetime.now().isoformat()))
             
             # Save long-term memory patterns
-            for pattern_id, pattern in self.long_term_memory.items():
+            for pattern_id, pattern in long_term_memory.items():
                 pattern_json = json.dumps(pattern)
                 confidence = pattern.get('confidence', 0.5)
                 cursor.execute("""
@@ -3224,19 +3238,27 @@ class ArcanBrain:
             return False
             
     def _register_event_handlers(self):
-        """Register event handlers with MetaSystems event system."""
+        """
+        Register event handlers with MetaSystems event system.
+        
+        Odds alerts, anomalies and prediction evaluations are delivered asynchronously
+        (on the event bus dispatcher thread) so the publishing module is never blocked;
+        these handlers take the state lock.
+        """
         # Register for odds change events
         self.meta_systems.register_event_handler(
             'odds_change_detected', 
             self._handle_odds_change_event,
-            'ArcanBrain'
+            'ArcanBrain',
+            asynchronous=True
         )
         
         # Register for anomaly events
         self.meta_systems.register_event_handler(
             'anomaly_detected', 
             self._handle_anomaly_event,
-            'ArcanBrain'
+            'ArcanBrain',
+            asynchronous=True
         )
         
         # Register for module activation events
@@ -3250,7 +3272,8 @@ class ArcanBrain:
         self.meta_systems.register_event_handler(
             'prediction_evaluated', 
             self._handle_prediction_evaluation_event,
-            'ArcanBrain'
+            'ArcanBrain',
+            asynchronous=True
         )
 
     def _handle_odds_change_event(self, event_data):
@@ -3267,18 +3290,19 @@ class ArcanBrain:
         if not match_id:
             return
             
-        # Store in associative memory
-        if 'odds_changes' not in self.associative_memory:
-            self.associative_memory['odds_changes'] = {}
+        with self._state_lock:
+            # Store in associative memory
+            if 'odds_changes' not in self.associative_memory:
+                self.associative_memory['odds_changes'] = {}
             
-        if match_id not in self.associative_memory['odds_changes']:
-            self.associative_memory['odds_changes'][match_id] = []
+            if match_id not in self.associative_memory['odds_changes']:
+                self.associative_memory['odds_changes'][match_id] = []
             
-        self.associative_memory['odds_changes'][match_id].append({
-            'timestamp': datetime.now().isoformat(),
-            'change_data': event_data,
-            'neural_response': self._generate_odds_change_response(event_data)
-        })
+            self.associative_memory['odds_changes'][match_id].append({
+                'timestamp': datetime.now().isoformat(),
+                'change_data': event_data,
+                'neural_response': self._generate_odds_change_response(event_data)
+            })
         
     def _handle_anomaly_event(self, event_data):
         """
@@ -3352,24 +3376,27 @@ class ArcanBrain:
         prediction_accuracy = event_data.get('accuracy', 0)
         match_data = event_data.get('match_data', {})
         
-        # Adjust learning parameters based on prediction accuracy
-        if prediction_accuracy < 0.4:  # Poor performance
-            # Increase learning rate to adapt faster
-            self.learning_rate = min(0.1, self.learning_rate * 1.2)
-            # Reduce pattern threshold to consider more patterns
-            self.pattern_threshold = max(0.5, self.pattern_threshold * 0.9)
-        elif prediction_accuracy > 0.7:  # Good performance
-            # Slightly decrease learning rate to stabilize
-            self.learning_rate = max(0.01, self.learning_rate * 0.95)
-            # Increase pattern threshold to focus on stronger patterns
-            self.pattern_threshold = min(0.8, self.pattern_threshold * 1.05)
+        with self._state_lock:
+            # Adjust learning parameters based on prediction accuracy
+            if prediction_accuracy < 0.4:  # Poor performance
+                # Increase learning rate to adapt faster
+                self.learning_rate = min(0.1, self.learning_rate * 1.2)
+                # Reduce pattern threshold to consider more patterns
+                self.pattern_threshold = max(0.5, self.pattern_threshold * 0.9)
+            elif prediction_accuracy > 0.7:  # Good performance
+                # Slightly decrease learning rate to stabilize
+                self.learning_rate = max(0.01, self.learning_rate * 0.95)
+                # Increase pattern threshold to focus on stronger patterns
+                self.pattern_threshold = min(0.8, self.pattern_threshold * 1.05)
+        
+            learning_rate, pattern_threshold = self.learning_rate, self.pattern_threshold
         
         # Notify MetaSystems of parameter adaptation
         if self.meta_systems:
             self.meta_systems.trigger_event('parameters_adapted', {
                 'source': 'ArcanBrain',
-                'learning_rate': self.learning_rate,
-                'pattern_threshold': self.pattern_threshold,
+                'learning_rate': learning_rate,
+                'pattern_threshold': pattern_threshold,
                 'based_on_accuracy': prediction_accuracy
             })
             
@@ -10,6 +10,7 @@ from datetime import datetime, timedelta
 import json
 import os
 import sqlite3
+import threading
 
 class ArcanReflex:
     """
@@ -35,12 +36,16 @@ class ArcanReflex:
         self.meta_systems = meta_systems
         self.arcan_brain = arcan_brain  # New reference to ArcanBrain
         
+        # Guards performance state: event handlers run on the event bus dispatcher thread
+        self._state_lock = threading.RLock()
+        
         # Initialize internal components
         self.reflex_eval = ReflexEval()
         self.reflex_switch = ReflexSwitch()
         self.reflex_memory = ReflexMemory()
         
         # Load historical performance data if available
+        self.module_performance = {}  # Recent performance of modules
         self._load_performance_data()
         
         # Configuration
@@ -48,10 +53,6 @@ class ArcanReflex:
         self.learning_rate = 0.05  # Rate at which module weights are adjusted
         self.memory_retention = 90  # Days to retain performance memory
         
-        # Register for events if MetaSystems is available
-        if self.meta_systems:
-            self._register_event_handlers()
-        
         # ArcanBrain parameter control ranges (meta-cognition)
         self.brain_param_ranges = {
             'learning_rate': (0.01, 0.1),
@@ -66,7 +67,6 @@ class ArcanReflex:
         
         # Current state
         self.active_modules = {}  # Currently active modules
-        self.module_performance = {}  # Recent performance of modules
         self.brain_param_history = []  # History of ArcanBrain parameter adjustments
         self.pattern_library = {}  # Identified effective patterns
         
@@ -74,10 +74,19 @@ class ArcanReflex:
         self.system_accuracy = 0.0
         self.module_contribution = {}
         
+        # Register for events if MetaSystems is available (last: asynchronous
+        # handlers may run as soon as they are registered)
+        if self.meta_systems:
+            self._register_event_handlers()
+        
     def _register_event_handlers(self):
         """
         Register event handlers with the MetaSystems event system.
         This enables ArcanReflex to respond to events from other modules.
+        
+        Anomalies, odds changes and match results are delivered asynchronously (on
+        the event bus dispatcher thread) so the publishing module is never blocked;
+        these handlers take the state lock.
         """
         if not self.meta_systems:
             return
@@ -93,14 +102,16 @@ class ArcanReflex:
         self.meta_systems.register_event_handler(
             'anomaly_detected',
             self._handle_anomaly_event,
-            'ArcanReflex'
+            'ArcanReflex',
+            asynchronous=True
         )
         
         # Register for odds change events
         self.meta_systems.register_event_handler(
             'significant_odds_change',
             self._handle_odds_change_event,
-            'ArcanReflex'
+            'ArcanReflex',
+            asynchronous=True
         )
         
         # Pattern recalibration events disabled for now
@@ -121,21 +132,8 @@ class ArcanReflex:
         self.meta_systems.register_event_handler(
             'match_result_available',
             self._handle_match_result_event,
-            'ArcanReflex'
-        )
-        
-        # Register for odds change events
-        self.meta_systems.register_event_handler(
-            'significant_odds_change',
-            self._handle_odds_change_event,
-            'ArcanReflex'
-        )
-        
-        # Register for match result events
-        self.meta_systems.register_event_handler(
-            'match_result_available',
-            self._handle_match_result_event,
-            'ArcanReflex'
+            'ArcanReflex',
+            asynchronous=True
         )
         
     def _handle_neural_learning_event(self, event_data):
@@ -198,31 +196,32 @@ class ArcanReflex:
         Returns:
             dict: Action taken in response to the anomaly
         """
-        evaluation = self.evaluate_anomaly(event_data)
+        with self._state_lock:
+            evaluation = self.evaluate_anomaly(event_data)
         
-        if evaluation['mitigation_required']:
-            # Apply the recommended adaptive action
-            action = evaluation['adaptive_action']
+            if evaluation['mitigation_required']:
+                # Apply the recommended adaptive action
+                action = evaluation['adaptive_action']
             
-            if action == 'activate_market_protection':
-                # Activate market protection modules
-                self.reflex_switch.activate_module('MarketVolatilityGuard')
-                self.reflex_switch.activate_module('SuddenShiftDetector')
+                if action == 'activate_market_protection':
+                    # Activate market protection modules
+                    self.reflex_switch.activate_module('MarketVolatilityGuard')
+                    self.reflex_switch.activate_module('SuddenShiftDetector')
                 
-            elif action == 'recalibrate_pattern_weights':
-                # Recalibrate pattern weights in ArcanBrain
-                if self.arcan_brain:
-                    self.arcan_brain.recalibrate_patterns()
+                elif action == 'recalibrate_pattern_weights':
+                    # Recalibrate pattern weights in ArcanBrain
+                    if self.arcan_brain:
+                        self.arcan_brain.recalibrate_patterns()
                     
-            elif action == 'boost_momentum_sensitivity':
-                # Boost momentum sensitivity
-                if self.arcan_x:
-                    self.arcan_x.boost_momentum_sensitivity()
+                elif action == 'boost_momentum_sensitivity':
+                    # Boost momentum sensitivity
+                    if self.arcan_x:
+                        self.arcan_x.boost_momentum_sensitivity()
                     
-            return {
-                'action_taken': action,
-                'evaluation': evaluation
-            }
+                return {
+                    'action_taken': action,
+                    'evaluation': evaluation
+                }
         
         return {
             'action_taken': 'monitoring_only',
@@ -245,16 +244,17 @@ class ArcanReflex:
         change_magnitude = event_data.get('magnitude', 0.0)
         
         # Determine if action is needed
-        if change_magnitude > 0.15:  # Significant change
-            # Activate odds-specific modules
-            if self.shadow_odds:
-                self.shadow_odds.activate_volatility_tracking(match_id)
+        with self._state_lock:
+            if change_magnitude > 0.15:  # Significant change
+                # Activate odds-specific modules
+                if self.shadow_odds:
+                    self.shadow_odds.activate_volatility_tracking(match_id)
                 
-            return {
-                'action_taken': 'activated_volatility_tracking',
-                'match_id': match_id,
-                'market': market
-            }
+                return {
+                    'action_taken': 'activated_volatility_tracking',
+                    'match_id': match_id,
+                    'market': market
+                }
         
         return {
             'action_taken': 'monitoring_only',
@@ -278,38 +278,39 @@ class ArcanReflex:
         # Find any predictions we made for this match
         predictions = self._get_match_predictions(match_id)
         
-        if predictions:
-            # Evaluate prediction accuracy
-            for prediction in predictions:
-                prediction_type = prediction.get('type', '')
-                predicted_outcome = prediction.get('outcome', '')
-                actual_outcome = self._extract_actual_outcome(result, prediction_type)
+        with self._state_lock:
+            if predictions:
+                # Evaluate prediction accuracy
+                for prediction in predictions:
+                    prediction_type = prediction.get('type', '')
+                    predicted_outcome = prediction.get('outcome', '')
+                    actual_outcome = self._extract_actual_outcome(result, prediction_type)
                 
-                # Determine if prediction was correct
-                was_correct = (predicted_outcome == actual_outcome)
+                    # Determine if prediction was correct
+                    was_correct = (predicted_outcome == actual_outcome)
                 
-                # Store pattern effectiveness
-                if 'pattern' in prediction:
-                    self.reflex_memory.update_pattern_effectiveness(
-                        prediction['pattern'],
-                        was_correct
-                    )
+                    # Store pattern effectiveness
+                    if 'pattern' in prediction:
+                        self.reflex_memory.update_pattern_effectiveness(
+                            prediction['pattern'],
+                            was_correct
+                        )
                 
-                # Update module performance
-                module_contributed = prediction.get('contributing_modules', [])
-                for module in module_contributed:
-                    current_score = self.module_performance.get(module, 0.5)
-                    adjustment = 0.05 if was_correct else -0.05
-                    new_score = max(0.1, min(0.9, current_score + adjustment))
-                    self.module_performance[module] = new_score
-            
-            self._save_performance_data()
-            
-            return {
-                'action_taken': 'updated_performance_metrics',
-                'match_id': match_id,
-                'predictions_evaluated': len(predictions)
-            }
+                    # Update module performance
+                    module_contributed = prediction.get('contributing_modules', [])
+                    for module in module_contributed:
+                        current_score = self.module_performance.get(module, 0.5)
+                        adjustment = 0.05 if was_correct else -0.05
+                        new_score = max(0.1, min(0.9, current_score + adjustment))
+                        self.module_performance[module] = new_score
+            
+                self._save_performance_data()
+                
+                return {
+                    'action_taken': 'updated_performance_metrics',
+                    'match_id': match_id,
+                    'predictions_evaluated': len(predictions)
+                }
         
         return {
             'action_taken': 'no_predictions_found',
@@ -487,12 +488,13 @@ class ArcanReflex:
             'timestamp': datetime.now().isoformat()
         }
         
-        # Update module performance based on this outcome
-        self.reflex_eval.track_prediction_result(result_data)
+        with self._state_lock:
+            # Update module performance based on this outcome
+            self.reflex_eval.track_prediction_result(result_data)
         
-        # If prediction was correct and high confidence, store the pattern
-        if correct and prediction.get('confidence', 0) > 0.7:
-            self.reflex_memory.store_patterns([result_data])
+            # If prediction was correct and high confidence, store the pattern
+            if correct and prediction.get('confidence', 0) > 0.7:
+                self.reflex_memory.store_patterns([result_data])
         
         return {
             'tracked': True,
@@ -501,6 +503,57 @@ class ArcanReflex:
             'timestamp': datetime.now().isoformat()
         }
     
+    def track_prediction_outcomes(self, outcomes):
+        """
+        Track a batch of settled predictions and persist module performance once.
+        
+        Args:
+            outcomes (list): Settled predictions, each a dict with 'correct',
+                'modules_used', 'confidence' and optionally 'match_data' and 'factors'
+            
+        Returns:
+            dict: Summary of the batch
+        """
+        timestamp = datetime.now().isoformat()
+        patterns = []
+        correct_count = 0
+        
+        with self._state_lock:
+            for outcome in outcomes:
+                correct = bool(outcome.get('correct'))
+                modules_used = outcome.get('modules_used', [])
+                result_data = {
+                    'correct': correct,
+                    'active_modules': modules_used,
+                    'match_data': outcome.get('match_data', {}),
+                    'confidence': outcome.get('confidence', 0),
+                    'factors': outcome.get('factors', []),
+                    'timestamp': timestamp
+                }
+                self.reflex_eval.track_prediction_result(result_data)
+            
+                if correct:
+                    correct_count += 1
+                    if result_data['confidence'] > 0.7:
+                        patterns.append(result_data)
+            
+                # Same adjustment as for live match results
+                adjustment = 0.05 if correct else -0.05
+                for module in modules_used:
+                    current_score = self.module_performance.get(module, 0.5)
+                    self.module_performance[module] = max(0.1, min(0.9, current_score + adjustment))
+        
+            if patterns:
+                self.reflex_memory.store_patterns(patterns)
+            if outcomes:
+                self._save_performance_data()
+        
+        return {
+            'tracked': len(outcomes),
+            'correct': correct_count,
+            'timestamp': timestamp
+        }
+    
     def suggest_new_modules(self, performance_data=None):
         """
         Suggest new modules that could be created to address gaps in system performance.
@@ -633,11 +686,13 @@ class ArcanReflex:
             """)
             
             # Save module performance data
-            for module, performance in self.module_performance.items():
-                cursor.execute("""
-                    INSERT OR REPLACE INTO module_performance (module_name, performance, last_updated)
-                    VALUES (?, ?, ?)
-                """, (module, performance, datetime.now().isoformat()))
+            now = datetime.now().isoformat()
+            with self._state_lock:
+                rows = [(module, performance, now) for module, performance in self.module_performance.items()]
+            cursor.executemany("""
+                INSERT OR REPLACE INTO module_performance (module_name, performance, last_updated)
+                VALUES (?, ?, ?)
+            """, rows)
             
             conn.commit()
             conn.close()
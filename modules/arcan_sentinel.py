@@ -10,10 +10,30 @@ import numpy as np
 from datetime import datetime
 import os
 from utils.api_integrations import APIIntegrations
+from utils.live_evaluator import LiveDependencyEvaluator
+from utils.match_event_log import get_match_event_log, fixture_key
 
 # Initialize random with a safe seed value
 random.seed(int(time.time()) % (2**32 - 1))
 
+# Inputs read by each live module: a module is only re-run when one of them changes
+LIVE_MODULE_INPUTS = {
+    'shadow_momentum': ('minute', 'score', 'events'),
+    'bet_pulse': ('minute_band', 'score', 'odds'),
+    'line_trap': ('late_window', 'score'),
+    'karmic_flow': ('minute', 'score'),
+    'mirror_phase': ('minute',),
+    'clutch_time_scanner': ('clutch_window', 'score')
+}
+
+# Match-state fingerprints derived from the minute, at the granularity the modules use it
+LIVE_SELECTORS = {
+    'match': lambda state: (state.get('home_team'), state.get('away_team'), str(state.get('date'))),
+    'minute_band': lambda state: (state['minute'] == 0, state['minute'] // 10),
+    'late_window': lambda state: (state['minute'] > 70, state['minute'] > 80),
+    'clutch_window': lambda state: (40 <= state['minute'] <= 45, state['minute'] >= 80, state['minute'] >= 85)
+}
+
 class ArcanSentinel:
     """
     ArcanSentinel - Real-time analysis system for ArcanShadow
@@ -49,6 +69,11 @@ class ArcanSentinel:
         self.predictions_history = []
         self.fixture_id = None  # Store API-Sports fixture ID when available
         
+        # Persistent append-only event log of the tracked match
+        self.event_log = get_match_event_log()
+        self.event_log_id = None
+        self.record_events = True
+        
         # Initialize specialized live modules
         self.live_modules = {
             'shadow_momentum': self.shadow_momentum_analysis,
@@ -59,6 +84,15 @@ class ArcanSentinel:
             'clutch_time_scanner': self.clutch_time_analysis
         }
         
+        # Dependency-tracked evaluator: core and live modules are only recomputed
+        # when the inputs they declare have changed since the previous tick
+        self.live_evaluator = LiveDependencyEvaluator(selectors=LIVE_SELECTORS)
+        self.live_evaluator.register('arcan_x', self.arcan_x.analyze_match, ('match',))
+        self.live_evaluator.register('shadow_odds', self.shadow_odds.analyze_match, ('match', 'odds'))
+        self.live_evaluator.register('collapse_detector', self._collapse_analysis, ('match', 'minute', 'score', 'events'))
+        for module_name, analysis_func in self.live_modules.items():
+            self.live_evaluator.register(module_name, analysis_func, LIVE_MODULE_INPUTS[module_name])
+        
         # API data retrieval timer
         self.last_api_update = 0
         self.api_update_interval = 60  # Seconds between live match data updates
@@ -124,6 +158,15 @@ class ArcanSentinel:
         self.predictions_history = []
         self.start_time = datetime.now()
         self.fixture_id = match_data.get('fixture_id')  # Try to get fixture_id if provided
+        self.live_evaluator.reset()
+        
+        # Open the persistent event log for this match
+        self.event_log_id = None
+        if self.record_events:
+            try:
+                self.event_log_id = self.event_log.open_fixture(fixture_key(match_data), match_data)
+            except Exception as e:
+                self.log_activity('event_log_error', f"Event log unavailable: {str(e)}")
         
         # If we have API access, try to identify the match in the API
         if self.api_sports_available and not self.fixture_id:
@@ -275,6 +318,14 @@ class ArcanSentinel:
                 'timestamp': datetime.now().isoformat()
             })
             self.log_activity('event_recorded', f"{event['type']} for {event['team']} at minute {minute}: {event['details']}")
+            
+            # Persist the event to the match log
+            if self.record_events and self.event_log_id:
+                try:
+                    self.event_log.append(self.event_log_id, dict(self.key_events[-1], player=event.get('player')),
+                                          seq=len(self.key_events) - 1)
+                except Exception as e:
+                    self.log_activity('event_log_error', f"Could not persist event: {str(e)}")
         
         # Update tracking metrics
         new_analysis = self.update_live_analysis()
@@ -308,22 +359,16 @@ class ArcanSentinel:
         current_state['score'] = self.score
         current_state['key_events'] = self.key_events
         
-        # Get results from core modules
-        arcan_x_results = self.arcan_x.analyze_match(current_state)
-        shadow_odds_results = self.shadow_odds.analyze_match(current_state)
+        # Get results from core modules (reused between ticks when their inputs are unchanged)
+        core_results = self.live_evaluator.evaluate(current_state, ('arcan_x', 'shadow_odds'))
+        arcan_x_results = core_results['arcan_x']
+        shadow_odds_results = core_results['shadow_odds']
         
         # Use advanced modules if meta_systems is available
         if self.meta_systems:
             # Check for collapse risk
-            collapse_detector = self.meta_systems.adv_modules.get('collapse_detector')
-            if collapse_detector:
-                collapse_analysis = collapse_detector.analyze_match_state(
-                    current_state, 
-                    self.match_minute, 
-                    self.score[0], 
-                    self.score[1], 
-                    self.key_events
-                )
+            collapse_analysis = self.live_evaluator.evaluate(current_state, ('collapse_detector',))['collapse_detector']
+            if collapse_analysis is not None:
                 current_state['collapse_analysis'] = collapse_analysis
             
             # Check for youth impact
@@ -351,12 +396,9 @@ class ArcanSentinel:
             shadow_odds_results
         )
         
-        # Run specialized live analysis modules
-        live_module_results = {}
+        # Run specialized live analysis modules whose declared inputs changed
         current_phase = self.determine_match_phase(self.match_minute)
-        
-        for module_name, analysis_func in self.live_modules.items():
-            live_module_results[module_name] = analysis_func(current_state)
+        live_module_results = self.live_evaluator.evaluate(current_state, self.live_modules)
         
         # Calculate adjusted confidence based on live modules
         adjusted_confidence = base_prediction['confidence']
@@ -394,9 +436,9 @@ class ArcanSentinel:
             'statistical_factors': base_prediction.get('statistical_factors', [])
         }
         
-        # Add live module results
+        # Add live module results (copies, so cached results are not mutated)
         for module_name, module_result in live_module_results.items():
-            result[module_name] = module_result
+            result[module_name] = dict(module_result)
         
         # Add momentum timeline
         if 'shadow_momentum' in result:
@@ -447,6 +489,82 @@ class ArcanSentinel:
         
         return final_analysis
     
+    def replay_fixture(self, fixture_id, event_log=None, end_minute=90):
+        """
+        Replay a recorded match through all live modules, faster than real time
+        
+        Args:
+            fixture_id (str): Match identifier in the event log
+            event_log (MatchEventLog, optional): Log to read (shared log by default)
+            end_minute (int): Last minute replayed when no event is later
+            
+        Returns:
+            list: Live analysis after each replayed update, ending with the final analysis
+        """
+        event_log = event_log or self.event_log
+        match = event_log.get_meta(fixture_id)['match']
+        
+        # Group the recorded events by minute, with the score after each event
+        events_by_minute = {}
+        for tick in event_log.iter_ticks(fixture_id, step='event'):
+            events_by_minute.setdefault(tick['minute'], []).append((tick['new_events'][0], tick['score']))
+        last_minute = max([end_minute] + list(events_by_minute))
+        
+        # No live API calls and no re-recording while replaying
+        api_available, record_events = self.api_sports_available, self.record_events
+        self.api_sports_available = False
+        self.record_events = False
+        try:
+            analyses = [self.start_live_tracking(dict(match))]
+            for minute in range(1, last_minute + 1):
+                if minute not in events_by_minute:
+                    analyses.append(self.update_match_state(minute))
+                    continue
+                for event, score in events_by_minute[minute]:
+                    details = f"{event['label']} at minute {minute}"
+                    if event['player']:
+                        details += f" ({event['player']})"
+                    analyses.append(self.update_match_state(minute, score, {
+                        'type': event['label'],
+                        'team': event['team'] or 'Unknown',
+                        'details': details
+                    }))
+            analyses.append(self.stop_live_tracking())
+            return analyses
+        finally:
+            self.api_sports_available = api_available
+            self.record_events = record_events
+    
+    def _collapse_analysis(self, match_data):
+        """
+        Run the CollapseDetector on the current match state, when available
+        
+        Args:
+            match_data (dict): Current match information
+            
+        Returns:
+            dict: Collapse analysis results, or None without a collapse detector
+        """
+        collapse_detector = self.meta_systems.adv_modules.get('collapse_detector') if self.meta_systems else None
+        if not collapse_detector:
+            return None
+        return collapse_detector.analyze_match_state(
+            match_data,
+            match_data['minute'],
+            match_data['score'][0],
+            match_data['score'][1],
+            match_data['key_events']
+        )
+    
+    def get_evaluation_stats(self):
+        """
+        Get the incremental evaluator counters for the tracked match
+        
+        Returns:
+            dict: Evaluation ticks, computed and reused module results
+        """
+        return self.live_evaluator.get_stats()
+    
     def shadow_momentum_analysis(self, match_data):
         """
         ShadowMomentum: Detects subtle momentum shifts in betting patterns and match dynamics
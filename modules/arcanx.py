@@ -4,6 +4,7 @@ from datetime import datetime
 import math
 import os
 from utils.api_integrations import APIIntegrations
+from utils.prediction_cache import cached_analysis
 
 class ArcanX:
     """
@@ -11,6 +12,8 @@ class ArcanX:
     Fuses esoteric disciplines with statistical data to generate prediction signals.
     """
     
+    CACHE_VERSION = "1.0"
+    
     def __init__(self):
         self.submodules = {
             'NumeriCode': self.numeri_code,
@@ -41,6 +44,7 @@ class ArcanX:
         # Cache for results to avoid redundant calculations
         self.cache = {}
     
+    @cached_analysis('ArcanX')
     def analyze_match(self, match_data):
         """
         Main method to analyze a match using esoteric principles.
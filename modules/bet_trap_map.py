@@ -12,6 +12,7 @@ from collections import defaultdict
 
 # Intégration de l'adaptateur Transfermarkt
 from api.transfermarkt_adapter import TransfermarktAdapter
+from utils.odds_tick_store import get_odds_tick_store
 
 # Configuration du logging
 logging.basicConfig(level=logging.INFO)
@@ -49,6 +50,9 @@ class BetTrapMap:
             'max_safe_markets': 3                # Nombre max de marchés "sûrs" à recommander
         }
         
+        # Magasin persistant des ticks de cotes (séries réelles)
+        self.tick_store = get_odds_tick_store()
+        
         # Types de pièges connus
         self.trap_types = {
             'odds_reversal': {
@@ -319,8 +323,10 @@ class BetTrapMap:
         # Obtenir ou simuler les volumes de paris
         betting_volumes = betting_volumes or self._simulate_betting_volumes(odds_data)
         
-        # Obtenir ou simuler les données historiques
-        historical_data = historical_data or self._simulate_historical_data(home_team, away_team)
+        # Obtenir les données historiques (ticks enregistrés en priorité) ou les simuler
+        historical_data = (historical_data
+                           or self._historical_data_from_ticks(match_data)
+                           or self._simulate_historical_data(home_team, away_team))
         
         # Analyser chaque marché
         for market_name, market_odds in odds_data.items():
@@ -1557,6 +1563,35 @@ class BetTrapMap:
         
         return volumes
     
+    def _historical_data_from_ticks(self, match_data):
+        """Construire les données historiques de cotes à partir des ticks enregistrés."""
+        match_id = match_data.get('id', match_data.get('match_id'))
+        if not self.tick_store.has_ticks(match_id):
+            return {}
+        
+        historical_data = {}
+        for market_name, outcomes in self.tick_store.get_markets(match_id).items():
+            series = {outcome: self.tick_store.get_consensus_series(match_id, market_name, outcome) for outcome in outcomes}
+            series = {outcome: s for outcome, s in series.items() if len(s)}
+            if not series:
+                continue
+            
+            # Aligner les issues sur l'union des horodatages (dernière cote connue)
+            timestamps = np.unique(np.concatenate([s['timestamp'] for s in series.values()]))
+            odds_history = [{'timestamp': datetime.fromtimestamp(ts).isoformat()} for ts in timestamps]
+            for outcome, s in series.items():
+                positions = np.searchsorted(s['timestamp'], timestamps, side='right') - 1
+                for point, pos in zip(odds_history, positions):
+                    if pos >= 0:
+                        point[outcome] = float(s['price'][pos])
+            
+            historical_data[market_name] = {
+                'odds_history': odds_history,
+                'average_odds': {outcome: round(float(s['price'].mean()), 2) for outcome, s in series.items()}
+            }
+        
+        return historical_data
+    
     def _simulate_historical_data(self, home_team, away_team):
         """Simuler des données historiques pour les tests."""
         historical_data = {}
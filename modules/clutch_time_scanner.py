@@ -9,6 +9,8 @@ from datetime import datetime, timedelta
 import json
 import os
 
+from utils.venue_profiles import get_venue_profile_store
+
 class ClutchTimeScanner:
     """
     ClutchTimeScanner - Analyse des moments décisifs dans un match.
@@ -62,6 +64,9 @@ class ClutchTimeScanner:
             'tactical_substitution': 0.5 # Changement tactique
         }
         
+        # Base partagée des stades et rivalités (derbies, affluences a priori)
+        self.venue_store = get_venue_profile_store()
+        
         # Historique des moments décisifs détectés
         self.clutch_moments_history = []
         
@@ -384,28 +389,8 @@ class ClutchTimeScanner:
     
     def _is_derby(self, home_team, away_team):
         """Déterminer si le match est un derby."""
-        # Liste simplifiée de derbies connus
-        known_derbies = [
-            ('Manchester United', 'Manchester City'),
-            ('Liverpool', 'Everton'),
-            ('Arsenal', 'Tottenham'),
-            ('AC Milan', 'Inter Milan'),
-            ('Real Madrid', 'Atletico Madrid'),
-            ('Barcelona', 'Espanyol'),
-            ('Boca Juniors', 'River Plate')
-        ]
-        
-        # Vérifier les derbies connus
-        for team1, team2 in known_derbies:
-            if (home_team == team1 and away_team == team2) or (home_team == team2 and away_team == team1):
-                return True
-        
-        # Vérifier si les équipes partagent la même ville (analyse simplifiée)
-        home_city = home_team.split()[0]  # Première partie du nom
-        if len(home_city) > 3 and home_city in away_team:
-            return True
-        
-        return False
+        # Lecture dans l'ensemble haché des derbies de la base des stades partagée
+        return self.venue_store.is_derby(home_team, away_team)
     
     def _calculate_overall_clutch_probability(self, match_context):
         """Calculer la probabilité globale d'avoir des moments décisifs dans le match."""
@@ -12,11 +12,19 @@ from collections import defaultdict
 
 # Intégration de l'adaptateur Transfermarkt
 from api.transfermarkt_adapter import TransfermarktAdapter
+from utils.team_ratings import get_team_rating_engine
+from utils.live_evaluator import LiveEventIndex
 
 # Configuration du logging
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
+# Types d'événements lus par les patterns d'effondrement et la tendance de risque
+COLLAPSE_EVENT_TYPES = (
+    'goal', 'missed_chance', 'red_card', 'penalty_against', 'substitution', 'injury',
+    'goal_against', 'goal_for', 'saved_shot', 'successful_tackle', 'key_pass'
+)
+
 class CollapseDetector:
     """
     CollapseDetector - Système de détection des risques d'effondrement mental et de performance.
@@ -82,6 +90,9 @@ class CollapseDetector:
         # Historique des analyses
         self.analysis_history = []
         
+        # Index incrémental des événements live par match (seuls les nouveaux événements sont lus)
+        self._event_indexes = {}
+        
         # Indicateurs psychologiques potentiels d'effondrement
         self.psychological_indicators = {
             'frustration_visible': 0.8,
@@ -128,6 +139,14 @@ class CollapseDetector:
         team1_name = match_data.get('home_team', 'Équipe 1')
         team2_name = match_data.get('away_team', 'Équipe 2')
         
+        # Ne conserver que les événements lus par les patterns, indexés au fil des appels
+        match_key = (match_data.get('id') or match_data.get('fixture_id'), team1_name, team2_name)
+        event_index = self._event_indexes.get(match_key)
+        if event_index is None:
+            event_index = self._event_indexes[match_key] = LiveEventIndex(COLLAPSE_EVENT_TYPES)
+        event_index.update(recent_events)
+        recent_events = event_index.events
+        
         # Analyse des risques pour chaque équipe
         team1_analysis = self._analyze_team_collapse_risk(
             team1_name, team1_score, team2_score, current_minute, recent_events, is_home=True
@@ -791,6 +810,22 @@ class CollapseDetector:
         # Limiter entre 0.1 et 0.9
         return max(0.1, min(0.9, base_score))
     
+    def _get_team_rating(self, team_data):
+        """Classement Elo local et forme récente d'une équipe (None si inconnue)."""
+        team_name = team_data.get('name')
+        if not team_name:
+            return None
+        try:
+            engine = get_team_rating_engine()
+            rating = engine.get_rating(team_name, team_data.get('match_date'))
+            if rating is None:
+                return None
+            rating['form'] = engine.get_form(team_name, team_data.get('match_date'), limit=10)
+            return rating
+        except Exception as e:
+            logger.warning(f"Classement local indisponible pour {team_name}: {e}")
+            return None
+    
     def _analyze_squad_vulnerability(self, team_data):
         """
         Analyser la vulnérabilité de l'effectif aux effondrements.
@@ -856,6 +891,15 @@ class CollapseDetector:
         squad_depth = random.uniform(0.3, 0.9)
         tactical_rigidity = random.uniform(0.3, 0.9)
         
+        # Classement local : la force Elo reflète la profondeur d'effectif,
+        # la forme sur les 10 derniers matchs la résilience mentale
+        rating = self._get_team_rating(team_data)
+        if rating:
+            squad_depth = 0.3 + 0.6 * rating['strength']
+            if rating['form']:
+                mental_resilience = 0.3 + 0.6 * sum(rating['form']) / len(rating['form'])
+            squad_analysis['elo_rating'] = rating['elo']
+        
         # Calculer le score de vulnérabilité
         vulnerability_factors = [
             1 - experience_level,  # Moins d'expérience = plus de vulnérabilité
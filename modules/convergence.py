@@ -1,6 +1,7 @@
 import numpy as np
 from datetime import datetime
 import random
+from utils.prediction_cache import cached_analysis
 
 class Convergence:
     """
@@ -8,6 +9,8 @@ class Convergence:
     Combines outputs from ArcanX and ShadowOdds to generate final predictions.
     """
     
+    CACHE_VERSION = "1.0"
+    
     def __init__(self):
         """Initialize the Convergence module with necessary components."""
         self.submodules = {
@@ -27,6 +30,7 @@ class Convergence:
         # Cache for results to avoid redundant calculations
         self.cache = {}
     
+    @cached_analysis('Convergence')
     def generate_prediction(self, match_data, arcan_x_results, shadow_odds_results):
         """
         Main method to generate final prediction by combining ArcanX and ShadowOdds outputs.
@@ -9,6 +9,12 @@ from datetime import datetime, timedelta
 import json
 import os
 
+from utils.venue_profiles import get_venue_profile_store
+from utils.live_evaluator import LiveEventIndex
+
+# Types d'événements qui modifient l'intensité du public ou créent un moment critique
+CROWD_EVENT_TYPES = ('goal', 'missed_penalty', 'red_card', 'penalty_awarded', 'var_review')
+
 class CrowdPressureIndex:
     """
     CrowdPressureIndex - Analyse la pression du public et l'ambiance du stade.
@@ -49,6 +55,15 @@ class CrowdPressureIndex:
             'momentum_amplifier': 0.0  # Amplification du momentum
         }
         
+        # Base partagée des stades et rivalités (derbies, affluences a priori)
+        self.venue_store = get_venue_profile_store()
+        
+        # Importance des matchs déjà évaluée, par contexte de compétition
+        self._importance_cache = {}
+        
+        # Index incrémental des événements live par match (seuls les nouveaux événements sont lus)
+        self._event_indexes = {}
+        
         # Historique des mesures de pression
         self.pressure_history = []
         
@@ -79,8 +94,13 @@ class CrowdPressureIndex:
         stadium_capacity = match_data.get('stadium_capacity', 0)
         match_type = match_data.get('match_type', 'league')
         
-        # Calculer les coefficients de base
-        attendance_ratio = attendance / stadium_capacity if stadium_capacity > 0 else 0.5
+        # Calculer les coefficients de base (affluence a priori du stade si la capacité est inconnue)
+        if stadium_capacity > 0:
+            attendance_ratio = attendance / stadium_capacity
+            if attendance > 0:
+                self.venue_store.record_attendance(home_team, attendance, stadium_capacity, match_data.get('date'))
+        else:
+            attendance_ratio = self.venue_store.attendance_prior(home_team, away_team)
         is_derby = self._is_derby(home_team, away_team)
         match_importance = self._calculate_match_importance(match_data)
         
@@ -91,8 +111,18 @@ class CrowdPressureIndex:
         if is_derby:
             pressure_curve = 'derby'
         
+        # Intégrer uniquement les événements reçus depuis le dernier appel
+        match_key = (match_data.get('id') or match_data.get('fixture_id'), home_team, away_team)
+        event_index = self._event_indexes.get(match_key)
+        if event_index is None:
+            event_index = self._event_indexes[match_key] = LiveEventIndex(CROWD_EVENT_TYPES)
+        event_index.update(live_events)
+        
         # Mise à jour de l'état actuel
-        current_minute = self._get_match_minute(match_data, live_events)
+        if event_index.count:
+            current_minute = event_index.max_minute
+        else:
+            current_minute = match_data.get('current_minute', 0)
         self.current_state['match_time'] = current_minute
         
         # Calculer l'intensité du public
@@ -101,7 +131,7 @@ class CrowdPressureIndex:
             attendance_ratio, 
             is_derby, 
             match_importance,
-            live_events
+            event_index.events
         )
         self.current_state['crowd_intensity'] = crowd_intensity
         
@@ -123,7 +153,7 @@ class CrowdPressureIndex:
         
         # Identifier les moments critiques
         if live_events:
-            critical_moments = self._identify_critical_moments(live_events, pressure_index)
+            critical_moments = self._identify_critical_moments(event_index.events, pressure_index)
             self.current_state['critical_moments'] = critical_moments
         
         # Enregistrer l'analyse dans l'historique
@@ -167,8 +197,11 @@ class CrowdPressureIndex:
         stadium_capacity = match_data.get('stadium_capacity', 0)
         match_type = match_data.get('match_type', 'league')
         
-        # Calculer les coefficients de base
-        attendance_ratio = expected_attendance / stadium_capacity if stadium_capacity > 0 else 0.5
+        # Calculer les coefficients de base (affluence a priori du stade si la capacité est inconnue)
+        if stadium_capacity > 0:
+            attendance_ratio = expected_attendance / stadium_capacity
+        else:
+            attendance_ratio = self.venue_store.attendance_prior(home_team, away_team)
         is_derby = self._is_derby(home_team, away_team)
         match_importance = self._calculate_match_importance(match_data)
         
@@ -365,33 +398,20 @@ class CrowdPressureIndex:
     
     def _is_derby(self, home_team, away_team):
         """Déterminer si le match est un derby."""
-        # Liste simplifiée de derbies connus
-        known_derbies = [
-            ('Manchester United', 'Manchester City'),
-            ('Liverpool', 'Everton'),
-            ('Arsenal', 'Tottenham'),
-            ('AC Milan', 'Inter Milan'),
-            ('Real Madrid', 'Atletico Madrid'),
-            ('Barcelona', 'Espanyol'),
-            ('Boca Juniors', 'River Plate')
-        ]
-        
-        # Vérifier les derbies connus
-        for team1, team2 in known_derbies:
-            if (home_team == team1 and away_team == team2) or (home_team == team2 and away_team == team1):
-                return True
-        
-        # Vérifier si les équipes partagent la même ville (analyse simplifiée)
-        home_city = home_team.split()[0]  # Première partie du nom
-        if len(home_city) > 3 and home_city in away_team:
-            return True
-        
-        return False
+        # Lecture dans l'ensemble haché des derbies de la base des stades partagée
+        return self.venue_store.is_derby(home_team, away_team)
     
     def _calculate_match_importance(self, match_data):
         """Calculer l'importance du match."""
         competition_type = match_data.get('competition_type', 'league')
         round_info = match_data.get('round', '')
+        title_decider = match_data.get('title_decider', False)
+        relegation_battle = match_data.get('relegation_battle', False)
+        
+        # Réutiliser l'évaluation d'un contexte identique (appels minute par minute en direct)
+        cache_key = (competition_type, round_info, bool(title_decider), bool(relegation_battle))
+        if cache_key in self._importance_cache:
+            return self._importance_cache[cache_key]
         
         # Importance de base selon le type de compétition
         importance = 0.5  # Valeur par défaut pour les matches de championnat
@@ -412,14 +432,12 @@ class CrowdPressureIndex:
             importance = min(1.0, importance + 0.1)
         
         # Prendre en compte les enjeux spécifiques
-        title_decider = match_data.get('title_decider', False)
-        relegation_battle = match_data.get('relegation_battle', False)
-        
         if title_decider:
             importance = min(1.0, importance + 0.2)
         if relegation_battle:
             importance = min(1.0, importance + 0.15)
         
+        self._importance_cache[cache_key] = importance
         return importance
     
     def _get_match_minute(self, match_data, live_events=None):
@@ -11,6 +11,177 @@ import os
 from collections import deque
 import math
 
+class BatchCycleEngine:
+    """
+    Moteur vectorisé de détection de cycles : fonction d'auto-corrélation complète par FFT,
+    détection des pics par comparaisons de tableaux et score de périodicité matriciel.
+    Traite un lot de séries (par exemple toutes les équipes de l'archive) en une passe ;
+    les séries de longueurs différentes sont complétées par des zéros.
+    """
+    
+    def __init__(self, config):
+        """
+        Initialise le moteur.
+        
+        Args:
+            config (dict): Configuration d'analyse (cycle_analysis_config de CycleMirror)
+        """
+        self.config = config
+    
+    @staticmethod
+    def pack(series_list):
+        """
+        Empile des séries de longueurs variables dans une matrice complétée par des zéros.
+        
+        Args:
+            series_list (list): Séries temporelles
+            
+        Returns:
+            tuple: (valeurs float64 [séries x points], longueurs int64)
+        """
+        lengths = np.array([len(series) for series in series_list], dtype=np.int64)
+        values = np.zeros((len(series_list), int(lengths.max()) if len(lengths) else 0))
+        for row, series in enumerate(series_list):
+            values[row, :lengths[row]] = series
+        return values, lengths
+    
+    @staticmethod
+    def _lag_products(values, max_lag):
+        """Somme des produits x[i] * x[i + lag] pour tous les décalages, par FFT."""
+        n_fft = 1 << int(2 * values.shape[1] - 1).bit_length()
+        spectrum = np.fft.rfft(values, n=n_fft, axis=1)
+        return np.fft.irfft(spectrum * np.conj(spectrum), n=n_fft, axis=1)[:, :max_lag + 1]
+    
+    def lagged_autocorrelation(self, values, lengths, max_lag):
+        """
+        Corrélation de Pearson entre x[:-lag] et x[lag:] pour tous les décalages en une passe.
+        
+        Args:
+            values (np.ndarray): Séries complétées par des zéros
+            lengths (np.ndarray): Longueurs réelles des séries
+            max_lag (int): Décalage maximal
+            
+        Returns:
+            np.ndarray: Corrélations [séries x (max_lag + 1)], 0 si indéfinie
+        """
+        valid = np.arange(values.shape[1]) < lengths[:, None]
+        # Centrer chaque série améliore la précision sans changer les corrélations
+        means = values.sum(axis=1) / np.maximum(lengths, 1)
+        centered = np.where(valid, values - means[:, None], 0.0)
+        
+        products = self._lag_products(centered, max_lag)
+        lags = np.arange(max_lag + 1)
+        counts = lengths[:, None] - lags[None, :]
+        usable = counts > 0
+        safe_counts = np.where(usable, counts, 1)
+        
+        zeros = np.zeros((values.shape[0], 1))
+        prefix = np.concatenate([zeros, np.cumsum(centered, axis=1)], axis=1)
+        prefix_sq = np.concatenate([zeros, np.cumsum(centered ** 2, axis=1)], axis=1)
+        rows = np.arange(values.shape[0])[:, None]
+        head_end = np.clip(counts, 0, None)
+        total = prefix[rows, lengths[:, None]]
+        total_sq = prefix_sq[rows, lengths[:, None]]
+        lag_idx = np.minimum(lags[None, :], lengths[:, None])
+        
+        sum_head = prefix[rows, head_end]
+        sum_tail = total - prefix[rows, lag_idx]
+        sq_head = prefix_sq[rows, head_end]
+        sq_tail = total_sq - prefix_sq[rows, lag_idx]
+        
+        covariance = products - sum_head * sum_tail / safe_counts
+        variance_head = sq_head - sum_head ** 2 / safe_counts
+        variance_tail = sq_tail - sum_tail ** 2 / safe_counts
+        
+        scale = np.maximum(total_sq, 1e-300)
+        defined = usable & (variance_head > 1e-12 * scale) & (variance_tail > 1e-12 * scale)
+        denominator = np.sqrt(np.where(defined, variance_head * variance_tail, 1.0))
+        return np.where(defined, covariance / denominator, 0.0)
+    
+    def extrema_mask(self, values, lengths, troughs=False):
+        """
+        Repère les pics (ou creux) suffisamment proéminents, bords exclus.
+        
+        Args:
+            values (np.ndarray): Séries complétées par des zéros
+            lengths (np.ndarray): Longueurs réelles des séries
+            troughs (bool): Chercher les creux plutôt que les pics
+            
+        Returns:
+            np.ndarray: Masque booléen [séries x points]
+        """
+        mask = np.zeros(values.shape, dtype=bool)
+        if values.shape[1] < 3:
+            return mask
+        signed = -values if troughs else values
+        middle = signed[:, 1:-1]
+        rise = middle - signed[:, :-2]
+        fall = middle - signed[:, 2:]
+        inside = np.arange(1, values.shape[1] - 1)[None, :] < (lengths[:, None] - 1)
+        mask[:, 1:-1] = (inside & (rise > 0) & (fall > 0)
+                         & (np.minimum(rise, fall) > self.config['peak_prominence']))
+        return mask
+    
+    def periodicity_counts(self, peak_mask, periods):
+        """
+        Nombre de paires de pics dont l'écart vaut un multiple de la période (tolérance 1).
+        
+        Args:
+            peak_mask (np.ndarray): Masque des pics [séries x points]
+            periods (np.ndarray): Périodes candidates
+            
+        Returns:
+            np.ndarray: Comptes [séries x périodes]
+        """
+        width = peak_mask.shape[1]
+        # Paires de pics à chaque distance = auto-corrélation du masque binaire
+        pair_counts = np.rint(self._lag_products(peak_mask.astype(np.float64), width - 1))
+        distances = np.arange(width)[:, None]
+        matches = (distances >= 1) & (distances % periods[None, :] <= 1)
+        return (pair_counts @ matches).astype(np.int64)
+    
+    def detect(self, series_list):
+        """
+        Détecte les cycles candidats de chaque série du lot.
+        
+        Args:
+            series_list (list): Séries temporelles
+            
+        Returns:
+            list: Pour chaque série, cycles candidats (period, correlation,
+                repetitions_found, years)
+        """
+        if not series_list:
+            return []
+        values, lengths = self.pack(series_list)
+        min_period = self.config['min_cycle_period']
+        max_period = min(self.config['max_cycle_period'], int(lengths.max()) // 2)
+        if max_period < min_period:
+            return [[] for _ in series_list]
+        
+        periods = np.arange(min_period, max_period + 1)
+        correlations = self.lagged_autocorrelation(values, lengths, max_period)[:, periods]
+        repeats = self.periodicity_counts(self.extrema_mask(values, lengths), periods)
+        
+        allowed = periods[None, :] <= (lengths[:, None] // 2)
+        accepted = (allowed
+                    & (correlations > self.config['correlation_threshold'])
+                    & (repeats >= self.config['min_repetitions']))
+        
+        results = []
+        for row in range(len(series_list)):
+            cycles = []
+            for col in np.flatnonzero(accepted[row]):
+                period = int(periods[col])
+                cycles.append({
+                    'period': period,
+                    'correlation': float(correlations[row, col]),
+                    'repetitions_found': int(repeats[row, col]),
+                    'years': period
+                })
+            results.append(cycles)
+        return results
+
 class CycleMirror:
     """
     CycleMirror - Analyse des patterns cycliques et des coïncidences statistiques.
@@ -29,13 +200,13 @@ class CycleMirror:
             },
             'manager_cycle': {
                 'period': 3,               # En années
-                'description': 'Cycle typique d'un entraîneur',
+                'description': "Cycle typique d'un entraîneur",
                 'significance': 0.7,
                 'predictive_power': 0.5
             },
             'team_generation': {
                 'period': 4,               # En années
-                'description': 'Cycle générationnel d'une équipe',
+                'description': "Cycle générationnel d'une équipe",
                 'significance': 0.75,
                 'predictive_power': 0.55
             },
@@ -53,7 +224,7 @@ class CycleMirror:
             },
             'club_renaissance': {
                 'period': 8,               # En années
-                'description': 'Cycle de renaissance d'un club',
+                'description': "Cycle de renaissance d'un club",
                 'significance': 0.5,
                 'predictive_power': 0.35
             }
@@ -117,6 +288,9 @@ class CycleMirror:
             'min_repetitions': 2,          # Nombre minimum de répétitions pour confirmer un cycle
             'sensitivity': 0.65            # Sensibilité générale de la détection
         }
+        
+        # Moteur vectorisé (FFT) partagé par l'analyse individuelle et par lot
+        self.batch_engine = BatchCycleEngine(self.cycle_analysis_config)
     
     def detect_team_cycles(self, team_data, category='performance'):
         """
@@ -227,6 +401,35 @@ class CycleMirror:
         
         return result
     
+    def detect_archive_cycles(self, team_series=None, min_seasons=6):
+        """
+        Détecter les cycles de performance de toutes les équipes de l'archive en un seul lot.
+        
+        Args:
+            team_series (dict, optional): Nom d'équipe -> (années, série) ; par défaut les
+                points par match saison par saison du moteur de classement local
+            min_seasons (int): Nombre minimal de saisons pour analyser une équipe
+            
+        Returns:
+            dict: Nom d'équipe -> cycles validés (seules les équipes avec au moins un cycle)
+        """
+        if team_series is None:
+            from utils.team_ratings import get_team_rating_engine
+            team_series = get_team_rating_engine().get_season_series(min_seasons=min_seasons)
+        
+        teams = [team for team, (years, series) in team_series.items() if len(series) >= min_seasons]
+        candidates = self.batch_engine.detect([team_series[team][1] for team in teams])
+        
+        archive_cycles = {}
+        for team, detected in zip(teams, candidates):
+            if not detected:
+                continue
+            years, series = team_series[team]
+            validated = self._validate_cycles(detected, series, years)
+            if validated:
+                archive_cycles[team] = validated
+        return archive_cycles
+    
     def find_historical_parallels(self, entity_data, entity_type='team', comparison_depth=30):
         """
         Trouver des parallèles historiques pour une équipe, un joueur ou une saison.
@@ -503,34 +706,8 @@ class CycleMirror:
         return result
     
     def _detect_cycles_in_timeseries(self, time_series, years):
-        """Détecter les cycles potentiels dans une série temporelle."""
-        # Méthode simplifiée: recherche de périodicité par auto-corrélation
-        cycles = []
-        
-        # Écart minimum entre les années
-        min_years = self.cycle_analysis_config['min_cycle_period']
-        max_years = min(self.cycle_analysis_config['max_cycle_period'], len(years) // 2)
-        
-        # Tester différentes périodes possibles
-        for period in range(min_years, max_years + 1):
-            # Calculer l'auto-corrélation à ce décalage
-            correlation = self._calculate_autocorrelation(time_series, period)
-            
-            # Si la corrélation est suffisamment forte, c'est un cycle potentiel
-            if correlation > self.cycle_analysis_config['correlation_threshold']:
-                # Vérifier si nous voyons des répétitions claires
-                peaks = self._find_peaks_in_series(time_series)
-                repeats = self._check_peak_periodicity(peaks, period, len(time_series))
-                
-                if repeats >= self.cycle_analysis_config['min_repetitions']:
-                    cycles.append({
-                        'period': period,
-                        'correlation': correlation,
-                        'repetitions_found': repeats,
-                        'years': period if isinstance(period, int) else period * (years[1] - years[0])
-                    })
-        
-        return cycles
+        """Détecter les cycles potentiels dans une série temporelle (auto-corrélation FFT)."""
+        return self.batch_engine.detect([time_series])[0]
     
     def _validate_cycles(self, detected_cycles, time_series, years):
         """Valider et affiner les cycles détectés."""
@@ -652,84 +829,48 @@ class CycleMirror:
         # Vérifier que le lag n'est pas plus grand que la série
         if lag >= len(series):
             return 0.0
-        
-        # Séries décalées
-        series1 = series[:-lag]
-        series2 = series[lag:]
-        
-        # Calcul de la corrélation
-        return self._calculate_correlation(series1, series2)
+        values, lengths = BatchCycleEngine.pack([series])
+        return float(self.batch_engine.lagged_autocorrelation(values, lengths, lag)[0, lag])
     
     def _calculate_correlation(self, series1, series2):
         """Calculer la corrélation entre deux séries."""
         # Vérifier qu'elles ont la même longueur
         min_len = min(len(series1), len(series2))
-        series1 = series1[:min_len]
-        series2 = series2[:min_len]
-        
         if min_len == 0:
             return 0.0
         
-        # Calcul de la moyenne
-        mean1 = sum(series1) / min_len
-        mean2 = sum(series2) / min_len
-        
-        # Calcul de la covariance et des variances
-        covariance = sum((series1[i] - mean1) * (series2[i] - mean2) for i in range(min_len))
-        variance1 = sum((x - mean1) ** 2 for x in series1)
-        variance2 = sum((x - mean2) ** 2 for x in series2)
+        series1 = np.asarray(series1[:min_len], dtype=np.float64)
+        series2 = np.asarray(series2[:min_len], dtype=np.float64)
+        centered1 = series1 - series1.mean()
+        centered2 = series2 - series2.mean()
         
         # Éviter la division par zéro
+        variance1 = float(centered1 @ centered1)
+        variance2 = float(centered2 @ centered2)
         if variance1 == 0 or variance2 == 0:
             return 0.0
         
-        # Calcul du coefficient de corrélation
-        correlation = covariance / (math.sqrt(variance1) * math.sqrt(variance2))
-        
-        return correlation
+        return float(centered1 @ centered2) / math.sqrt(variance1 * variance2)
     
     def _find_peaks_in_series(self, series):
         """Trouver les indices des pics dans une série."""
-        peaks = []
-        
-        # Exclure les bords
-        for i in range(1, len(series) - 1):
-            if series[i] > series[i-1] and series[i] > series[i+1]:
-                # Vérifier si le pic est suffisamment proéminent
-                prominence = min(series[i] - series[i-1], series[i] - series[i+1])
-                if prominence > self.cycle_analysis_config['peak_prominence']:
-                    peaks.append(i)
-        
-        return peaks
+        values, lengths = BatchCycleEngine.pack([series])
+        return np.flatnonzero(self.batch_engine.extrema_mask(values, lengths)[0]).tolist()
     
     def _find_troughs_in_series(self, series):
         """Trouver les indices des creux dans une série."""
-        troughs = []
-        
-        # Exclure les bords
-        for i in range(1, len(series) - 1):
-            if series[i] < series[i-1] and series[i] < series[i+1]:
-                # Vérifier si le creux est suffisamment proéminent
-                prominence = min(series[i-1] - series[i], series[i+1] - series[i])
-                if prominence > self.cycle_analysis_config['peak_prominence']:
-                    troughs.append(i)
-        
-        return troughs
+        values, lengths = BatchCycleEngine.pack([series])
+        return np.flatnonzero(self.batch_engine.extrema_mask(values, lengths, troughs=True)[0]).tolist()
     
     def _check_peak_periodicity(self, peaks, period, series_length):
         """Vérifier si les pics suivent une périodicité donnée."""
         if not peaks or len(peaks) < 2:
             return 0
         
-        # Compter combien de pics respectent la périodicité
-        periodicity_count = 0
-        
-        for i in range(len(peaks) - 1):
-            for j in range(i + 1, len(peaks)):
-                if abs(peaks[j] - peaks[i]) % period <= 1:  # Tolérance de 1
-                    periodicity_count += 1
-        
-        return periodicity_count
+        # Écarts de toutes les paires (i < j), tolérance de 1
+        peaks = np.asarray(peaks)
+        gaps = np.abs(peaks[None, :] - peaks[:, None])[np.triu_indices(len(peaks), k=1)]
+        return int(np.count_nonzero(gaps % period <= 1))
     
     def _load_historical_database(self, entity_type):
         """Charger la base de données des entités historiques."""
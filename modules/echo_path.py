@@ -5,10 +5,522 @@ Détecte les patterns historiques et géométriques dans les trajectoires des é
 
 import random
 import math
+import threading
+from array import array
 import numpy as np
-from datetime import datetime, timedelta
+from numpy.lib.stride_tricks import sliding_window_view
+from datetime import date, datetime, timedelta
 from collections import defaultdict
 
+class PathSequenceEngine:
+    """
+    Moteur vectorisé des parcours d'équipes : chaque historique est encodé en séquence int8
+    (1 victoire, 0 nul, -1 défaite) accompagnée de l'écart de buts et de l'adversaire, puis
+    les patterns géométriques et les traces karmiques sont calculés par fenêtres glissantes
+    sur toutes les équipes à la fois. Les caractéristiques par équipe sont mises en cache et
+    seules les équipes ayant reçu un nouveau résultat sont recalculées.
+    """
+    
+    RESONANCE_BANDS = (
+        (3, 7, "Cycle court de performance"),
+        (8, 15, "Cycle moyen de contexte"),
+        (16, 30, "Cycle long saisonnier")
+    )
+    SPIRAL_LAGS = (3, 7)
+    FIBONACCI_HORIZONS = (2, 3, 5, 8, 13, 21)
+    GOLDEN_WINDOW = 13
+    PHI = (1 + math.sqrt(5)) / 2
+    BATCH_SIZE = 1024
+    
+    def __init__(self, karmic_memory=50, echo_depth=5, resonance_threshold=0.7, rating_engine=None):
+        """
+        Initialise le moteur.
+        
+        Args:
+            karmic_memory (int): Nombre de derniers matchs conservés par équipe
+            echo_depth (int): Longueur des fenêtres d'écho
+            resonance_threshold (float): Concordance minimale d'un point d'écho
+            rating_engine (TeamRatingEngine, optional): Source des résultats (moteur partagé par défaut)
+        """
+        self.karmic_memory = karmic_memory
+        self.echo_depth = echo_depth
+        self.resonance_threshold = resonance_threshold
+        self._rating_engine = rating_engine
+        
+        self._index = {}
+        self._names = []
+        self._results = []
+        self._goal_diffs = []
+        self._opponents = []
+        self._days = []
+        self._features = {}
+        self._dirty = set()
+        self._loaded = False
+        self._lock = threading.RLock()
+        self._stats = {'teams': 0, 'results': 0, 'batches': 0, 'recomputed': 0}
+    
+    @property
+    def rating_engine(self):
+        """Moteur de classement alimentant les séquences."""
+        if self._rating_engine is None:
+            from utils.team_ratings import get_team_rating_engine
+            self._rating_engine = get_team_rating_engine()
+        return self._rating_engine
+    
+    def _team(self, name):
+        team = self._index.get(name)
+        if team is None:
+            team = len(self._names)
+            self._index[name] = team
+            self._names.append(name)
+            self._results.append(array('b'))
+            self._goal_diffs.append(array('b'))
+            self._opponents.append(array('i'))
+            self._days.append(array('i'))
+        return team
+    
+    def _append(self, team, day, opponent, goals_for, goals_against):
+        difference = max(-127, min(127, goals_for - goals_against))
+        self._results[team].append((difference > 0) - (difference < 0))
+        self._goal_diffs[team].append(difference)
+        self._opponents[team].append(opponent)
+        self._days[team].append(day)
+        if len(self._results[team]) > self.karmic_memory:
+            for column in (self._results, self._goal_diffs, self._opponents, self._days):
+                del column[team][0]
+        self._dirty.add(team)
+    
+    def load(self):
+        """Encode les derniers résultats de toutes les équipes et s'abonne aux nouveaux."""
+        if self._loaded:
+            return
+        with self._lock:
+            if self._loaded:
+                return
+            engine = self.rating_engine
+            for name, entries in engine.get_result_sequences(limit=self.karmic_memory).items():
+                team = self._team(name)
+                for day, opponent, goals_for, goals_against in entries:
+                    self._append(team, day, self._team(opponent), goals_for, goals_against)
+                    self._stats['results'] += 1
+            engine.subscribe(self._on_result)
+            self._loaded = True
+    
+    def _on_result(self, home_team, away_team, home_goals, away_goals, day):
+        """Ajoute un résultat aux deux équipes et invalide leurs caractéristiques."""
+        with self._lock:
+            if not self._loaded:
+                return
+            home, away = self._team(home_team), self._team(away_team)
+            self._append(home, day, away, home_goals, away_goals)
+            self._append(away, day, home, away_goals, home_goals)
+            self._stats['results'] += 2
+    
+    def _refresh(self):
+        """Recalcule en lots les caractéristiques des équipes invalidées."""
+        dirty = sorted(self._dirty)
+        self._dirty.clear()
+        for start in range(0, len(dirty), self.BATCH_SIZE):
+            batch = dirty[start:start + self.BATCH_SIZE]
+            sequences = [(self._results[t], self._goal_diffs[t], self._opponents[t], self._days[t])
+                         for t in batch]
+            for team, features in zip(batch, self._compute(sequences, self._names)):
+                self._features[team] = features
+            self._stats['batches'] += 1
+            self._stats['recomputed'] += len(batch)
+    
+    def canonical_name(self, team_name):
+        """
+        Nom de l'équipe tel qu'enregistré dans l'archive.
+        
+        Args:
+            team_name (str): Nom utilisé par l'application
+        
+        Returns:
+            str: Nom d'archive ou None si l'équipe est inconnue
+        """
+        self.load()
+        if team_name in self._index:
+            return team_name
+        rating = self.rating_engine.get_rating(team_name)
+        return rating['team'] if rating else None
+    
+    def get_features(self, team_name):
+        """
+        Caractéristiques de parcours d'une équipe de l'archive.
+        
+        Args:
+            team_name (str): Nom de l'équipe
+        
+        Returns:
+            dict: Caractéristiques mises en cache ou None si l'équipe est inconnue
+        """
+        name = self.canonical_name(team_name)
+        with self._lock:
+            team = self._index.get(name)
+            if team is None:
+                return None
+            if self._dirty:
+                self._refresh()
+            return self._features.get(team)
+    
+    def get_all_features(self):
+        """
+        Caractéristiques de parcours de toutes les équipes de l'archive.
+        
+        Returns:
+            dict: Nom d'équipe -> caractéristiques
+        """
+        self.load()
+        with self._lock:
+            if self._dirty:
+                self._refresh()
+            return {self._names[team]: features for team, features in self._features.items()}
+    
+    def compute_sequence(self, entries):
+        """
+        Caractéristiques d'un historique fourni hors archive.
+        
+        Args:
+            entries (list): Matchs du plus ancien au plus récent, en tuples
+                (jour ordinal ou 0, adversaire, écart de buts, résultat -1/0/1)
+        
+        Returns:
+            dict: Caractéristiques de parcours
+        """
+        entries = entries[-self.karmic_memory:]
+        names, index = [], {}
+        results, goal_diffs, opponents, days = array('b'), array('b'), array('i'), array('i')
+        for day, opponent, difference, result in entries:
+            if opponent not in index:
+                index[opponent] = len(names)
+                names.append(opponent)
+            results.append(result)
+            goal_diffs.append(max(-127, min(127, difference)))
+            opponents.append(index[opponent])
+            days.append(day)
+        return self._compute([(results, goal_diffs, opponents, days)], names)[0]
+    
+    def get_stats(self):
+        """
+        Renvoie les compteurs du moteur.
+        
+        Returns:
+            dict: teams, results, batches, recomputed
+        """
+        with self._lock:
+            stats = dict(self._stats)
+            stats['teams'] = len(self._names)
+            return stats
+    
+    # ------------------------------------------------------------------
+    # Calcul vectorisé
+    # ------------------------------------------------------------------
+    def _lag_agreement(self, results, valid, max_lag):
+        """Part des matchs répétant le résultat d'il y a `lag` matchs, pour lag = 1..max_lag."""
+        agreement = np.zeros((results.shape[0], max_lag + 1))
+        for lag in range(1, min(max_lag, results.shape[1] - 1) + 1):
+            pairs = valid[:, lag:]
+            count = pairs.sum(axis=1)
+            same = ((results[:, :-lag] == results[:, lag:]) & pairs).sum(axis=1)
+            agreement[:, lag] = np.where(count >= self.echo_depth, same / np.maximum(count, 1), 0.0)
+        return agreement
+    
+    @staticmethod
+    def _iso_day(day):
+        """Date ISO d'un jour ordinal (None pour un jour inconnu)."""
+        return date.fromordinal(int(day)).isoformat() if day > 0 else None
+    
+    @staticmethod
+    def _echo_agreement(results, lengths, size):
+        """
+        Concordance entre la dernière fenêtre de chaque équipe et ses fenêtres antérieures
+        sans chevauchement (-1 pour les fenêtres invalides).
+        """
+        if results.shape[1] < size:
+            return np.full((results.shape[0], 0), -1.0)
+        windows = sliding_window_view(results, size, axis=1)
+        last_start = np.maximum(lengths - size, 0)
+        last = windows[np.arange(results.shape[0]), np.minimum(last_start, windows.shape[1] - 1)]
+        agreement = (windows == last[:, None, :]).mean(axis=2)
+        starts = np.arange(windows.shape[1])
+        usable = (starts[None, :] + size <= last_start[:, None]) & (lengths[:, None] >= 2 * size)
+        return np.where(usable, agreement, -1.0)
+    
+    def _compute(self, sequences, names):
+        """
+        Calcule les caractéristiques d'un lot de séquences.
+        
+        Args:
+            sequences (list): (résultats, écarts de buts, adversaires, jours) par équipe
+            names (list): Noms correspondant aux indices d'adversaires
+        
+        Returns:
+            list: Caractéristiques par séquence
+        """
+        count = len(sequences)
+        lengths = np.array([len(sequence[0]) for sequence in sequences], dtype=np.int64)
+        # Largeur fixe : les caractéristiques ne dépendent pas de la composition du lot
+        width = max(int(lengths.max()) if count else 0, self.karmic_memory, 1)
+        results = np.zeros((count, width), dtype=np.int8)
+        goal_diffs = np.zeros((count, width), dtype=np.int8)
+        opponents = np.full((count, width), -1, dtype=np.int64)
+        days = np.zeros((count, width), dtype=np.int64)
+        for row, (result_seq, diff_seq, opponent_seq, day_seq) in enumerate(sequences):
+            size = lengths[row]
+            results[row, :size] = result_seq
+            goal_diffs[row, :size] = diff_seq
+            opponents[row, :size] = opponent_seq
+            days[row, :size] = day_seq
+        
+        rows = np.arange(count)
+        positions = np.arange(width)
+        valid = positions[None, :] < lengths[:, None]
+        values = results.astype(np.float64)
+        wins = results == 1
+        depth = self.echo_depth
+        
+        # Moitiés ancienne et récente de la mémoire
+        older = valid & (positions[None, :] < (lengths // 2)[:, None])
+        recent = valid & ~older
+        older_mean = (values * older).sum(axis=1) / np.maximum(older.sum(axis=1), 1)
+        recent_mean = (values * recent).sum(axis=1) / np.maximum(recent.sum(axis=1), 1)
+        margins = np.abs(goal_diffs.astype(np.float64))
+        expansion = (((margins * recent).sum(axis=1) / np.maximum(recent.sum(axis=1), 1) + 0.5) /
+                     ((margins * older).sum(axis=1) / np.maximum(older.sum(axis=1), 1) + 0.5))
+        
+        # Cycles spiralés et périodes de résonance : concordance des résultats décalés
+        agreement = self._lag_agreement(results, valid, self.RESONANCE_BANDS[-1][1])
+        spiral = agreement[:, self.SPIRAL_LAGS[0]:self.SPIRAL_LAGS[1] + 1]
+        spiral_length = spiral.argmax(axis=1) + self.SPIRAL_LAGS[0]
+        spiral_strength = spiral.max(axis=1)
+        
+        # Réflexions en miroir : fenêtre de 2 x echo_depth comparée à son image inversée
+        mirror = np.full((count, 0), -1.0)
+        if width >= 2 * depth:
+            windows = sliding_window_view(results, 2 * depth, axis=1)
+            mirror = (windows[:, :, depth - 1::-1] == windows[:, :, depth:]).mean(axis=2)
+            starts = np.arange(windows.shape[1])
+            mirror = np.where(starts[None, :] + 2 * depth <= lengths[:, None], mirror, -1.0)
+        
+        # Onde harmonique : composante dominante du spectre de la forme centrée
+        centred = np.where(valid, values - (values * valid).sum(axis=1, keepdims=True)
+                           / np.maximum(lengths, 1)[:, None], 0.0)
+        spectrum = np.fft.rfft(centred, axis=1)
+        power = np.abs(spectrum) ** 2
+        power[:, 0] = 0.0
+        wave_bin = power.argmax(axis=1)
+        wave_share = power[rows, wave_bin] / np.maximum(power.sum(axis=1), 1e-12)
+        wave_strength = np.where(lengths >= 2 * depth, np.sqrt(wave_share), 0.0)
+        
+        # Nombre d'or : rapport victoires / autres résultats sur des fenêtres de 13 matchs
+        golden = np.full((count, 0), 0.0)
+        golden_wins = np.zeros((count, 0), dtype=np.int64)
+        if width >= self.GOLDEN_WINDOW:
+            golden_wins = sliding_window_view(wins, self.GOLDEN_WINDOW, axis=1).sum(axis=2)
+            others = self.GOLDEN_WINDOW - golden_wins
+            ratio = np.divide(golden_wins, others, out=np.full(golden_wins.shape, np.inf), where=others > 0)
+            golden = np.exp(-np.abs(ratio - self.PHI))
+            starts = np.arange(golden.shape[1])
+            golden = np.where(starts[None, :] + self.GOLDEN_WINDOW <= lengths[:, None], golden, -1.0)
+        golden_strength = (np.where(golden >= 0, golden, 0.0).sum(axis=1) /
+                           np.maximum((golden >= 0).sum(axis=1), 1))
+        
+        # Chemin de Fibonacci : forme monotone sur les horizons 2, 3, 5, 8, 13, 21
+        cumulative = np.zeros((count, width + 1))
+        cumulative[:, 1:] = np.cumsum(values * valid, axis=1)
+        total = cumulative[rows, lengths]
+        horizons = np.array(self.FIBONACCI_HORIZONS)
+        horizon_ok = lengths[:, None] >= horizons[None, :]
+        starts = np.clip(lengths[:, None] - horizons[None, :], 0, None)
+        forms = (total[:, None] - np.take_along_axis(cumulative, starts, axis=1)) / horizons[None, :]
+        steps = np.sign(forms[:, :-1] - forms[:, 1:]) * horizon_ok[:, 1:]
+        step_count = horizon_ok[:, 1:].sum(axis=1)
+        fibonacci_strength = np.where(step_count >= 3, np.abs(steps.sum(axis=1)) / np.maximum(step_count, 1), 0.0)
+        
+        # Nœud de destinée : rupture de moyenne la plus marquée
+        splits = np.arange(1, width)
+        before = cumulative[:, 1:width] / splits[None, :]
+        after = (total[:, None] - cumulative[:, 1:width]) / np.maximum(lengths[:, None] - splits[None, :], 1)
+        split_ok = (splits[None, :] >= depth) & (splits[None, :] <= lengths[:, None] - depth)
+        shift = np.where(split_ok, after - before, 0.0)
+        node_column = np.abs(shift).argmax(axis=1) if width > 1 else np.zeros(count, dtype=np.int64)
+        node_shift = shift[rows, node_column] if width > 1 else np.zeros(count)
+        
+        # Revanches et éclipses : matrice des matchs contre un même adversaire
+        same = ((opponents[:, :, None] == opponents[:, None, :]) & valid[:, :, None] & valid[:, None, :])
+        rematches = same & np.triu(np.ones((width, width), dtype=bool), 1)[None, :, :]
+        losses = results == -1
+        rematched = rematches.any(axis=2) & losses
+        avenged = (rematches & wins[:, None, :]).any(axis=2) & losses
+        rematched_count = rematched.sum(axis=1)
+        avenged_count = avenged.sum(axis=1)
+        vengeance_strength = (avenged_count / np.maximum(rematched_count, 1)) * np.minimum(1.0, rematched_count / 3)
+        meetings = same.sum(axis=2)
+        dominance = np.where(meetings >= 3, (same & wins[:, None, :]).sum(axis=2) / np.maximum(meetings, 1), 0.0)
+        eclipse_column = dominance.argmax(axis=1)
+        
+        # Mémoire ancestrale et points d'écho : répétition de la séquence la plus récente
+        ancestral = self._echo_agreement(results, lengths, 2 * depth)
+        echoes = self._echo_agreement(results, lengths, depth)
+        
+        features = []
+        for row in range(count):
+            size = int(lengths[row])
+            mirror_row = mirror[row] if mirror.shape[1] else np.zeros(0)
+            reflection = np.flatnonzero(mirror_row >= 0.8)
+            best_reflections = reflection[np.argsort(-mirror_row[reflection], kind='stable')[:3]]
+            
+            golden_row = golden[row] if golden.shape[1] else np.zeros(0)
+            golden_segments = np.flatnonzero(golden_row >= 0.95)[-5:]
+            
+            avenged_positions = np.flatnonzero(avenged[row])
+            vengeance_target = (names[opponents[row, avenged_positions[-1]]]
+                                if len(avenged_positions) else None)
+            
+            eclipse_target = None
+            eclipse_duration = 0
+            if dominance[row, eclipse_column[row]] > 0:
+                opponent = opponents[row, eclipse_column[row]]
+                eclipse_target = names[opponent]
+                met = np.flatnonzero(opponents[row, :size] == opponent)
+                eclipse_duration = int(round((met[-1] - met[0]) / max(len(met) - 1, 1)))
+            
+            ancestral_row = ancestral[row] if ancestral.shape[1] else np.zeros(0)
+            memories = np.flatnonzero(ancestral_row >= 0.7)
+            memories = memories[np.argsort(-ancestral_row[memories], kind='stable')[:3]]
+            memory_patterns = [{'matches_ago': size - 2 * depth - int(start),
+                                'agreement': float(ancestral_row[start])} for start in memories]
+            
+            echo_row = echoes[row] if echoes.shape[1] else np.zeros(0)
+            echo_starts = np.flatnonzero(echo_row >= self.resonance_threshold)
+            echo_starts = echo_starts[np.argsort(-echo_row[echo_starts], kind='stable')[:3]]
+            echo_points = [{'echo_depth': size - depth - int(start),
+                            'strength': float(echo_row[start]),
+                            'description': "Répétition significative de pattern"} for start in echo_starts]
+            
+            resonance_periods = []
+            for low, high, description in self.RESONANCE_BANDS:
+                band = agreement[row, low:high + 1]
+                if band.size and band.max() >= 0.5:
+                    resonance_periods.append({
+                        'period_length': int(band.argmax()) + low,
+                        'strength': float(band.max()),
+                        'description': description
+                    })
+            resonance_periods.sort(key=lambda p: p['strength'], reverse=True)
+            
+            node_strength = float(min(1.0, abs(node_shift[row])))
+            node_position = int(splits[node_column[row]]) if width > 1 else 0
+            key_moments = []
+            if node_strength > 0:
+                key_moments.append({
+                    'date': self._iso_day(days[row, node_position]),
+                    'description': "Point d'inflexion saisonnier",
+                    'intensity': node_strength
+                })
+            if size:
+                for position, description in ((int(goal_diffs[row, :size].argmax()), "Victoire transformative"),
+                                              (int(goal_diffs[row, :size].argmin()), "Défaite catalytique")):
+                    margin = int(goal_diffs[row, position])
+                    if (margin > 0) == (description == "Victoire transformative") and margin != 0:
+                        key_moments.append({
+                            'date': self._iso_day(days[row, position]),
+                            'description': description,
+                            'intensity': min(0.95, 0.5 + abs(margin) / 8)
+                        })
+            key_moments.sort(key=lambda m: m['intensity'], reverse=True)
+            
+            if older_mean[row] * recent_mean[row] < 0:
+                debt_pattern = "inverted_dominance"
+            elif recent_mean[row] > older_mean[row]:
+                debt_pattern = "recovery"
+            else:
+                debt_pattern = "decline"
+            
+            fibonacci_segments = [int(h) for h in horizons[horizon_ok[row]]]
+            spectrum_bin = int(wave_bin[row])
+            
+            features.append({
+                'matches': size,
+                'last_match': self._iso_day(days[row, size - 1]) if size else None,
+                'cycle_spiral': {
+                    'strength': float(spiral_strength[row]),
+                    'cycle_length': int(spiral_length[row]),
+                    'expansion_factor': round(float(expansion[row]), 3)
+                },
+                'mirror_reflection': {
+                    'strength': float(max(0.0, mirror_row.max())) if mirror_row.size else 0.0,
+                    'reflection_points': sorted(int(start) + depth for start in best_reflections),
+                    'symmetry_quality': float(mirror_row[mirror_row >= 0].mean()) if (mirror_row >= 0).any() else 0.0
+                },
+                'harmonic_wave': {
+                    'strength': float(wave_strength[row]),
+                    'frequency': spectrum_bin / width,
+                    'amplitude': float(2 * np.abs(spectrum[row, spectrum_bin]) / max(size, 1)),
+                    'phase': float(np.angle(spectrum[row, spectrum_bin]) % (2 * math.pi))
+                },
+                'golden_ratio_sequence': {
+                    'strength': float(golden_strength[row]),
+                    'golden_segments': [int(start) for start in golden_segments]
+                },
+                'fibonacci_path': {
+                    'strength': float(fibonacci_strength[row]),
+                    'fibonacci_segments': fibonacci_segments
+                },
+                'vengeance_path': {
+                    'strength': float(vengeance_strength[row]),
+                    'target_team': vengeance_target,
+                    'vengeance_intensity': float(avenged_count[row] / max(losses[row].sum(), 1))
+                },
+                'debt_repayment': {
+                    'strength': float(min(1.0, abs(recent_mean[row] - older_mean[row]))),
+                    'debt_pattern': debt_pattern,
+                    'repayment_progress': float((recent_mean[row] + 1) / 2)
+                },
+                'destiny_node': {
+                    'strength': node_strength,
+                    'node_characteristics': ["transformation", "ascension" if node_shift[row] > 0 else "chute"],
+                    'transformation_potential': node_strength / 2 + 0.5 if node_strength else 0.0,
+                    'date': self._iso_day(days[row, node_position]) if node_strength else None
+                },
+                'ancestral_memory': {
+                    'strength': float(max(0.0, ancestral_row.max())) if ancestral_row.size else 0.0,
+                    'memory_patterns': memory_patterns,
+                    'echo_depth': memory_patterns[0]['matches_ago'] if memory_patterns else 0
+                },
+                'eclipse_pattern': {
+                    'strength': float(dominance[row, eclipse_column[row]]),
+                    'eclipse_target': eclipse_target,
+                    'cycle_duration': eclipse_duration
+                },
+                'resonance_periods': resonance_periods,
+                'echo_points': echo_points,
+                'debt_balance': float(np.clip(older_mean[row] - recent_mean[row], -1.0, 1.0)),
+                'key_moments': key_moments
+            })
+        return features
+
+
+_path_sequence_engine = None
+_path_sequence_engine_lock = threading.Lock()
+
+
+def get_path_sequence_engine():
+    """
+    Renvoie l'instance partagée du moteur de séquences de parcours.
+
+    Returns:
+        PathSequenceEngine: Moteur partagé
+    """
+    global _path_sequence_engine
+    if _path_sequence_engine is None:
+        with _path_sequence_engine_lock:
+            if _path_sequence_engine is None:
+                _path_sequence_engine = PathSequenceEngine()
+    return _path_sequence_engine
+
+
 class EchoPath:
     """
     EchoPath - Système d'analyse des traces karmiques et géométriques dans les parcours d'équipes.
@@ -26,6 +538,9 @@ class EchoPath:
             'symmetry_weight': 0.8       # Poids des symétries temporelles
         }
         
+        # Moteur vectorisé des séquences de résultats (partagé, caches par équipe)
+        self.path_engine = get_path_sequence_engine()
+        
         # Types de patterns géométriques surveillés
         self.geometric_patterns = [
             'cycle_spiral',           # Spirales cycliques de performance
@@ -78,12 +593,19 @@ class EchoPath:
         Returns:
             dict: Analyse du parcours karmique et géométrique
         """
-        # Si aucun historique n'est fourni, utiliser des données simulées
+        # Sans historique fourni, lire les caractéristiques en cache de l'archive
+        features = None
         if match_history is None:
-            match_history = self._generate_simulated_history(team_name)
+            features = self._archive_features(team_name)
+            # Équipe absente de l'archive : utiliser des données simulées
+            if features is None:
+                match_history = self._generate_simulated_history(team_name)
+        
+        if features is None:
+            features = self._path_features(match_history)
         
         # Vérifier si l'historique est suffisant
-        if len(match_history) < 10:
+        if features['matches'] < 10:
             return {
                 'team_name': team_name,
                 'error': "Historique insuffisant pour une analyse complète",
@@ -91,13 +613,13 @@ class EchoPath:
             }
         
         # Analyser les patterns géométriques
-        geometric_analysis = self._analyze_geometric_patterns(match_history)
+        geometric_analysis = self._analyze_geometric_patterns(features)
         
         # Analyser les traces karmiques
-        karmic_analysis = self._analyze_karmic_traces(team_name, match_history)
+        karmic_analysis = self._analyze_karmic_traces(team_name, features)
         
         # Analyser les résonances
-        resonance_analysis = self._analyze_resonances(match_history)
+        resonance_analysis = self._analyze_resonances(features)
         
         # Calculer le score de destinée
         destiny_score = self._calculate_destiny_score(geometric_analysis, karmic_analysis)
@@ -109,7 +631,7 @@ class EchoPath:
         analysis = {
             'team_name': team_name,
             'analysis_timestamp': datetime.now().isoformat(),
-            'matches_analyzed': len(match_history),
+            'matches_analyzed': features['matches'],
             'geometric_analysis': geometric_analysis,
             'karmic_analysis': karmic_analysis,
             'resonance_analysis': resonance_analysis,
@@ -142,9 +664,11 @@ class EchoPath:
         Returns:
             dict: Analyse de la géométrie des confrontations
         """
-        # Si aucun historique n'est fourni, utiliser des données simulées
+        # Sans historique fourni, utiliser les confrontations de l'archive, sinon des données simulées
         if historical_matchups is None:
-            historical_matchups = self._generate_simulated_matchups(team1_name, team2_name)
+            historical_matchups = self._archive_matchups(team1_name, team2_name)
+            if not historical_matchups:
+                historical_matchups = self._generate_simulated_matchups(team1_name, team2_name)
         
         # Vérifier si l'historique est suffisant
         if len(historical_matchups) < 5:
@@ -340,8 +864,8 @@ class EchoPath:
         
         return analysis
     
-    def _analyze_geometric_patterns(self, match_history):
-        """Analyser les patterns géométriques dans l'historique des matchs."""
+    def _analyze_geometric_patterns(self, features):
+        """Analyser les patterns géométriques à partir des caractéristiques de parcours."""
         # Base de l'analyse
         analysis = {
             'patterns_detected': [],
@@ -350,13 +874,10 @@ class EchoPath:
             'geometric_score': 0.0
         }
         
-        # Convertir l'historique en séquence numérique (résultats, buts, etc.)
-        result_sequence = [self._match_to_numerical_result(match) for match in match_history]
-        
         # Analyser chaque type de pattern géométrique
         pattern_results = []
         for pattern_type in self.geometric_patterns:
-            pattern_analysis = self._analyze_single_pattern(pattern_type, result_sequence)
+            pattern_analysis = self._analyze_single_pattern(pattern_type, features)
             if pattern_analysis.get('detected', False):
                 pattern_results.append(pattern_analysis)
         
@@ -376,8 +897,8 @@ class EchoPath:
         
         return analysis
     
-    def _analyze_karmic_traces(self, team_name, match_history):
-        """Analyser les traces karmiques dans l'historique des matchs."""
+    def _analyze_karmic_traces(self, team_name, features):
+        """Analyser les traces karmiques à partir des caractéristiques de parcours."""
         # Base de l'analyse
         analysis = {
             'traces_detected': [],
@@ -390,7 +911,7 @@ class EchoPath:
         # Analyser chaque type de trace karmique
         trace_results = []
         for trace_type, trace_params in self.karmic_traces.items():
-            trace_analysis = self._analyze_single_trace(trace_type, trace_params, team_name, match_history)
+            trace_analysis = self._analyze_single_trace(trace_type, trace_params, team_name, features)
             if trace_analysis.get('detected', False):
                 trace_results.append(trace_analysis)
         
@@ -404,15 +925,15 @@ class EchoPath:
             analysis['karmic_potential'] = max(t.get('strength', 0) for t in trace_results)
         
         # Calculer la balance de dette karmique
-        analysis['debt_balance'] = self._calculate_debt_balance(team_name, match_history)
+        analysis['debt_balance'] = self._calculate_debt_balance(team_name, features)
         
         # Identifier les moments karmiques clés
-        analysis['key_moments'] = self._identify_key_moments(team_name, match_history)
+        analysis['key_moments'] = self._identify_key_moments(team_name, features)
         
         return analysis
     
-    def _analyze_resonances(self, match_history):
-        """Analyser les résonances dans l'historique des matchs."""
+    def _analyze_resonances(self, features):
+        """Analyser les résonances à partir des caractéristiques de parcours."""
         # Base de l'analyse
         analysis = {
             'resonance_detected': False,
@@ -422,21 +943,18 @@ class EchoPath:
         }
         
         # Vérifier si l'historique est suffisant
-        if len(match_history) < 2 * self.karmic_parameters['echo_depth']:
+        if features['matches'] < 2 * self.karmic_parameters['echo_depth']:
             return analysis
         
-        # Convertir l'historique en séquence de résultats
-        result_sequence = [self._match_to_numerical_result(match) for match in match_history]
-        
         # Chercher des périodes de résonance
-        periods = self._find_resonance_periods(result_sequence)
+        periods = self._find_resonance_periods(features)
         if periods:
             analysis['resonance_detected'] = True
             analysis['resonance_periods'] = periods
             analysis['resonance_strength'] = max(p.get('strength', 0) for p in periods)
         
         # Identifier les points d'écho
-        echo_points = self._find_echo_points(result_sequence)
+        echo_points = self._find_echo_points(features)
         if echo_points:
             analysis['echo_points'] = echo_points
             if not analysis['resonance_detected']:
@@ -1594,7 +2112,7 @@ class EchoPath:
         
         return narrative
     
-    def _analyze_single_pattern(self, pattern_type, result_sequence):
+    def _analyze_single_pattern(self, pattern_type, features):
         """Analyser un pattern géométrique spécifique dans une séquence."""
         # Base de l'analyse
         analysis = {
@@ -1608,31 +2126,31 @@ class EchoPath:
         # Différentes analyses selon le type de pattern
         if pattern_type == 'cycle_spiral':
             # Recherche de cycles spiralés
-            cycle_length, cycle_strength = self._detect_spiral_cycle(result_sequence)
+            cycle_length, cycle_strength = self._detect_spiral_cycle(features)
             if cycle_strength > 0.6:
                 analysis['detected'] = True
                 analysis['strength'] = cycle_strength
                 analysis['complexity'] = 0.7
                 analysis['parameters'] = {
                     'cycle_length': cycle_length,
-                    'expansion_factor': random.uniform(1.1, 1.5)
+                    'expansion_factor': features['cycle_spiral']['expansion_factor']
                 }
         
         elif pattern_type == 'mirror_reflection':
             # Recherche de réflexions en miroir
-            reflection_points, reflection_strength = self._detect_mirror_reflection(result_sequence)
+            reflection_points, reflection_strength = self._detect_mirror_reflection(features)
             if reflection_strength > 0.6:
                 analysis['detected'] = True
                 analysis['strength'] = reflection_strength
                 analysis['complexity'] = 0.6
                 analysis['parameters'] = {
                     'reflection_points': reflection_points,
-                    'symmetry_quality': random.uniform(0.6, 0.9)
+                    'symmetry_quality': features['mirror_reflection']['symmetry_quality']
                 }
         
         elif pattern_type == 'harmonic_wave':
             # Recherche d'ondes harmoniques
-            wave_params, wave_strength = self._detect_harmonic_wave(result_sequence)
+            wave_params, wave_strength = self._detect_harmonic_wave(features)
             if wave_strength > 0.6:
                 analysis['detected'] = True
                 analysis['strength'] = wave_strength
@@ -1641,19 +2159,19 @@ class EchoPath:
         
         elif pattern_type == 'golden_ratio_sequence':
             # Recherche de séquences respectant le nombre d'or
-            golden_segments, golden_strength = self._detect_golden_ratio(result_sequence)
+            golden_segments, golden_strength = self._detect_golden_ratio(features)
             if golden_strength > 0.6:
                 analysis['detected'] = True
                 analysis['strength'] = golden_strength
                 analysis['complexity'] = 0.9
                 analysis['parameters'] = {
                     'golden_segments': golden_segments,
-                    'phi_approximation': 1.618
+                    'phi_approximation': round(PathSequenceEngine.PHI, 3)
                 }
         
         elif pattern_type == 'fibonacci_path':
             # Recherche de chemins suivant la suite de Fibonacci
-            fib_segments, fib_strength = self._detect_fibonacci_path(result_sequence)
+            fib_segments, fib_strength = self._detect_fibonacci_path(features)
             if fib_strength > 0.6:
                 analysis['detected'] = True
                 analysis['strength'] = fib_strength
@@ -1665,7 +2183,7 @@ class EchoPath:
         
         return analysis
     
-    def _analyze_single_trace(self, trace_type, trace_params, team_name, match_history):
+    def _analyze_single_trace(self, trace_type, trace_params, team_name, features):
         """Analyser une trace karmique spécifique."""
         # Base de l'analyse
         analysis = {
@@ -1679,61 +2197,120 @@ class EchoPath:
         # Différentes analyses selon le type de trace
         if trace_type == 'vengeance_path':
             # Recherche de parcours de revanche
-            target_team, revenge_strength = self._detect_vengeance_path(team_name, match_history)
+            target_team, revenge_strength = self._detect_vengeance_path(team_name, features)
             if revenge_strength > trace_params.get('detection_threshold', 0.7):
                 analysis['detected'] = True
                 analysis['strength'] = revenge_strength
                 analysis['parameters'] = {
                     'target_team': target_team,
-                    'vengeance_intensity': random.uniform(0.7, 0.95)
+                    'vengeance_intensity': features['vengeance_path']['vengeance_intensity']
                 }
         
         elif trace_type == 'debt_repayment':
             # Recherche de remboursement de dette karmique
-            debt_pattern, debt_strength = self._detect_debt_repayment(team_name, match_history)
+            debt_pattern, debt_strength = self._detect_debt_repayment(team_name, features)
             if debt_strength > trace_params.get('detection_threshold', 0.75):
                 analysis['detected'] = True
                 analysis['strength'] = debt_strength
                 analysis['parameters'] = {
                     'debt_pattern': debt_pattern,
-                    'repayment_progress': random.uniform(0.3, 0.8)
+                    'repayment_progress': features['debt_repayment']['repayment_progress']
                 }
         
         elif trace_type == 'destiny_node':
             # Recherche de nœuds de destinée
-            node_characteristics, node_strength = self._detect_destiny_node(team_name, match_history)
+            node_characteristics, node_strength = self._detect_destiny_node(team_name, features)
             if node_strength > trace_params.get('detection_threshold', 0.8):
                 analysis['detected'] = True
                 analysis['strength'] = node_strength
                 analysis['parameters'] = {
                     'node_characteristics': node_characteristics,
-                    'transformation_potential': random.uniform(0.7, 1.0)
+                    'transformation_potential': features['destiny_node']['transformation_potential']
                 }
         
         elif trace_type == 'ancestral_memory':
             # Recherche de mémoire ancestrale
-            memory_patterns, memory_strength = self._detect_ancestral_memory(team_name, match_history)
+            memory_patterns, memory_strength = self._detect_ancestral_memory(team_name, features)
             if memory_strength > trace_params.get('detection_threshold', 0.7):
                 analysis['detected'] = True
                 analysis['strength'] = memory_strength
                 analysis['parameters'] = {
                     'memory_patterns': memory_patterns,
-                    'echo_depth': random.randint(10, 50)
+                    'echo_depth': features['ancestral_memory']['echo_depth']
                 }
         
         elif trace_type == 'eclipse_pattern':
             # Recherche de patterns d'éclipse
-            eclipse_target, eclipse_strength = self._detect_eclipse_pattern(team_name, match_history)
+            eclipse_target, eclipse_strength = self._detect_eclipse_pattern(team_name, features)
             if eclipse_strength > trace_params.get('detection_threshold', 0.65):
                 analysis['detected'] = True
                 analysis['strength'] = eclipse_strength
                 analysis['parameters'] = {
                     'eclipse_target': eclipse_target,
-                    'cycle_duration': random.randint(3, 10)
+                    'cycle_duration': features['eclipse_pattern']['cycle_duration']
                 }
         
         return analysis
     
+    def _archive_features(self, team_name):
+        """Caractéristiques en cache d'une équipe de l'archive (None si indisponible)."""
+        try:
+            return self.path_engine.get_features(team_name)
+        except Exception:
+            return None
+    
+    def _path_features(self, match_history):
+        """Encoder un historique fourni et calculer ses caractéristiques de parcours."""
+        # Trier chronologiquement si toutes les dates sont connues
+        if all(match.get('date') for match in match_history):
+            match_history = sorted(match_history, key=lambda m: str(m['date']))
+        
+        entries = []
+        for match in match_history:
+            result = self._match_to_numerical_result(match)
+            score = match.get('score')
+            if isinstance(score, (list, tuple)) and len(score) == 2:
+                difference = int(score[0]) - int(score[1])
+            else:
+                difference = int(np.sign(result))
+            try:
+                day = datetime.fromisoformat(str(match.get('date'))[:10]).toordinal()
+            except ValueError:
+                day = 0
+            entries.append((day, match.get('opponent'), difference, int(np.sign(result))))
+        
+        return self.path_engine.compute_sequence(entries)
+    
+    def _archive_matchups(self, team1_name, team2_name):
+        """Confrontations directes de l'archive, du point de vue de la première équipe."""
+        try:
+            team1 = self.path_engine.canonical_name(team1_name)
+            meetings = self.path_engine.rating_engine.get_head_to_head(team1_name, team2_name)
+        except Exception:
+            return []
+        
+        matchups = []
+        for meeting in meetings:
+            team1_home = meeting['home_team'] == team1
+            team1_goals = meeting['home_goals'] if team1_home else meeting['away_goals']
+            team2_goals = meeting['away_goals'] if team1_home else meeting['home_goals']
+            if team1_goals > team2_goals:
+                result = 'team1_win'
+            elif team2_goals > team1_goals:
+                result = 'team2_win'
+            else:
+                result = 'draw'
+            matchups.append({
+                'date': meeting['date'],
+                'result': result,
+                'score': [team1_goals, team2_goals],
+                'home_team': team1_name if team1_home else team2_name,
+                'context': 'regular',
+                'special_events': []
+            })
+        
+        return matchups
+    
     def _match_to_numerical_result(self, match):
         """Convertir un match en résultat numérique."""
         # Cette fonction extrait une valeur numérique d'un match
@@ -1807,39 +2384,18 @@ class EchoPath:
         
         return interactions
     
-    def _calculate_debt_balance(self, team_name, match_history):
+    def _calculate_debt_balance(self, team_name, features):
         """Calculer la balance de dette karmique."""
-        # Cette fonction simule le calcul de dette karmique
-        # Dans une implémentation réelle, elle analyserait des facteurs complexes
+        # Écart entre la forme ancienne et la forme récente de la mémoire karmique :
+        # une équipe en déclin accumule une créance, une équipe en essor rembourse sa dette
         
         # Retourner une valeur entre -1.0 (forte dette) et +1.0 (forte créance)
-        return random.uniform(-0.8, 0.8)
+        return features['debt_balance']
     
-    def _identify_key_moments(self, team_name, match_history):
+    def _identify_key_moments(self, team_name, features):
         """Identifier les moments karmiques clés dans l'historique."""
-        # Cette fonction simule l'identification de moments clés
-        # Dans une implémentation réelle, elle analyserait des points d'inflexion historiques
-        
-        moments = []
-        
-        # Simuler 1 à 3 moments clés
-        for _ in range(random.randint(1, 3)):
-            moments.append({
-                'date': (datetime.now() - timedelta(days=random.randint(30, 1000))).isoformat(),
-                'description': random.choice([
-                    "Victoire transformative",
-                    "Défaite catalytique",
-                    "Match révélateur",
-                    "Confrontation décisive",
-                    "Point d'inflexion saisonnier"
-                ]),
-                'intensity': random.uniform(0.7, 0.95)
-            })
-        
-        # Trier par intensité
-        moments.sort(key=lambda m: m.get('intensity', 0), reverse=True)
-        
-        return moments
+        # Point d'inflexion de la forme et écarts de buts extrêmes, triés par intensité
+        return list(features['key_moments'])
     
     def _determine_destiny_level(self, destiny_score):
         """Déterminer le niveau de destin basé sur le score."""
@@ -1882,64 +2438,45 @@ class EchoPath:
             'strength': strongest.get('strength', 0)
         } if strongest else None
     
-    def _detect_spiral_cycle(self, result_sequence):
+    def _detect_spiral_cycle(self, features):
         """Détecter un cycle spiral dans une séquence de résultats."""
-        # Cette fonction simule la détection de cycles spiralés
-        # Dans une implémentation réelle, elle utiliserait des algorithmes sophistiqués
+        # Décalage (3 à 7 matchs) répétant le plus souvent le même résultat
+        spiral = features['cycle_spiral']
         
-        # Simuler un cycle de longueur aléatoire
-        cycle_length = random.randint(3, 7)
-        cycle_strength = random.uniform(0.5, 0.9)
-        
-        return cycle_length, cycle_strength
+        return spiral['cycle_length'], spiral['strength']
     
-    def _detect_mirror_reflection(self, result_sequence):
+    def _detect_mirror_reflection(self, features):
         """Détecter des réflexions en miroir dans une séquence de résultats."""
-        # Cette fonction simule la détection de réflexions
-        # Dans une implémentation réelle, elle rechercherait des symétries
-        
-        # Simuler des points de réflexion
-        reflection_points = [random.randint(5, len(result_sequence) - 5)]
-        reflection_strength = random.uniform(0.5, 0.9)
+        # Fenêtres dont la moitié récente reproduit la moitié ancienne inversée
+        mirror = features['mirror_reflection']
         
-        return reflection_points, reflection_strength
+        return mirror['reflection_points'], mirror['strength']
     
-    def _detect_harmonic_wave(self, result_sequence):
+    def _detect_harmonic_wave(self, features):
         """Détecter une onde harmonique dans une séquence de résultats."""
-        # Cette fonction simule la détection d'ondes harmoniques
-        # Dans une implémentation réelle, elle analyserait des patterns sinusoïdaux
-        
-        # Simuler des paramètres d'onde
+        # Composante dominante du spectre de la forme centrée
+        wave = features['harmonic_wave']
         wave_params = {
-            'frequency': random.uniform(0.1, 0.3),
-            'amplitude': random.uniform(0.5, 1.5),
-            'phase': random.uniform(0, 2 * math.pi)
+            'frequency': wave['frequency'],
+            'amplitude': wave['amplitude'],
+            'phase': wave['phase']
         }
-        wave_strength = random.uniform(0.5, 0.9)
         
-        return wave_params, wave_strength
+        return wave_params, wave['strength']
     
-    def _detect_golden_ratio(self, result_sequence):
+    def _detect_golden_ratio(self, features):
         """Détecter des segments respectant le nombre d'or."""
-        # Cette fonction simule la détection de segments dorés
-        # Dans une implémentation réelle, elle rechercherait des ratios phi
-        
-        # Simuler des segments
-        golden_segments = [random.randint(5, len(result_sequence) - 10)]
-        golden_strength = random.uniform(0.5, 0.9)
+        # Fenêtres de 13 matchs dont le rapport victoires / autres résultats approche phi
+        golden = features['golden_ratio_sequence']
         
-        return golden_segments, golden_strength
+        return golden['golden_segments'], golden['strength']
     
-    def _detect_fibonacci_path(self, result_sequence):
+    def _detect_fibonacci_path(self, features):
         """Détecter un chemin suivant la suite de Fibonacci."""
-        # Cette fonction simule la détection de patterns Fibonacci
-        # Dans une implémentation réelle, elle comparerait avec la séquence
+        # Forme monotone sur les horizons de Fibonacci (2, 3, 5, 8, 13, 21 matchs)
+        fibonacci = features['fibonacci_path']
         
-        # Simuler des segments
-        fib_segments = [3, 5, 8]  # Quelques nombres de Fibonacci
-        fib_strength = random.uniform(0.5, 0.9)
-        
-        return fib_segments, fib_strength
+        return fibonacci['fibonacci_segments'], fibonacci['strength']
     
     def _calculate_pattern_synergy(self, pattern1, pattern2):
         """Calculer la synergie entre deux patterns."""
@@ -1957,114 +2494,50 @@ class EchoPath:
         # Simuler un conflit
         return random.uniform(0.3, 0.8)
     
-    def _detect_vengeance_path(self, team_name, match_history):
+    def _detect_vengeance_path(self, team_name, features):
         """Détecter un parcours de revanche."""
-        # Cette fonction simule la détection de vengeance
-        # Dans une implémentation réelle, elle analyserait les défaites suivies de victoires
-        
-        # Simuler une cible et une force
-        target_team = f"Équipe {random.randint(1, 20)}"
-        revenge_strength = random.uniform(0.6, 0.9)
+        # Défaites suivies d'une victoire contre le même adversaire
+        vengeance = features['vengeance_path']
         
-        return target_team, revenge_strength
+        return vengeance['target_team'], vengeance['strength']
     
-    def _detect_debt_repayment(self, team_name, match_history):
+    def _detect_debt_repayment(self, team_name, features):
         """Détecter un remboursement de dette karmique."""
-        # Cette fonction simule la détection de remboursement
-        # Dans une implémentation réelle, elle analyserait les inversions de tendance
+        # Inversion de tendance entre la moitié ancienne et la moitié récente
+        debt = features['debt_repayment']
         
-        # Simuler un pattern et une force
-        debt_pattern = "inverted_dominance"
-        debt_strength = random.uniform(0.6, 0.9)
-        
-        return debt_pattern, debt_strength
+        return debt['debt_pattern'], debt['strength']
     
-    def _detect_destiny_node(self, team_name, match_history):
+    def _detect_destiny_node(self, team_name, features):
         """Détecter un nœud de destinée."""
-        # Cette fonction simule la détection de nœuds
-        # Dans une implémentation réelle, elle analyserait les points d'inflexion
-        
-        # Simuler des caractéristiques et une force
-        node_characteristics = ["transformation", "convergence"]
-        node_strength = random.uniform(0.7, 0.95)
+        # Point de rupture de la forme moyenne le plus marqué
+        node = features['destiny_node']
         
-        return node_characteristics, node_strength
+        return node['node_characteristics'], node['strength']
     
-    def _detect_ancestral_memory(self, team_name, match_history):
+    def _detect_ancestral_memory(self, team_name, features):
         """Détecter des patterns de mémoire ancestrale."""
-        # Cette fonction simule la détection de mémoire
-        # Dans une implémentation réelle, elle comparerait avec l'historique lointain
+        # Séquence récente déjà jouée plus tôt dans la mémoire karmique
+        memory = features['ancestral_memory']
         
-        # Simuler des patterns et une force
-        memory_patterns = ["seasonal_echo", "coach_lineage"]
-        memory_strength = random.uniform(0.6, 0.9)
-        
-        return memory_patterns, memory_strength
+        return memory['memory_patterns'], memory['strength']
     
-    def _detect_eclipse_pattern(self, team_name, match_history):
+    def _detect_eclipse_pattern(self, team_name, features):
         """Détecter un pattern d'éclipse."""
-        # Cette fonction simule la détection d'éclipse
-        # Dans une implémentation réelle, elle analyserait les cycles de domination
-        
-        # Simuler une cible et une force
-        eclipse_target = f"Équipe {random.randint(1, 20)}"
-        eclipse_strength = random.uniform(0.5, 0.85)
+        # Adversaire rencontré au moins trois fois et le plus souvent battu
+        eclipse = features['eclipse_pattern']
         
-        return eclipse_target, eclipse_strength
+        return eclipse['eclipse_target'], eclipse['strength']
     
-    def _find_resonance_periods(self, result_sequence):
+    def _find_resonance_periods(self, features):
         """Trouver des périodes de résonance dans une séquence."""
-        # Cette fonction simule la recherche de périodes
-        # Dans une implémentation réelle, elle utiliserait l'analyse spectrale
-        
-        # Simuler quelques périodes
-        periods = []
-        
-        if random.random() > 0.3:
-            periods.append({
-                'period_length': random.randint(3, 7),
-                'strength': random.uniform(0.6, 0.9),
-                'description': "Cycle court de performance"
-            })
-        
-        if random.random() > 0.5:
-            periods.append({
-                'period_length': random.randint(8, 15),
-                'strength': random.uniform(0.5, 0.8),
-                'description': "Cycle moyen de contexte"
-            })
-        
-        if random.random() > 0.7:
-            periods.append({
-                'period_length': random.randint(16, 30),
-                'strength': random.uniform(0.7, 0.95),
-                'description': "Cycle long saisonnier"
-            })
-        
-        # Trier par force
-        periods.sort(key=lambda p: p.get('strength', 0), reverse=True)
-        
-        return periods
+        # Meilleur décalage par bande (court, moyen, long), trié par force
+        return list(features['resonance_periods'])
     
-    def _find_echo_points(self, result_sequence):
+    def _find_echo_points(self, features):
         """Trouver des points d'écho dans une séquence."""
-        # Cette fonction simule la recherche de points d'écho
-        # Dans une implémentation réelle, elle rechercherait des répétitions
-        
-        # Simuler quelques points d'écho
-        echo_points = []
-        
-        for _ in range(random.randint(0, 3)):
-            echo_points.append({
-                'echo_depth': random.randint(5, 20),
-                'strength': random.uniform(0.6, 0.9),
-                'description': "Répétition significative de pattern"
-            })
-        
-        # Trier par force
-        echo_points.sort(key=lambda e: e.get('strength', 0), reverse=True)
-        
-        return echo_points
+        # Fenêtres antérieures répétant la séquence la plus récente, triées par force
+        return list(features['echo_points'])
     
     def _detect_cycle_pattern(self, result_sequence, cycle_length):
         """Détecter un pattern cyclique d'une longueur donnée."""
@@ -17,8 +17,16 @@ class EnhancedComponents:
     Centralise la détection, l'initialisation et l'accès aux composants enrichis.
     """
     
-    def __init__(self):
-        """Initialise et détecte les composants améliorés disponibles"""
+    def __init__(self, meta_systems=None):
+        """
+        Initialise et détecte les composants améliorés disponibles
+        
+        Args:
+            meta_systems: Instance de MetaSystems transmise aux composants qui émettent
+                des événements (optionnel)
+        """
+        self.meta_systems = meta_systems
+        
         # Dictionnaire des composants disponibles
         self.available_components = {}
         
@@ -67,6 +75,7 @@ class EnhancedComponents:
                 'name': 'shadow_odds_plus',
                 'module': 'modules.shadow_odds_plus_enhanced',
                 'class': 'ShadowOddsPlusEnhanced',
+                'accepts_meta_systems': True,
                 'fallback_module': 'modules.shadow_odds_plus',
                 'fallback_class': 'ShadowOddsPlus'
             },
@@ -105,7 +114,10 @@ class EnhancedComponents:
             if class_name:
                 component_class = getattr(module, class_name)
                 # Instancier la classe
-                component_instance = component_class()
+                if component_info.get('accepts_meta_systems'):
+                    component_instance = component_class(meta_systems=self.meta_systems)
+                else:
+                    component_instance = component_class()
                 # Stocker l'instance
                 self.available_components[name] = {
                     'type': 'class',
@@ -240,6 +252,19 @@ class EnhancedComponents:
         """
         return self.get_component('fan_sentiment_monitor')
     
+    def set_meta_systems(self, meta_systems):
+        """
+        Associe MetaSystems aux composants améliorés qui émettent des événements.
+        
+        Args:
+            meta_systems: Instance de MetaSystems
+        """
+        self.meta_systems = meta_systems
+        for component in self.available_components.values():
+            instance = component.get('instance')
+            if component['enhanced'] and hasattr(instance, 'set_meta_systems'):
+                instance.set_meta_systems(meta_systems)
+    
     def get_daily_combo_tab(self):
         """
         Récupère la fonction d'affichage de l'onglet Daily Combo.
@@ -287,16 +312,21 @@ class EnhancedComponents:
 # Instance globale des composants améliorés
 _enhanced_components = None
 
-def get_enhanced_components():
+def get_enhanced_components(meta_systems=None):
     """
     Récupère l'instance globale des composants améliorés.
     
+    Args:
+        meta_systems: Instance de MetaSystems à associer aux composants (optionnel)
+    
     Returns:
         EnhancedComponents: Instance des composants améliorés
     """
     global _enhanced_components
     
     if _enhanced_components is None:
-        _enhanced_components = EnhancedComponents()
+        _enhanced_components = EnhancedComponents(meta_systems)
+    elif meta_systems is not None and _enhanced_components.meta_systems is not meta_systems:
+        _enhanced_components.set_meta_systems(meta_systems)
     
     return _enhanced_components
\ No newline at end of file
@@ -0,0 +1,518 @@
+"""
+EventBus - Publish/subscribe bus for inter-module communication in ArcanShadow.
+
+Handlers are called synchronously, in the publisher's thread, unless they subscribe
+with asynchronous=True. Asynchronous handlers must be thread-safe: each one gets a
+bounded queue, and every queue of a bus is drained by a single shared dispatcher
+thread (started on first use, stopped by close()), so a slow handler never blocks
+the module that raised the event. When a queue is full, its overflow policy decides
+what happens: drop the oldest pending event, drop the new one, or block the publisher
+for a bounded time (backpressure). Event types declared as coalescing (such as
+'odds_change_detected') replace an event still waiting in the queue for the same key
+instead of piling up behind it. Handler latency and queue wait are tracked per
+subscription.
+"""
+
+import logging
+import threading
+import time
+from collections import deque
+from datetime import datetime
+
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+# Overflow policies
+DROP_OLDEST = 'drop_oldest'
+DROP_NEWEST = 'drop_newest'
+BLOCK = 'block'
+OVERFLOW_POLICIES = (DROP_OLDEST, DROP_NEWEST, BLOCK)
+
+DEFAULT_QUEUE_SIZE = 256
+DEFAULT_BLOCK_TIMEOUT = 1.0
+LATENCY_WINDOW = 512
+
+# Events that supersede a pending event with the same key (latest value wins)
+DEFAULT_COALESCE_KEYS = {
+    'odds_change_detected': lambda data: (data.get('match_id'), data.get('market'), data.get('behavior_type')),
+}
+
+
+class _Dispatcher:
+    """
+    Single thread delivering the queued events of every asynchronous subscription of a bus.
+    """
+
+    def __init__(self, name):
+        self.name = name
+        self._ready = deque()
+        self._condition = threading.Condition()
+        self._thread = None
+        self._stopped = False
+
+    def schedule(self, subscription):
+        """Queue a subscription that has pending events; start the thread on first use."""
+        with self._condition:
+            if self._stopped:
+                return False
+            self._ready.append(subscription)
+            if self._thread is None:
+                self._thread = threading.Thread(target=self._run, name=self.name, daemon=True)
+                self._thread.start()
+            self._condition.notify()
+            return True
+
+    def in_dispatcher_thread(self):
+        """True when called from a handler running on the dispatcher."""
+        return self._thread is not None and threading.current_thread() is self._thread
+
+    def _run(self):
+        """Deliver one event per ready subscription in turn (round-robin)."""
+        while True:
+            with self._condition:
+                while not self._ready and not self._stopped:
+                    self._condition.wait()
+                if not self._ready:
+                    return
+                subscription = self._ready.popleft()
+            if subscription.deliver_one():
+                with self._condition:
+                    self._ready.append(subscription)
+
+    def stop(self, timeout=None):
+        """
+        Stop the thread once the pending events are delivered.
+
+        Args:
+            timeout (float, optional): Maximum wait for the thread to exit
+
+        Returns:
+            bool: True if the thread is stopped
+        """
+        with self._condition:
+            self._stopped = True
+            self._condition.notify_all()
+            thread = self._thread
+        if thread is None or thread is threading.current_thread():
+            return thread is None
+        thread.join(timeout)
+        return not thread.is_alive()
+
+    @property
+    def running(self):
+        return self._thread is not None and self._thread.is_alive()
+
+
+class Subscription:
+    """
+    A handler registered for one event type, with its queue (asynchronous mode) and metrics.
+    """
+
+    def __init__(self, bus, event_type, handler, module_name, max_queue_size, overflow_policy,
+                 asynchronous=False):
+        self.bus = bus
+        self.event_type = event_type
+        self.handler = handler
+        self.module = module_name
+        self.max_queue_size = max(1, int(max_queue_size))
+        self.overflow_policy = overflow_policy
+        self.asynchronous = asynchronous
+
+        self._queue = deque()
+        self._pending_by_key = {}
+        self._condition = threading.Condition()
+        self._active = True
+        self._busy = False
+        self._scheduled = False
+
+        self.delivered = 0
+        self.dropped = 0
+        self.coalesced = 0
+        self.errors = 0
+        self.latencies = deque(maxlen=LATENCY_WINDOW)
+        self.waits = deque(maxlen=LATENCY_WINDOW)
+
+    def _call(self, event, enqueued_at):
+        """Run the handler on one event and record its metrics."""
+        started = time.perf_counter()
+        try:
+            self.handler(event['data'])
+            failed = False
+        except Exception as e:
+            failed = True
+            logger.error(f"Error in event handler from {self.module} ({self.event_type}): {e}")
+        finished = time.perf_counter()
+
+        with self._condition:
+            self.delivered += 1
+            self.errors += int(failed)
+            self.latencies.append(finished - started)
+            self.waits.append(started - (enqueued_at if enqueued_at is not None else started))
+            self._condition.notify_all()
+        return not failed
+
+    def deliver(self, event):
+        """
+        Call the handler in the current thread (synchronous subscriptions).
+
+        Args:
+            event (dict): Event record ('type', 'timestamp', 'data')
+
+        Returns:
+            bool: True if the handler ran without error
+        """
+        if not self._active:
+            return False
+        return self._call(event, None)
+
+    def offer(self, event, coalesce_key=None, block_timeout=DEFAULT_BLOCK_TIMEOUT):
+        """
+        Enqueue an event for the bus dispatcher (asynchronous subscriptions).
+
+        Args:
+            event (dict): Event record ('type', 'timestamp', 'data')
+            coalesce_key (hashable, optional): Key used to merge with a pending event
+            block_timeout (float): Maximum wait when the policy is BLOCK
+
+        Returns:
+            bool: True if the event was queued or merged into a pending one
+        """
+        with self._condition:
+            if not self._active:
+                return False
+
+            if coalesce_key is not None:
+                pending = self._pending_by_key.get(coalesce_key)
+                if pending is not None:
+                    pending[0] = event
+                    self.coalesced += 1
+                    return True
+
+            if len(self._queue) >= self.max_queue_size:
+                # A handler publishing from the dispatcher thread cannot wait for it
+                if self.overflow_policy == DROP_NEWEST or (
+                        self.overflow_policy == BLOCK and self.bus._dispatcher.in_dispatcher_thread()):
+                    self.dropped += 1
+                    return False
+                if self.overflow_policy == BLOCK:
+                    deadline = time.monotonic() + block_timeout
+                    while len(self._queue) >= self.max_queue_size and self._active:
+                        remaining = deadline - time.monotonic()
+                        if remaining <= 0:
+                            self.dropped += 1
+                            return False
+                        self._condition.wait(remaining)
+                else:
+                    _, _, old_key = self._queue.popleft()
+                    if old_key is not None:
+                        self._pending_by_key.pop(old_key, None)
+                    self.dropped += 1
+
+            entry = [event, time.perf_counter(), coalesce_key]
+            self._queue.append(entry)
+            if coalesce_key is not None:
+                self._pending_by_key[coalesce_key] = entry
+            schedule = not self._scheduled
+            self._scheduled = True
+            self._condition.notify_all()
+
+        if schedule and not self.bus._dispatcher.schedule(self):
+            with self._condition:
+                self._scheduled = False
+            return False
+        return True
+
+    def deliver_one(self):
+        """
+        Deliver the oldest queued event (called by the dispatcher).
+
+        Returns:
+            bool: True if more events are waiting
+        """
+        with self._condition:
+            if not self._queue:
+                self._scheduled = False
+                self._condition.notify_all()
+                return False
+            event, enqueued_at, coalesce_key = self._queue.popleft()
+            if coalesce_key is not None:
+                self._pending_by_key.pop(coalesce_key, None)
+            self._busy = True
+            self._condition.notify_all()
+
+        try:
+            self._call(event, enqueued_at)
+        finally:
+            with self._condition:
+                self._busy = False
+                more = bool(self._queue)
+                if not more:
+                    self._scheduled = False
+                self._condition.notify_all()
+        return more
+
+    def pending(self):
+        """Number of events waiting or being processed."""
+        with self._condition:
+            return len(self._queue) + int(self._busy)
+
+    def join(self, timeout=None):
+        """
+        Wait until the queue is drained.
+
+        Args:
+            timeout (float, optional): Maximum wait in seconds
+
+        Returns:
+            bool: True if the queue was drained
+        """
+        deadline = None if timeout is None else time.monotonic() + timeout
+        with self._condition:
+            while self._queue or self._busy:
+                remaining = None if deadline is None else deadline - time.monotonic()
+                if remaining is not None and remaining <= 0:
+                    return False
+                self._condition.wait(remaining)
+        return True
+
+    def close(self):
+        """Stop accepting events; events already queued are still delivered."""
+        with self._condition:
+            self._active = False
+            self._condition.notify_all()
+
+    def unsubscribe(self):
+        """Remove this subscription from its bus and close it."""
+        self.bus._remove(self)
+        self.close()
+
+    def get_metrics(self):
+        """
+        Get delivery and latency metrics for this subscription.
+
+        Returns:
+            dict: Counters and latency percentiles in milliseconds
+        """
+        with self._condition:
+            latencies = np.array(self.latencies) * 1000.0
+            waits = np.array(self.waits) * 1000.0
+            metrics = {
+                'module': self.module,
+                'event_type': self.event_type,
+                'asynchronous': self.asynchronous,
+                'overflow_policy': self.overflow_policy,
+                'queued': len(self._queue),
+                'delivered': self.delivered,
+                'dropped': self.dropped,
+                'coalesced': self.coalesced,
+                'errors': self.errors
+            }
+        if len(latencies):
+            p50, p95 = np.percentile(latencies, [50, 95])
+            metrics['latency_ms'] = {'p50': round(float(p50), 3), 'p95': round(float(p95), 3),
+                                     'max': round(float(latencies.max()), 3)}
+            metrics['queue_wait_ms'] = {'p50': round(float(np.percentile(waits, 50)), 3),
+                                        'p95': round(float(np.percentile(waits, 95)), 3)}
+        return metrics
+
+
+class EventBus:
+    """
+    Event bus with synchronous delivery by default and opt-in queued delivery on a shared dispatcher.
+    """
+
+    def __init__(self, max_history=100, default_queue_size=DEFAULT_QUEUE_SIZE,
+                 default_overflow_policy=DROP_OLDEST, coalesce_keys=None, asynchronous=False):
+        """
+        Initialize the event bus.
+
+        Args:
+            max_history (int): Number of events kept in the history
+            default_queue_size (int): Queue capacity of each asynchronous subscription
+            default_overflow_policy (str): Policy when a queue is full (see OVERFLOW_POLICIES)
+            coalesce_keys (dict, optional): {event_type: function(data) -> key} for coalescing events
+            asynchronous (bool): Default delivery mode of new subscriptions
+        """
+        if default_overflow_policy not in OVERFLOW_POLICIES:
+            raise ValueError(f"Unknown overflow policy: {default_overflow_policy}")
+        self.history = deque(maxlen=max_history)
+        self.default_queue_size = default_queue_size
+        self.default_overflow_policy = default_overflow_policy
+        self.coalesce_keys = dict(DEFAULT_COALESCE_KEYS if coalesce_keys is None else coalesce_keys)
+        self.asynchronous = asynchronous
+
+        self._subscriptions = {}
+        self._lock = threading.Lock()
+        self._dispatcher = _Dispatcher(f"event-bus-{id(self):x}")
+        self._closed = False
+        self.published = 0
+
+    def subscribe(self, event_type, handler, module_name, max_queue_size=None, overflow_policy=None,
+                  asynchronous=None):
+        """
+        Register a handler for an event type.
+
+        Args:
+            event_type (str): Type of event to listen for
+            handler (callable): Function called with the event data
+            module_name (str): Name of the subscribing module
+            max_queue_size (int, optional): Queue capacity (bus default if None)
+            overflow_policy (str, optional): Overflow policy (bus default if None)
+            asynchronous (bool, optional): Queue events for the dispatcher thread instead of
+                calling the handler in the publisher's thread (bus default if None); the
+                handler must then be thread-safe
+
+        Returns:
+            Subscription: The new subscription
+        """
+        if self._closed:
+            raise RuntimeError("EventBus is closed")
+        overflow_policy = overflow_policy or self.default_overflow_policy
+        if overflow_policy not in OVERFLOW_POLICIES:
+            raise ValueError(f"Unknown overflow policy: {overflow_policy}")
+        subscription = Subscription(self, event_type, handler, module_name,
+                                    max_queue_size or self.default_queue_size, overflow_policy,
+                                    self.asynchronous if asynchronous is None else asynchronous)
+        with self._lock:
+            # Copy-on-write so publishers can iterate without holding the lock
+            self._subscriptions[event_type] = self._subscriptions.get(event_type, ()) + (subscription,)
+        return subscription
+
+    def unsubscribe(self, event_type, module_name):
+        """
+        Remove all handlers of a module for an event type.
+
+        Args:
+            event_type (str): Type of event
+            module_name (str): Name of the module that registered the handlers
+        """
+        with self._lock:
+            subscriptions = self._subscriptions.get(event_type, ())
+            removed = [s for s in subscriptions if s.module == module_name]
+            self._subscriptions[event_type] = tuple(s for s in subscriptions if s.module != module_name)
+        for subscription in removed:
+            subscription.close()
+
+    def _remove(self, subscription):
+        """Remove one subscription (see Subscription.unsubscribe)."""
+        with self._lock:
+            subscriptions = self._subscriptions.get(subscription.event_type, ())
+            self._subscriptions[subscription.event_type] = tuple(s for s in subscriptions if s is not subscription)
+
+    def subscribers(self, event_type=None):
+        """
+        List the current subscriptions.
+
+        Args:
+            event_type (str, optional): Restrict to one event type
+
+        Returns:
+            list: Subscriptions
+        """
+        with self._lock:
+            if event_type is not None:
+                return list(self._subscriptions.get(event_type, ()))
+            return [s for subscriptions in self._subscriptions.values() for s in subscriptions]
+
+    def publish(self, event_type, event_data):
+        """
+        Publish an event to every subscriber of its type.
+
+        Args:
+            event_type (str): Type of event being published
+            event_data (dict): Data related to the event
+
+        Returns:
+            int: Number of subscribers that handled the event (synchronous) or queued it (asynchronous)
+        """
+        event = {'type': event_type, 'timestamp': datetime.now(), 'data': event_data}
+        self.history.append(event)
+        self.published += 1
+
+        subscriptions = self._subscriptions.get(event_type, ())
+        if not subscriptions:
+            return 0
+
+        coalesce_key = None
+        key_function = self.coalesce_keys.get(event_type)
+        if key_function is not None and isinstance(event_data, dict) and any(s.asynchronous for s in subscriptions):
+            try:
+                coalesce_key = key_function(event_data)
+            except Exception:
+                coalesce_key = None
+
+        handled = 0
+        for subscription in subscriptions:
+            if subscription.asynchronous:
+                handled += int(subscription.offer(event, coalesce_key))
+            else:
+                handled += int(subscription.deliver(event))
+        return handled
+
+    def recent_events(self, event_type=None, limit=10):
+        """
+        Get recent events from the history.
+
+        Args:
+            event_type (str, optional): Filter by event type
+            limit (int): Maximum number of events to return
+
+        Returns:
+            list: Recent events, oldest first
+        """
+        events = list(self.history)
+        if event_type:
+            events = [e for e in events if e['type'] == event_type]
+        return events[-limit:] if limit > 0 else []
+
+    def flush(self, timeout=None):
+        """
+        Wait until every asynchronous subscription queue is drained.
+
+        Args:
+            timeout (float, optional): Maximum total wait in seconds
+
+        Returns:
+            bool: True if all queues were drained
+        """
+        deadline = None if timeout is None else time.monotonic() + timeout
+        for subscription in self.subscribers():
+            remaining = None if deadline is None else max(0.0, deadline - time.monotonic())
+            if not subscription.join(remaining):
+                return False
+        return True
+
+    def get_metrics(self):
+        """
+        Get metrics for the whole bus.
+
+        Returns:
+            dict: Bus counters and per-subscription metrics
+        """
+        subscriptions = self.subscribers()
+        return {
+            'published': self.published,
+            'history_size': len(self.history),
+            'subscriptions': [s.get_metrics() for s in subscriptions],
+            'pending': sum(s.pending() for s in subscriptions),
+            'dispatcher_running': self._dispatcher.running
+        }
+
+    def close(self, timeout=DEFAULT_BLOCK_TIMEOUT):
+        """
+        Remove every subscription and stop the dispatcher once the queued events are delivered.
+
+        Args:
+            timeout (float, optional): Maximum wait for the dispatcher thread to exit
+
+        Returns:
+            bool: True if the dispatcher thread is stopped
+        """
+        with self._lock:
+            self._closed = True
+            subscriptions = [s for group in self._subscriptions.values() for s in group]
+            self._subscriptions = {}
+        for subscription in subscriptions:
+            subscription.close()
+        return self._dispatcher.stop(timeout)
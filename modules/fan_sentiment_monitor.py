@@ -8,6 +8,8 @@ import numpy as np
 from datetime import datetime, timedelta
 from collections import defaultdict
 
+from utils.sentiment_engine import get_sentiment_engine
+
 class FanSentimentMonitor:
     """
     FanSentimentMonitor - Système d'analyse de l'influence des émotions collectives des supporters.
@@ -64,6 +66,9 @@ class FanSentimentMonitor:
         # Cache de sentiment
         self.sentiment_cache = {}
         
+        # Moteur de sentiment lexical alimenté par les corpus locaux
+        self.sentiment_engine = get_sentiment_engine()
+        
     def analyze_current_sentiment(self, team_name, match_data=None, sentiment_data=None):
         """
         Analyser le sentiment actuel des supporters d'une équipe.
@@ -85,6 +90,11 @@ class FanSentimentMonitor:
             else:
                 sentiment_data = self._generate_sentiment_data(team_name)
                 self.sentiment_cache[cache_key] = sentiment_data
+
+            # Superposer les profils mesurés sur les corpus de textes de supporters
+            corpus_data = self.sentiment_engine.get_team_sentiment_data(team_name)
+            if corpus_data:
+                sentiment_data = {**sentiment_data, **corpus_data}
         
         # Extraire le contexte du match si disponible
         match_context = None
@@ -11,6 +11,8 @@ from collections import defaultdict
 import logging
 import pandas as pd
 
+from utils.sentiment_engine import get_sentiment_engine
+
 # Configuration du logging
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
@@ -154,6 +156,9 @@ class FanSentimentMonitorEnhanced:
         
         # Cache de sentiment
         self.sentiment_cache = {}
+        
+        # Moteur de sentiment lexical alimenté par les corpus locaux
+        self.sentiment_engine = get_sentiment_engine()
     
     def analyze_current_sentiment_enhanced(self, team_name, match_data=None, sentiment_data=None):
         """
@@ -269,6 +274,11 @@ class FanSentimentMonitorEnhanced:
             else:
                 sentiment_data = self._generate_sentiment_data_enhanced(team_name, team_data)
                 self.sentiment_cache[cache_key] = sentiment_data
+
+            # Superposer les profils mesurés sur les corpus de textes de supporters
+            corpus_data = self.sentiment_engine.get_team_sentiment_data(team_name)
+            if corpus_data:
+                sentiment_data = {**sentiment_data, **corpus_data}
         
         # Extraire le contexte du match si disponible
         match_context = None
@@ -688,6 +698,13 @@ class FanSentimentMonitorEnhanced:
                 emotions_for_moderate = ['anticipation', 'anxiety', 'nostalgia', 'skepticism']
                 analysis['dominant_emotion'] = random.choice(emotions_for_moderate)
         
+        # Distribution mesurée sur les textes si disponible
+        if source_data.get('emotion_distribution'):
+            analysis['emotional_distribution'] = dict(source_data['emotion_distribution'])
+            if source == 'social_media' and 'top_mentioned_players' in source_data:
+                analysis['key_influencers'] = source_data['top_mentioned_players']
+            return analysis
+        
         # Générer une distribution des émotions
         if 'secondary_emotion' in source_data:
             secondary_emotion = source_data['secondary_emotion']
@@ -1185,7 +1202,14 @@ class FanSentimentMonitorEnhanced:
             analysis['overall_sentiment'] = sum(sentiment_values) / len(sentiment_values)
         
         # Déterminer l'émotion dominante basée sur le ton et le contexte
-        if 'primary_tone' in source_data:
+        if source_data.get('emotion_distribution') and 'primary_emotion' in source_data:
+            # Distribution mesurée sur les textes
+            analysis['dominant_emotion'] = source_data['primary_emotion']
+            analysis['emotional_distribution'] = {
+                emotion: share for emotion, share in source_data['emotion_distribution'].items() if share > 0
+            }
+            return analysis
+        elif 'primary_tone' in source_data:
             primary_tone = source_data['primary_tone']
             
             # Associer le ton à une émotion
@@ -4,11 +4,14 @@ import random
 import os
 import sqlite3
 import json
-from collections import defaultdict
+import threading
 from modules.arcan_reflex import ArcanReflex
 from modules.eastern_gate import EasternGate
 from modules.d_forge import DForge
 from modules.arcan_brain import ArcanBrain
+from modules.event_bus import EventBus
+from utils.module_profiler import get_module_profiler
+from utils.result_settlement import attach_arcan_reflex, detach_arcan_reflex
 
 class MetaSystems:
     """
@@ -39,9 +42,10 @@ class MetaSystems:
         self.adv_modules = advanced_modules or {}
         
         # Initialize event system for inter-module communication
-        self.event_subscribers = defaultdict(list)
-        self.event_history = []
+        # (handlers run synchronously unless registered as asynchronous, see modules/event_bus.py)
         self.max_event_history = 100
+        self.event_bus = EventBus(max_history=self.max_event_history)
+        self.event_history = self.event_bus.history
         
         # Initialize system state tracking
         self.system_state = {
@@ -91,11 +95,19 @@ class MetaSystems:
         
         # Advanced module initialization
         self.arcan_reflex = ArcanReflex(arcan_x, shadow_odds, convergence, self)
+        # Settled results are fed back to this ArcanReflex (see utils/result_settlement.py)
+        attach_arcan_reflex(self.arcan_reflex)
+        self._module_accuracy_snapshot = {}
         self.eastern_gate = EasternGate()
         self.d_forge = DForge(self.arcan_reflex, self)
         
         # Cache for results to avoid redundant calculations
         self.cache = {}
+        
+        # Instrument the analysers' entry points when profiling is enabled at startup
+        profiler = get_module_profiler()
+        if profiler.enabled:
+            profiler.instrument_loaded_modules()
     
     def update_system(self, match_data=None, prediction_result=None):
         """
@@ -120,15 +132,10 @@ class MetaSystems:
             if len(self.prediction_history) > 1000:
                 self.prediction_history = self.prediction_history[-1000:]
         
-        # Run each submodule and collect results
+        # Run each submodule and collect results (not cached: submodules update the
+        # brain's memory, fire events and read thresholds learned from results)
         if match_data:
-            submodule_results = {}
-            for name, module_func in self.submodules.items():
-                try:
-                    submodule_results[name] = module_func(match_data)
-                except Exception as e:
-                    print(f"Error in {name}: {str(e)}")
-                    submodule_results[name] = {'status': 'error', 'details': str(e)}
+            submodule_results = self._run_submodules(match_data)
             
             # Update system state with submodule results
             for module, result in submodule_results.items():
@@ -136,6 +143,26 @@ class MetaSystems:
         
         return self.system_state
     
+    def _run_submodules(self, match_data):
+        """
+        Run every meta submodule on a match.
+        
+        Args:
+            match_data (dict): Match information
+            
+        Returns:
+            dict: Submodule results keyed by submodule name
+        """
+        submodule_results = {}
+        for name, module_func in self.submodules.items():
+            try:
+                with get_module_profiler().measure('MetaSystems', name):
+                    submodule_results[name] = module_func(match_data)
+            except Exception as e:
+                print(f"Error in {name}: {str(e)}")
+                submodule_results[name] = {'status': 'error', 'details': str(e)}
+        return submodule_results
+    
     def grid_sync_alpha(self, match_data):
         """
         GridSyncAlpha: Core synchronization engine for ArcanShadow's modules.
@@ -917,79 +944,82 @@ class MetaSystems:
         
         return result
         
-    def evaluate_modules_performance(self, prediction_data):
+    def evaluate_modules_performance(self, prediction_data=None):
         """
-        Evaluate the performance of each module based on a completed prediction.
+        Evaluate the performance of each module from its settled predictions.
+        
+        Figures come from the running per-module aggregates (ModuleAccuracy) that the
+        result settlement pipeline updates for every settled prediction.
         
         Args:
-            prediction_data (dict): Prediction data with actual results
+            prediction_data (dict, optional): Completed prediction; when it lists
+                'modules_used', only those modules are evaluated
             
         Returns:
-            dict: Performance metrics for each module
+            dict: Performance metrics for each module with settled predictions
         """
-        # For this implementation, we'll return sample evaluations
-        # In a full implementation, this would analyze the actual contribution
-        # of each module to the prediction accuracy
-        
-        modules = [
-            'ArcanX', 
-            'ShadowOdds', 
-            'Convergence', 
-            'NumeriCode', 
-            'TarotEcho',
-            'ShadowOddsPlus',
-            'EchoPath', 
-            'FanSentimentMonitor',
-            'LateSurgeDetector',
-            'CollapseDetector'
-        ]
+        try:
+            from utils.database import db
+            aggregates = db.get_module_accuracy()
+        except Exception as e:
+            print(f"Error loading module accuracy: {str(e)}")
+            return {}
         
-        evaluations = {}
+        modules_used = (prediction_data or {}).get('modules_used')
+        if modules_used:
+            aggregates = {module: values for module, values in aggregates.items() if module in modules_used}
         
-        # Use the prediction correctness to influence evaluation
-        is_correct = prediction_data.get('correct', False)
-        base_accuracy = 0.75 if is_correct else 0.45
+        total_settled = sum(values['settled'] for values in aggregates.values())
+        previous = self._module_accuracy_snapshot
+        evaluations = {}
         
-        for module in modules:
-            # Add some variation to make each module's performance different
-            variation = random.uniform(-0.15, 0.15)
-            
-            # Calculate performance metrics
-            accuracy = min(1.0, max(0.0, base_accuracy + variation))
-            performance_score = random.randint(60, 95) if is_correct else random.randint(30, 65)
+        for module, values in aggregates.items():
+            accuracy = values['accuracy']
+            before = previous.get(module)
+            if before is None or abs(accuracy - before) < 0.01:
+                trend = 'Stable'
+            else:
+                trend = 'Improving' if accuracy > before else 'Declining'
             
             evaluations[module] = {
                 'accuracy': accuracy,
-                'performance_score': performance_score,
-                'trend': random.choice(['Improving', 'Stable', 'Declining']),
-                'contribution': round(random.uniform(0.1, 0.3), 2),
-                'key_factors': random.sample([
-                    'Pattern Recognition', 
-                    'Timing Sensitivity', 
-                    'Historical Data Analysis',
-                    'Public Sentiment Analysis',
-                    'Odds Movement Detection',
-                    'Team Strength Evaluation',
-                    'Momentum Detection',
-                    'Statistical Model Accuracy'
-                ], k=3)
+                'settled': values['settled'],
+                'brier_score': values['brier_score'],
+                # 0-100 score from the Brier score (100 = perfectly calibrated and correct)
+                'performance_score': round(100 * (1 - values['brier_score'])),
+                'avg_confidence': values['avg_confidence'],
+                'trend': trend,
+                'contribution': round(values['settled'] / total_settled, 2) if total_settled else 0.0,
+                'last_updated': values['last_updated']
             }
-            
+        
+        previous.update((module, values['accuracy']) for module, values in aggregates.items())
         return evaluations
 
-    def register_event_handler(self, event_type, handler_function, module_name):
+    def register_event_handler(self, event_type, handler_function, module_name=None,
+                               max_queue_size=None, overflow_policy=None, asynchronous=False):
         """
         Register a function to handle specific events.
         
+        Handlers are called in the thread that triggers the event. Thread-safe handlers
+        can opt into asynchronous delivery: their events are then queued in a bounded
+        queue and delivered by the event bus dispatcher thread.
+        
         Args:
             event_type (str): Type of event to listen for (e.g., 'prediction_complete', 'anomaly_detected')
             handler_function (callable): Function to call when the event occurs
-            module_name (str): Name of the module registering the handler
+            module_name (str, optional): Name of the module registering the handler
+                (defaults to the class name of a bound method handler)
+            max_queue_size (int, optional): Capacity of the handler's queue
+            overflow_policy (str, optional): 'drop_oldest', 'drop_newest' or 'block' when the queue is full
+            asynchronous (bool): Deliver on the dispatcher thread instead of the caller's thread
         """
-        self.event_subscribers[event_type].append({
-            'handler': handler_function,
-            'module': module_name
-        })
+        if module_name is None:
+            owner = getattr(handler_function, '__self__', None)
+            module_name = type(owner).__name__ if owner is not None else getattr(handler_function, '__name__', 'unknown')
+        self.event_bus.subscribe(event_type, handler_function, module_name,
+                                 max_queue_size=max_queue_size, overflow_policy=overflow_policy,
+                                 asynchronous=asynchronous)
         
     def unregister_event_handler(self, event_type, module_name):
         """
@@ -999,46 +1029,23 @@ class MetaSystems:
             event_type (str): Type of event
             module_name (str): Name of the module that registered the handler
         """
-        if event_type in self.event_subscribers:
-            self.event_subscribers[event_type] = [
-                handler for handler in self.event_subscribers[event_type] 
-                if handler['module'] != module_name
-            ]
+        self.event_bus.unsubscribe(event_type, module_name)
             
     def trigger_event(self, event_type, event_data):
         """
         Trigger an event to all registered handlers.
         
+        The event is recorded in the history, handled right away by synchronous
+        handlers and queued for asynchronous ones.
+        
         Args:
             event_type (str): Type of event being triggered
             event_data (dict): Data related to the event
             
         Returns:
-            int: Number of handlers that processed the event
+            int: Number of handlers that handled or queued the event
         """
-        # Add event to history
-        timestamp = datetime.now()
-        self.event_history.append({
-            'type': event_type,
-            'timestamp': timestamp,
-            'data': event_data
-        })
-        
-        # Trim history if needed
-        if len(self.event_history) > self.max_event_history:
-            self.event_history = self.event_history[-self.max_event_history:]
-        
-        # Notify subscribers
-        processed_count = 0
-        if event_type in self.event_subscribers:
-            for handler_info in self.event_subscribers[event_type]:
-                try:
-                    handler_info['handler'](event_data)
-                    processed_count += 1
-                except Exception as e:
-                    print(f"Error in event handler from {handler_info['module']}: {e}")
-        
-        return processed_count
+        return self.event_bus.publish(event_type, event_data)
         
     def get_recent_events(self, event_type=None, limit=10):
         """
@@ -1051,8 +1058,42 @@ class MetaSystems:
         Returns:
             list: Recent events
         """
-        if event_type:
-            filtered_events = [e for e in self.event_history if e['type'] == event_type]
-            return filtered_events[-limit:] if filtered_events else []
-        else:
-            return self.event_history[-limit:] if self.event_history else []
+        return self.event_bus.recent_events(event_type, limit)
+    
+    def get_event_bus_metrics(self):
+        """
+        Get delivery counters and per-handler latency metrics of the event bus.
+        
+        Returns:
+            dict: Event bus metrics
+        """
+        return self.event_bus.get_metrics()
+        
+    def close(self):
+        """
+        Release the event bus (remove the handlers and stop its dispatcher thread)
+        and detach the ArcanReflex from result settlement.
+        
+        Call it when a MetaSystems instance is discarded.
+        """
+        self.event_bus.close()
+        detach_arcan_reflex(self.arcan_reflex)
+
+
+# Shared instance used by the application tabs
+_meta_systems = None
+_meta_systems_lock = threading.Lock()
+
+def get_meta_systems():
+    """
+    Get the shared MetaSystems instance (created on first use).
+    
+    Returns:
+        MetaSystems: Shared instance
+    """
+    global _meta_systems
+    if _meta_systems is None:
+        with _meta_systems_lock:
+            if _meta_systems is None:
+                _meta_systems = MetaSystems()
+    return _meta_systems
@@ -10,6 +10,8 @@ import json
 import os
 from collections import deque
 
+from utils.live_evaluator import LiveEventIndex
+
 class MomentumShiftTracker:
     """
     MomentumShiftTracker - Détection et analyse des changements d'élan pendant un match.
@@ -62,6 +64,10 @@ class MomentumShiftTracker:
         # Compteurs d'événements positifs/négatifs récents par équipe
         self.recent_positive_events = {'home': 0, 'away': 0}
         self.recent_negative_events = {'home': 0, 'away': 0}
+        
+        # Index incrémental des événements live : seuls les événements ajoutés depuis
+        # la dernière mise à jour sont appliqués au momentum
+        self.event_index = LiveEventIndex()
     
     def track_live_momentum(self, match_data, live_events=None):
         """
@@ -77,37 +83,26 @@ class MomentumShiftTracker:
         # Extraire les informations pertinentes
         home_team = match_data.get('home_team', '')
         away_team = match_data.get('away_team', '')
-        current_minute = self._get_match_minute(match_data, live_events)
         
         # Initialiser le timestamp de la dernière mise à jour si nécessaire
         if self.current_momentum['last_update'] is None:
             self.current_momentum['last_update'] = datetime.now()
+        last_momentum_update = self.current_momentum['last_update']
+        if isinstance(last_momentum_update, str):
+            last_momentum_update = datetime.fromisoformat(last_momentum_update)
         
         # Traiter les événements récents pour mettre à jour le momentum
         momentum_changes = {'home': 0.0, 'away': 0.0}
         detected_shifts = []
         
-        if live_events:
-            # Filtrer les événements récents (depuis la dernière mise à jour)
-            last_momentum_update = self.current_momentum['last_update']
-            if isinstance(last_momentum_update, str):
-                last_momentum_update = datetime.fromisoformat(last_momentum_update)
-            
-            recent_events = []
-            for event in live_events:
-                event_time = event.get('timestamp', None)
-                if event_time:
-                    if isinstance(event_time, str):
-                        event_time = datetime.fromisoformat(event_time)
-                    if event_time > last_momentum_update:
-                        recent_events.append(event)
-                
-                # Si pas de timestamp, se baser sur la minute de jeu
-                event_minute = event.get('minute', 0)
-                last_processed_minute = self.momentum_history[-1]['minute'] if self.momentum_history else 0
-                if event_minute > last_processed_minute:
-                    recent_events.append(event)
-            
+        # Événements ajoutés depuis la dernière mise à jour (la liste n'est pas reparcourue)
+        recent_events = self.event_index.update(live_events)
+        if self.event_index.count:
+            current_minute = self.event_index.max_minute
+        else:
+            current_minute = match_data.get('current_minute', 0)
+        
+        if recent_events:
             # Ajouter les événements au buffer et calculer les changements de momentum
             for event in recent_events:
                 self.recent_events_buffer.append(event)
@@ -182,7 +177,7 @@ class MomentumShiftTracker:
             'home_momentum': new_home_momentum,
             'away_momentum': new_away_momentum,
             'dominant_team': new_dominant,
-            'recent_events': len(recent_events) if 'recent_events' in locals() else 0
+            'recent_events': len(recent_events)
         })
         
         # Calculer les métriques d'élan
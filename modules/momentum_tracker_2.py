@@ -7,10 +7,16 @@ import numpy as np
 import random
 from datetime import datetime, timedelta
 import json
+import logging
 import os
 from collections import deque
 import math
 
+from utils.team_ratings import get_team_rating_engine
+from utils.match_event_log import get_match_event_log, fixture_key
+
+logger = logging.getLogger(__name__)
+
 class MomentumTracker2:
     """
     MomentumTracker 2.0 - Version avancée du MomentumShiftTracker avec modélisation multidimensionnelle.
@@ -422,6 +428,12 @@ class MomentumTracker2:
         
         # État d'initialisation
         self.initialized = False
+        
+        # Journal persistant des événements du match suivi
+        self.event_log = get_match_event_log()
+        self.event_log_id = None
+        self.event_log_seq = 0
+        self.record_events = True
     
     def initialize_match(self, match_data):
         """
@@ -456,8 +468,8 @@ class MomentumTracker2:
             'red_cards': {'home': 0, 'away': 0},
             'current_minute': 0,
             'current_phase': 'kickoff',
-            'home_team_strength': match_data.get('home_team', {}).get('strength', 0.5),
-            'away_team_strength': match_data.get('away_team', {}).get('strength', 0.5),
+            'home_team_strength': self._get_team_strength(match_data, 'home'),
+            'away_team_strength': self._get_team_strength(match_data, 'away'),
             'match_importance': match_data.get('importance', 0.5),
             'crowd_factor': match_data.get('crowd_factor', 0.5),
             'weather_factor': match_data.get('weather_factor', 0.0)
@@ -480,6 +492,19 @@ class MomentumTracker2:
         
         self.initialized = True
         
+        # Ouvrir le journal d'événements du match (équipes à plat pour les métadonnées)
+        self.event_log_seq = 0
+        if self.record_events:
+            log_match = dict(match_data)
+            for side in ('home_team', 'away_team'):
+                if isinstance(log_match.get(side), dict):
+                    log_match[side] = log_match[side].get('name')
+            try:
+                self.event_log_id = self.event_log.open_fixture(fixture_key(log_match), log_match)
+            except Exception as e:
+                self.event_log_id = None
+                logger.warning(f"Journal d'événements indisponible: {e}")
+        
         # Retourner l'état initial
         return {
             'home_team': match_data.get('home_team', {}).get('name', 'Home'),
@@ -496,6 +521,35 @@ class MomentumTracker2:
             'initialization_time': datetime.now().isoformat()
         }
     
+    def replay_fixture(self, fixture_id, event_log=None):
+        """
+        Rejouer un match journalisé événement par événement, sans attendre le temps réel.
+        
+        Args:
+            fixture_id (str): Identifiant du match dans le journal
+            event_log (MatchEventLog, optional): Journal à lire (journal partagé par défaut)
+            
+        Returns:
+            list: Impact de chaque événement rejoué sur le momentum
+        """
+        event_log = event_log or self.event_log
+        meta = event_log.get_meta(fixture_id)
+        match = meta['match']
+        match_data = dict(match)
+        match_data['home_team'] = {'name': match.get('home_team', 'Home')}
+        match_data['away_team'] = {'name': match.get('away_team', 'Away')}
+        
+        record_events = self.record_events
+        self.record_events = False
+        try:
+            self.initialize_match(match_data)
+            impacts = []
+            for event in event_log.get_events(fixture_id):
+                impacts.append(self.process_match_event(dict(event, team=event['side'] or 'home')))
+            return impacts
+        finally:
+            self.record_events = record_events
+    
     def process_match_event(self, event_data):
         """
         Traiter un événement de match et mettre à jour le momentum.
@@ -520,6 +574,14 @@ class MomentumTracker2:
         # Mettre à jour le contexte du match
         self._update_match_context(event_data)
         
+        # Journaliser l'événement (en ajout seul, avant tout filtrage)
+        if self.record_events and self.event_log_id:
+            seq, self.event_log_seq = self.event_log_seq, self.event_log_seq + 1
+            try:
+                self.event_log.append(self.event_log_id, event_data, seq=seq)
+            except Exception as e:
+                logger.warning(f"Impossible de journaliser l'événement: {e}")
+        
         # Vérifier si l'événement est reconnu
         if event_type not in self.momentum_events:
             return {
@@ -1033,11 +1095,29 @@ class MomentumTracker2:
         
         return result
     
+    def _get_team_strength(self, match_data, side):
+        """
+        Force d'avant-match d'une équipe (0-1).
+        Utilise la force fournie dans les données du match, sinon le classement Elo local.
+        """
+        team = match_data.get(f'{side}_team', {})
+        if isinstance(team, dict) and 'strength' in team:
+            return team['strength']
+        
+        team_name = team.get('name') if isinstance(team, dict) else team
+        if not team_name:
+            return 0.5
+        try:
+            rating = get_team_rating_engine().get_rating(team_name, match_data.get('date'))
+        except Exception:
+            rating = None
+        return rating['strength'] if rating else 0.5
+    
     def _calculate_initial_momentum(self, match_data):
         """Calculer le momentum initial basé sur les données du match."""
         # Récupérer les forces des équipes
-        home_strength = match_data.get('home_team', {}).get('strength', 0.5)
-        away_strength = match_data.get('away_team', {}).get('strength', 0.5)
+        home_strength = self.match_context['home_team_strength']
+        away_strength = self.match_context['away_team_strength']
         
         # Facteur d'avantage à domicile
         home_advantage = 0.1 * self.match_context['crowd_factor']
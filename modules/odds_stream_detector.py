@@ -0,0 +1,481 @@
+"""
+OddsStreamDetector - Détection incrémentale des comportements de cotes pour ArcanShadow.
+Maintient des statistiques glissantes par (match, marché, issue) mises à jour en O(1)
+à chaque nouveau tick, et émet les alertes (steam move, mouvement de ligne inversé,
+afflux pré-match, dérive nocturne) dès qu'elles apparaissent, sans ré-analyser l'historique.
+"""
+
+import math
+import logging
+from collections import deque
+from datetime import datetime, timezone
+
+from utils.odds_tick_store import to_epoch
+
+# Configuration du logging
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+# Bookmaker fictif des instantanés d'historique (moyennes), retiré après l'amorçage
+HISTORY_BOOKMAKER = '_history'
+
+
+class _SeriesState:
+    """État glissant d'une série de cotes (une issue d'un marché d'un match)."""
+
+    __slots__ = (
+        'count', 'price', 'timestamp', 'ew_mean', 'ew_var', 'velocity',
+        'book_prices', 'book_timestamps', 'book_sum', 'book_sumsq', 'book_moves',
+        'volume', 'ew_volume_delta', 'night_session', 'night_open', 'last_alerts'
+    )
+
+    def __init__(self):
+        self.count = 0
+        self.price = None
+        self.timestamp = None
+        self.ew_mean = 0.0
+        self.ew_var = 0.0
+        self.velocity = 0.0
+        self.book_prices = {}
+        self.book_timestamps = {}
+        self.book_sum = 0.0
+        self.book_sumsq = 0.0
+        self.book_moves = {}
+        self.volume = None
+        self.ew_volume_delta = 0.0
+        self.night_session = None
+        self.night_open = None
+        self.last_alerts = {}
+
+    def dispersion(self):
+        """Écart-type des cotes entre bookmakers (0 si un seul bookmaker)."""
+        n = len(self.book_prices)
+        if n < 2:
+            return 0.0
+        mean = self.book_sum / n
+        return math.sqrt(max(0.0, self.book_sumsq / n - mean * mean))
+
+    def drop_book(self, bookmaker):
+        """Retire un bookmaker du consensus et de la dispersion."""
+        price = self.book_prices.pop(bookmaker, None)
+        if price is not None:
+            self.book_sum -= price
+            self.book_sumsq -= price * price
+        self.book_timestamps.pop(bookmaker, None)
+        self.book_moves.pop(bookmaker, None)
+
+
+class OddsStreamDetector:
+    """
+    Détecteur incrémental de comportements spéciaux dans les flux de cotes.
+    Chaque tick met à jour la moyenne et la variance exponentielles, la vélocité
+    et la dispersion entre bookmakers de sa série, puis évalue les règles d'alerte.
+    """
+
+    # Comportements évalués en flux (mêmes clés que ShadowOddsPlusEnhanced.special_behaviors)
+    BEHAVIORS = ('steam_move', 'reverse_line_movement', 'pre_match_surge', 'overnight_drift')
+
+    def __init__(self, meta_systems=None, alpha=0.2, max_alerts_per_market=20):
+        """
+        Initialise le détecteur de flux.
+
+        Args:
+            meta_systems: Référence au module MetaSystems pour l'émission des alertes
+            alpha (float): Facteur de lissage exponentiel (0 < alpha <= 1)
+            max_alerts_per_market (int): Nombre d'alertes conservées par marché
+        """
+        self.meta_systems = meta_systems
+        self.alpha = alpha
+        self.max_alerts_per_market = max_alerts_per_market
+
+        # Paramètres de détection
+        self.detection_params = {
+            'steam_relative_move': 0.03,     # Variation relative minimale du consensus
+            'steam_zscore': 3.0,             # Ou écart en nombre d'écarts-types
+            'steam_window': 10 * 60,         # Fenêtre de confirmation entre bookmakers (s)
+            'steam_min_books': 3,            # Bookmakers devant suivre le mouvement
+            'rlm_relative_move': 0.02,       # Allongement minimal de la cote
+            'rlm_min_volume': 100,           # Hausse de volume minimale sur l'issue
+            'surge_window': 60 * 60,         # Fenêtre avant le coup d'envoi (s)
+            'surge_factor': 3.0,             # Multiple de l'incrément de volume moyen
+            'drift_threshold': 0.05,         # Dérive relative pendant la nuit asiatique
+            'night_hours_utc': (15, 23),     # Nuit asiatique (UTC+8 : 23h-7h)
+            'alert_cooldown': 5 * 60         # Délai minimal entre deux alertes identiques (s)
+        }
+
+        self.series = {}        # (match_id, market, outcome) -> _SeriesState
+        self.kickoffs = {}      # match_id -> epoch du coup d'envoi
+        self.alerts = {}        # (match_id, market) -> deque d'alertes récentes
+        self.markets = {}       # match_id -> set de marchés suivis
+
+    def set_meta_systems(self, meta_systems):
+        """
+        Associe le détecteur à MetaSystems pour l'émission des alertes.
+
+        Args:
+            meta_systems: Instance de MetaSystems
+        """
+        self.meta_systems = meta_systems
+
+    def register_match(self, match_id, kickoff=None):
+        """
+        Déclare un match suivi et son heure de coup d'envoi.
+
+        Args:
+            match_id (str): Identifiant du match
+            kickoff (any, optional): Heure du coup d'envoi (epoch, datetime ou ISO)
+        """
+        self.markets.setdefault(str(match_id), set())
+        if kickoff is not None:
+            self.kickoffs[str(match_id)] = to_epoch(kickoff)
+
+    def is_tracking(self, match_id):
+        """
+        Indique si des ticks ont été reçus pour un match.
+
+        Args:
+            match_id (str): Identifiant du match
+
+        Returns:
+            bool: True si le match est suivi et possède au moins un marché
+        """
+        return bool(self.markets.get(str(match_id)))
+
+    def process_tick(self, match_id, market, outcome, price, timestamp=None, bookmaker='consensus', volume=None,
+                     publish=True):
+        """
+        Met à jour les statistiques de la série en O(1) et évalue les règles d'alerte.
+        Un tick antérieur au dernier tick du même bookmaker (ou identique) est ignoré ;
+        les bookmakers en retard sur les autres restent pris en compte.
+
+        Args:
+            match_id (str): Identifiant du match
+            market (str): Marché
+            outcome (str): Issue ou ligne
+            price (float): Cote observée
+            timestamp (any, optional): Horodatage de l'observation
+            bookmaker (str): Bookmaker source
+            volume (float, optional): Volume cumulé de paris sur l'issue
+            publish (bool): Publier les alertes sur le bus de MetaSystems (sinon seulement conservées)
+
+        Returns:
+            list: Alertes émises par ce tick
+        """
+        match_id, market, outcome = str(match_id), str(market), str(outcome)
+        ts = to_epoch(timestamp)
+        price = float(price)
+
+        key = (match_id, market, outcome)
+        state = self.series.get(key)
+        if state is None:
+            state = self.series[key] = _SeriesState()
+            self.markets.setdefault(match_id, set()).add(market)
+        else:
+            last_book_ts = state.book_timestamps.get(bookmaker)
+            if last_book_ts is not None and (ts < last_book_ts or
+                                             (ts == last_book_ts and state.book_prices.get(bookmaker) == price)):
+                # Tick antérieur ou déjà traité pour ce bookmaker (historique ré-ingéré)
+                return []
+
+        # Dispersion entre bookmakers : sommes mises à jour en remplaçant l'ancienne cote du bookmaker
+        previous_book_price = state.book_prices.get(bookmaker)
+        if previous_book_price is not None:
+            state.book_sum -= previous_book_price
+            state.book_sumsq -= previous_book_price * previous_book_price
+            if price != previous_book_price:
+                state.book_moves[bookmaker] = (ts, 1 if price > previous_book_price else -1)
+        state.book_prices[bookmaker] = price
+        state.book_timestamps[bookmaker] = ts
+        state.book_sum += price
+        state.book_sumsq += price * price
+        consensus = state.book_sum / len(state.book_prices)
+
+        alerts = []
+        if state.count == 0:
+            state.ew_mean = consensus
+        else:
+            previous = state.price
+            change = consensus - previous
+            # Un bookmaker en retard peut livrer un tick antérieur au dernier tick de la série
+            dt_hours = max((ts - state.timestamp) / 3600.0, 1.0 / 60)
+
+            # Moyenne et variance exponentielles (forme incrémentale de West)
+            ew_std = math.sqrt(state.ew_var)
+            delta = consensus - state.ew_mean
+            state.ew_mean += self.alpha * delta
+            state.ew_var = (1 - self.alpha) * (state.ew_var + self.alpha * delta * delta)
+            state.velocity += self.alpha * (change / dt_hours - state.velocity)
+
+            relative_change = change / previous if previous else 0.0
+            zscore = change / ew_std if ew_std > 0 else 0.0
+
+            alerts.extend(self._check_steam_move(state, key, ts, consensus, previous, relative_change, zscore))
+            alerts.extend(self._check_reverse_line_movement(state, key, ts, consensus, previous, relative_change, volume))
+            alerts.extend(self._check_overnight_drift(state, key, ts, consensus))
+
+        alerts.extend(self._check_pre_match_surge(state, key, ts, consensus, volume))
+
+        state.count += 1
+        state.price = consensus
+        state.timestamp = ts if state.timestamp is None else max(state.timestamp, ts)
+        if volume is not None:
+            state.volume = float(volume)
+
+        for alert in alerts:
+            self._emit(alert, publish)
+
+        return alerts
+
+    def process_ticks(self, match_id, ticks, publish=False):
+        """
+        Amorce les statistiques d'un match en rejouant ses ticks bruts, bookmaker par bookmaker.
+
+        Args:
+            match_id (str): Identifiant du match
+            ticks (iterable): Ticks (market, outcome, bookmaker, timestamp, price, volume) triés par horodatage
+            publish (bool): Publier les alertes du rejeu sur le bus (elles sont passées)
+
+        Returns:
+            int: Nombre de ticks traités
+        """
+        processed = 0
+        for market, outcome, bookmaker, timestamp, price, volume in ticks:
+            self.process_tick(match_id, market, outcome, price, timestamp, bookmaker, volume, publish=publish)
+            processed += 1
+        return processed
+
+    def process_history(self, match_id, odds_history, publish=False):
+        """
+        Amorce les statistiques d'un match à partir d'un historique par instantanés.
+
+        Les instantanés sont des moyennes : ils passent par un bookmaker fictif, retiré
+        ensuite pour que le consensus et la dispersion ne reposent que sur les vrais
+        bookmakers des ticks suivants.
+
+        Args:
+            match_id (str): Identifiant du match
+            odds_history (list): Instantanés {'timestamp', 'markets', 'volumes'}
+            publish (bool): Publier les alertes de l'amorçage sur le bus (elles sont passées)
+
+        Returns:
+            int: Nombre de ticks traités
+        """
+        processed = 0
+        for snapshot in sorted(odds_history or [], key=lambda s: s.get('timestamp', '')):
+            volumes = snapshot.get('volumes', {})
+            for market, lines in snapshot.get('markets', {}).items():
+                for outcome, price in lines.items():
+                    if not isinstance(price, (int, float)):
+                        continue
+                    volume = volumes.get(market, {}).get(outcome)
+                    self.process_tick(match_id, market, outcome, price, snapshot.get('timestamp'),
+                                      HISTORY_BOOKMAKER, volume, publish=publish)
+                    processed += 1
+
+        match_id = str(match_id)
+        for key, state in self.series.items():
+            if key[0] == match_id:
+                state.drop_book(HISTORY_BOOKMAKER)
+        return processed
+
+    def _check_steam_move(self, state, key, ts, consensus, previous, relative_change, zscore):
+        """Mouvement brusque du consensus confirmé par plusieurs bookmakers dans la même direction."""
+        params = self.detection_params
+        if abs(relative_change) < params['steam_relative_move'] and abs(zscore) < params['steam_zscore']:
+            return []
+
+        direction = 1 if relative_change > 0 else -1
+        following_books = sum(
+            1 for move_ts, move_dir in state.book_moves.values()
+            if move_dir == direction and ts - move_ts <= params['steam_window']
+        )
+        if following_books < params['steam_min_books'] and len(state.book_prices) >= params['steam_min_books']:
+            return []
+
+        score = min(0.95, 0.5 + abs(relative_change) * 5 + 0.05 * following_books)
+        return self._make_alert(state, key, ts, 'steam_move', score, consensus, previous, {
+            'relative_change': relative_change,
+            'zscore': zscore,
+            'following_books': following_books
+        })
+
+    def _check_reverse_line_movement(self, state, key, ts, consensus, previous, relative_change, volume):
+        """Cote qui s'allonge alors que l'argent afflue sur l'issue."""
+        if volume is None or state.volume is None:
+            return []
+        params = self.detection_params
+        volume_change = float(volume) - state.volume
+        if relative_change < params['rlm_relative_move'] or volume_change < params['rlm_min_volume']:
+            return []
+
+        score = min(0.9, (relative_change / 0.04) * (volume_change / 200) * 0.5)
+        return self._make_alert(state, key, ts, 'reverse_line_movement', score, consensus, previous, {
+            'relative_change': relative_change,
+            'volume_change': volume_change
+        })
+
+    def _check_pre_match_surge(self, state, key, ts, consensus, volume):
+        """Incrément de volume anormal dans l'heure précédant le coup d'envoi."""
+        if volume is None or state.volume is None:
+            return []
+        params = self.detection_params
+        volume_delta = float(volume) - state.volume
+        baseline = state.ew_volume_delta
+        state.ew_volume_delta += self.alpha * (volume_delta - state.ew_volume_delta)
+
+        kickoff = self.kickoffs.get(key[0])
+        if kickoff is None or not 0 <= kickoff - ts <= params['surge_window'] or state.count < 5:
+            return []
+        if baseline <= 0 or volume_delta < params['surge_factor'] * baseline:
+            return []
+
+        score = min(0.95, 0.4 + 0.1 * volume_delta / baseline)
+        return self._make_alert(state, key, ts, 'pre_match_surge', score, consensus, state.price, {
+            'volume_delta': volume_delta,
+            'baseline_delta': baseline,
+            'minutes_to_kickoff': (kickoff - ts) / 60
+        })
+
+    def _check_overnight_drift(self, state, key, ts, consensus):
+        """Dérive cumulée de la cote pendant la nuit asiatique."""
+        params = self.detection_params
+        moment = datetime.fromtimestamp(ts, timezone.utc)
+        start_hour, end_hour = params['night_hours_utc']
+        if not start_hour <= moment.hour < end_hour:
+            state.night_session = None
+            return []
+
+        session = moment.date()
+        if state.night_session != session:
+            state.night_session = session
+            state.night_open = state.price
+
+        drift = (consensus - state.night_open) / state.night_open if state.night_open else 0.0
+        if abs(drift) < params['drift_threshold']:
+            return []
+
+        score = min(0.9, 0.4 + abs(drift) * 4)
+        return self._make_alert(state, key, ts, 'overnight_drift', score, consensus, state.night_open, {
+            'drift': drift,
+            'session': session.isoformat()
+        })
+
+    def _make_alert(self, state, key, ts, behavior_type, score, price, previous_price, details):
+        """Construit une alerte en respectant le délai minimal entre alertes identiques."""
+        last_alert_ts = state.last_alerts.get(behavior_type)
+        if last_alert_ts is not None and ts - last_alert_ts < self.detection_params['alert_cooldown']:
+            return []
+        state.last_alerts[behavior_type] = ts
+
+        match_id, market, outcome = key
+        return [{
+            'source': 'OddsStreamDetector',
+            'behavior_type': behavior_type,
+            'match_id': match_id,
+            'market': market,
+            'outcome': outcome,
+            'score': round(score, 4),
+            'price': price,
+            'previous_price': previous_price,
+            'ew_mean': state.ew_mean,
+            'ew_std': math.sqrt(state.ew_var),
+            'velocity': state.velocity,
+            'dispersion': state.dispersion(),
+            'timestamp': datetime.fromtimestamp(ts).isoformat(),
+            'details': details
+        }]
+
+    def _emit(self, alert, publish=True):
+        """Conserve l'alerte et la publie sur le bus d'événements de MetaSystems."""
+        alerts = self.alerts.get((alert['match_id'], alert['market']))
+        if alerts is None:
+            alerts = self.alerts[(alert['match_id'], alert['market'])] = deque(maxlen=self.max_alerts_per_market)
+        alerts.append(alert)
+
+        if publish and self.meta_systems:
+            try:
+                self.meta_systems.trigger_event('odds_change_detected', alert)
+            except Exception as e:
+                logger.error(f"Erreur lors de l'émission de l'alerte {alert['behavior_type']}: {e}")
+
+    def get_market_stats(self, match_id):
+        """
+        Renvoie les statistiques glissantes courantes d'un match.
+
+        Args:
+            match_id (str): Identifiant du match
+
+        Returns:
+            dict: {marché: {issue: statistiques}}
+        """
+        match_id = str(match_id)
+        stats = {}
+        for (m_id, market, outcome), state in self.series.items():
+            if m_id == match_id:
+                stats.setdefault(market, {})[outcome] = {
+                    'price': state.price,
+                    'ticks': state.count,
+                    'ew_mean': state.ew_mean,
+                    'ew_std': math.sqrt(state.ew_var),
+                    'velocity': state.velocity,
+                    'dispersion': state.dispersion(),
+                    'bookmakers': len(state.book_prices)
+                }
+        return stats
+
+    def get_behavior_analysis(self, match_id, behavior_type):
+        """
+        Résume les alertes d'un comportement pour un match, au format des détecteurs
+        de ShadowOddsPlusEnhanced.
+
+        Args:
+            match_id (str): Identifiant du match
+            behavior_type (str): Comportement (voir BEHAVIORS)
+
+        Returns:
+            dict: Analyse du comportement
+        """
+        match_id = str(match_id)
+        alerts = [
+            alert
+            for market in self.markets.get(match_id, ())
+            for alert in self.alerts.get((match_id, market), ())
+            if alert['behavior_type'] == behavior_type
+        ]
+
+        analysis = {
+            'behavior_type': behavior_type,
+            'detection_score': 0.0,
+            'details': {},
+            'data_sources': ['odds_stream'],
+            'evidence_strength': 0.0,
+            'time_pattern': []
+        }
+        if not alerts:
+            return analysis
+
+        top_alerts = sorted(alerts, key=lambda a: a['score'], reverse=True)[:3]
+        analysis.update({
+            'detection_score': sum(a['score'] for a in top_alerts) / len(top_alerts),
+            'details': {
+                'alerts_detected': len(alerts),
+                'most_significant': top_alerts[0]
+            },
+            'evidence_strength': min(0.9, len(alerts) / 5 * 0.6),
+            'time_pattern': [a['timestamp'] for a in top_alerts]
+        })
+        return analysis
+
+    def forget_match(self, match_id):
+        """
+        Libère l'état d'un match terminé.
+
+        Args:
+            match_id (str): Identifiant du match
+        """
+        match_id = str(match_id)
+        for market in self.markets.pop(match_id, ()):
+            self.alerts.pop((match_id, market), None)
+        for key in [k for k in self.series if k[0] == match_id]:
+            del self.series[key]
+        self.kickoffs.pop(match_id, None)
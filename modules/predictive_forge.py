@@ -16,6 +16,7 @@ import os
 import logging
 import datetime
 import json
+from utils.score_matrix import price_slate
 
 class PredictiveForge:
     """
@@ -1786,6 +1787,10 @@ class ScorePredictor:
         home_scores_rounded = np.round(home_scores).astype(int)
         away_scores_rounded = np.round(away_scores).astype(int)
         
+        # Matrices de scores de tous les matchs en un seul passage (les sorties
+        # Poisson des modèles sont les buts attendus de chaque équipe)
+        goal_markets = price_slate(home_scores, away_scores)
+        
         # Préparer les résultats
         results = []
         for i in range(len(home_scores)):
@@ -1796,23 +1801,8 @@ class ScorePredictor:
             home_score = max(0, int(home_scores_rounded[i]))
             away_score = max(0, int(away_scores_rounded[i]))
             
-            # Calculer les probabilités pour scores voisins
-            score_probabilities = {}
-            
-            # Prédir les probabilités pour les scores voisins
-            for h in range(max(0, home_score - 2), home_score + 3):
-                for a in range(max(0, away_score - 2), away_score + 3):
-                    score = f"{h}-{a}"
-                    # Distance au score prédit
-                    distance = np.sqrt((h - home_scores[i])**2 + (a - away_scores[i])**2)
-                    # Probabilité selon une distribution normale
-                    probability = np.exp(-distance)
-                    score_probabilities[score] = float(probability)
-            
-            # Normaliser les probabilités
-            total_prob = sum(score_probabilities.values())
-            for score in score_probabilities:
-                score_probabilities[score] /= total_prob
+            # Probabilités des scores exacts issues de la matrice de scores
+            score_probabilities = dict(goal_markets[i]['correct_score'])
             
             # Ajouter des probabilités historiques si disponibles
             historical_probabilities = {}
@@ -1840,9 +1830,10 @@ class ScorePredictor:
                 "away_score": away_score,
                 "predicted_score": f"{home_score}-{away_score}",
                 "result": result,
-                "score_probabilities": {k: v for k, v in sorted(score_probabilities.items(), key=lambda x: x[1], reverse=True)[:5]},
+                "score_probabilities": score_probabilities,
                 "raw_home_score": float(home_scores[i]),
-                "raw_away_score": float(away_scores[i])
+                "raw_away_score": float(away_scores[i]),
+                "goal_markets": goal_markets[i]
             }
             
             # Ajouter les probabilités historiques si disponibles
@@ -3,6 +3,7 @@ from datetime import datetime, timedelta
 import math
 import os
 from utils.api_integrations import APIIntegrations
+from utils.prediction_cache import cached_analysis
 
 class ShadowOdds:
     """
@@ -10,6 +11,8 @@ class ShadowOdds:
     Detects anomalies, manipulations, and hidden patterns in odds data.
     """
     
+    CACHE_VERSION = "1.0"
+    
     def __init__(self):
         """Initialize the ShadowOdds module with necessary components."""
         self.submodules = {
@@ -32,6 +35,7 @@ class ShadowOdds:
         # Cache for results to avoid redundant calculations
         self.cache = {}
     
+    @cached_analysis('ShadowOdds')
     def analyze_match(self, match_data):
         """
         Main method to analyze match odds and market behavior.
@@ -12,6 +12,7 @@ from collections import defaultdict
 
 # Intégration de l'adaptateur Transfermarkt
 from api.transfermarkt_adapter import TransfermarktAdapter
+from utils.odds_tick_store import get_odds_tick_store
 
 # Configuration du logging
 logging.basicConfig(level=logging.INFO)
@@ -85,6 +86,9 @@ class ShadowOddsPlus:
         # Historique des analyses
         self.analysis_history = []
         
+        # Magasin persistant des ticks de cotes (séries réelles)
+        self.tick_store = get_odds_tick_store()
+        
     def analyze_asian_markets(self, match_data, odds_data=None):
         """
         Analyser les marchés de paris asiatiques pour un match.
@@ -146,9 +150,13 @@ class ShadowOddsPlus:
         away_team = match_data.get('away_team', 'Équipe extérieure')
         
         # Analyser chaque marché disponible
+        match_id = match_data.get('id', match_data.get('match_id'))
+        has_ticks = self.tick_store.has_ticks(match_id)
         market_analyses = {}
         for market in available_markets:
             market_data = odds_data.get(market, {})
+            if has_ticks and 'line_movement' not in market_data:
+                market_data = dict(market_data, line_movement=self._line_movement_from_ticks(match_id, market))
             market_analyses[market] = self._analyze_single_market(market, market_data, home_team, away_team)
         
         # Analyser les corrélations entre marchés
@@ -193,9 +201,12 @@ class ShadowOddsPlus:
         Returns:
             dict: Analyse des comportements spéciaux détectés
         """
-        # Si aucun historique n'est fourni, utiliser des données par défaut
+        # Si aucun historique n'est fourni, lire les ticks enregistrés ou utiliser des données par défaut
         if odds_history is None:
-            odds_history = self._generate_default_odds_history()
+            match_id = match_data.get('id', match_data.get('match_id'))
+            odds_history = self.tick_store.get_odds_history(match_id) if self.tick_store.has_ticks(match_id) else []
+            if not odds_history:
+                odds_history = self._generate_default_odds_history()
         
         # Extraire les noms des équipes
         home_team = match_data.get('home_team', 'Équipe domicile')
@@ -838,6 +849,24 @@ class ShadowOddsPlus:
         
         return "Combinaison inhabituelle de comportements détectée dans les cotes. Recommandation d'une vigilance accrue et d'analyses supplémentaires."
     
+    def _line_movement_from_ticks(self, match_id, market):
+        """Construire les mouvements de ligne d'un marché à partir des ticks enregistrés."""
+        line_movement = []
+        for outcome in self.tick_store.get_markets(match_id).get(market, []):
+            series = self.tick_store.get_consensus_series(match_id, market, outcome)
+            if len(series) < 2:
+                continue
+            changes = np.diff(series['price'])
+            moved = np.nonzero(changes)[0]
+            for idx in moved:
+                line_movement.append({
+                    'outcome': outcome,
+                    'timestamp': datetime.fromtimestamp(series['timestamp'][idx + 1]).isoformat(),
+                    'change': float(changes[idx])
+                })
+        line_movement.sort(key=lambda m: m['timestamp'])
+        return line_movement
+    
     def _analyze_line_movements(self, line_movement):
         """Analyser les mouvements de ligne pour détecter des patterns."""
         analysis = {
@@ -22,6 +22,8 @@ from api.transfermarkt_integration import (
     get_team_players, 
     search_club_by_name
 )
+from utils.odds_tick_store import get_odds_tick_store, to_epoch
+from modules.odds_stream_detector import OddsStreamDetector
 
 # Vérifier si nos nouvelles sources de données sont disponibles
 try:
@@ -57,8 +59,15 @@ class ShadowOddsPlusEnhanced:
     plus fine des anomalies dans les marchés de paris.
     """
     
-    def __init__(self):
-        """Initialise le module ShadowOdds+ enrichi avec accès à toutes les sources de données"""
+    def __init__(self, meta_systems=None):
+        """
+        Initialise le module ShadowOdds+ enrichi avec accès à toutes les sources de données
+        
+        Args:
+            meta_systems: Référence au module MetaSystems pour l'émission des alertes de cotes
+        """
+        self.meta_systems = meta_systems
+        
         # Vérifier si Transfermarkt est disponible
         self.transfermarkt_available = is_transfermarkt_available()
         
@@ -150,6 +159,74 @@ class ShadowOddsPlusEnhanced:
         
         # Historique des analyses
         self.analysis_history = []
+        
+        # Magasin persistant des ticks de cotes (séries réelles)
+        self.tick_store = get_odds_tick_store()
+        
+        # Détecteur incrémental des comportements (steam move, RLM, afflux, dérive),
+        # alimenté par chaque tick ajouté au magasin (scrapers compris)
+        self.stream_detector = OddsStreamDetector(meta_systems)
+        self.tick_store.add_listener(self._on_odds_tick)
+    
+    def set_meta_systems(self, meta_systems):
+        """
+        Associe le module à MetaSystems pour l'émission des alertes de cotes.
+        
+        Args:
+            meta_systems: Instance de MetaSystems
+        """
+        self.meta_systems = meta_systems
+        self.stream_detector.set_meta_systems(meta_systems)
+    
+    def _on_odds_tick(self, match_id, market, outcome, price, timestamp, bookmaker, volume):
+        """Met à jour le détecteur en flux avec un tick enregistré dans le magasin."""
+        self.stream_detector.process_tick(match_id, market, outcome, price, timestamp, bookmaker, volume)
+    
+    def _match_kickoff(self, match_data):
+        """
+        Extrait l'heure du coup d'envoi d'un match.
+        
+        Args:
+            match_data (dict): Données du match ('kickoff', 'date_time' ou 'date' et 'time')
+            
+        Returns:
+            float: Coup d'envoi en secondes epoch, ou None si inconnu
+        """
+        candidates = [match_data.get('kickoff'), match_data.get('date_time')]
+        if match_data.get('date') and match_data.get('time'):
+            candidates.append(f"{match_data['date']} {match_data['time']}")
+        for value in candidates:
+            if not value:
+                continue
+            try:
+                return to_epoch(value)
+            except (TypeError, ValueError):
+                pass
+            for fmt in ('%d.%m.%Y %H:%M', '%Y-%m-%d %H:%M', '%d/%m/%Y %H:%M'):
+                try:
+                    return datetime.strptime(str(value).strip(), fmt).timestamp()
+                except ValueError:
+                    continue
+        return None
+    
+    def ingest_odds_tick(self, match_id, market, outcome, price, timestamp=None, bookmaker='consensus', volume=None):
+        """
+        Enregistre un nouveau tick de cote et met à jour les détecteurs en flux.
+        
+        Args:
+            match_id (str): Identifiant du match
+            market (str): Marché
+            outcome (str): Issue ou ligne
+            price (float): Cote observée
+            timestamp (any, optional): Horodatage de l'observation
+            bookmaker (str): Bookmaker source
+            volume (float, optional): Volume cumulé de paris sur l'issue
+            
+        Returns:
+            list: Alertes émises par ce tick
+        """
+        self.tick_store.append_tick(match_id, market, outcome, price, timestamp, bookmaker, volume, notify=False)
+        return self.stream_detector.process_tick(match_id, market, outcome, price, timestamp, bookmaker, volume)
     
     def analyze_asian_markets_enhanced(self, match_data, odds_data=None):
         """
@@ -452,13 +529,29 @@ class ShadowOddsPlusEnhanced:
         # Ajouter les données des équipes à l'analyse
         enriched_match_data['team_data'] = team_data
         
-        # Si aucun historique n'est fourni, utiliser des données par défaut
+        # Si le match est suivi en flux, ses comportements de mouvement sont déjà à jour
+        match_id = match_data.get('id', match_data.get('match_id'))
+        if match_id is not None:
+            # Coup d'envoi nécessaire à la détection de l'afflux pré-match
+            self.stream_detector.register_match(match_id, self._match_kickoff(match_data))
+            # Ticks enregistrés avant le démarrage de ce processus : amorcer le détecteur
+            # en rejouant les ticks bruts de chaque bookmaker
+            if odds_history is None and not self.stream_detector.is_tracking(match_id) and self.tick_store.has_ticks(match_id):
+                self.stream_detector.process_ticks(match_id, self.tick_store.get_ticks(match_id))
+        streaming = odds_history is None and self.stream_detector.is_tracking(match_id)
+        
+        # Si aucun historique n'est fourni, lire les ticks enregistrés ou utiliser des données par défaut
         if odds_history is None:
-            odds_history = self._generate_default_odds_history()
+            odds_history = self.tick_store.get_odds_history(match_id) if self.tick_store.has_ticks(match_id) else []
+            if not odds_history:
+                odds_history = self._generate_default_odds_history()
         
         # Analyser chaque type de comportement spécial avec données enrichies
         behavior_analyses = {}
         for behavior_type, behavior_params in self.special_behaviors.items():
+            if streaming and behavior_type in OddsStreamDetector.BEHAVIORS:
+                behavior_analyses[behavior_type] = self.stream_detector.get_behavior_analysis(match_id, behavior_type)
+                continue
             behavior_analyses[behavior_type] = self._analyze_behavior_enhanced(
                 behavior_type, behavior_params, odds_history, enriched_match_data
             )
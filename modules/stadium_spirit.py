@@ -9,6 +9,8 @@ import numpy as np
 from collections import defaultdict
 import math
 
+from utils.venue_profiles import get_venue_profile_store
+
 class StadiumSpirit:
     """
     StadiumSpirit - Système d'analyse de l'énergie des stades et de leur influence historique.
@@ -109,6 +111,9 @@ class StadiumSpirit:
         # Base de données des stades (serait normalement chargée depuis une source externe)
         self.stadium_database = {}
         
+        # Base partagée des stades : bilans à domicile, derbies et affluences de l'archive
+        self.venue_store = get_venue_profile_store()
+        
         # Historique des analyses
         self.analysis_history = []
     
@@ -146,8 +151,12 @@ class StadiumSpirit:
             'key_energy_patterns': []               # Patterns énergétiques clés
         }
         
+        # Rattacher le stade à son équipe résidente dans la base partagée
+        if match_data.get('stadium'):
+            self.venue_store.register_venue(match_data['stadium'], home_team)
+        
         # Obtenir ou simuler les données du stade
-        stadium_data = stadium_data or self._get_stadium_data(stadium_name)
+        stadium_data = stadium_data or self._get_stadium_data(stadium_name, home_team)
         
         # Obtenir ou simuler les données historiques
         historical_data = historical_data or self._get_historical_data(stadium_name, home_team)
@@ -666,6 +675,7 @@ class StadiumSpirit:
                     'teams': event_teams,
                     'event_type': event_type,
                     'significance': event_significance,
+                    'emotional_charge': event.get('emotional_charge', 'neutral'),
                     'resonance_factor': resonance_factor,
                     'memory_potency': memory_potency,
                     'similarity_factors': [],
@@ -1232,84 +1242,128 @@ class StadiumSpirit:
         
         return patterns
     
-    def _get_stadium_data(self, stadium_name):
+    def _get_stadium_data(self, stadium_name, home_team=None):
         """Obtenir les données d'un stade (ou simuler si non disponibles)."""
         # Vérifier si le stade est dans la base de données
         if stadium_name in self.stadium_database:
             return self.stadium_database[stadium_name]
         
-        # Sinon, générer des données simulées
+        # Sinon, lire le profil partagé entre modules, construit une seule fois par stade
+        stadium_data = self.venue_store.cached(
+            'stadium', stadium_name, lambda: self._build_stadium_data(stadium_name, home_team)
+        )
+        
+        # Sauvegarder dans la base de données
+        self.stadium_database[stadium_name] = stadium_data
+        
+        return stadium_data
+    
+    def _build_stadium_data(self, stadium_name, home_team=None):
+        """Construire le profil d'un stade : archive si connue, caractéristiques physiques simulées."""
+        # Générateur déterministe : un même stade garde le même profil d'une session à l'autre
+        rng = random.Random(f"stadium:{stadium_name}")
         current_year = datetime.now().year
         
         # Simuler différents types de stades
         stadium_types = [
             {
                 'name': 'Modern Arena',
-                'construction_year': random.randint(2000, current_year - 5),
-                'capacity': random.randint(40000, 70000),
-                'roof_coverage': random.uniform(0.5, 1.0),
-                'pitch_quality': random.uniform(0.8, 1.0),
-                'historical_significance': random.uniform(0.1, 0.4),
-                'acoustic_properties': random.uniform(0.4, 0.8),
+                'construction_year': rng.randint(2000, current_year - 5),
+                'capacity': rng.randint(40000, 70000),
+                'roof_coverage': rng.uniform(0.5, 1.0),
+                'pitch_quality': rng.uniform(0.8, 1.0),
+                'historical_significance': rng.uniform(0.1, 0.4),
+                'acoustic_properties': rng.uniform(0.4, 0.8),
                 'architectural_design': 'modern'
             },
             {
                 'name': 'Historic Stadium',
-                'construction_year': random.randint(1900, 1980),
-                'capacity': random.randint(30000, 60000),
-                'roof_coverage': random.uniform(0.0, 0.5),
-                'pitch_quality': random.uniform(0.6, 0.9),
-                'historical_significance': random.uniform(0.7, 1.0),
-                'acoustic_properties': random.uniform(0.6, 0.9),
+                'construction_year': rng.randint(1900, 1980),
+                'capacity': rng.randint(30000, 60000),
+                'roof_coverage': rng.uniform(0.0, 0.5),
+                'pitch_quality': rng.uniform(0.6, 0.9),
+                'historical_significance': rng.uniform(0.7, 1.0),
+                'acoustic_properties': rng.uniform(0.6, 0.9),
                 'architectural_design': 'traditional'
             },
             {
                 'name': 'Compact Ground',
-                'construction_year': random.randint(1950, 1990),
-                'capacity': random.randint(15000, 35000),
-                'roof_coverage': random.uniform(0.3, 0.7),
-                'pitch_quality': random.uniform(0.5, 0.8),
-                'historical_significance': random.uniform(0.5, 0.8),
-                'acoustic_properties': random.uniform(0.7, 1.0),
+                'construction_year': rng.randint(1950, 1990),
+                'capacity': rng.randint(15000, 35000),
+                'roof_coverage': rng.uniform(0.3, 0.7),
+                'pitch_quality': rng.uniform(0.5, 0.8),
+                'historical_significance': rng.uniform(0.5, 0.8),
+                'acoustic_properties': rng.uniform(0.7, 1.0),
                 'architectural_design': 'compact'
             },
             {
                 'name': 'Iconic Venue',
-                'construction_year': random.randint(1910, 1970),
-                'capacity': random.randint(50000, 90000),
-                'roof_coverage': random.uniform(0.2, 0.6),
-                'pitch_quality': random.uniform(0.7, 1.0),
-                'historical_significance': random.uniform(0.8, 1.0),
-                'acoustic_properties': random.uniform(0.7, 0.9),
+                'construction_year': rng.randint(1910, 1970),
+                'capacity': rng.randint(50000, 90000),
+                'roof_coverage': rng.uniform(0.2, 0.6),
+                'pitch_quality': rng.uniform(0.7, 1.0),
+                'historical_significance': rng.uniform(0.8, 1.0),
+                'acoustic_properties': rng.uniform(0.7, 0.9),
                 'architectural_design': 'iconic'
             }
         ]
         
         # Choisir un type de stade et personnaliser pour le nom fourni
-        stadium_type = random.choice(stadium_types)
+        stadium_type = rng.choice(stadium_types)
         stadium_data = {
             'name': stadium_name,
             'construction_year': stadium_type['construction_year'],
             'capacity': stadium_type['capacity'],
             'roof_coverage': stadium_type['roof_coverage'],
             'pitch_quality': stadium_type['pitch_quality'],
-            'pitch_dimensions': f"{random.randint(100, 110)}x{random.randint(65, 75)}",
-            'altitude': random.randint(0, 500),
+            'pitch_dimensions': f"{rng.randint(100, 110)}x{rng.randint(65, 75)}",
+            'altitude': rng.randint(0, 500),
             'historical_significance': stadium_type['historical_significance'],
             'acoustic_properties': stadium_type['acoustic_properties'],
             'architectural_design': stadium_type['architectural_design'],
-            'renovations': random.randint(0, 3),
-            'spatial_configuration': random.choice(['compact', 'open', 'balanced']),
-            'orientation': random.choice(['north-south', 'east-west', 'northeast-southwest'])
+            'renovations': rng.randint(0, 3),
+            'spatial_configuration': rng.choice(['compact', 'open', 'balanced']),
+            'orientation': rng.choice(['north-south', 'east-west', 'northeast-southwest'])
         }
         
-        # Sauvegarder dans la base de données
-        self.stadium_database[stadium_name] = stadium_data
+        # Compléter avec l'historique réel du stade lorsque l'archive le connaît
+        profile = self.venue_store.get_venue_profile(stadium_name, home_team)
+        if profile:
+            stadium_data['resident_team'] = profile['venue']
+            stadium_data['archived_seasons'] = len(profile['seasons'])
+            stadium_data['historical_significance'] = max(
+                stadium_data['historical_significance'], min(1.0, 0.3 + 0.05 * len(profile['seasons']))
+            )
         
         return stadium_data
     
     def _get_historical_data(self, stadium_name, team_name=None):
         """Obtenir les données historiques d'un stade (ou simuler si non disponibles)."""
+        # Profil précalculé de l'archive : par nom de stade, sinon par équipe résidente
+        profile = self.venue_store.get_venue_profile(stadium_name)
+        if profile is None and team_name:
+            profile = self.venue_store.get_venue_profile(home_team=team_name)
+        if profile is None:
+            return self._simulate_historical_data(stadium_name, team_name)
+        
+        return {
+            'stadium': stadium_name,
+            'resident_team': profile['venue'],
+            'total_matches': profile['total_matches'],
+            'home_win_rate': profile['home_win_rate'],
+            'home_draw_rate': profile['home_draw_rate'],
+            'home_loss_rate': profile['home_loss_rate'],
+            'significant_events': list(profile['significant_events']),
+            'rivalry_level': dict(profile['rivalry_level']),
+            'historical_performance': {
+                'goals_scored_avg': profile['goals_scored_avg'],
+                'goals_conceded_avg': profile['goals_conceded_avg'],
+                'clean_sheets_rate': profile['clean_sheets_rate']
+            }
+        }
+    
+    def _simulate_historical_data(self, stadium_name, team_name=None):
+        """Simuler les données historiques d'un stade absent de l'archive."""
         # Simuler des données historiques
         num_seasons = random.randint(5, 30)
         matches_per_season = random.randint(15, 25)
@@ -1412,6 +1466,17 @@ class StadiumSpirit:
     
     def _get_atmospheric_conditions(self, match_data):
         """Obtenir les conditions atmosphériques (ou simuler si non disponibles)."""
+        # Une seule simulation par match, partagée entre modules et minutes de jeu
+        match_key = (match_data.get('stadium'), match_data.get('home_team'),
+                     match_data.get('away_team'), str(match_data.get('date', ''))[:10])
+        return self.venue_store.cached(
+            'atmosphere', match_key, lambda: self._simulate_atmospheric_conditions(match_data, match_key)
+        )
+    
+    def _simulate_atmospheric_conditions(self, match_data, match_key):
+        """Simuler des conditions atmosphériques déterministes pour un match."""
+        rng = random.Random("atmosphere:" + "|".join(str(part) for part in match_key))
+        
         # Simuler des conditions atmosphériques
         weather_types = ['clear', 'partly_cloudy', 'cloudy', 'light_rain', 'heavy_rain', 'snow']
         time_of_day = ['morning', 'afternoon', 'evening', 'night']
@@ -1444,35 +1509,35 @@ class StadiumSpirit:
             'winter': (-5, 10)
         }
         temp_range = temperature_ranges.get(season, (10, 25))
-        temperature = random.uniform(temp_range[0], temp_range[1])
+        temperature = rng.uniform(temp_range[0], temp_range[1])
         
         # Générer des conditions météorologiques plus probables selon la saison
         if season == 'winter':
-            weather = random.choices(weather_types, weights=[0.1, 0.2, 0.2, 0.2, 0.1, 0.2])[0]
+            weather = rng.choices(weather_types, weights=[0.1, 0.2, 0.2, 0.2, 0.1, 0.2])[0]
         elif season == 'summer':
-            weather = random.choices(weather_types, weights=[0.4, 0.3, 0.1, 0.1, 0.1, 0.0])[0]
+            weather = rng.choices(weather_types, weights=[0.4, 0.3, 0.1, 0.1, 0.1, 0.0])[0]
         else:
-            weather = random.choices(weather_types, weights=[0.2, 0.3, 0.2, 0.2, 0.1, 0.0])[0]
+            weather = rng.choices(weather_types, weights=[0.2, 0.3, 0.2, 0.2, 0.1, 0.0])[0]
         
         # Générer des précipitations cohérentes avec la météo
         precipitation = 0
         if weather == 'light_rain':
-            precipitation = random.uniform(1, 5)
+            precipitation = rng.uniform(1, 5)
         elif weather == 'heavy_rain':
-            precipitation = random.uniform(5, 20)
+            precipitation = rng.uniform(5, 20)
         elif weather == 'snow':
-            precipitation = random.uniform(1, 10)
+            precipitation = rng.uniform(1, 10)
         
         # Générer des conditions atmosphériques complètes
         atmospheric_conditions = {
             'weather': weather,
             'temperature': temperature,
             'precipitation': precipitation,
-            'wind': random.uniform(0, 40),
-            'time_of_day': random.choice(time_of_day),
+            'wind': rng.uniform(0, 40),
+            'time_of_day': rng.choice(time_of_day),
             'season': season,
-            'moon_phase': random.choice(moon_phases),
-            'solar_activity': random.choices(solar_activities, weights=[0.4, 0.5, 0.09, 0.01])[0]
+            'moon_phase': rng.choice(moon_phases),
+            'solar_activity': rng.choices(solar_activities, weights=[0.4, 0.5, 0.09, 0.01])[0]
         }
         
         return atmospheric_conditions
@@ -22,7 +22,9 @@ from api.data_integration_hub import DataIntegrationHub
 # Importer les composants améliorés
 try:
     from modules.enhanced_components import get_enhanced_components
-    enhanced_components = get_enhanced_components()
+    from modules.meta_systems import get_meta_systems
+    # MetaSystems partagé : les alertes de cotes en flux sont publiées sur son bus d'événements
+    enhanced_components = get_enhanced_components(get_meta_systems())
     
     # Récupération des composants améliorés
     ShadowOddsPlusEnhanced = enhanced_components.get_component('shadow_odds_plus')
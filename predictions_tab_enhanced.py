@@ -37,6 +37,9 @@ from api.transfermarkt_integration import (
     get_team_profile
 )
 
+# Table d'enrichissement partagée par programme de matchs
+from utils.enrichment_planner import get_enrichment_planner
+
 # Imports de nos NOUVEAUX modules de données avancées
 try:
     # Pour éviter les problèmes de récursion, on n'importe que les modules existants
@@ -77,7 +80,7 @@ except ImportError:
     ADVANCED_INSIGHTS_AVAILABLE = False
 
 # Fonction pour générer des probabilités pour un match avec données enrichies
-def generate_enhanced_match_probabilities(match_id, home_team, away_team, home_team_id=None, away_team_id=None, leagues=None, league_id=None):
+def generate_enhanced_match_probabilities(match_id, home_team, away_team, home_team_id=None, away_team_id=None, leagues=None, league_id=None, enrichment=None):
     """
     Génère des probabilités avancées pour un match spécifique en utilisant toutes les sources
     de données disponibles (Transfermarkt, soccerdata, détails des joueurs et managers).
@@ -89,6 +92,7 @@ def generate_enhanced_match_probabilities(match_id, home_team, away_team, home_t
         home_team_id (int, optional): ID de l'équipe à domicile dans l'API
         away_team_id (int, optional): ID de l'équipe à l'extérieur dans l'API
         league_id (int, optional): ID de la ligue dans l'API
+        enrichment (EnrichmentTable, optional): Table d'enrichissement du programme
         
     Returns:
         dict: Probabilités enrichies pour le match
@@ -104,13 +108,17 @@ def generate_enhanced_match_probabilities(match_id, home_team, away_team, home_t
         'date': datetime.now().strftime('%Y-%m-%d')
     }
     
-    # Récupérer des statistiques détaillées si disponibles
+    # Lire les statistiques détaillées depuis la table d'enrichissement du programme
     try:
-        home_stats = get_team_statistics(home_team_id) if home_team_id else {}
-        away_stats = get_team_statistics(away_team_id) if away_team_id else {}
-        h2h_data = get_h2h_matches(home_team_id, away_team_id) if home_team_id and away_team_id else []
+        if enrichment is None:
+            enrichment = get_enrichment_planner().enrich_slate([match_data])
+        match_enrichment = enrichment.for_match(match_data)
+        home_stats = match_enrichment['home_stats'] or {}
+        away_stats = match_enrichment['away_stats'] or {}
+        h2h_data = match_enrichment['h2h'] or []
     except Exception as e:
         logger.warning(f"Erreur lors de la récupération des statistiques détaillées: {e}")
+        enrichment = None
         home_stats = {}
         away_stats = {}
         h2h_data = []
@@ -132,29 +140,11 @@ def generate_enhanced_match_probabilities(match_id, home_team, away_team, home_t
                 logger.error(f"Erreur lors de l'enrichissement des données: {e}")
                 enhanced_data = match_data
             
-            # Récupérer des détails sur les équipes (implémentation sécurisée)
-            try:
-                # Créer une fonction de récupération des détails équipe avec gestion d'erreurs
-                def get_safe_team_details(team_name):
-                    try:
-                        # Chercher l'équipe via Transfermarkt si disponible
-                        if is_transfermarkt_available():
-                            from api.transfermarkt_integration import search_club_by_name
-                            club_info = search_club_by_name(team_name)
-                            if club_info and len(club_info) > 0:
-                                return club_info[0]
-                        return {"name": team_name}
-                    except Exception as e:
-                        logger.error(f"Erreur lors de la récupération des détails de l'équipe {team_name}: {e}")
-                        return {"name": team_name}
-                
-                # Utiliser notre fonction sécurisée
-                home_team_details = get_safe_team_details(home_team)
-                away_team_details = get_safe_team_details(away_team)
-            except Exception as e:
-                logger.error(f"Erreur lors de la récupération des détails des équipes: {e}")
-                home_team_details = {"name": home_team}
-                away_team_details = {"name": away_team}
+            # Détails des équipes (fiche Transfermarkt) issus de la table d'enrichissement
+            if enrichment is not None:
+                enhanced_data = enrichment.join(enhanced_data)
+            home_team_details = enhanced_data.get('home_club') or {"name": home_team}
+            away_team_details = enhanced_data.get('away_club') or {"name": away_team}
             
             # Utiliser ces données pour améliorer les probabilités
             if ADVANCED_INSIGHTS_AVAILABLE:
@@ -223,10 +213,10 @@ def generate_enhanced_match_probabilities(match_id, home_team, away_team, home_t
     
     # Retomber sur la méthode traditionnelle si les nouvelles sources ne sont pas disponibles
     # ou si une erreur s'est produite
-    return generate_match_probabilities(match_id, home_team, away_team, home_team_id, away_team_id, leagues=leagues, league_id=league_id)
+    return generate_match_probabilities(match_id, home_team, away_team, home_team_id, away_team_id, leagues=leagues, league_id=league_id, enrichment=enrichment)
 
 # Fonction originale pour générer des probabilités pour un match (comme fallback)
-def generate_match_probabilities(match_id, home_team, away_team, home_team_id=None, away_team_id=None, leagues=None, league_id=None):
+def generate_match_probabilities(match_id, home_team, away_team, home_team_id=None, away_team_id=None, leagues=None, league_id=None, enrichment=None):
     """
     Génère des probabilités pour un match spécifique.
     Utilise des données réelles lorsque disponibles pour améliorer la précision,
@@ -239,15 +229,26 @@ def generate_match_probabilities(match_id, home_team, away_team, home_team_id=No
         home_team_id (int, optional): ID de l'équipe à domicile dans l'API
         away_team_id (int, optional): ID de l'équipe à l'extérieur dans l'API
         league_id (int, optional): ID de la ligue dans l'API
+        enrichment (EnrichmentTable, optional): Table d'enrichissement du programme
         
     Returns:
         dict: Probabilités générées pour le match
     """
-    # Récupérer des statistiques détaillées si disponibles
+    # Lire les statistiques détaillées depuis la table d'enrichissement du programme
+    slate_match = {
+        'home_team': home_team,
+        'away_team': away_team,
+        'home_team_id': home_team_id,
+        'away_team_id': away_team_id,
+        'league_id': league_id
+    }
     try:
-        home_stats = get_team_statistics(home_team_id) if home_team_id else {}
-        away_stats = get_team_statistics(away_team_id) if away_team_id else {}
-        h2h_data = get_h2h_matches(home_team_id, away_team_id) if home_team_id and away_team_id else []
+        if enrichment is None:
+            enrichment = get_enrichment_planner().enrich_slate([slate_match], include_players=False)
+        match_enrichment = enrichment.for_match(slate_match)
+        home_stats = match_enrichment['home_stats'] or {}
+        away_stats = match_enrichment['away_stats'] or {}
+        h2h_data = match_enrichment['h2h'] or []
         has_detailed_data = bool(home_stats and away_stats)
     except Exception as e:
         logger.warning(f"Erreur lors de la récupération des statistiques: {e}")
@@ -350,8 +351,11 @@ def generate_enhanced_match_insights(home_team, away_team, home_stats={}, away_s
     # Vérifier si le module d'insights avancés est disponible
     if ADVANCED_INSIGHTS_AVAILABLE and DATA_HUB_AVAILABLE and match_data:
         try:
-            # Enrichir les données du match avec toutes les sources disponibles
-            enhanced_data = enhance_match_data(match_data)
+            # Enrichir les données du match, sauf si la table du programme l'a déjà fait
+            if match_data.get('slate_enriched'):
+                enhanced_data = match_data
+            else:
+                enhanced_data = get_enrichment_planner().enrich_slate([match_data]).join(match_data)
             
             # Générer des insights avancés
             advanced_insights = generate_match_insights(enhanced_data)
@@ -809,11 +813,28 @@ def display_enhanced_predictions_tab():
         st.error(f"Erreur lors de la récupération des matchs à venir: {e}")
         return
     
+    # Enrichir tout le programme en une fois : chaque équipe et confrontation n'est récupérée qu'une fois.
+    # Seules les sources rapides (statistiques, confrontations) sont interrogées pour le programme ;
+    # le préchargement ne remplit que le cache du planificateur et n'est relancé que si le programme change.
+    for match in upcoming_matches:
+        match.setdefault('league_id', selected_league.get('id'))
+    slate_key = tuple((match.get('id'), match.get('home_team_id'), match.get('away_team_id'), match.get('league_id'))
+                      for match in upcoming_matches)
+    if st.session_state.get('predictions_slate_key') != slate_key:
+        get_enrichment_planner().enrich_slate(
+            upcoming_matches, include_players=False, include_clubs=False
+        )
+        st.session_state['predictions_slate_key'] = slate_key
+    
     # Sélectionner un match
     match_options = [f"{match['home_team']} vs {match['away_team']} ({match['date']})" for match in upcoming_matches]
     selected_match_idx = st.selectbox("Sélectionner un match", range(len(match_options)), format_func=lambda i: match_options[i])
     selected_match = upcoming_matches[selected_match_idx]
     
+    # Fiches clubs et effectifs Transfermarkt (1 req/s) : uniquement pour le match sélectionné ;
+    # statistiques et confrontations sont servies par le cache du planificateur
+    slate_enrichment = get_enrichment_planner().enrich_slate([selected_match], include_players=True)
+    
     # Afficher une carte détaillée du match
     match_date = datetime.fromisoformat(selected_match['date'].replace('Z', '+00:00'))
     date_string = match_date.strftime('%d/%m/%Y %H:%M')
@@ -868,7 +889,9 @@ def display_enhanced_predictions_tab():
             away_team=selected_match['away_team'],
             home_team_id=selected_match.get('home_team_id'),
             away_team_id=selected_match.get('away_team_id'),
-            leagues=leagues
+            leagues=leagues,
+            league_id=selected_league['id'],
+            enrichment=slate_enrichment
         )
     else:
         leagues = [selected_league['id']] if 'id' in selected_league else None
@@ -878,7 +901,9 @@ def display_enhanced_predictions_tab():
             away_team=selected_match['away_team'],
             home_team_id=selected_match.get('home_team_id'),
             away_team_id=selected_match.get('away_team_id'),
-            leagues=leagues
+            leagues=leagues,
+            league_id=selected_league['id'],
+            enrichment=slate_enrichment
         )
     
     # Afficher le graphique des probabilités
@@ -917,9 +942,10 @@ def display_enhanced_predictions_tab():
     
     # Récupérer des données statistiques si disponibles
     try:
-        home_stats = get_team_statistics(selected_match.get('home_team_id', None))
-        away_stats = get_team_statistics(selected_match.get('away_team_id', None))
-        h2h_data = get_h2h_matches(selected_match.get('home_team_id', None), selected_match.get('away_team_id', None))
+        match_enrichment = slate_enrichment.for_match(selected_match)
+        home_stats = match_enrichment['home_stats'] or {}
+        away_stats = match_enrichment['away_stats'] or {}
+        h2h_data = match_enrichment['h2h'] or []
     except Exception as e:
         home_stats = {}
         away_stats = {}
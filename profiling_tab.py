@@ -0,0 +1,148 @@
+"""
+Module pour l'onglet Profilage d'ArcanShadow.
+Ce module affiche les latences mesurées pour chaque point d'entrée des analyseurs
+(appels, p50/p95/p99, erreurs, taux de succès du cache), permet d'exporter le rapport
+en JSON et de capturer un profil détaillé (cProfile/pyinstrument) de l'analyse d'un match.
+"""
+
+import streamlit as st
+import pandas as pd
+import plotly.express as px
+from datetime import datetime
+import logging
+
+from utils.module_profiler import get_module_profiler, PYINSTRUMENT_AVAILABLE
+
+# Configuration du logging
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+# Match utilisé pour la capture lorsqu'aucun match n'est sélectionné
+DEFAULT_CAPTURE_MATCH = {
+    'home_team': 'Paris Saint-Germain',
+    'away_team': 'Olympique de Marseille',
+    'league': 'Ligue 1',
+    'date': datetime.now().strftime('%Y-%m-%d'),
+    'odds': {'home': 1.65, 'draw': 3.9, 'away': 5.2}
+}
+
+
+def create_latency_chart(entry_points, top=15):
+    """
+    Crée le graphique des latences p50/p95/p99 des points d'entrée les plus coûteux.
+
+    Args:
+        entry_points (list): Lignes du rapport du profileur
+        top (int): Nombre de points d'entrée affichés
+
+    Returns:
+        plotly.graph_objects.Figure: Graphique en barres groupées
+    """
+    df = pd.DataFrame(entry_points[:top])
+    df['label'] = df['module'] + '.' + df['entry_point']
+    df = df.melt(id_vars='label', value_vars=['p50_ms', 'p95_ms', 'p99_ms'],
+                 var_name='percentile', value_name='ms')
+    fig = px.bar(df, x='ms', y='label', color='percentile', barmode='group', orientation='h',
+                 color_discrete_sequence=['#7038FF', '#01FF80', '#FF6B6B'])
+    fig.update_layout(
+        height=max(300, 40 * min(top, len(entry_points))),
+        plot_bgcolor='rgba(25, 25, 44, 0.0)',
+        paper_bgcolor='rgba(25, 25, 44, 0.0)',
+        margin=dict(l=40, r=40, t=30, b=40),
+        yaxis={'categoryorder': 'total ascending'},
+        xaxis_title='Latence (ms)',
+        yaxis_title=None
+    )
+    return fig
+
+
+def _capture_match_analysis(match, engine):
+    """Exécute l'analyse MetaSystems d'un match sous profileur détaillé."""
+    if 'profiling_meta_systems' not in st.session_state:
+        from modules.meta_systems import MetaSystems
+        st.session_state.profiling_meta_systems = MetaSystems()
+    meta_systems = st.session_state.profiling_meta_systems
+    return get_module_profiler().capture(meta_systems.update_system, match, engine=engine)
+
+
+def display_profiling_tab():
+    """
+    Affiche l'onglet Profilage des modules.
+    """
+    st.markdown("## ⏱️ Profilage des modules")
+    st.markdown("Latence et nombre d'appels des points d'entrée `analyze_*` / `predict_*` des analyseurs.")
+
+    profiler = get_module_profiler()
+
+    col1, col2, col3 = st.columns(3)
+    with col1:
+        enabled = st.toggle("Mesures actives", value=profiler.enabled)
+        if enabled and not profiler.enabled:
+            profiler.enable()
+        elif not enabled and profiler.enabled:
+            profiler.disable()
+    with col2:
+        if st.button("Réinitialiser les mesures"):
+            profiler.reset()
+    with col3:
+        st.download_button(
+            "Exporter en JSON",
+            data=profiler.export_json(),
+            file_name=f"arcanshadow_profile_{datetime.now().strftime('%Y%m%d_%H%M%S')}.json",
+            mime="application/json"
+        )
+
+    report = profiler.get_report()
+    entry_points = report['entry_points']
+
+    if not entry_points:
+        st.info("Aucune mesure pour le moment. Activez les mesures puis lancez des analyses.")
+    else:
+        total_calls = sum(row['calls'] for row in entry_points)
+        total_ms = sum(row['total_ms'] for row in entry_points)
+        metric1, metric2, metric3 = st.columns(3)
+        metric1.metric("Points d'entrée mesurés", len(entry_points))
+        metric2.metric("Appels", total_calls)
+        metric3.metric("Temps cumulé", f"{total_ms / 1000:.2f} s")
+
+        st.markdown("### Latences par point d'entrée")
+        st.plotly_chart(create_latency_chart(entry_points), use_container_width=True)
+
+        st.dataframe(pd.DataFrame(entry_points), use_container_width=True, hide_index=True)
+
+    if report['cache']:
+        st.markdown("### Cache de prédictions par module")
+        cache_df = pd.DataFrame([
+            {'module': module, **counters} for module, counters in report['cache'].items()
+        ]).sort_values('hit_ratio')
+        st.dataframe(cache_df, use_container_width=True, hide_index=True)
+
+    st.markdown("### Capture détaillée d'une analyse")
+    match = st.session_state.get('selected_match') or DEFAULT_CAPTURE_MATCH
+    st.caption(f"Match analysé : {match.get('home_team', '?')} - {match.get('away_team', '?')}")
+    engines = ['cprofile'] + (['pyinstrument'] if PYINSTRUMENT_AVAILABLE else [])
+    engine = st.selectbox("Profileur", engines)
+
+    if st.button("Capturer l'analyse MetaSystems"):
+        try:
+            with st.spinner("Analyse en cours..."):
+                capture = _capture_match_analysis(match, engine)
+            st.success(f"Analyse capturée en {capture['elapsed_ms']:.1f} ms ({capture['engine']})")
+            if capture['functions']:
+                st.dataframe(pd.DataFrame(capture['functions']), use_container_width=True, hide_index=True)
+            with st.expander("Rapport brut"):
+                st.text(capture['report'])
+        except Exception as e:
+            logger.error(f"Erreur lors de la capture du profil: {e}")
+            st.error(f"Capture impossible : {e}")
+
+
+def add_profiling_tab(tab):
+    """
+    Ajoute l'onglet Profilage à l'application principale.
+
+    Args:
+        tab: Objet tab Streamlit
+    """
+    with tab:
+        display_profiling_tab()
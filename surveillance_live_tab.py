@@ -2,72 +2,52 @@
 Module complet pour l'onglet Surveillance en direct avec des données réelles de football.
 """
 import streamlit as st
-import os
-import requests
 import random
 import pandas as pd
 import matplotlib.pyplot as plt
 import numpy as np
 from datetime import datetime, timedelta
 
+from utils.live_feed import get_live_feed
+
 def get_real_football_matches():
     """
-    Récupère les matchs en direct depuis l'API Football.
+    Récupère les matchs en direct depuis le flux partagé de l'API Football.
     
     Returns:
         list: Liste des matchs en direct
     """
     try:
-        # Récupérer la clé API
-        api_key = os.environ.get('FOOTBALL_API_KEY')
+        # Le flux partagé interroge l'API une seule fois pour toutes les sessions
+        snapshot = get_live_feed().get_snapshot()
         
-        if not api_key:
+        if snapshot is None or snapshot['status'] == 'no_api_key':
             st.warning("Clé API Football non trouvée. Utilisation de données simulées.")
             return []
         
-        # Préparer la requête
-        headers = {
-            'X-RapidAPI-Key': api_key,
-            'X-RapidAPI-Host': 'api-football-v1.p.rapidapi.com'
-        }
-        
-        # Récupérer les matchs en direct
-        url = "https://api-football-v1.p.rapidapi.com/v3/fixtures"
-        params = {"live": "all"}
-        
-        # Exécuter la requête
-        response = requests.get(url, headers=headers, params=params)
-        data = response.json()
+        if snapshot['status'] == 'error':
+            st.error(f"Erreur lors de la récupération des matchs en direct: {snapshot['error']}")
         
         # Transformer les données
         formatted_matches = []
         
-        if data.get('response'):
-            st.success(f"Données réelles: {len(data['response'])} matchs en direct trouvés via l'API Football")
+        if snapshot['matches']:
+            st.success(f"Données réelles: {len(snapshot['matches'])} matchs en direct trouvés via l'API Football")
             
-            for idx, fixture in enumerate(data.get('response', [])):
-                fixture_data = fixture.get('fixture', {})
-                teams = fixture.get('teams', {})
-                goals = fixture.get('goals', {})
-                league = fixture.get('league', {})
-                
-                # Calculer la minute actuelle
-                status = fixture_data.get('status', {})
-                minute = status.get('elapsed', 0)
-                
+            for idx, match in enumerate(snapshot['matches']):
                 match_data = {
                     "id": idx + 1,
-                    "home": teams.get('home', {}).get('name', ''),
-                    "away": teams.get('away', {}).get('name', ''),
-                    "league": league.get('name', ''),
+                    "home": match['home_team'],
+                    "away": match['away_team'],
+                    "league": match['league'],
                     "time": datetime.now().strftime("%H:%M"),
                     "status": "En direct",
-                    "minute": f"{minute}'",
-                    "score": f"{goals.get('home', 0)}-{goals.get('away', 0)}",
+                    "minute": f"{match['minute']}'",
+                    "score": f"{match['home_score']}-{match['away_score']}",
                     # Ajout des champs pour compatibilité avec l'application
-                    "home_team": teams.get('home', {}).get('name', ''),
-                    "away_team": teams.get('away', {}).get('name', ''),
-                    "period": status.get('long', 'En direct'),
+                    "home_team": match['home_team'],
+                    "away_team": match['away_team'],
+                    "period": match['status_long'],
                 }
                 
                 formatted_matches.append(match_data)
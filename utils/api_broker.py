@@ -0,0 +1,487 @@
+"""
+APIBroker - Courtier central des requêtes vers les API football pour ArcanShadow
+Ce module fait passer tous les appels aux API à quota (RapidAPI API-Football, API-Sports,
+football-data.org, The Odds API) par un seul point :
+- fusion des requêtes identiques en vol (single-flight)
+- seau à jetons par fournisseur calé sur les quotas de nos abonnements (minute et jour)
+- classes de priorité (direct > à venir > historique), les classes basses ne consommant
+  jamais la réserve des classes hautes
+- service « stale-while-revalidate » depuis le CacheManager : un quota épuisé dégrade
+  la fraîcheur des données au lieu de faire échouer les pages, dans la limite d'un âge
+  maximal par classe de priorité
+- compteurs de quota persistés dans la base SQLite du cache, partagés entre processus
+"""
+
+import logging
+import sqlite3
+import threading
+import time
+from concurrent.futures import Future, ThreadPoolExecutor
+from urllib.parse import urlencode
+
+import requests
+
+from utils.cache_manager import CacheManager
+
+# Configuration du logger
+logging.basicConfig(
+    level=logging.INFO,
+    format='%(asctime)s - %(name)s - %(levelname)s - %(message)s'
+)
+logger = logging.getLogger('api_broker')
+
+# Classes de priorité
+PRIORITY_LIVE = 0
+PRIORITY_UPCOMING = 1
+PRIORITY_BACKFILL = 2
+
+PRIORITY_NAMES = {
+    PRIORITY_LIVE: 'live',
+    PRIORITY_UPCOMING: 'upcoming',
+    PRIORITY_BACKFILL: 'backfill',
+}
+
+# Part du seau et du quota journalier réservée aux classes plus prioritaires
+PRIORITY_RESERVE = {
+    PRIORITY_LIVE: 0.0,
+    PRIORITY_UPCOMING: 0.2,
+    PRIORITY_BACKFILL: 0.5,
+}
+
+# Attente maximale d'un jeton quand aucune donnée, même périmée, n'est en cache (secondes)
+PRIORITY_MAX_WAIT = {
+    PRIORITY_LIVE: 3.0,
+    PRIORITY_UPCOMING: 5.0,
+    PRIORITY_BACKFILL: 30.0,
+}
+
+# Quotas des abonnements : requêtes par minute et par jour (None = illimité)
+PROVIDER_QUOTAS = {
+    'api-football': {'per_minute': 30, 'per_day': 100},
+    'api-sports': {'per_minute': 10, 'per_day': 100},
+    'football-data': {'per_minute': 10, 'per_day': None},
+    'odds-api': {'per_minute': 10, 'per_day': 16},
+    'default': {'per_minute': 30, 'per_day': None},
+}
+
+# Paramètres d'authentification exclus des clés de cache
+SECRET_PARAMS = {'apiKey', 'api_key', 'key', 'token'}
+
+# Durée de fraîcheur par défaut selon la priorité (secondes)
+PRIORITY_TTL = {
+    PRIORITY_LIVE: 30,
+    PRIORITY_UPCOMING: 30 * 60,
+    PRIORITY_BACKFILL: 24 * 60 * 60,
+}
+
+# Âge maximal, au-delà de l'expiration, d'une donnée périmée encore servie (secondes) ;
+# plus vieille, elle est ignorée : requête synchrone, ou `default` si elle échoue
+PRIORITY_MAX_STALENESS = {
+    PRIORITY_LIVE: 2 * 60,
+    PRIORITY_UPCOMING: 6 * 60 * 60,
+    PRIORITY_BACKFILL: 7 * 24 * 60 * 60,
+}
+
+
+class UpstreamError(Exception):
+    """Réponse invalide d'un fournisseur (code HTTP différent de 200)."""
+
+    def __init__(self, provider, status_code):
+        super().__init__(f"{provider}: HTTP {status_code}")
+        self.provider = provider
+        self.status_code = status_code
+
+
+class _ProviderBudget:
+    """
+    Seau à jetons d'un fournisseur, doublé d'un compteur journalier (UTC).
+    Une requête de priorité p ne prend un jeton que s'il en reste au moins la
+    réserve des classes plus prioritaires après consommation.
+
+    Avec une base SQLite, l'état du seau est relu et réécrit dans une transaction
+    à chaque opération : tous les processus partagent ainsi le même quota.
+    """
+
+    def __init__(self, per_minute, per_day=None, provider=None, db_path=None):
+        self.capacity = float(per_minute)
+        self.rate = per_minute / 60.0
+        self.per_day = per_day
+        self.provider = provider
+        self.db_path = db_path
+        self._tokens = float(per_minute)
+        self._last = time.time()
+        self._day = time.strftime('%Y-%m-%d', time.gmtime())
+        self._used_today = 0
+        self._lock = threading.Lock()
+
+    def _refill(self):
+        now = time.time()
+        self._tokens = min(self.capacity, self._tokens + max(0.0, now - self._last) * self.rate)
+        self._last = now
+        today = time.strftime('%Y-%m-%d', time.gmtime())
+        if today != self._day:
+            self._day = today
+            self._used_today = 0
+
+    def _update(self, operation):
+        """
+        Applique une opération à l'état du seau (verrou détenu), en le synchronisant
+        avec la base si elle est configurée. En cas d'erreur de la base, l'état
+        en mémoire est utilisé.
+        """
+        if self.db_path is None:
+            self._refill()
+            return operation()
+        conn = None
+        try:
+            conn = sqlite3.connect(self.db_path, timeout=5)
+            conn.isolation_level = None
+            conn.execute("BEGIN IMMEDIATE")
+            row = conn.execute(
+                "SELECT tokens, updated_at, day, used_today FROM api_budget WHERE provider = ?",
+                (self.provider,)
+            ).fetchone()
+            if row is not None:
+                self._tokens, self._last, self._day, self._used_today = row
+            self._refill()
+            result = operation()
+            conn.execute(
+                "INSERT OR REPLACE INTO api_budget (provider, tokens, updated_at, day, used_today) "
+                "VALUES (?, ?, ?, ?, ?)",
+                (self.provider, self._tokens, self._last, self._day, self._used_today)
+            )
+            conn.execute("COMMIT")
+            return result
+        except sqlite3.Error as e:
+            logger.warning(f"Quota {self.provider} non synchronisé avec la base: {e}")
+            if conn is not None and conn.in_transaction:
+                conn.execute("ROLLBACK")
+            self._refill()
+            return operation()
+        finally:
+            if conn is not None:
+                conn.close()
+
+    def try_acquire(self, priority):
+        """
+        Prend un jeton sans attendre.
+
+        Args:
+            priority (int): Classe de priorité de la requête
+
+        Returns:
+            float: 0 si un jeton a été pris, sinon délai estimé avant le prochain
+                jeton (inf si le quota journalier est épuisé pour cette classe)
+        """
+        reserve = PRIORITY_RESERVE.get(priority, 0.0)
+
+        def take():
+            if self.per_day is not None and self._used_today + 1 > self.per_day * (1.0 - reserve):
+                return float('inf')
+            floor = self.capacity * reserve
+            if self._tokens - 1.0 >= floor:
+                self._tokens -= 1.0
+                self._used_today += 1
+                return 0.0
+            return (floor + 1.0 - self._tokens) / self.rate
+
+        with self._lock:
+            return self._update(take)
+
+    def acquire(self, priority, max_wait):
+        """
+        Attend un jeton au plus `max_wait` secondes.
+
+        Returns:
+            bool: True si un jeton a été pris
+        """
+        deadline = time.monotonic() + max_wait
+        while True:
+            wait = self.try_acquire(priority)
+            if wait == 0.0:
+                return True
+            remaining = deadline - time.monotonic()
+            if wait > remaining:
+                return False
+            time.sleep(wait)
+
+    def exhaust(self):
+        """Vide le seau après une réponse 429 du fournisseur."""
+        def empty():
+            self._tokens = 0.0
+
+        with self._lock:
+            self._update(empty)
+
+    def snapshot(self):
+        def read():
+            return {
+                'tokens': round(self._tokens, 2),
+                'capacity': self.capacity,
+                'used_today': self._used_today,
+                'per_day': self.per_day,
+            }
+
+        with self._lock:
+            return self._update(read)
+
+
+class APIBroker:
+    """
+    Courtier de requêtes : cache frais -> requête en vol -> jeton du fournisseur,
+    avec repli sur la donnée périmée du cache quand le quota ou l'amont fait défaut.
+    """
+
+    def __init__(self, cache_manager=None, quotas=None, revalidate_workers=2, request_timeout=10,
+                 persist_budgets=True):
+        """
+        Initialise le courtier.
+
+        Args:
+            cache_manager (CacheManager, optional): Cache partagé (SQLite)
+            quotas (dict, optional): Quotas par fournisseur (per_minute, per_day)
+            revalidate_workers (int): Threads de revalidation en arrière-plan
+            request_timeout (int): Délai maximal d'une requête HTTP (secondes)
+            persist_budgets (bool): Partager les compteurs de quota entre processus
+                via la base SQLite du cache
+        """
+        self.cache = cache_manager or CacheManager()
+        self.quotas = {provider: dict(values) for provider, values in PROVIDER_QUOTAS.items()}
+        for provider, values in (quotas or {}).items():
+            self.quotas.setdefault(provider, {}).update(values)
+        self.request_timeout = request_timeout
+        self.budget_db_path = self._init_budget_table() if persist_budgets else None
+
+        self._budgets = {}
+        self._inflight = {}
+        self._lock = threading.Lock()
+        self._revalidator = ThreadPoolExecutor(max_workers=revalidate_workers,
+                                               thread_name_prefix='api-broker')
+        self._stats = {}
+
+    def _init_budget_table(self):
+        """
+        Crée la table des compteurs de quota dans la base du cache.
+
+        Returns:
+            str: Chemin de la base, ou None si elle est inutilisable (compteurs en mémoire)
+        """
+        db_path = getattr(self.cache, 'db_path', None)
+        if not db_path:
+            return None
+        conn = None
+        try:
+            conn = sqlite3.connect(db_path, timeout=5)
+            conn.execute('''
+            CREATE TABLE IF NOT EXISTS api_budget (
+                provider TEXT PRIMARY KEY,
+                tokens REAL,
+                updated_at REAL,
+                day TEXT,
+                used_today INTEGER
+            )
+            ''')
+            conn.commit()
+            return db_path
+        except sqlite3.Error as e:
+            logger.error(f"Compteurs de quota non persistés: {e}")
+            return None
+        finally:
+            if conn is not None:
+                conn.close()
+
+    def _budget(self, provider):
+        with self._lock:
+            budget = self._budgets.get(provider)
+            if budget is None:
+                quota = self.quotas.get(provider, self.quotas['default'])
+                budget = _ProviderBudget(quota.get('per_minute', 30), quota.get('per_day'),
+                                         provider=provider, db_path=self.budget_db_path)
+                self._budgets[provider] = budget
+            return budget
+
+    def _count(self, provider, field):
+        with self._lock:
+            stats = self._stats.setdefault(provider, {
+                'requests': 0, 'fresh_hits': 0, 'stale_served': 0, 'coalesced': 0,
+                'upstream_calls': 0, 'revalidations': 0, 'throttled': 0, 'errors': 0, 'too_stale': 0
+            })
+            stats[field] += 1
+
+    def request(self, provider, key, fetch, priority=PRIORITY_UPCOMING, ttl=None, default=None, max_stale=None):
+        """
+        Sert une requête via le cache, la fusion des requêtes en vol et le quota.
+
+        Args:
+            provider (str): Fournisseur (clé de PROVIDER_QUOTAS)
+            key (str): Clé de cache identifiant la requête
+            fetch (callable): Fonction sans argument appelant l'amont ; None = échec
+            priority (int): PRIORITY_LIVE, PRIORITY_UPCOMING ou PRIORITY_BACKFILL
+            ttl (int, optional): Durée de fraîcheur (secondes)
+            default (any): Valeur renvoyée si rien n'est disponible
+            max_stale (int, optional): Âge maximal d'une donnée périmée servie, au-delà
+                de son expiration (secondes ; PRIORITY_MAX_STALENESS par défaut)
+
+        Returns:
+            any: Donnée fraîche, donnée périmée d'au plus `max_stale` secondes ou `default`
+        """
+        if ttl is None:
+            ttl = PRIORITY_TTL.get(priority, PRIORITY_TTL[PRIORITY_UPCOMING])
+        if max_stale is None:
+            max_stale = PRIORITY_MAX_STALENESS.get(priority, PRIORITY_MAX_STALENESS[PRIORITY_UPCOMING])
+        self._count(provider, 'requests')
+
+        entry = self.cache.get_entry(key)
+        if entry is not None:
+            data, expiry, _ = entry
+            now = time.time()
+            if expiry > now:
+                self._count(provider, 'fresh_hits')
+                return data
+            if now - expiry <= max_stale:
+                # Donnée périmée : la servir tout de suite et revalider si le quota le permet
+                self._count(provider, 'stale_served')
+                self._revalidate(provider, key, fetch, priority, ttl)
+                return data
+            # Trop ancienne pour être servie : requête synchrone ci-dessous
+            self._count(provider, 'too_stale')
+
+        future, leader = self._join_or_lead(key)
+        if not leader:
+            self._count(provider, 'coalesced')
+            try:
+                result = future.result(timeout=PRIORITY_MAX_WAIT.get(priority, 5.0) + self.request_timeout)
+            except Exception:
+                result = None
+            return default if result is None else result
+
+        result = None
+        try:
+            if self._budget(provider).acquire(priority, PRIORITY_MAX_WAIT.get(priority, 5.0)):
+                result = self._call(provider, key, fetch, ttl)
+            else:
+                self._count(provider, 'throttled')
+                logger.warning(f"Quota {provider} épuisé pour la classe "
+                               f"{PRIORITY_NAMES.get(priority, priority)} : {key}")
+        finally:
+            self._settle(key, future, result)
+        return default if result is None else result
+
+    def _join_or_lead(self, key):
+        with self._lock:
+            future = self._inflight.get(key)
+            if future is not None:
+                return future, False
+            future = Future()
+            self._inflight[key] = future
+            return future, True
+
+    def _settle(self, key, future, result):
+        with self._lock:
+            self._inflight.pop(key, None)
+        future.set_result(result)
+
+    def _call(self, provider, key, fetch, ttl):
+        self._count(provider, 'upstream_calls')
+        try:
+            data = fetch()
+        except UpstreamError as e:
+            if e.status_code == 429:
+                self._budget(provider).exhaust()
+            self._count(provider, 'errors')
+            logger.warning(f"Échec de la requête {key}: {e}")
+            return None
+        except Exception as e:
+            self._count(provider, 'errors')
+            logger.warning(f"Échec de la requête {key}: {e}")
+            return None
+        if data is not None:
+            self.cache.set(key, data, source=provider, duration=ttl)
+        return data
+
+    def _revalidate(self, provider, key, fetch, priority, ttl):
+        future, leader = self._join_or_lead(key)
+        if not leader:
+            return
+        if self._budget(provider).try_acquire(priority) != 0.0:
+            self._count(provider, 'throttled')
+            self._settle(key, future, None)
+            return
+        self._count(provider, 'revalidations')
+
+        def run():
+            result = None
+            try:
+                result = self._call(provider, key, fetch, ttl)
+            finally:
+                self._settle(key, future, result)
+
+        self._revalidator.submit(run)
+
+    def get_json(self, provider, url, params=None, headers=None, priority=PRIORITY_UPCOMING,
+                 ttl=None, default=None, method='GET', json_body=None, max_stale=None):
+        """
+        Requête HTTP JSON passant par le courtier.
+
+        Args:
+            provider (str): Fournisseur (clé de PROVIDER_QUOTAS)
+            url (str): URL de l'endpoint
+            params (dict, optional): Paramètres de requête
+            headers (dict, optional): En-têtes (exclus de la clé de cache, comme SECRET_PARAMS)
+            priority (int): Classe de priorité
+            ttl (int, optional): Durée de fraîcheur (secondes)
+            default (any): Valeur renvoyée si rien n'est disponible
+            method (str): 'GET' ou 'POST'
+            json_body (dict, optional): Corps JSON des requêtes POST
+            max_stale (int, optional): Âge maximal d'une donnée périmée servie (secondes)
+
+        Returns:
+            any: Réponse JSON décodée, donnée périmée ou `default`
+        """
+        query = urlencode(sorted((name, value) for name, value in (params or {}).items()
+                                 if name not in SECRET_PARAMS))
+        key = f"broker:{provider}:{method}:{url}?{query}"
+        if json_body is not None:
+            key += f"#{urlencode(sorted(json_body.items()))}"
+
+        def fetch():
+            response = requests.request(method, url, params=params, headers=headers,
+                                        json=json_body, timeout=self.request_timeout)
+            if response.status_code != 200:
+                raise UpstreamError(provider, response.status_code)
+            return response.json()
+
+        return self.request(provider, key, fetch, priority=priority, ttl=ttl, default=default, max_stale=max_stale)
+
+    def get_stats(self):
+        """
+        Renvoie les compteurs et l'état des quotas par fournisseur.
+
+        Returns:
+            dict: Statistiques par fournisseur
+        """
+        with self._lock:
+            stats = {provider: dict(values) for provider, values in self._stats.items()}
+            budgets = dict(self._budgets)
+        for provider, budget in budgets.items():
+            stats.setdefault(provider, {})['budget'] = budget.snapshot()
+        return stats
+
+
+_api_broker = None
+_api_broker_lock = threading.Lock()
+
+
+def get_api_broker():
+    """
+    Renvoie l'instance partagée du courtier de requêtes.
+
+    Returns:
+        APIBroker: Courtier partagé
+    """
+    global _api_broker
+    if _api_broker is None:
+        with _api_broker_lock:
+            if _api_broker is None:
+                _api_broker = APIBroker()
+    return _api_broker
@@ -14,6 +14,8 @@ import json
 import time
 from datetime import datetime, timedelta
 
+from utils.api_broker import get_api_broker, PRIORITY_LIVE, PRIORITY_UPCOMING, PRIORITY_BACKFILL
+
 class APIIntegrations:
     """Main class for handling all API integrations for ArcanShadow."""
     
@@ -97,11 +99,10 @@ class APIIntegrations:
         
         try:
             # Make the API request
-            response = requests.get(endpoint, params=params)
+            odds_data = get_api_broker().get_json('odds-api', endpoint, params=params,
+                                                  priority=PRIORITY_UPCOMING, ttl=self.cache_durations['odds'])
             
-            if response.status_code == 200:
-                odds_data = response.json()
-                
+            if odds_data is not None:
                 # Process the data into our format
                 processed_odds = self._process_odds_data(odds_data, sport)
                 
@@ -111,8 +112,7 @@ class APIIntegrations:
                 
                 return processed_odds
             else:
-                print(f"The Odds API request failed: {response.status_code}")
-                print(f"Response: {response.text}")
+                print("The Odds API request failed or quota exhausted")
                 return None
                 
         except Exception as e:
@@ -153,11 +153,10 @@ class APIIntegrations:
         
         try:
             # Make the API request
-            response = requests.get(endpoint, params=params, headers=headers)
+            match_data = get_api_broker().get_json('api-sports', endpoint, params=params, headers=headers,
+                                                   priority=PRIORITY_LIVE, ttl=30)
             
-            if response.status_code == 200:
-                match_data = response.json()
-                
+            if match_data is not None:
                 # Process the data into our format
                 processed_match = self._process_match_data(match_data)
                 
@@ -167,8 +166,7 @@ class APIIntegrations:
                 
                 return processed_match
             else:
-                print(f"API-Sports request failed: {response.status_code}")
-                print(f"Response: {response.text}")
+                print("API-Sports request failed or quota exhausted")
                 return None
                 
         except Exception as e:
@@ -289,11 +287,10 @@ class APIIntegrations:
         
         try:
             # Make the API request
-            response = requests.get(endpoint, params=params, headers=headers)
+            history_data = get_api_broker().get_json('api-sports', endpoint, params=params, headers=headers,
+                                                     priority=PRIORITY_BACKFILL, ttl=self.cache_durations['matches'])
             
-            if response.status_code == 200:
-                history_data = response.json()
-                
+            if history_data is not None:
                 # Process the data into our format
                 processed_history = self._process_team_history(history_data, team_name)
                 
@@ -303,8 +300,7 @@ class APIIntegrations:
                 
                 return processed_history
             else:
-                print(f"API-Sports request failed: {response.status_code}")
-                print(f"Response: {response.text}")
+                print("API-Sports request failed or quota exhausted")
                 return None
                 
         except Exception as e:
@@ -356,11 +352,10 @@ class APIIntegrations:
         
         try:
             # Make the API request
-            response = requests.get(endpoint, params=params, headers=headers)
+            h2h_data = get_api_broker().get_json('api-sports', endpoint, params=params, headers=headers,
+                                                 priority=PRIORITY_BACKFILL, ttl=self.cache_durations['matches'])
             
-            if response.status_code == 200:
-                h2h_data = response.json()
-                
+            if h2h_data is not None:
                 # Process the data into our format
                 processed_h2h = self._process_h2h_data(h2h_data, team1, team2)
                 
@@ -370,8 +365,7 @@ class APIIntegrations:
                 
                 return processed_h2h
             else:
-                print(f"API-Sports request failed: {response.status_code}")
-                print(f"Response: {response.text}")
+                print("API-Sports request failed or quota exhausted")
                 return None
                 
         except Exception as e:
@@ -623,10 +617,10 @@ class APIIntegrations:
         
         try:
             # Make the API request
-            response = requests.get(endpoint, params=params, headers=headers)
+            teams_data = get_api_broker().get_json('api-sports', endpoint, params=params, headers=headers,
+                                                   priority=PRIORITY_BACKFILL, ttl=7 * 24 * 60 * 60)
             
-            if response.status_code == 200:
-                teams_data = response.json()
+            if teams_data is not None:
                 teams = teams_data.get('response', [])
                 
                 if teams:
@@ -641,8 +635,7 @@ class APIIntegrations:
                     return None
                     
             else:
-                print(f"API-Sports request failed: {response.status_code}")
-                print(f"Response: {response.text}")
+                print("API-Sports request failed or quota exhausted")
                 return None
                 
         except Exception as e:
@@ -12,6 +12,9 @@ from functools import reduce
 import pandas as pd
 import numpy as np
 from .data_enrichment import DataEnrichment
+from .prediction_cache import cached_analysis
+from .score_matrix import price_match
+from .kelly_portfolio import KellyPortfolioOptimizer, DEFAULT_KELLY_FRACTION, DEFAULT_SCENARIOS
 
 # Configuration du logger
 logging.basicConfig(
@@ -25,6 +28,8 @@ class BettingComboGenerator:
     Générateur de combinés de paris optimisés.
     Utilise les données enrichies et les prédictions des modules d'ArcanShadow.
     """
+    CACHE_VERSION = "1.1"
+    
     def __init__(self):
         """
         Initialise le générateur de combinés.
@@ -129,6 +134,7 @@ class BettingComboGenerator:
         
         return example_matches
         
+    @cached_analysis('BettingComboGenerator')
     def predict_match_outcomes(self, match, arcan_predictions=None):
         """
         Prédit les résultats d'un match en combinant les données enrichies et les prédictions ArcanShadow.
@@ -171,6 +177,7 @@ class BettingComboGenerator:
             h2h_draws = 0
             h2h_total_goals = 0
             h2h_matches_count = 0
+            h2h_btts_count = 0
             
             for h2h_match in h2h:
                 try:
@@ -182,6 +189,7 @@ class BettingComboGenerator:
                         away_score = int(score[1].strip())
                         h2h_total_goals += home_score + away_score
                         h2h_matches_count += 1
+                        h2h_btts_count += home_score > 0 and away_score > 0
                         
                         if home_score > away_score:
                             if home_team_h2h == home_team:
@@ -263,47 +271,35 @@ class BettingComboGenerator:
             away_goals_scored_avg = away_goals_scored / away_match_count if away_match_count > 0 else 1.0
             away_goals_conceded_avg = away_goals_conceded / away_match_count if away_match_count > 0 else 1.5
             
-            # Prédire le nombre de buts
-            expected_goals = (home_goals_scored_avg * 0.25) + (away_goals_conceded_avg * 0.25) + (away_goals_scored_avg * 0.25) + (home_goals_conceded_avg * 0.25)
+            # Buts attendus de chaque équipe (attaque propre et défense adverse)
+            home_expected_goals = (home_goals_scored_avg + away_goals_conceded_avg) / 2
+            away_expected_goals = (away_goals_scored_avg + home_goals_conceded_avg) / 2
             
-            # Probabilités Over/Under 2.5
-            over_probability = 0.5
-            if expected_goals > 2.5:
-                over_probability = 0.5 + ((expected_goals - 2.5) * 0.15)
-            else:
-                over_probability = 0.5 - ((2.5 - expected_goals) * 0.15)
+            # Ajuster le total attendu avec les H2H
+            if h2h_matches_count > 0:
+                model_total = home_expected_goals + away_expected_goals
+                h2h_scale = (model_total * 0.8 + avg_goals_h2h * 0.2) / model_total if model_total > 0 else 1.0
+                home_expected_goals *= h2h_scale
+                away_expected_goals *= h2h_scale
+            expected_goals = home_expected_goals + away_expected_goals
             
-            # Ajuster avec les H2H
-            if avg_goals_h2h > 2.5:
-                over_probability += (avg_goals_h2h - 2.5) * 0.1
-            else:
-                over_probability -= (2.5 - avg_goals_h2h) * 0.1
+            # Matrice de scores : 1X2, Over/Under et BTTS dérivent de la même distribution
+            goal_markets = price_match(home_expected_goals, away_expected_goals)
             
-            # Limites
-            over_probability = max(0.2, min(0.9, over_probability))
-            under_probability = 1 - over_probability
+            # Combiner le modèle forme/H2H et la matrice pour le 1X2
+            matrix_1x2 = goal_markets['1X2']
+            home_probability = (home_probability + matrix_1x2['home_win']) / 2
+            draw_probability = (draw_probability + matrix_1x2['draw']) / 2
+            away_probability = (away_probability + matrix_1x2['away_win']) / 2
+            
+            # Probabilités Over/Under 2.5
+            over_probability = goal_markets['over_under'][2.5]['over']
+            under_probability = goal_markets['over_under'][2.5]['under']
             
             # 3. Analyse pour BTTS (Both Teams To Score)
             # ------------------------------------------
-            btts_yes_matches_h2h = sum(1 for m in h2h if len(m.get('score', '').split('-')) == 2 and int(m.get('score', '').split('-')[0]) > 0 and int(m.get('score', '').split('-')[1]) > 0)
-            btts_yes_ratio_h2h = btts_yes_matches_h2h / h2h_matches_count if h2h_matches_count > 0 else 0.5
-            
-            # Calcul basé sur la capacité offensive et défensive des équipes
-            home_attacking_strength = home_goals_scored_avg / 1.5  # Normaliser par rapport à la moyenne
-            away_attacking_strength = away_goals_scored_avg / 1.0  # Normaliser par rapport à la moyenne
-            home_defensive_weakness = home_goals_conceded_avg / 1.0  # Normaliser par rapport à la moyenne
-            away_defensive_weakness = away_goals_conceded_avg / 1.5  # Normaliser par rapport à la moyenne
-            
-            # Probabilité que chaque équipe marque
-            home_scores_prob = (home_attacking_strength * 0.7) + (away_defensive_weakness * 0.3)
-            away_scores_prob = (away_attacking_strength * 0.7) + (home_defensive_weakness * 0.3)
-            
-            # Probabilité BTTS
-            btts_yes_probability = home_scores_prob * away_scores_prob
-            btts_yes_probability = (btts_yes_probability * 0.6) + (btts_yes_ratio_h2h * 0.4)
-            
-            # Limites
-            btts_yes_probability = max(0.3, min(0.9, btts_yes_probability))
+            btts_yes_ratio_h2h = h2h_btts_count / h2h_matches_count if h2h_matches_count > 0 else 0.5
+            btts_yes_probability = goal_markets['btts']
             btts_no_probability = 1 - btts_yes_probability
             
             # 4. Intégrer les prédictions ArcanShadow si disponibles
@@ -436,7 +432,7 @@ class BettingComboGenerator:
                         'market': 'BTTS',
                         'odds': 1.85,  # Cotes par défaut si non disponibles
                         'confidence': btts_yes_probability,
-                        'insight': f"Force attaque: {home_attacking_strength:.2f}/{away_attacking_strength:.2f}, BTTS en H2H: {btts_yes_ratio_h2h:.2f}",
+                        'insight': f"Buts attendus: {home_expected_goals:.2f}/{away_expected_goals:.2f}, BTTS en H2H: {btts_yes_ratio_h2h:.2f}",
                         'ev': (btts_yes_probability * 1.85) - 1
                     },
                     'no': {
@@ -445,7 +441,7 @@ class BettingComboGenerator:
                         'market': 'BTTS',
                         'odds': 1.95,  # Cotes par défaut si non disponibles
                         'confidence': btts_no_probability,
-                        'insight': f"Force défense: {(2-home_defensive_weakness):.2f}/{(2-away_defensive_weakness):.2f}, Clean sheets en H2H: {1-btts_yes_ratio_h2h:.2f}",
+                        'insight': f"Clean sheets: {goal_markets['clean_sheets']['home']:.2f}/{goal_markets['clean_sheets']['away']:.2f}, Clean sheets en H2H: {1-btts_yes_ratio_h2h:.2f}",
                         'ev': (btts_no_probability * 1.95) - 1
                     }
                 },
@@ -455,6 +451,9 @@ class BettingComboGenerator:
                     'home_team': home_team,
                     'away_team': away_team,
                     'expected_goals': expected_goals,
+                    'home_expected_goals': home_expected_goals,
+                    'away_expected_goals': away_expected_goals,
+                    'correct_scores': goal_markets['correct_score'],
                     'home_form_rating': home_form_rating,
                     'away_form_rating': away_form_rating,
                     'h2h_home_ratio': h2h_home_ratio,
@@ -552,6 +551,13 @@ class BettingComboGenerator:
             logger.error(f"Erreur lors de la génération des meilleurs paris: {e}")
             return []
     
+    # Paramètres de sélection selon le niveau de risque
+    RISK_PROFILES = {
+        'low': {'min_confidence': 0.7, 'min_ev': 0.1, 'max_odds': 1.8},
+        'medium': {'min_confidence': 0.65, 'min_ev': 0.05, 'max_odds': 2.5},
+        'high': {'min_confidence': 0.55, 'min_ev': 0.0, 'max_odds': 4.0}
+    }
+    
     def generate_daily_combo(self, matches=None, arcan_predictions=None, max_selections=4, risk_level='medium', use_top_modules=False):
         """
         Génère un combiné de paris du jour.
@@ -566,213 +572,379 @@ class BettingComboGenerator:
         Returns:
             dict: Combiné du jour
         """
-        try:
-            # Journaliser l'appel à la fonction
-            logger.info(f"Génération du combiné du jour: {max_selections} max, risque={risk_level}, top_modules={use_top_modules}")
-            
-            # Ajouter une date/heure de génération
-            generated_at = datetime.now().strftime('%d/%m/%Y %H:%M')
+        # Journaliser l'appel à la fonction
+        logger.info(f"Génération du combiné du jour: {max_selections} max, risque={risk_level}, top_modules={use_top_modules}")
+        
+        combos = self.generate_combo_profiles(
+            matches=matches,
+            arcan_predictions=arcan_predictions,
+            max_selections=max_selections,
+            risk_levels=(risk_level,),
+            top_modules_options=(use_top_modules,)
+        )
+        return combos[(risk_level, bool(use_top_modules))]
+    
+    def generate_combo_profiles(self, matches=None, arcan_predictions=None, max_selections=4,
+                                risk_levels=('low', 'medium', 'high'), top_modules_options=(False, True)):
+        """
+        Génère en une seule passe le combiné du jour de plusieurs profils de risque.
+        
+        La table des sélections candidates est calculée une fois pour tous les profils ;
+        chaque profil (niveau de risque, filtre des modules performants) y est ensuite
+        évalué par des masques vectorisés.
+        
+        Args:
+            matches (list, optional): Liste de matchs (si None, utilise des matchs exemplaires)
+            arcan_predictions (list, optional): Prédictions des modules ArcanShadow
+            max_selections (int): Nombre maximum de sélections par combiné
+            risk_levels (tuple): Niveaux de risque à évaluer ('low', 'medium', 'high')
+            top_modules_options (tuple): Valeurs de `use_top_modules` à évaluer
             
+        Returns:
+            dict: (risk_level, use_top_modules) -> combiné du jour, au format de generate_daily_combo
+        """
+        # Ajouter une date/heure de génération
+        generated_at = datetime.now().strftime('%d/%m/%Y %H:%M')
+        profiles = [(risk_level, bool(use_top)) for risk_level in risk_levels for use_top in top_modules_options]
+        
+        try:
             # S'assurer que nous avons des matchs valides
             matches = self._ensure_valid_matches(matches)
-            logger.info(f"Utilisation de {len(matches)} matchs pour le combiné du jour")
-                    
-            # Créer des prédictions si aucune n'est fournie
+            logger.info(f"Utilisation de {len(matches)} matchs pour {len(profiles)} profil(s) de combiné")
+            
+            # Créer des prédictions si aucune n'est fournie (une seule fois pour tous les profils)
             if not arcan_predictions:
                 logger.info("Aucune prédiction fournie, génération de prédictions pour les matchs...")
-                arcan_predictions = []
-                
-                if matches:
-                    # Générer des prédictions plus informatives pour chaque match
-                    for match in matches:
-                        # Obtenir des infos de base sur le match
-                        home_team = match.get('home_team', '')
-                        away_team = match.get('away_team', '')
-                        home_odds = match.get('odds', {}).get('1', 2.0)
-                        draw_odds = match.get('odds', {}).get('X', 3.0)
-                        away_odds = match.get('odds', {}).get('2', 4.0)
-                        
-                        # Calculer les probabilités à partir des cotes (relation inverse)
-                        # Plus la cote est basse, plus la probabilité est élevée
-                        home_prob = 1 / home_odds if home_odds > 0 else 0.5
-                        draw_prob = 1 / draw_odds if draw_odds > 0 else 0.3
-                        away_prob = 1 / away_odds if away_odds > 0 else 0.2
-                        
-                        # Normaliser les probabilités
-                        total_prob = home_prob + draw_prob + away_prob
-                        home_prob /= total_prob
-                        draw_prob /= total_prob
-                        away_prob /= total_prob
-                        
-                        # Déterminer le résultat le plus probable
-                        probs = [
-                            ('home_win', home_prob),
-                            ('draw', draw_prob),
-                            ('away_win', away_prob)
-                        ]
-                        outcome, confidence = max(probs, key=lambda x: x[1])
-                        
-                        # Créer des facteurs statistiques
-                        factors = []
-                        if outcome == 'home_win':
-                            factors.append({
-                                'name': 'Home Advantage',
-                                'value': 'Strong home performance expected',
-                                'weight': 0.3
-                            })
-                            factors.append({
-                                'name': 'Form Analysis',
-                                'value': f'{home_team} in better recent form',
-                                'weight': 0.4
-                            })
-                        elif outcome == 'away_win':
-                            factors.append({
-                                'name': 'Away Strength',
-                                'value': f'{away_team} performs well away',
-                                'weight': 0.3
-                            })
-                            factors.append({
-                                'name': 'Momentum',
-                                'value': f'{away_team} has strong momentum',
-                                'weight': 0.4
-                            })
-                        else:  # draw
-                            factors.append({
-                                'name': 'Balanced Teams',
-                                'value': 'Evenly matched teams',
-                                'weight': 0.5
-                            })
-                            factors.append({
-                                'name': 'Historical Pattern',
-                                'value': 'Teams often draw against each other',
-                                'weight': 0.3
-                            })
-                        
-                        # Ajouter un facteur supplémentaire
-                        factors.append({
-                            'name': 'Market Analysis',
-                            'value': f'Odds movement suggests {outcome.replace("_", " ")}',
-                            'weight': 0.2
-                        })
-                        
-                        # Générer une prédiction détaillée
-                        pred = {
-                            'match': match,
-                            'match_id': match.get('id', ''),
-                            'outcome': outcome,
-                            'selection': outcome,
-                            'market': 'match_result',
-                            'confidence': confidence,
-                            'odds': home_odds if outcome == 'home_win' else (draw_odds if outcome == 'draw' else away_odds),
-                            'source_module': random.choice(['ArcanX', 'ShadowOdds', 'ArcanBrain']),
-                            'statistical_factors': factors,
-                            'expected_value': (confidence * (home_odds if outcome == 'home_win' else
-                                                 (draw_odds if outcome == 'draw' else away_odds))) - 1
-                        }
-                        arcan_predictions.append(pred)
-                    
-                    logger.info(f"Généré {len(arcan_predictions)} prédictions pour le combiné du jour")
+                arcan_predictions = self._generate_default_predictions(matches)
+                logger.info(f"Généré {len(arcan_predictions)} prédictions pour le combiné du jour")
             
-            # Paramètres selon le niveau de risque
-            risk_params = {
-                'low': {'min_confidence': 0.7, 'min_ev': 0.1, 'max_odds': 1.8},
-                'medium': {'min_confidence': 0.65, 'min_ev': 0.05, 'max_odds': 2.5},
-                'high': {'min_confidence': 0.55, 'min_ev': 0.0, 'max_odds': 4.0}
-            }
-            
-            params = risk_params.get(risk_level, risk_params['medium'])
-            logger.info(f"Paramètres de risque: {params}")
-            
-            # Filtrer les prédictions par modules performants si demandé
-            filtered_predictions = arcan_predictions if arcan_predictions else []
-            if use_top_modules and filtered_predictions:
-                # Récupérer les performances des modules
-                module_performance = self._get_module_performance()
-                
-                # Filtrer pour ne garder que les prédictions des modules performants
-                top_modules = [module for module, perf in module_performance.items() if perf >= 0.6]
-                
-                if top_modules:
-                    new_filtered = []
-                    for pred in filtered_predictions:
-                        # S'assurer que pred est un dictionnaire et contient une clé source_module
-                        if isinstance(pred, dict) and pred.get('source_module') in top_modules:
-                            new_filtered.append(pred)
-                    
-                    filtered_predictions = new_filtered
-                    logger.info(f"Après filtrage par modules performants: {len(filtered_predictions)} prédictions")
-            
-            # Générer les meilleurs paris
-            best_bets = self.generate_best_bets(
-                matches=matches,
-                arcan_predictions=filtered_predictions,
-                min_confidence=params['min_confidence'],
-                min_ev=params['min_ev']
+            table = self._build_selection_table(
+                matches, arcan_predictions, any(use_top for _, use_top in profiles)
             )
+            logger.info(f"Table de sélection: {len(table['bets'])} paris candidats")
             
-            logger.info(f"Généré {len(best_bets)} meilleurs paris pour le combiné")
+            return self._evaluate_profiles(table, profiles, max_selections, generated_at)
             
-            # Filtrer selon les cotes maximales
-            filtered_bets = [bet for bet in best_bets if bet.get('odds', 0) <= params['max_odds']]
+        except Exception as e:
+            logger.error(f"Erreur lors de la génération des combinés par profil: {e}")
+            return {
+                (risk_level, use_top): {
+                    'selections': [],
+                    'total_odds': 0,
+                    'avg_confidence': 0,
+                    'expected_value': 0,
+                    'risk_level': risk_level,
+                    'generated_at': generated_at
+                }
+                for risk_level, use_top in profiles
+            }
+    
+    def generate_staking_plan(self, matches=None, arcan_predictions=None, bankroll=100.0,
+                              kelly_fraction=DEFAULT_KELLY_FRACTION, max_selections=4,
+                              risk_levels=('low', 'medium', 'high'), min_confidence=0.6, min_ev=0.05,
+                              n_scenarios=DEFAULT_SCENARIOS, seed=None):
+        """
+        Répartit la bankroll entre les meilleurs paris et les combinés du jour (Kelly fractionnaire).
+        
+        Les paris simples de generate_best_bets et les combinés de generate_combo_profiles sont
+        mis en portefeuille ; les mises maximisent la croissance logarithmique espérée sur des
+        scénarios de scores conjoints tirés dans la matrice de scores de chaque match, ce qui
+        tient compte des paris corrélés (même match, simple inclus dans un combiné).
+        
+        Args:
+            matches (list, optional): Liste de matchs (si None, utilise des matchs exemplaires)
+            arcan_predictions (list, optional): Prédictions des modules ArcanShadow
+            bankroll (float): Bankroll disponible
+            kelly_fraction (float): Fraction de Kelly appliquée aux mises optimales
+            max_selections (int): Nombre maximum de sélections par combiné
+            risk_levels (tuple): Niveaux de risque des combinés candidats
+            min_confidence (float): Confiance minimale des paris simples candidats
+            min_ev (float): Valeur espérée minimale des paris simples candidats
+            n_scenarios (int): Nombre de scénarios Monte-Carlo
+            seed (int, optional): Graine du générateur aléatoire
+        
+        Returns:
+            dict: Mises par pari et statistiques du portefeuille (voir KellyPortfolioOptimizer.optimise)
+        """
+        matches = self._ensure_valid_matches(matches)
+        if not arcan_predictions:
+            arcan_predictions = self._generate_default_predictions(matches)
+        
+        optimizer = KellyPortfolioOptimizer(n_scenarios=n_scenarios, kelly_fraction=kelly_fraction, seed=seed)
+        for match in matches:
+            match_id = match.get('id')
+            match_prediction = next((pred for pred in arcan_predictions
+                                     if isinstance(pred, dict) and pred.get('match_id') == match_id), None)
+            match_info = self.predict_match_outcomes(match, match_prediction).get('match_info', {})
+            if 'home_expected_goals' in match_info:
+                optimizer.add_match(match_id, match_info['home_expected_goals'], match_info['away_expected_goals'],
+                                    match.get('home_team'), match.get('away_team'))
+        
+        singles = optimizer.add_best_bets(self.generate_best_bets(matches, arcan_predictions, min_confidence, min_ev))
+        combos = self.generate_combo_profiles(matches, arcan_predictions, max_selections,
+                                              risk_levels=risk_levels, top_modules_options=(False,))
+        for (risk_level, _), combo in combos.items():
+            if len(combo['selections']) > 1:
+                optimizer.add_combo(combo['selections'], label=f"Combiné {risk_level}", source=f"combo_{risk_level}")
+        logger.info(f"Plan de mises: {singles} paris simples et {len(optimizer.bets) - singles} combinés candidats")
+        
+        return optimizer.optimise(bankroll)
+    
+    def _generate_default_predictions(self, matches):
+        """
+        Génère des prédictions à partir des cotes lorsque aucune prédiction n'est fournie.
+        
+        Args:
+            matches (list): Liste de matchs
             
-            # Assurer que nous ne sélectionnons pas plus d'un pari par match
-            selected_matches = set()
-            combo_selections = []
+        Returns:
+            list: Prédictions par match (issue la plus probable selon les cotes)
+        """
+        predictions = []
+        
+        # Générer des prédictions plus informatives pour chaque match
+        for match in matches:
+            # Obtenir des infos de base sur le match
+            home_team = match.get('home_team', '')
+            away_team = match.get('away_team', '')
+            home_odds = match.get('odds', {}).get('1', 2.0)
+            draw_odds = match.get('odds', {}).get('X', 3.0)
+            away_odds = match.get('odds', {}).get('2', 4.0)
+            
+            # Calculer les probabilités à partir des cotes (relation inverse)
+            # Plus la cote est basse, plus la probabilité est élevée
+            home_prob = 1 / home_odds if home_odds > 0 else 0.5
+            draw_prob = 1 / draw_odds if draw_odds > 0 else 0.3
+            away_prob = 1 / away_odds if away_odds > 0 else 0.2
+            
+            # Normaliser les probabilités
+            total_prob = home_prob + draw_prob + away_prob
+            home_prob /= total_prob
+            draw_prob /= total_prob
+            away_prob /= total_prob
+            
+            # Déterminer le résultat le plus probable
+            probs = [
+                ('home_win', home_prob),
+                ('draw', draw_prob),
+                ('away_win', away_prob)
+            ]
+            outcome, confidence = max(probs, key=lambda x: x[1])
+            
+            # Créer des facteurs statistiques
+            factors = []
+            if outcome == 'home_win':
+                factors.append({
+                    'name': 'Home Advantage',
+                    'value': 'Strong home performance expected',
+                    'weight': 0.3
+                })
+                factors.append({
+                    'name': 'Form Analysis',
+                    'value': f'{home_team} in better recent form',
+                    'weight': 0.4
+                })
+            elif outcome == 'away_win':
+                factors.append({
+                    'name': 'Away Strength',
+                    'value': f'{away_team} performs well away',
+                    'weight': 0.3
+                })
+                factors.append({
+                    'name': 'Momentum',
+                    'value': f'{away_team} has strong momentum',
+                    'weight': 0.4
+                })
+            else:  # draw
+                factors.append({
+                    'name': 'Balanced Teams',
+                    'value': 'Evenly matched teams',
+                    'weight': 0.5
+                })
+                factors.append({
+                    'name': 'Historical Pattern',
+                    'value': 'Teams often draw against each other',
+                    'weight': 0.3
+                })
+            
+            # Ajouter un facteur supplémentaire
+            factors.append({
+                'name': 'Market Analysis',
+                'value': f'Odds movement suggests {outcome.replace("_", " ")}',
+                'weight': 0.2
+            })
+            
+            # Générer une prédiction détaillée
+            pred = {
+                'match': match,
+                'match_id': match.get('id', ''),
+                'outcome': outcome,
+                'selection': outcome,
+                'market': 'match_result',
+                'confidence': confidence,
+                'odds': home_odds if outcome == 'home_win' else (draw_odds if outcome == 'draw' else away_odds),
+                'source_module': random.choice(['ArcanX', 'ShadowOdds', 'ArcanBrain']),
+                'statistical_factors': factors,
+                'expected_value': (confidence * (home_odds if outcome == 'home_win' else
+                                     (draw_odds if outcome == 'draw' else away_odds))) - 1
+            }
+            predictions.append(pred)
+        
+        return predictions
+    
+    def _build_selection_table(self, matches, arcan_predictions, with_top_modules):
+        """
+        Construit la table des sélections candidates commune à tous les profils.
+        
+        Chaque pari de chaque marché est une ligne ; les colonnes numériques (confiance,
+        valeur espérée, cote, match) sont des tableaux NumPy. Un match dont la prédiction
+        ArcanShadow est écartée par le filtre des modules performants est évalué une
+        seconde fois sans cette prédiction, et chaque ligne indique pour quelle valeur de
+        `use_top_modules` elle est valide.
+        
+        Args:
+            matches (list): Liste de matchs
+            arcan_predictions (list): Prédictions des modules ArcanShadow
+            with_top_modules (bool): Préparer aussi les lignes du filtre des modules performants
             
-            for bet in filtered_bets:
-                match_id = bet.get('match', {}).get('id')
+        Returns:
+            dict: bets, confidence, ev, odds, match_key, valid (2 x N : sans / avec filtre)
+        """
+        predictions = [pred for pred in (arcan_predictions or []) if isinstance(pred, dict)]
+        
+        # Modules performants (sans module performant, aucun filtrage n'est appliqué)
+        top_modules = None
+        if with_top_modules and predictions:
+            module_performance = self._get_module_performance()
+            top_modules = {module for module, perf in module_performance.items() if perf >= 0.6} or None
+        
+        bets = []
+        columns = {'confidence': [], 'ev': [], 'odds': [], 'match_key': [], 'all': [], 'top': []}
+        match_keys = {}
+        
+        for match in matches:
+            try:
+                match_id = match.get('id')
+                match_key = match_keys.setdefault(match_id, len(match_keys))
                 
-                if match_id not in selected_matches and len(combo_selections) < max_selections:
-                    selected_matches.add(match_id)
-                    combo_selections.append(bet)
-            
-            # Si nous n'avons pas assez de sélections, compléter avec d'autres paris
-            if len(combo_selections) < max_selections and len(best_bets) > len(combo_selections):
-                for bet in best_bets:
-                    match_id = bet.get('match', {}).get('id')
-                    
-                    if match_id not in selected_matches and len(combo_selections) < max_selections:
-                        selected_matches.add(match_id)
-                        combo_selections.append(bet)
-            
-            # Calculer les cotes totales et la confiance
-            total_odds = 1.0
-            for selection in combo_selections:
-                total_odds *= selection.get('odds', 1.0)
-            
-            # Calculer la confiance globale (moyenne géométrique)
-            total_confidence = 1.0
-            for selection in combo_selections:
-                total_confidence *= selection.get('confidence', 0.5)
-            
-            avg_confidence = total_confidence ** (1 / len(combo_selections)) if combo_selections else 0
-            
-            # Calculer la valeur espérée
-            expected_value = (avg_confidence * total_odds) - 1
+                # Prédiction ArcanShadow du match, sans puis avec le filtre des modules performants
+                pred_all = next((pred for pred in predictions if pred.get('match_id') == match_id), None)
+                pred_top = pred_all
+                if top_modules is not None:
+                    pred_top = next((pred for pred in predictions
+                                     if pred.get('match_id') == match_id and pred.get('source_module') in top_modules), None)
+                
+                variants = [(pred_all, True, pred_top is pred_all)]
+                if with_top_modules and pred_top is not pred_all:
+                    variants.append((pred_top, False, True))
+                
+                for match_prediction, for_all, for_top in variants:
+                    outcomes = self.predict_match_outcomes(match, match_prediction)
+                    for market, market_predictions in outcomes.items():
+                        if market == 'match_info':
+                            continue
+                        for outcome, prediction in market_predictions.items():
+                            bets.append({
+                                'match': {
+                                    'id': match.get('id'),
+                                    'home_team': match.get('home_team'),
+                                    'away_team': match.get('away_team'),
+                                    'time': match.get('time'),
+                                    'date': match.get('date'),
+                                    'league': match.get('league')
+                                },
+                                'selection': prediction.get('selection'),
+                                'market': prediction.get('market'),
+                                'odds': prediction.get('odds'),
+                                'confidence': prediction.get('confidence'),
+                                'ev': prediction.get('ev'),
+                                'insight': prediction.get('insight'),
+                                'module_source': 'BettingComboGenerator'
+                            })
+                            columns['confidence'].append(prediction.get('confidence', 0))
+                            columns['ev'].append(prediction.get('ev', 0))
+                            columns['odds'].append(prediction.get('odds', 0))
+                            columns['match_key'].append(match_key)
+                            columns['all'].append(for_all)
+                            columns['top'].append(for_top)
+            
+            except Exception as e:
+                logger.error(f"Erreur lors de l'analyse du match {match.get('id')}: {e}")
+                continue
+        
+        return {
+            'bets': bets,
+            'confidence': np.asarray(columns['confidence'], dtype=float),
+            'ev': np.asarray(columns['ev'], dtype=float),
+            'odds': np.asarray(columns['odds'], dtype=float),
+            'match_key': np.asarray(columns['match_key'], dtype=int),
+            'valid': np.array([columns['all'], columns['top']], dtype=bool).reshape(2, len(bets))
+        }
+    
+    @staticmethod
+    def _first_per_match(order, match_key, limit):
+        """Garde, dans l'ordre donné, le premier pari de chaque match (au plus `limit`)."""
+        if limit <= 0 or len(order) == 0:
+            return order[:0]
+        _, first = np.unique(match_key[order], return_index=True)
+        return order[np.sort(first)][:limit]
+    
+    def _evaluate_profiles(self, table, profiles, max_selections, generated_at):
+        """
+        Évalue tous les profils sur la table des sélections.
+        
+        Args:
+            table (dict): Table construite par _build_selection_table
+            profiles (list): Couples (risk_level, use_top_modules)
+            max_selections (int): Nombre maximum de sélections par combiné
+            generated_at (str): Date/heure de génération
             
-            return {
+        Returns:
+            dict: (risk_level, use_top_modules) -> combiné du jour
+        """
+        params = [self.RISK_PROFILES.get(risk_level, self.RISK_PROFILES['medium']) for risk_level, _ in profiles]
+        min_confidence = np.array([p['min_confidence'] for p in params])[:, None]
+        min_ev = np.array([p['min_ev'] for p in params])[:, None]
+        max_odds = np.array([p['max_odds'] for p in params])[:, None]
+        
+        confidence, ev, odds, match_key = table['confidence'], table['ev'], table['odds'], table['match_key']
+        
+        # Masques profils x paris : critères des meilleurs paris, puis plafond de cote
+        valid = table['valid'][[int(use_top) for _, use_top in profiles]]
+        best_masks = valid & (confidence >= min_confidence) & (ev >= min_ev)
+        odds_masks = odds <= max_odds
+        
+        combos = {}
+        for i, (risk_level, use_top) in enumerate(profiles):
+            # Meilleurs paris triés par valeur espérée décroissante (tri stable)
+            best = np.flatnonzero(best_masks[i])
+            best = best[np.argsort(-ev[best], kind='stable')]
+            
+            # Un pari par match, d'abord sous le plafond de cote, puis complété par les autres
+            chosen = self._first_per_match(best[odds_masks[i, best]], match_key, max_selections)
+            if len(chosen) < max_selections and len(best) > len(chosen):
+                remaining = best[~np.isin(match_key[best], match_key[chosen])]
+                chosen = np.concatenate([
+                    chosen, self._first_per_match(remaining, match_key, max_selections - len(chosen))
+                ])
+            
+            combo_selections = [dict(table['bets'][j]) for j in chosen]
+            
+            # Cotes totales et confiance globale (moyenne géométrique)
+            total_odds = float(np.prod(odds[chosen])) if len(chosen) else 1.0
+            avg_confidence = float(np.prod(confidence[chosen]) ** (1 / len(chosen))) if len(chosen) else 0
+            
+            combos[(risk_level, use_top)] = {
                 'selections': combo_selections,
                 'total_odds': total_odds,
                 'avg_confidence': avg_confidence,
-                'expected_value': expected_value,
-                'risk_level': risk_level,
-                'generated_at': generated_at
-            }
-            
-        except Exception as e:
-            logger.error(f"Erreur lors de la génération du combiné du jour: {e}")
-            # Éviter l'erreur de variable non liée
-            if 'generated_at' not in locals():
-                generated_at = datetime.now().strftime('%d/%m/%Y %H:%M')
-                
-            return {
-                'selections': [],
-                'total_odds': 0,
-                'avg_confidence': 0,
-                'expected_value': 0,
+                'expected_value': (avg_confidence * total_odds) - 1,
                 'risk_level': risk_level,
                 'generated_at': generated_at
             }
+            logger.info(f"Profil {risk_level}/top_modules={use_top}: {len(best)} paris retenus, {len(combo_selections)} sélections")
+        
+        return combos
     
     def _get_module_performance(self):
         """
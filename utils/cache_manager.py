@@ -133,6 +133,38 @@ class CacheManager:
             if 'conn' in locals() and conn:
                 conn.close()
     
+    def get_entry(self, key):
+        """
+        Récupère une entrée du cache avec ses horodatages, qu'elle soit expirée ou non.
+        
+        Args:
+            key (str): Clé de cache
+            
+        Returns:
+            tuple: (donnée, expiry, created_at) ou None si absente ou illisible
+        """
+        conn = None
+        try:
+            conn = sqlite3.connect(self.db_path)
+            cursor = conn.cursor()
+            cursor.execute(
+                "SELECT data, expiry, created_at FROM cache WHERE cache_key = ?",
+                (key,)
+            )
+            result = cursor.fetchone()
+            if not result:
+                return None
+            data_blob, expiry, created_at = result
+            return pickle.loads(data_blob), expiry, created_at
+            
+        except Exception as e:
+            logger.error(f"Erreur lors de la récupération de l'entrée de cache {key}: {e}")
+            return None
+            
+        finally:
+            if conn:
+                conn.close()
+    
     def set(self, key, data, source='default', duration=None):
         """
         Stocke une donnée dans le cache.
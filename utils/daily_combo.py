@@ -4,6 +4,8 @@ Module pour la génération des combinaisons quotidiennes.
 import random
 from datetime import datetime, timedelta
 
+from .kelly_portfolio import KellyPortfolioOptimizer, DEFAULT_KELLY_FRACTION, DEFAULT_SCENARIOS
+
 def get_daily_combos(all_matches, days_range=3, combo_sizes=None, min_odds=1.3, max_selections=5):
     """
     Génère des combinaisons optimisées à partir des matchs disponibles.
@@ -298,6 +300,50 @@ def get_daily_combo_analysis(combo):
     
     return analysis
 
+def get_daily_combo_stakes(combos_by_size, all_matches, bankroll=100.0, kelly_fraction=DEFAULT_KELLY_FRACTION,
+                           n_scenarios=DEFAULT_SCENARIOS, seed=None):
+    """
+    Calcule les mises de Kelly fractionnaires des combinaisons du jour et de leurs sélections.
+    
+    Chaque sélection est aussi candidate en pari simple. La matrice de scores de chaque match
+    est reconstruite à partir de ses probabilités 1X2, puis les mises sont optimisées sur des
+    scénarios de scores conjoints (voir utils.kelly_portfolio).
+    
+    Args:
+        combos_by_size (dict): Combinaisons par taille, au format de get_daily_combos
+        all_matches (list): Matchs utilisés pour générer les combinaisons
+        bankroll (float): Bankroll disponible
+        kelly_fraction (float): Fraction de Kelly appliquée aux mises optimales
+        n_scenarios (int): Nombre de scénarios Monte-Carlo
+        seed (int, optional): Graine du générateur aléatoire
+        
+    Returns:
+        dict: Mises par pari et statistiques du portefeuille
+    """
+    optimizer = KellyPortfolioOptimizer(n_scenarios=n_scenarios, kelly_fraction=kelly_fraction, seed=seed)
+    
+    # Les sélections de get_daily_combos désignent leur match par "Domicile vs Extérieur"
+    for match in all_matches:
+        if not isinstance(match, dict):
+            continue
+        home_team = match.get('home_team', match.get('home', '?'))
+        away_team = match.get('away_team', match.get('away', '?'))
+        probabilities = [match.get(key, 0) for key in ('home_prob', 'draw_prob', 'away_prob')]
+        if all(p > 0 for p in probabilities):
+            optimizer.add_match_from_probabilities(f"{home_team} vs {away_team}", *probabilities,
+                                                   home_team=home_team, away_team=away_team)
+    
+    for size, combos in sorted(combos_by_size.items()):
+        for combo in combos:
+            legs = [{'match': sel['match'], 'market': None, 'selection': sel['selection'], 'odds': sel['odds']}
+                    for sel in combo['matches']]
+            for leg in legs:
+                optimizer.add_bet([leg], source='single')
+            optimizer.add_bet(legs, label=f"Combiné x{size}: " + " + ".join(leg['selection'] for leg in legs),
+                              source=f"combo_{size}")
+    
+    return optimizer.optimise(bankroll)
+
 def _generate_combo_advice(total_odds, avg_confidence, risk_level):
     """
     Génère un conseil pour une combinaison.
@@ -5,7 +5,7 @@ Handles database connection, models, and operations.
 
 import os
 from datetime import datetime, timedelta
-from sqlalchemy import create_engine, Column, Integer, String, Float, Boolean, DateTime, Text
+from sqlalchemy import create_engine, Column, Integer, String, Float, Boolean, DateTime, Text, Index
 from sqlalchemy.ext.declarative import declarative_base
 from sqlalchemy.orm import sessionmaker
 
@@ -16,6 +16,10 @@ Base = declarative_base()
 class Prediction(Base):
     """Model for storing match predictions."""
     __tablename__ = 'predictions'
+    __table_args__ = (
+        # Used to match incoming results to predictions by fixture
+        Index('ix_predictions_fixture', 'date', 'home_team', 'away_team'),
+    )
     
     id = Column(Integer, primary_key=True)
     date = Column(DateTime, default=datetime.now)
@@ -169,6 +173,25 @@ class MarketRecommendation(Base):
         return f"<MarketRecommendation(id={self.id}, market='{self.market_type}', score={self.recommendation_score})>"
 
 
+class ModuleAccuracy(Base):
+    """Model for storing running per-module accuracy aggregates."""
+    __tablename__ = 'module_accuracy'
+    
+    module = Column(String(50), primary_key=True)
+    settled = Column(Integer, nullable=False, default=0)
+    correct = Column(Integer, nullable=False, default=0)
+    confidence_sum = Column(Float, nullable=False, default=0.0)
+    brier_sum = Column(Float, nullable=False, default=0.0)
+    last_updated = Column(DateTime, default=datetime.now)
+    
+    def __repr__(self):
+        return f"<ModuleAccuracy(module='{self.module}', settled={self.settled}, correct={self.correct})>"
+
+
+# Maximum number of bound parameters in a single IN (...) clause
+MAX_IN_CLAUSE = 900
+
+
 # Database connection and session management
 class Database:
     """Database connection and operations manager."""
@@ -183,6 +206,10 @@ class Database:
         
         # Create tables if they don't exist
         Base.metadata.create_all(self.engine)
+        
+        # create_all does not add new indexes to existing tables
+        for index in Prediction.__table__.indexes:
+            index.create(self.engine, checkfirst=True)
     
     def save_prediction(self, prediction_data):
         """
@@ -427,6 +454,153 @@ class Database:
         finally:
             session.close()
     
+    def get_unsettled_predictions(self, start_date, end_date):
+        """
+        Get predictions without a recorded outcome for fixtures in a date range.
+        
+        Args:
+            start_date (datetime): Start of the range (inclusive)
+            end_date (datetime): End of the range (exclusive)
+            
+        Returns:
+            list: List of Prediction objects awaiting a result
+        """
+        session = self.Session()
+        try:
+            return session.query(Prediction).filter(
+                Prediction.date >= start_date,
+                Prediction.date < end_date,
+                Prediction.outcome == None
+            ).all()
+        finally:
+            session.close()
+    
+    def get_settled_fixtures(self, start_date, end_date):
+        """
+        Get the fixtures that already have a settled prediction in a date range.
+        
+        Args:
+            start_date (datetime): Start of the range (inclusive)
+            end_date (datetime): End of the range (exclusive)
+            
+        Returns:
+            list: (date, home_team, away_team) tuples of the settled predictions
+        """
+        session = self.Session()
+        try:
+            return session.query(Prediction.date, Prediction.home_team, Prediction.away_team).filter(
+                Prediction.date >= start_date,
+                Prediction.date < end_date,
+                Prediction.outcome != None
+            ).distinct().all()
+        finally:
+            session.close()
+    
+    def get_prediction_modules(self, prediction_ids):
+        """
+        Get the modules that contributed factors to each prediction.
+        
+        Args:
+            prediction_ids (list): IDs of the predictions
+            
+        Returns:
+            dict: Mapping of prediction ID to the set of contributing module names
+        """
+        modules = {prediction_id: set() for prediction_id in prediction_ids}
+        session = self.Session()
+        try:
+            ids = list(modules)
+            for start in range(0, len(ids), MAX_IN_CLAUSE):
+                chunk = ids[start:start + MAX_IN_CLAUSE]
+                for model in (EsotericFactor, OddsFactor):
+                    rows = session.query(model.prediction_id, model.module_source).filter(
+                        model.prediction_id.in_(chunk)
+                    ).distinct()
+                    for prediction_id, module_source in rows:
+                        if module_source:
+                            modules[prediction_id].add(module_source)
+            return modules
+        finally:
+            session.close()
+    
+    def settle_predictions(self, updates, module_deltas=None):
+        """
+        Record the results of many predictions and update the per-module accuracy
+        aggregates in a single transaction.
+        
+        Args:
+            updates (list): Dicts with 'id', 'home_score', 'away_score', 'outcome' and 'correct'
+            module_deltas (dict, optional): Mapping of module name to increments of
+                'settled', 'correct', 'confidence_sum' and 'brier_sum'
+            
+        Returns:
+            int: Number of predictions updated
+        """
+        if not updates and not module_deltas:
+            return 0
+        
+        session = self.Session()
+        try:
+            if updates:
+                session.bulk_update_mappings(Prediction, updates)
+            
+            if module_deltas:
+                existing = {
+                    row.module: row for row in session.query(ModuleAccuracy).filter(
+                        ModuleAccuracy.module.in_(list(module_deltas))
+                    )
+                }
+                now = datetime.now()
+                for module, delta in module_deltas.items():
+                    row = existing.get(module)
+                    if row is None:
+                        row = ModuleAccuracy(module=module, settled=0, correct=0,
+                                             confidence_sum=0.0, brier_sum=0.0)
+                        session.add(row)
+                    row.settled += delta.get('settled', 0)
+                    row.correct += delta.get('correct', 0)
+                    row.confidence_sum += delta.get('confidence_sum', 0.0)
+                    row.brier_sum += delta.get('brier_sum', 0.0)
+                    row.last_updated = now
+            
+            session.commit()
+            return len(updates)
+        except Exception as e:
+            session.rollback()
+            raise e
+        finally:
+            session.close()
+    
+    def get_module_accuracy(self, module=None):
+        """
+        Get the running accuracy aggregates of each module.
+        
+        Args:
+            module (str, optional): Filter by module name
+            
+        Returns:
+            dict: Mapping of module name to accuracy metrics
+        """
+        session = self.Session()
+        try:
+            query = session.query(ModuleAccuracy)
+            if module:
+                query = query.filter(ModuleAccuracy.module == module)
+            
+            return {
+                row.module: {
+                    'settled': row.settled,
+                    'correct': row.correct,
+                    'accuracy': row.correct / row.settled if row.settled else 0,
+                    'avg_confidence': row.confidence_sum / row.settled if row.settled else 0,
+                    'brier_score': row.brier_sum / row.settled if row.settled else 0,
+                    'last_updated': row.last_updated
+                }
+                for row in query.all()
+            }
+        finally:
+            session.close()
+    
     def save_system_metric(self, metric_name, metric_value, module=None, notes=None):
         """
         Save a system performance metric.
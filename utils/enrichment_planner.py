@@ -0,0 +1,395 @@
+"""
+EnrichmentPlanner - Enrichissement groupé d'un programme de matchs pour ArcanShadow
+Ce module reçoit un programme complet (slate) de matchs, en extrait les clés uniques
+(statistiques d'équipe, confrontations directes, fiche club Transfermarkt, effectif) et
+récupère chaque clé une seule fois, en parallèle entre les sources, avec une limite de
+débit et de concurrence propre à chaque source. Le résultat est une table d'enrichissement
+jointe en lecture seule, lue par tous les onglets et modules au lieu de relancer les
+mêmes appels match par match.
+"""
+
+import logging
+import threading
+import time
+from concurrent.futures import Future, ThreadPoolExecutor, as_completed
+from types import MappingProxyType
+
+from utils.team_ratings import normalize_team_name
+
+# Configuration du logger
+logging.basicConfig(
+    level=logging.INFO,
+    format='%(asctime)s - %(name)s - %(levelname)s - %(message)s'
+)
+logger = logging.getLogger('enrichment_planner')
+
+# Limites par source : débit soutenu (requêtes/s), rafale autorisée et appels simultanés
+SOURCE_LIMITS = {
+    'team_stats': {'rate': 5.0, 'burst': 5, 'concurrency': 4},
+    'h2h': {'rate': 5.0, 'burst': 5, 'concurrency': 4},
+    'club_search': {'rate': 1.0, 'burst': 2, 'concurrency': 2},
+    'players': {'rate': 1.0, 'burst': 2, 'concurrency': 2},
+}
+
+# Durée de vie des valeurs récupérées (secondes)
+DEFAULT_TTL = 1800
+
+# Durée pendant laquelle un échec est mémorisé avant une nouvelle tentative (secondes)
+FAILURE_TTL = 120
+
+def _fetch_team_stats(team_id, league_id):
+    from api.football_adapter import get_team_statistics
+    return get_team_statistics(team_id, league_id)
+
+
+def _fetch_h2h(team1_id, team2_id):
+    from api.football_adapter import get_h2h_matches
+    return get_h2h_matches(team1_id, team2_id)
+
+
+def _fetch_club(team_name):
+    from api.transfermarkt_integration import is_transfermarkt_available, search_club_by_name
+    if not is_transfermarkt_available():
+        return None
+    result = search_club_by_name(team_name)
+    if isinstance(result, dict) and result.get('status') == 'success' and result.get('clubs'):
+        return result['clubs'][0]
+    return None
+
+
+def _fetch_players(club_id):
+    from api.transfermarkt_integration import get_team_players
+    result = get_team_players(club_id)
+    if isinstance(result, dict) and result.get('status') == 'error':
+        return None
+    return result
+
+
+DEFAULT_FETCHERS = {
+    'team_stats': _fetch_team_stats,
+    'h2h': _fetch_h2h,
+    'club_search': _fetch_club,
+    'players': _fetch_players,
+}
+
+
+def _match_league_id(match):
+    league_id = match.get('league_id')
+    if league_id is None and isinstance(match.get('league'), dict):
+        league_id = match['league'].get('id')
+    return league_id
+
+
+def _pair_key(team1_id, team2_id):
+    return (team1_id, team2_id) if str(team1_id) <= str(team2_id) else (team2_id, team1_id)
+
+
+class _SourceLimiter:
+    """
+    Seau à jetons d'une source : limite le débit soutenu et la taille des rafales.
+    La concurrence est bornée par la taille du pool de threads dédié à la source.
+    """
+
+    def __init__(self, rate, burst):
+        self.rate = float(rate)
+        self.burst = float(burst)
+        self._tokens = float(burst)
+        self._last = time.monotonic()
+        self._lock = threading.Lock()
+
+    def acquire(self):
+        """Bloque jusqu'à ce qu'un jeton soit disponible."""
+        while True:
+            with self._lock:
+                now = time.monotonic()
+                self._tokens = min(self.burst, self._tokens + (now - self._last) * self.rate)
+                self._last = now
+                if self._tokens >= 1.0:
+                    self._tokens -= 1.0
+                    return
+                wait = (1.0 - self._tokens) / self.rate
+            time.sleep(wait)
+
+
+class EnrichmentTable:
+    """
+    Table d'enrichissement en lecture seule produite pour un programme de matchs.
+    Les valeurs sont partagées entre les matchs : `join` en renvoie des copies.
+    """
+
+    def __init__(self, team_stats, h2h, clubs, players):
+        self.team_stats = MappingProxyType(dict(team_stats))
+        self.h2h = MappingProxyType(dict(h2h))
+        self.clubs = MappingProxyType(dict(clubs))
+        self.players = MappingProxyType(dict(players))
+
+    def __len__(self):
+        return len(self.team_stats) + len(self.h2h) + len(self.clubs) + len(self.players)
+
+    def _club(self, team_name):
+        if not team_name:
+            return None
+        return self.clubs.get(normalize_team_name(team_name))
+
+    def _squad(self, club):
+        if not club or club.get('id') is None:
+            return None
+        return self.players.get(club['id'])
+
+    def for_match(self, match):
+        """
+        Renvoie la vue d'enrichissement d'un match.
+
+        Args:
+            match (dict): Match du programme (home_team, away_team, home_team_id, ...)
+
+        Returns:
+            MappingProxyType: home_stats, away_stats, h2h, home_club, away_club,
+                home_players, away_players
+        """
+        league_id = _match_league_id(match)
+        home_id = match.get('home_team_id')
+        away_id = match.get('away_team_id')
+        home_club = self._club(match.get('home_team'))
+        away_club = self._club(match.get('away_team'))
+        h2h = None
+        if home_id is not None and away_id is not None:
+            h2h = self.h2h.get(_pair_key(home_id, away_id))
+        return MappingProxyType({
+            'home_stats': self.team_stats.get((home_id, league_id)),
+            'away_stats': self.team_stats.get((away_id, league_id)),
+            'h2h': h2h,
+            'home_club': home_club,
+            'away_club': away_club,
+            'home_players': self._squad(home_club),
+            'away_players': self._squad(away_club),
+        })
+
+    def join(self, match):
+        """
+        Fusionne le match et son enrichissement dans un nouveau dictionnaire.
+
+        Args:
+            match (dict): Match du programme
+
+        Returns:
+            dict: Copie du match avec les champs d'enrichissement et `slate_enriched`
+        """
+        joined = dict(match)
+        for field, value in self.for_match(match).items():
+            if isinstance(value, dict):
+                value = dict(value)
+            elif isinstance(value, list):
+                value = list(value)
+            joined[field] = value
+        joined['slate_enriched'] = True
+        return joined
+
+
+class EnrichmentPlanner:
+    """
+    Planificateur d'enrichissement : déduplique les clés d'un programme de matchs,
+    récupère chaque clé une seule fois (cache TTL + fusion des requêtes en vol) et
+    respecte les limites de chaque source.
+    """
+
+    def __init__(self, fetchers=None, limits=None, ttl=DEFAULT_TTL, include_players=True):
+        """
+        Initialise le planificateur.
+
+        Args:
+            fetchers (dict, optional): Fonctions de récupération par source
+            limits (dict, optional): Limites par source (rate, burst, concurrency)
+            ttl (int): Durée de vie des valeurs en cache (secondes)
+            include_players (bool): Récupérer aussi les effectifs Transfermarkt
+        """
+        self.fetchers = dict(DEFAULT_FETCHERS)
+        if fetchers:
+            self.fetchers.update(fetchers)
+        self.limits = {source: dict(values) for source, values in SOURCE_LIMITS.items()}
+        for source, values in (limits or {}).items():
+            self.limits.setdefault(source, {}).update(values)
+        self.ttl = ttl
+        self.include_players = include_players
+
+        self._cache = {}
+        self._inflight = {}
+        self._lock = threading.Lock()
+        self._limiters = {}
+        self._executors = {}
+        self._stats = {source: {'requested': 0, 'fetched': 0, 'cache_hits': 0,
+                                'coalesced': 0, 'errors': 0}
+                       for source in self.fetchers}
+
+    def _executor(self, source):
+        executor = self._executors.get(source)
+        if executor is None:
+            limits = self.limits.get(source, {})
+            executor = ThreadPoolExecutor(max_workers=limits.get('concurrency', 2),
+                                          thread_name_prefix=f'enrich-{source}')
+            self._executors[source] = executor
+            self._limiters[source] = _SourceLimiter(limits.get('rate', 1.0),
+                                                    limits.get('burst', 1))
+        return executor
+
+    def plan(self, slate):
+        """
+        Collecte les clés uniques à récupérer pour un programme de matchs.
+
+        Args:
+            slate (list): Liste de matchs (dicts)
+
+        Returns:
+            dict: Par source, dictionnaire clé -> arguments de récupération
+        """
+        plan = {'team_stats': {}, 'h2h': {}, 'club_search': {}}
+        for match in slate:
+            league_id = _match_league_id(match)
+            home_id = match.get('home_team_id')
+            away_id = match.get('away_team_id')
+            for team_id in (home_id, away_id):
+                if team_id is not None:
+                    plan['team_stats'].setdefault((team_id, league_id), (team_id, league_id))
+            if home_id is not None and away_id is not None:
+                plan['h2h'].setdefault(_pair_key(home_id, away_id), (home_id, away_id))
+            for team_name in (match.get('home_team'), match.get('away_team')):
+                if team_name:
+                    plan['club_search'].setdefault(normalize_team_name(team_name), (team_name,))
+        return plan
+
+    def _get(self, source, key, args):
+        """
+        Renvoie un Future pour la clé, servi par le cache, une requête en vol ou un
+        nouvel appel à la source.
+        """
+        cache_key = (source, key)
+        with self._lock:
+            stats = self._stats[source]
+            stats['requested'] += 1
+            cached = self._cache.get(cache_key)
+            if cached is not None and cached[0] > time.monotonic():
+                stats['cache_hits'] += 1
+                future = Future()
+                future.set_result(cached[1])
+                return future
+            future = self._inflight.get(cache_key)
+            if future is not None:
+                stats['coalesced'] += 1
+                return future
+            executor = self._executor(source)
+            future = executor.submit(self._fetch, source, key, args)
+            self._inflight[cache_key] = future
+            return future
+
+    def _fetch(self, source, key, args):
+        cache_key = (source, key)
+        self._limiters[source].acquire()
+        try:
+            value = self.fetchers[source](*args)
+        except Exception as e:
+            logger.warning(f"Échec de l'enrichissement {source} pour {key}: {e}")
+            with self._lock:
+                self._stats[source]['errors'] += 1
+                # Échec mémorisé brièvement : les rechargements ne relancent pas la source en boucle
+                self._cache[cache_key] = (time.monotonic() + FAILURE_TTL, None)
+                self._inflight.pop(cache_key, None)
+            return None
+        with self._lock:
+            self._stats[source]['fetched'] += 1
+            self._cache[cache_key] = (time.monotonic() + self.ttl, value)
+            self._inflight.pop(cache_key, None)
+        return value
+
+    def enrich_slate(self, slate, include_players=None, include_clubs=True):
+        """
+        Enrichit un programme de matchs complet.
+
+        Args:
+            slate (list): Liste de matchs (dicts)
+            include_players (bool, optional): Surcharge de `include_players`
+            include_clubs (bool): Rechercher les fiches clubs Transfermarkt (limitées à 1 req/s) ;
+                sans fiche club, aucun effectif n'est récupéré
+
+        Returns:
+            EnrichmentTable: Table d'enrichissement en lecture seule
+        """
+        if include_players is None:
+            include_players = self.include_players
+        plan = self.plan(slate)
+        if not include_clubs:
+            plan.pop('club_search')
+
+        futures = {}
+        for source, keys in plan.items():
+            for key, args in keys.items():
+                futures[self._get(source, key, args)] = (source, key)
+
+        results = {'team_stats': {}, 'h2h': {}, 'club_search': {}, 'players': {}}
+        player_futures = {}
+        pending = set(futures)
+        while pending:
+            for future in as_completed(list(pending)):
+                pending.discard(future)
+                source, key = futures.pop(future)
+                value = future.result()
+                results[source][key] = value
+                # Les effectifs dépendent de l'identifiant Transfermarkt du club
+                if (include_players and source == 'club_search' and value
+                        and value.get('id') is not None and value['id'] not in player_futures):
+                    player_future = self._get('players', value['id'], (value['id'],))
+                    player_futures[value['id']] = player_future
+                    futures[player_future] = ('players', value['id'])
+                    pending.add(player_future)
+                    break
+
+        return EnrichmentTable(results['team_stats'], results['h2h'],
+                               results['club_search'], results['players'])
+
+    def invalidate(self, source=None):
+        """
+        Vide le cache, pour une source ou pour toutes.
+
+        Args:
+            source (str, optional): Source à invalider
+        """
+        with self._lock:
+            if source is None:
+                self._cache.clear()
+            else:
+                for cache_key in [k for k in self._cache if k[0] == source]:
+                    del self._cache[cache_key]
+
+    def get_stats(self):
+        """
+        Renvoie les compteurs par source.
+
+        Returns:
+            dict: requested, fetched, cache_hits, coalesced, errors par source
+        """
+        with self._lock:
+            return {source: dict(values) for source, values in self._stats.items()}
+
+    def close(self):
+        """Arrête les pools de threads des sources."""
+        for executor in self._executors.values():
+            executor.shutdown(wait=False)
+        self._executors.clear()
+
+
+_enrichment_planner = None
+_enrichment_planner_lock = threading.Lock()
+
+
+def get_enrichment_planner():
+    """
+    Renvoie l'instance partagée du planificateur d'enrichissement.
+
+    Returns:
+        EnrichmentPlanner: Planificateur partagé
+    """
+    global _enrichment_planner
+    if _enrichment_planner is None:
+        with _enrichment_planner_lock:
+            if _enrichment_planner is None:
+                _enrichment_planner = EnrichmentPlanner()
+    return _enrichment_planner
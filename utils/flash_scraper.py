@@ -16,6 +16,7 @@ from trafilatura import fetch_url, extract
 from bs4 import BeautifulSoup
 import logging
 from .cache_manager import CacheManager
+from .odds_tick_store import get_odds_tick_store
 
 # Configuration du logger
 logging.basicConfig(
@@ -47,6 +48,9 @@ class FlashScraper:
         # Initialiser le gestionnaire de cache
         self.cache_manager = CacheManager()
         
+        # Magasin persistant des ticks de cotes
+        self.tick_store = get_odds_tick_store()
+        
         # Durées de cache par défaut (en secondes)
         self.cache_durations = {
             'matches_of_day': 3 * 60 * 60,      # 3 heures pour les matchs du jour
@@ -442,6 +446,8 @@ class FlashScraper:
                 except:
                     continue
             
+            self._record_odds_ticks(match_id, odds_movement)
+            
             return odds_movement
             
         except Exception as e:
@@ -451,6 +457,62 @@ class FlashScraper:
         finally:
             self._random_delay()
     
+    def _record_odds_ticks(self, match_id, odds_movement):
+        """
+        Enregistre l'évolution des cotes scrapée dans le magasin de ticks.
+        
+        Args:
+            match_id (str): Identifiant unique du match
+            odds_movement (dict): Historique des cotes par marché tel que renvoyé par get_odds_movement
+            
+        Returns:
+            int: Nombre de ticks enregistrés
+        """
+        now = datetime.now()
+        ticks = []
+        undated = 0
+        for market, outcomes in odds_movement.items():
+            for outcome, points in outcomes.items():
+                for point in points:
+                    try:
+                        price = float(str(point['value']).replace(',', '.'))
+                    except (KeyError, ValueError):
+                        continue
+                    
+                    # Sans horodatage lisible, le tick serait daté de l'instant du scraping et
+                    # ré-inséré à chaque passage (l'unicité porte sur l'horodatage) : il est ignoré
+                    timestamp = None
+                    time_text = str(point.get('time', '')).strip()
+                    for fmt in ('%d.%m.%Y %H:%M', '%d.%m. %H:%M', '%H:%M'):
+                        try:
+                            parsed = datetime.strptime(time_text, fmt)
+                            if fmt == '%d.%m. %H:%M':
+                                parsed = parsed.replace(year=now.year)
+                            elif fmt == '%H:%M':
+                                parsed = now.replace(hour=parsed.hour, minute=parsed.minute, second=0, microsecond=0)
+                            timestamp = parsed
+                            break
+                        except ValueError:
+                            continue
+                    if timestamp is None:
+                        undated += 1
+                        continue
+                    
+                    ticks.append({
+                        'match_id': match_id,
+                        'market': market,
+                        'outcome': outcome,
+                        'price': price,
+                        'timestamp': timestamp,
+                        'bookmaker': 'flashscore'
+                    })
+        
+        if undated:
+            logger.warning(f"{undated} cotes sans horodatage lisible ignorées pour le match {match_id}")
+        if not ticks:
+            return 0
+        return self.tick_store.append_ticks(ticks)
+    
     def get_head_to_head(self, team1_id, team2_id, num_matches=10):
         """
         Récupère l'historique des confrontations directes entre deux équipes.
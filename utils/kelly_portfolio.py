@@ -0,0 +1,468 @@
+"""
+KellyPortfolio - Optimisation des mises au critère de Kelly sur un portefeuille de paris
+Ce module répartit la bankroll entre les paris simples et les combinés candidats du jour
+en tenant compte de leurs corrélations : deux paris sur le même match (ou un simple et
+un combiné qui le contient) ne sont pas indépendants.
+
+Les scénarios conjoints sont tirés par Monte-Carlo dans la matrice de scores de chaque
+match (voir score_matrix) ; chaque pari est réglé sur le score simulé, ce qui donne une
+matrice de gains (scénarios x paris). Les mises maximisent la croissance logarithmique
+espérée de la bankroll, puis sont réduites d'une fraction de Kelly.
+"""
+
+import logging
+import re
+import time
+
+import numpy as np
+
+from .score_matrix import MAX_GOALS, DEFAULT_RHO, build_score_matrices, fit_expected_goals
+
+# Configuration du logger
+logging.basicConfig(
+    level=logging.INFO,
+    format='%(asctime)s - %(name)s - %(levelname)s - %(message)s'
+)
+logger = logging.getLogger('kelly_portfolio')
+
+# Paramètres par défaut de l'optimisation
+DEFAULT_SCENARIOS = 100_000
+DEFAULT_KELLY_FRACTION = 0.25
+DEFAULT_MAX_EXPOSURE = 0.5
+
+_GOALS = np.arange(MAX_GOALS + 1)
+_HOME_GRID, _AWAY_GRID = np.meshgrid(_GOALS, _GOALS, indexing='ij')
+_TOTAL_GRID = _HOME_GRID + _AWAY_GRID
+_DIFF_GRID = _HOME_GRID - _AWAY_GRID
+
+_NUMBER = re.compile(r'[-+]?\d+(?:\.\d+)?')
+_CORRECT_SCORE = re.compile(r'^\s*(\d+)\s*[-:]\s*(\d+)\s*$')
+_TOTAL_SELECTION = re.compile(r'\b(over|under|plus de|moins de)\b\s*(\d+(?:\.\d+)?)?')
+
+
+def _settle_margin(margin, line):
+    """
+    Règle un pari gagnant si `margin + line > 0` sur chaque case de la grille.
+
+    Les lignes en quart sont réparties à parts égales sur les deux demi-lignes voisines.
+
+    Returns:
+        tuple: (part gagnée, part remboursée), grilles (11, 11)
+    """
+    if (line * 4) % 2:
+        low, high = _settle_margin(margin, line - 0.25), _settle_margin(margin, line + 0.25)
+        return (low[0] + high[0]) / 2, (low[1] + high[1]) / 2
+    value = margin + line
+    return (value > 0).astype(float), (value == 0).astype(float)
+
+
+def _same_team(text, team):
+    return bool(team) and text.strip().lower() == str(team).strip().lower()
+
+
+def settlement_grids(market, selection, home_team=None, away_team=None):
+    """
+    Traduit une sélection en grilles de règlement sur les scores exacts.
+
+    Formats reconnus : ceux de BettingComboGenerator ('1X2', 'O/U 2.5', 'BTTS', 'match_result'),
+    ceux de daily_combo ('Victoire X', 'Match nul', 'Double chance: X ou Nul'), les handicaps
+    asiatiques ('Asian Handicap', sélection 'Equipe -0.75') et les scores exacts ('2-1').
+
+    Args:
+        market (str): Marché du pari
+        selection (str): Sélection jouée
+        home_team (str, optional): Équipe à domicile (sélections nommées par équipe)
+        away_team (str, optional): Équipe à l'extérieur
+
+    Returns:
+        tuple: (part gagnée, part remboursée), grilles (11, 11) indexées par (buts domicile, buts extérieur)
+
+    Raises:
+        ValueError: Si la sélection n'est pas reconnue
+    """
+    market_text = str(market or '').strip().lower()
+    text = str(selection or '').strip()
+    lower = text.lower()
+    zeros = np.zeros(_DIFF_GRID.shape)
+
+    # Score exact
+    score = _CORRECT_SCORE.match(text)
+    if score:
+        win = ((_HOME_GRID == int(score.group(1))) & (_AWAY_GRID == int(score.group(2)))).astype(float)
+        return win, zeros
+
+    # Over/Under (la ligne peut être portée par la sélection ou par le marché)
+    total = _TOTAL_SELECTION.search(lower)
+    if total and (total.group(2) or _NUMBER.search(market_text)):
+        line = float(total.group(2) or _NUMBER.search(market_text).group())
+        if total.group(1) in ('over', 'plus de'):
+            return _settle_margin(_TOTAL_GRID, -line)
+        return _settle_margin(-_TOTAL_GRID, line)
+
+    # Les deux équipes marquent
+    if 'btts' in market_text or 'both' in market_text or 'deux équipes' in market_text:
+        both = ((_HOME_GRID > 0) & (_AWAY_GRID > 0)).astype(float)
+        if lower in ('yes', 'oui'):
+            return both, zeros
+        if lower in ('no', 'non'):
+            return 1.0 - both, zeros
+        raise ValueError(f"Sélection BTTS inconnue: {selection}")
+
+    home_win = (_DIFF_GRID > 0).astype(float)
+    draw = (_DIFF_GRID == 0).astype(float)
+    away_win = (_DIFF_GRID < 0).astype(float)
+
+    # Double chance
+    if lower.startswith('double chance') or lower in ('1x', 'x2', '12'):
+        choice = lower.split(':', 1)[-1].strip()
+        parts = [part.strip() for part in re.split(r'\s+ou\s+|\s+or\s+|/', choice)]
+        if lower == '1x' or ('nul' in parts and any(_same_team(p, home_team) for p in parts)):
+            return home_win + draw, zeros
+        if lower == 'x2' or ('nul' in parts and any(_same_team(p, away_team) for p in parts)):
+            return away_win + draw, zeros
+        if lower == '12' or (any(_same_team(p, home_team) for p in parts) and any(_same_team(p, away_team) for p in parts)):
+            return home_win + away_win, zeros
+        raise ValueError(f"Double chance inconnue: {selection}")
+
+    # Handicap asiatique (ligne appliquée à l'équipe désignée par la sélection)
+    if 'handicap' in market_text:
+        number = _NUMBER.findall(text)
+        if not number:
+            raise ValueError(f"Ligne de handicap absente: {selection}")
+        line = float(number[-1])
+        side = _NUMBER.sub('', text).strip()
+        if side.lower() in ('away', '2') or _same_team(side, away_team):
+            return _settle_margin(-_DIFF_GRID, line)
+        return _settle_margin(_DIFF_GRID, line)
+
+    # Résultat du match (1X2)
+    name = lower[len('victoire '):] if lower.startswith('victoire ') else lower
+    if lower in ('x', 'draw', 'nul', 'match nul'):
+        return draw, zeros
+    if lower in ('1', 'home', 'home_win', 'domicile') or _same_team(name, home_team):
+        return home_win, zeros
+    if lower in ('2', 'away', 'away_win', 'extérieur') or _same_team(name, away_team):
+        return away_win, zeros
+    raise ValueError(f"Sélection inconnue: {market} / {selection}")
+
+
+def _project_capped_simplex(f, cap):
+    """Projection euclidienne sur {f >= 0, somme(f) <= cap}."""
+    f = np.maximum(f, 0.0)
+    if f.sum() <= cap:
+        return f
+    # Projection sur la face somme(f) == cap (algorithme par tri)
+    u = np.sort(f)[::-1]
+    cumulative = np.cumsum(u) - cap
+    k = np.arange(1, len(u) + 1)
+    rho = np.flatnonzero(u - cumulative / k > 0)[-1]
+    return np.maximum(f - cumulative[rho] / (rho + 1), 0.0)
+
+
+def _solve_quadratic_step(hessian, gradient, f, cap, max_iter=500):
+    """
+    Maximise le modèle quadratique g'(z - f) - (z - f)'H(z - f) / 2 sur {z >= 0, somme(z) <= cap}
+    par gradient projeté accéléré (FISTA) ; le problème est de la taille du nombre de paris.
+    """
+    lipschitz = max(float(np.linalg.eigvalsh(hessian)[-1]), 1e-12)
+    z = y = f
+    momentum = 1.0
+    for _ in range(max_iter):
+        z_next = _project_capped_simplex(y + (gradient - hessian @ (y - f)) / lipschitz, cap)
+        if np.abs(z_next - z).max() < 1e-12:
+            return z_next
+        momentum_next = (1.0 + np.sqrt(1.0 + 4.0 * momentum ** 2)) / 2.0
+        y = z_next + (momentum - 1.0) / momentum_next * (z_next - z)
+        z, momentum = z_next, momentum_next
+    return z
+
+
+def maximise_log_growth(returns, max_exposure=DEFAULT_MAX_EXPOSURE, max_iter=50, tol=1e-10):
+    """
+    Mises (fractions de bankroll) maximisant la croissance logarithmique espérée.
+
+    Résout max E[log(1 + R.f)] sous f >= 0 et somme(f) <= max_exposure par programmation
+    quadratique successive : à chaque itération, gradient et hessien sont calculés en une
+    passe sur les scénarios, le sous-problème quadratique contraint est résolu dans l'espace
+    des paris, puis le pas est ajusté par recherche linéaire.
+
+    Args:
+        returns (numpy.ndarray): Gains nets par unité misée, forme (scénarios, paris)
+        max_exposure (float): Part maximale de la bankroll engagée (strictement inférieure à 1)
+        max_iter (int): Nombre maximal d'itérations
+        tol (float): Gain de croissance minimal pour continuer
+
+    Returns:
+        tuple: (mises de Kelly complètes (paris,), croissance logarithmique espérée)
+    """
+    if not 0 < max_exposure < 1:
+        raise ValueError("max_exposure doit être compris strictement entre 0 et 1")
+    n_scenarios, n_bets = returns.shape
+
+    f = np.zeros(n_bets)
+    growth = 0.0
+    for _ in range(max_iter):
+        inverse = 1.0 / (1.0 + returns @ f)
+        gradient = returns.T @ inverse / n_scenarios
+        # Paris concernés : déjà misés ou dont la mise améliorerait la croissance
+        active = (f > 0) | (gradient > 0)
+        if not active.any():
+            break
+
+        # Opposé du hessien sur les paris concernés : R' diag(1 / W²) R / S
+        scaled = returns[:, active] * inverse[:, None]
+        hessian = scaled.T @ scaled / n_scenarios
+        hessian[np.diag_indices_from(hessian)] += 1e-10
+        target = np.zeros(n_bets)
+        target[active] = _solve_quadratic_step(hessian, gradient[active], f[active],
+                                               max_exposure - f[~active].sum())
+        direction = target - f
+
+        # Recherche linéaire (les points f + t.direction restent admissibles)
+        step, improved = 1.0, False
+        while step > 1e-6:
+            candidate = f + step * direction
+            candidate_growth = float(np.log1p(returns @ candidate).mean())
+            if candidate_growth > growth:
+                improved = True
+                break
+            step /= 2
+        if not improved:
+            break
+
+        gain = candidate_growth - growth
+        f, growth = candidate, candidate_growth
+        if gain < tol:
+            break
+
+    return f, growth
+
+
+class KellyPortfolioOptimizer:
+    """
+    Optimiseur de mises de Kelly sur les paris simples et combinés d'une journée,
+    par scénarios de scores conjoints tirés dans les matrices de scores des matchs.
+    """
+
+    def __init__(self, n_scenarios=DEFAULT_SCENARIOS, kelly_fraction=DEFAULT_KELLY_FRACTION,
+                 max_exposure=DEFAULT_MAX_EXPOSURE, rho=DEFAULT_RHO, seed=None):
+        """
+        Initialise l'optimiseur.
+
+        Args:
+            n_scenarios (int): Nombre de scénarios Monte-Carlo
+            kelly_fraction (float): Fraction de Kelly appliquée aux mises optimales
+            max_exposure (float): Part maximale de la bankroll engagée (Kelly complet)
+            rho (float): Paramètre de dépendance Dixon-Coles des matrices de scores
+            seed (int, optional): Graine du générateur aléatoire
+        """
+        self.n_scenarios = int(n_scenarios)
+        self.kelly_fraction = kelly_fraction
+        self.max_exposure = max_exposure
+        self.rho = rho
+        self.seed = seed
+        self.matches = {}
+        self.bets = []
+        self._bet_keys = set()
+
+    def add_match(self, match_key, home_expected_goals, away_expected_goals, home_team=None, away_team=None):
+        """
+        Déclare un match à partir de ses buts attendus.
+
+        Args:
+            match_key: Identifiant du match (référencé par les paris)
+            home_expected_goals (float): Buts attendus à domicile
+            away_expected_goals (float): Buts attendus à l'extérieur
+            home_team (str, optional): Équipe à domicile
+            away_team (str, optional): Équipe à l'extérieur
+        """
+        self.matches[match_key] = {
+            'home_expected_goals': float(home_expected_goals),
+            'away_expected_goals': float(away_expected_goals),
+            'home_team': home_team,
+            'away_team': away_team
+        }
+
+    def add_match_from_probabilities(self, match_key, home_win, draw, away_win, home_team=None, away_team=None):
+        """
+        Déclare un match dont seules les probabilités 1X2 sont connues (en % ou en fractions).
+
+        Args:
+            match_key: Identifiant du match
+            home_win (float): Probabilité de victoire à domicile
+            draw (float): Probabilité de match nul
+            away_win (float): Probabilité de victoire à l'extérieur
+            home_team (str, optional): Équipe à domicile
+            away_team (str, optional): Équipe à l'extérieur
+        """
+        home_xg, away_xg = fit_expected_goals(home_win, draw, away_win)
+        self.add_match(match_key, home_xg[0], away_xg[0], home_team, away_team)
+
+    def add_bet(self, legs, label=None, source=None):
+        """
+        Ajoute un pari candidat (simple si une jambe, combiné sinon).
+
+        Args:
+            legs (list): Jambes {'match': clé du match, 'market', 'selection', 'odds'}
+            label (str, optional): Libellé du pari
+            source (str, optional): Origine du pari (best_bets, combo, ...)
+
+        Returns:
+            bool: True si le pari a été ajouté (jambes reconnues et pari non dupliqué)
+        """
+        settled = []
+        for leg in legs:
+            match = self.matches.get(leg.get('match'))
+            odds = leg.get('odds') or 0
+            if match is None or odds <= 1.0:
+                logger.warning(f"Jambe ignorée (match inconnu ou cote invalide): {leg}")
+                return False
+            try:
+                win, push = settlement_grids(leg.get('market'), leg.get('selection'),
+                                             match['home_team'], match['away_team'])
+            except ValueError as e:
+                logger.warning(f"Jambe ignorée: {e}")
+                return False
+            settled.append({**leg, 'payout': (win * odds + push).ravel()})
+
+        key = tuple(sorted((str(l['match']), str(l.get('market')), str(l.get('selection')), float(l['odds']))
+                           for l in settled))
+        if not settled or key in self._bet_keys:
+            return False
+        self._bet_keys.add(key)
+
+        total_odds = float(np.prod([leg['odds'] for leg in settled]))
+        if label is None:
+            label = ' + '.join(f"{leg.get('selection')}" for leg in settled)
+        self.bets.append({'label': label, 'source': source, 'legs': settled, 'odds': total_odds})
+        return True
+
+    def add_best_bets(self, best_bets, source='best_bets'):
+        """
+        Ajoute des paris simples au format de BettingComboGenerator.generate_best_bets.
+
+        Args:
+            best_bets (list): Paris simples ('match' avec 'id', 'market', 'selection', 'odds')
+            source (str): Origine des paris
+
+        Returns:
+            int: Nombre de paris ajoutés
+        """
+        return sum(
+            self.add_bet([{'match': bet['match'].get('id'), 'market': bet.get('market'),
+                           'selection': bet.get('selection'), 'odds': bet.get('odds')}], source=source)
+            for bet in best_bets
+        )
+
+    def add_combo(self, selections, label=None, source='combo'):
+        """
+        Ajoute un combiné dont les sélections sont au format de generate_best_bets.
+
+        Args:
+            selections (list): Sélections du combiné
+            label (str, optional): Libellé du combiné
+            source (str): Origine du combiné
+
+        Returns:
+            bool: True si le combiné a été ajouté
+        """
+        legs = [{'match': sel['match'].get('id'), 'market': sel.get('market'),
+                 'selection': sel.get('selection'), 'odds': sel.get('odds')} for sel in selections]
+        return self.add_bet(legs, label=label, source=source)
+
+    def sample_scenarios(self):
+        """
+        Tire les scores conjoints de la journée.
+
+        Returns:
+            numpy.ndarray: Indices des cases de score (buts domicile * 11 + buts extérieur), forme (scénarios, matchs)
+        """
+        keys = list(self.matches)
+        matrices = build_score_matrices(
+            [self.matches[k]['home_expected_goals'] for k in keys],
+            [self.matches[k]['away_expected_goals'] for k in keys],
+            self.rho
+        ).reshape(len(keys), -1)
+        cdf = np.cumsum(matrices, axis=1)
+        cdf /= cdf[:, -1:]
+
+        rng = np.random.default_rng(self.seed)
+        uniforms = rng.random((self.n_scenarios, len(keys)))
+        cells = np.empty((self.n_scenarios, len(keys)), dtype=np.int16)
+        for i in range(len(keys)):
+            cells[:, i] = np.searchsorted(cdf[i], uniforms[:, i], side='right')
+        return np.minimum(cells, matrices.shape[1] - 1)
+
+    def payoff_matrix(self, cells):
+        """
+        Règle chaque pari sur chaque scénario.
+
+        Args:
+            cells (numpy.ndarray): Scénarios tirés par sample_scenarios
+
+        Returns:
+            numpy.ndarray: Gains nets par unité misée, forme (scénarios, paris)
+        """
+        columns = {key: np.ascontiguousarray(cells[:, i], dtype=np.intp) for i, key in enumerate(self.matches)}
+        # Une ligne contiguë par pari, renvoyée transposée (scénarios x paris)
+        returns = np.empty((len(self.bets), len(cells)))
+        for j, bet in enumerate(self.bets):
+            first, *others = bet['legs']
+            payout = first['payout'].take(columns[first['match']])
+            for leg in others:
+                payout *= leg['payout'].take(columns[leg['match']])
+            np.subtract(payout, 1.0, out=returns[j])
+        return returns.T
+
+    def optimise(self, bankroll=1.0):
+        """
+        Calcule les mises de Kelly fractionnaires du portefeuille.
+
+        Args:
+            bankroll (float): Bankroll disponible
+
+        Returns:
+            dict: Mises par pari et statistiques du portefeuille
+        """
+        started = time.perf_counter()
+        if not self.bets:
+            return {'bets': [], 'total_stake': 0.0, 'expected_growth': 0.0, 'expected_return': 0.0,
+                    'loss_probability': 0.0, 'bankroll_quantiles': {}, 'n_scenarios': 0, 'elapsed': 0.0}
+
+        returns = self.payoff_matrix(self.sample_scenarios())
+        full_kelly, _ = maximise_log_growth(returns, self.max_exposure)
+        stakes = full_kelly * self.kelly_fraction
+
+        outcome = returns @ stakes
+        quantiles = dict(zip((5, 50, 95), (bankroll * (1.0 + np.percentile(outcome, (5, 50, 95)))).tolist()))
+
+        probabilities = (returns > 0).mean(axis=0)
+        expected_values = returns.mean(axis=0)
+        bets = []
+        for j, bet in enumerate(self.bets):
+            bets.append({
+                'label': bet['label'],
+                'source': bet['source'],
+                'selections': [{k: v for k, v in leg.items() if k != 'payout'} for leg in bet['legs']],
+                'odds': bet['odds'],
+                'probability': float(probabilities[j]),
+                'expected_value': float(expected_values[j]),
+                'full_kelly': float(full_kelly[j]),
+                'stake_fraction': float(stakes[j]),
+                'stake': float(bankroll * stakes[j])
+            })
+        bets.sort(key=lambda b: b['stake'], reverse=True)
+
+        elapsed = time.perf_counter() - started
+        logger.info(f"Portefeuille de Kelly: {len(self.bets)} paris, {self.n_scenarios} scénarios, "
+                    f"{np.count_nonzero(stakes)} mises, {elapsed:.3f}s")
+        return {
+            'bets': bets,
+            'total_stake': float(bankroll * stakes.sum()),
+            'expected_growth': float(np.log1p(outcome).mean()),
+            'expected_return': float(bankroll * outcome.mean()),
+            'loss_probability': float((outcome < 0).mean()),
+            'bankroll_quantiles': quantiles,
+            'n_scenarios': self.n_scenarios,
+            'elapsed': elapsed
+        }
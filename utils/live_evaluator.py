@@ -0,0 +1,234 @@
+"""
+LiveEvaluator - Évaluation incrémentale des modules live pour ArcanShadow
+Chaque module live déclare les entrées qu'il lit (minute, score, événements, cotes, ...).
+À chaque mise à jour, une empreinte légère de chaque entrée est calculée une seule fois et
+seuls les modules dont au moins une entrée a changé sont relancés ; les autres résultats
+sont repris du cache du tick précédent.
+Le module fournit aussi un index incrémental des événements live, qui ne lit que les
+événements ajoutés depuis le dernier appel au lieu de reparcourir la liste complète.
+"""
+
+import logging
+
+# Configuration du logger
+logging.basicConfig(
+    level=logging.INFO,
+    format='%(asctime)s - %(name)s - %(levelname)s - %(message)s'
+)
+logger = logging.getLogger('live_evaluator')
+
+
+def event_key(event):
+    """
+    Clé de contenu d'un événement live (minute, type, équipe, horodatage).
+
+    Args:
+        event (dict): Événement live
+
+    Returns:
+        tuple: Clé identifiant l'événement indépendamment de l'objet qui le porte
+    """
+    return (event.get('minute'), event.get('type'), event.get('team'), event.get('timestamp'))
+
+
+def _events_fingerprint(state):
+    events = state.get('key_events') or []
+    if not events:
+        return (0, None)
+    last = events[-1]
+    return (len(events), last.get('timestamp'), last.get('minute'), last.get('type'))
+
+
+# Empreintes des entrées de base d'un état de match live
+DEFAULT_SELECTORS = {
+    'minute': lambda state: state.get('minute', 0),
+    'score': lambda state: tuple(state.get('score') or (0, 0)),
+    'events': _events_fingerprint,
+    'odds': lambda state: (state.get('home_odds'), state.get('draw_odds'), state.get('away_odds')),
+}
+
+
+class LiveDependencyEvaluator:
+    """
+    Évaluateur à dépendances suivies : un nœud n'est recalculé que si l'empreinte
+    d'une de ses entrées déclarées, ou le résultat d'un nœud dont il dépend, a changé.
+    """
+
+    def __init__(self, selectors=None):
+        """
+        Initialise l'évaluateur.
+
+        Args:
+            selectors (dict, optional): Empreintes supplémentaires, nom -> fonction(état)
+        """
+        self.selectors = dict(DEFAULT_SELECTORS)
+        if selectors:
+            self.selectors.update(selectors)
+        self._nodes = {}
+        self._cache = {}
+        self._stats = {'ticks': 0, 'computed': 0, 'reused': 0}
+
+    def register(self, name, func, inputs, depends=()):
+        """
+        Déclare un nœud d'évaluation.
+
+        Args:
+            name (str): Nom du nœud
+            func (callable): Fonction appelée avec l'état du match (et les résultats amont)
+            inputs (tuple): Noms des entrées lues par le nœud
+            depends (tuple): Nœuds dont les résultats sont passés à `func`
+        """
+        unknown = [i for i in inputs if i not in self.selectors]
+        if unknown:
+            raise ValueError(f"Entrées inconnues pour {name}: {unknown}")
+        missing = [d for d in depends if d not in self._nodes]
+        if missing:
+            raise ValueError(f"Dépendances non déclarées pour {name}: {missing}")
+        self._nodes[name] = {'func': func, 'inputs': tuple(inputs), 'depends': tuple(depends)}
+        self._cache.pop(name, None)
+
+    def fingerprint(self, state, inputs=None):
+        """
+        Calcule les empreintes des entrées d'un état.
+
+        Args:
+            state (dict): État courant du match
+            inputs (iterable, optional): Entrées à calculer (toutes par défaut)
+
+        Returns:
+            dict: nom d'entrée -> empreinte
+        """
+        names = self.selectors if inputs is None else inputs
+        return {name: self.selectors[name](state) for name in names}
+
+    def evaluate(self, state, names=None):
+        """
+        Évalue les nœuds demandés, en réutilisant les résultats dont les entrées n'ont pas changé.
+
+        Args:
+            state (dict): État courant du match
+            names (iterable, optional): Nœuds à évaluer (tous par défaut, dans l'ordre de déclaration)
+
+        Returns:
+            dict: nom de nœud -> résultat
+        """
+        wanted = list(self._nodes) if names is None else list(names)
+        needed = set(wanted)
+        for name in reversed(list(self._nodes)):
+            if name in needed:
+                needed.update(self._nodes[name]['depends'])
+
+        used_inputs = set()
+        for name in needed:
+            used_inputs.update(self._nodes[name]['inputs'])
+        prints = self.fingerprint(state, used_inputs)
+
+        self._stats['ticks'] += 1
+        results = {}
+        changed = set()
+        for name, node in self._nodes.items():
+            if name not in needed:
+                continue
+            key = tuple(prints[i] for i in node['inputs'])
+            cached = self._cache.get(name)
+            stale = cached is None or cached[0] != key or any(d in changed for d in node['depends'])
+            if stale:
+                upstream = [results[d] for d in node['depends']]
+                value = node['func'](state, *upstream)
+                self._cache[name] = (key, value)
+                changed.add(name)
+                self._stats['computed'] += 1
+            else:
+                value = cached[1]
+                self._stats['reused'] += 1
+            results[name] = value
+        return {name: results[name] for name in wanted}
+
+    def invalidate(self, name=None):
+        """
+        Vide le cache, pour un nœud ou pour tous.
+
+        Args:
+            name (str, optional): Nœud à invalider
+        """
+        if name is None:
+            self._cache.clear()
+        else:
+            self._cache.pop(name, None)
+
+    def reset(self):
+        """Vide le cache et remet les compteurs à zéro (nouveau match suivi)."""
+        self._cache.clear()
+        self._stats = {'ticks': 0, 'computed': 0, 'reused': 0}
+
+    def get_stats(self):
+        """
+        Renvoie les compteurs d'évaluation.
+
+        Returns:
+            dict: ticks, computed, reused
+        """
+        return dict(self._stats)
+
+
+class LiveEventIndex:
+    """
+    Index incrémental des événements live d'un match : seuls les événements ajoutés
+    depuis le dernier appel sont lus. La continuité est vérifiée sur le contenu du
+    dernier événement indexé, de sorte qu'une liste reconstruite à chaque poll (depuis
+    le JSON de l'API par exemple) ne renvoie pas les anciens événements comme nouveaux.
+    Si la liste a été raccourcie ou ne prolonge plus la précédente, l'index est reconstruit.
+    """
+
+    def __init__(self, types=None):
+        """
+        Initialise l'index.
+
+        Args:
+            types (iterable, optional): Types d'événements conservés dans l'index
+        """
+        self.types = set(types) if types else None
+        self.clear()
+
+    def clear(self):
+        """Réinitialise l'index."""
+        self.count = 0
+        self.max_minute = 0
+        self.events = []
+        self._last = None
+
+    def update(self, live_events):
+        """
+        Intègre les nouveaux événements.
+
+        Args:
+            live_events (list): Liste complète (croissante) des événements du match
+
+        Returns:
+            list: Événements ajoutés depuis le dernier appel
+        """
+        live_events = live_events or []
+        if len(live_events) < self.count or (self.count and event_key(live_events[self.count - 1]) != self._last):
+            self.clear()
+        new_events = live_events[self.count:]
+        for event in new_events:
+            minute = event.get('minute', 0)
+            if minute > self.max_minute:
+                self.max_minute = minute
+            if self.types is None or event.get('type', '') in self.types:
+                self.events.append(event)
+        self.count = len(live_events)
+        self._last = event_key(live_events[-1]) if live_events else None
+        return new_events
+
+    def since(self, minute):
+        """
+        Renvoie les événements indexés strictement postérieurs à une minute.
+
+        Args:
+            minute (int): Minute de référence
+
+        Returns:
+            list: Événements indexés avec minute > `minute`
+        """
+        return [e for e in self.events if e.get('minute', 0) > minute]
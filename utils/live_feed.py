@@ -0,0 +1,468 @@
+"""
+LiveFeed - Flux partagé des matchs en direct pour ArcanShadow
+Un seul processus interroge l'endpoint des matchs en direct (fixtures?live=all) à
+cadence fixe, via le courtier d'API (quota et cache partagés) : un bail stocké en base
+désigne le processus chargé du polling, les autres se contentent de lire. Le polling
+s'arrête lorsque plus personne ne lit le flux et reprend à la lecture suivante.
+Chaque réponse est normalisée une seule fois, puis publiée dans une base SQLite en
+mode WAL sous forme d'instantané versionné et de différences (matchs ajoutés,
+modifiés, terminés) ; une réponse identique à la précédente ne crée pas de version.
+Toutes les sessions Streamlit lisent cette base ; une version déjà décodée est servie
+depuis la mémoire. Le nombre d'appels à l'API ne dépend donc plus du nombre de
+tableaux de bord ouverts.
+"""
+
+import hashlib
+import json
+import logging
+import os
+import sqlite3
+import threading
+import time
+import uuid
+import zlib
+
+from utils.api_broker import get_api_broker, PRIORITY_LIVE
+
+# Configuration du logger
+logging.basicConfig(
+    level=logging.INFO,
+    format='%(asctime)s - %(name)s - %(levelname)s - %(message)s'
+)
+logger = logging.getLogger('live_feed')
+
+API_URL = "https://api-football-v1.p.rapidapi.com/v3/fixtures"
+API_HOST = "api-football-v1.p.rapidapi.com"
+
+# Champs comparés pour détecter qu'un match a changé entre deux instantanés
+TRACKED_FIELDS = ('home_score', 'away_score', 'minute', 'status_short', 'status_long')
+
+
+def _encode(data):
+    """Sérialise un instantané en JSON compact compressé."""
+    return zlib.compress(json.dumps(data, ensure_ascii=False, separators=(',', ':')).encode('utf-8'))
+
+
+def _decode(blob):
+    """Désérialise un instantané produit par _encode."""
+    return json.loads(zlib.decompress(blob).decode('utf-8'))
+
+
+def _payload_hash(status, matches):
+    """Empreinte du contenu publié (statut et matchs), hors horodatage."""
+    payload = json.dumps([status, matches], sort_keys=True, separators=(',', ':'))
+    return hashlib.sha256(payload.encode('utf-8')).hexdigest()
+
+
+def normalize_fixture(fixture):
+    """
+    Normalise un match de la réponse de l'API Football.
+
+    Args:
+        fixture (dict): Élément de la liste 'response' de l'API
+
+    Returns:
+        dict: Match normalisé partagé par tous les onglets
+    """
+    fixture_data = fixture.get('fixture', {})
+    teams = fixture.get('teams', {})
+    goals = fixture.get('goals', {})
+    league = fixture.get('league', {})
+    status = fixture_data.get('status', {})
+    return {
+        'fixture_id': fixture_data.get('id'),
+        'home_team': teams.get('home', {}).get('name', ''),
+        'away_team': teams.get('away', {}).get('name', ''),
+        'league': league.get('name', ''),
+        'league_id': league.get('id'),
+        'country': league.get('country', ''),
+        'home_score': goals.get('home') or 0,
+        'away_score': goals.get('away') or 0,
+        'minute': status.get('elapsed') or 0,
+        'status_short': status.get('short', ''),
+        'status_long': status.get('long', 'En direct'),
+        'kickoff': fixture_data.get('date')
+    }
+
+
+def diff_matches(previous, current):
+    """
+    Calcule les différences entre deux listes de matchs normalisés.
+
+    Args:
+        previous (list): Matchs de l'instantané précédent
+        current (list): Matchs du nouvel instantané
+
+    Returns:
+        dict: Matchs ajoutés, modifiés (champs changés) et retirés
+    """
+    before = {match['fixture_id']: match for match in previous}
+    after = {match['fixture_id']: match for match in current}
+    changed = []
+    for fixture_id, match in after.items():
+        old = before.get(fixture_id)
+        if old is None:
+            continue
+        fields = {field: match.get(field) for field in TRACKED_FIELDS if match.get(field) != old.get(field)}
+        if fields:
+            changed.append({'fixture_id': fixture_id, 'changes': fields})
+    return {
+        'added': [match for fixture_id, match in after.items() if fixture_id not in before],
+        'changed': changed,
+        'removed': [fixture_id for fixture_id in before if fixture_id not in after]
+    }
+
+
+class LiveFeed:
+    """
+    Flux partagé des matchs en direct : polling unique, publication dans SQLite
+    (instantanés et différences) et lecture par toutes les sessions.
+    """
+    def __init__(self, db_path=os.path.join("data", "live_feed.db"), poll_interval=20.0,
+                 lease_duration=None, retention=200, request_timeout=10, idle_timeout=120.0):
+        """
+        Initialise le flux partagé.
+
+        Args:
+            db_path (str): Base SQLite de publication des instantanés
+            poll_interval (float): Cadence de polling de l'API (secondes)
+            lease_duration (float, optional): Durée du bail de polling (3 cadences par défaut)
+            retention (int): Nombre de versions conservées (instantanés et différences)
+            request_timeout (float): Délai maximal d'une requête à l'API (secondes)
+            idle_timeout (float): Arrêt du polling sans lecture pendant cette durée (secondes)
+        """
+        self.db_path = db_path
+        self.poll_interval = poll_interval
+        self.lease_duration = lease_duration or poll_interval * 3
+        self.retention = retention
+        self.request_timeout = request_timeout
+        self.idle_timeout = idle_timeout
+        self.owner = f"{os.getpid()}-{uuid.uuid4().hex[:8]}"
+
+        self._local = threading.local()
+        self._cache_lock = threading.Lock()
+        self._cached_snapshot = None
+        self._subscribers = []
+        self._stop = threading.Event()
+        self._thread = None
+        self._thread_lock = threading.Lock()
+        self._last_read = time.time()
+        self._stats = {'polls': 0, 'upstream_errors': 0, 'published': 0, 'unchanged': 0,
+                       'reads': 0, 'decodes': 0, 'idle_stops': 0}
+
+        directory = os.path.dirname(self.db_path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        self._init_db()
+
+    # ------------------------------------------------------------------
+    # Stockage
+    # ------------------------------------------------------------------
+    def _connect(self):
+        """Renvoie la connexion SQLite propre au thread courant."""
+        conn = getattr(self._local, 'conn', None)
+        if conn is None:
+            conn = sqlite3.connect(self.db_path, timeout=5)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            self._local.conn = conn
+        return conn
+
+    def _init_db(self):
+        """
+        Initialise les tables des instantanés, des différences et du bail de polling.
+        """
+        conn = self._connect()
+        conn.executescript("""
+            CREATE TABLE IF NOT EXISTS live_snapshots (
+                version INTEGER PRIMARY KEY,
+                fetched_at REAL NOT NULL,
+                status TEXT NOT NULL,
+                payload BLOB NOT NULL
+            );
+            CREATE TABLE IF NOT EXISTS live_diffs (
+                version INTEGER PRIMARY KEY,
+                payload BLOB NOT NULL
+            );
+            CREATE TABLE IF NOT EXISTS poller_lease (
+                id INTEGER PRIMARY KEY CHECK (id = 1),
+                owner TEXT NOT NULL,
+                expires_at REAL NOT NULL
+            );
+        """)
+        conn.commit()
+
+    def _acquire_lease(self):
+        """
+        Prend ou renouvelle le bail de polling.
+
+        Returns:
+            bool: True si ce processus est chargé du polling
+        """
+        now = time.time()
+        conn = self._connect()
+        try:
+            with conn:
+                conn.execute("""
+                    INSERT INTO poller_lease (id, owner, expires_at) VALUES (1, ?, ?)
+                    ON CONFLICT(id) DO UPDATE SET owner = excluded.owner, expires_at = excluded.expires_at
+                    WHERE poller_lease.owner = excluded.owner OR poller_lease.expires_at < ?
+                """, (self.owner, now + self.lease_duration, now))
+            row = conn.execute("SELECT owner FROM poller_lease WHERE id = 1").fetchone()
+            return row is not None and row[0] == self.owner
+        except sqlite3.Error as e:
+            logger.warning(f"Bail de polling indisponible: {e}")
+            return False
+
+    def _release_lease(self):
+        """Libère le bail si ce processus le détient."""
+        try:
+            with self._connect() as conn:
+                conn.execute("DELETE FROM poller_lease WHERE id = 1 AND owner = ?", (self.owner,))
+        except sqlite3.Error:
+            pass
+
+    def _latest_version(self):
+        """Numéro de la dernière version publiée (0 si aucune)."""
+        row = self._connect().execute("SELECT MAX(version) FROM live_snapshots").fetchone()
+        return row[0] or 0
+
+    # ------------------------------------------------------------------
+    # Polling et publication
+    # ------------------------------------------------------------------
+    def _fetch(self):
+        """
+        Interroge l'API via le courtier (priorité live) et normalise la réponse.
+
+        Returns:
+            tuple: (statut, matchs normalisés ou None, message d'erreur)
+        """
+        api_key = os.environ.get('FOOTBALL_API_KEY')
+        if not api_key:
+            return 'no_api_key', [], "Clé API Football non trouvée dans les variables d'environnement"
+
+        headers = {'X-RapidAPI-Key': api_key, 'X-RapidAPI-Host': API_HOST}
+        data = get_api_broker().get_json('api-football', API_URL, params={'live': 'all'}, headers=headers,
+                                         priority=PRIORITY_LIVE, ttl=self.poll_interval)
+        if not isinstance(data, dict):
+            self._stats['upstream_errors'] += 1
+            return 'error', None, "Matchs en direct indisponibles (erreur amont ou quota épuisé)"
+        matches = [normalize_fixture(fixture) for fixture in data.get('response') or []]
+        return ('ok' if matches else 'empty'), matches, None
+
+    def poll_once(self):
+        """
+        Effectue un polling et publie le nouvel instantané.
+        En cas d'erreur, les matchs du dernier instantané sont conservés. Si le statut
+        et les matchs sont identiques au dernier instantané, aucune version n'est créée.
+
+        Returns:
+            dict: Instantané publié, ou le dernier instantané s'il n'a pas changé
+        """
+        status, matches, error = self._fetch()
+        self._stats['polls'] += 1
+
+        previous = self._read_snapshot()
+        previous_matches = previous['matches'] if previous else []
+        if matches is None:
+            matches = previous_matches
+
+        if previous is not None and _payload_hash(status, matches) == _payload_hash(previous['status'], previous_matches):
+            self._stats['unchanged'] += 1
+            return previous
+
+        snapshot = {
+            'status': status,
+            'error': error,
+            'fetched_at': time.time(),
+            'matches': matches
+        }
+        diff = diff_matches(previous_matches, matches)
+        self._publish(snapshot, diff, previous)
+        return snapshot
+
+    def _publish(self, snapshot, diff, previous):
+        """Écrit l'instantané et ses différences, puis notifie les abonnés du processus."""
+        conn = self._connect()
+        with conn:
+            version = self._latest_version() + 1
+            snapshot['version'] = version
+            conn.execute("INSERT INTO live_snapshots (version, fetched_at, status, payload) VALUES (?, ?, ?, ?)",
+                         (version, snapshot['fetched_at'], snapshot['status'], _encode(snapshot)))
+            conn.execute("INSERT INTO live_diffs (version, payload) VALUES (?, ?)", (version, _encode(diff)))
+            conn.execute("DELETE FROM live_snapshots WHERE version <= ?", (version - self.retention,))
+            conn.execute("DELETE FROM live_diffs WHERE version <= ?", (version - self.retention,))
+        self._stats['published'] += 1
+
+        with self._cache_lock:
+            self._cached_snapshot = snapshot
+
+        for callback in list(self._subscribers):
+            try:
+                callback(snapshot, diff)
+            except Exception as e:
+                logger.error(f"Erreur dans un abonné du flux en direct: {e}")
+
+    def _run(self):
+        """
+        Boucle du thread de polling : seul le détenteur du bail interroge l'API.
+        La boucle s'arrête lorsque le flux n'a pas été lu depuis `idle_timeout`.
+        """
+        while not self._stop.is_set():
+            started = time.time()
+            if started - self._last_read > self.idle_timeout:
+                self._stats['idle_stops'] += 1
+                logger.info("Flux en direct sans lecteur : arrêt du polling")
+                break
+            if self._acquire_lease():
+                try:
+                    self.poll_once()
+                except Exception as e:
+                    logger.error(f"Erreur lors du polling des matchs en direct: {e}")
+            self._stop.wait(max(0.0, self.poll_interval - (time.time() - started)))
+        self._release_lease()
+
+    def start(self):
+        """Démarre le thread de polling (sans effet s'il tourne déjà)."""
+        with self._thread_lock:
+            if self._thread is None or not self._thread.is_alive():
+                self._last_read = time.time()
+                self._stop.clear()
+                self._thread = threading.Thread(target=self._run, name='live-feed-poller', daemon=True)
+                self._thread.start()
+
+    def _touch(self):
+        """Enregistre une lecture et relance le polling s'il s'était arrêté faute de lecteur."""
+        self._last_read = time.time()
+        if not self._stop.is_set() and (self._thread is None or not self._thread.is_alive()):
+            self.start()
+
+    def stop(self):
+        """Arrête le thread de polling et libère le bail."""
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join(timeout=self.request_timeout + 1)
+
+    # ------------------------------------------------------------------
+    # Lecture
+    # ------------------------------------------------------------------
+    def get_snapshot(self, wait=True, timeout=None):
+        """
+        Renvoie le dernier instantané publié. Un instantané déjà décodé dans ce
+        processus est servi depuis la mémoire.
+
+        Args:
+            wait (bool): Attendre le premier instantané s'il n'existe pas encore
+            timeout (float, optional): Attente maximale (délai d'une requête par défaut)
+
+        Returns:
+            dict: Instantané (version, statut, matchs) ou None si aucun n'est disponible
+        """
+        self._stats['reads'] += 1
+        self._touch()
+        deadline = time.time() + (self.request_timeout if timeout is None else timeout)
+        while True:
+            snapshot = self._read_snapshot()
+            if snapshot is not None or not wait or time.time() >= deadline:
+                return snapshot
+            time.sleep(0.1)
+
+    def _read_snapshot(self):
+        """Lit le dernier instantané (depuis la mémoire s'il est déjà décodé), sans attente."""
+        version = self._latest_version()
+        with self._cache_lock:
+            cached = self._cached_snapshot
+        if cached is not None and cached['version'] == version:
+            return cached
+        if version:
+            row = self._connect().execute(
+                "SELECT payload FROM live_snapshots WHERE version = ?", (version,)).fetchone()
+            if row is not None:
+                snapshot = _decode(row[0])
+                self._stats['decodes'] += 1
+                with self._cache_lock:
+                    if self._cached_snapshot is None or self._cached_snapshot['version'] < version:
+                        self._cached_snapshot = snapshot
+                return snapshot
+        return None
+
+    def get_matches(self):
+        """
+        Renvoie les matchs en direct du dernier instantané.
+
+        Returns:
+            list: Matchs normalisés (vide si aucun instantané n'est disponible)
+        """
+        snapshot = self.get_snapshot()
+        return snapshot['matches'] if snapshot else []
+
+    def get_changes(self, since_version):
+        """
+        Renvoie les différences publiées après une version donnée.
+
+        Args:
+            since_version (int): Dernière version connue du lecteur
+
+        Returns:
+            list: Différences (avec leur version) dans l'ordre de publication
+        """
+        self._touch()
+        rows = self._connect().execute(
+            "SELECT version, payload FROM live_diffs WHERE version > ? ORDER BY version", (since_version,))
+        return [{'version': version, **_decode(payload)} for version, payload in rows]
+
+    def subscribe(self, callback):
+        """
+        Abonne une fonction aux instantanés publiés par ce processus.
+
+        Args:
+            callback (callable): Fonction appelée avec (instantané, différences)
+        """
+        self._subscribers.append(callback)
+
+    def unsubscribe(self, callback):
+        """
+        Désabonne une fonction.
+
+        Args:
+            callback (callable): Fonction précédemment abonnée
+        """
+        if callback in self._subscribers:
+            self._subscribers.remove(callback)
+
+    def get_stats(self):
+        """
+        Statistiques du flux.
+
+        Returns:
+            dict: Compteurs de polling, de publication et de lecture
+        """
+        lease = self._connect().execute("SELECT owner, expires_at FROM poller_lease WHERE id = 1").fetchone()
+        return {
+            **self._stats,
+            'version': self._latest_version(),
+            'is_poller': bool(lease and lease[0] == self.owner and lease[1] > time.time()),
+            'poll_interval': self.poll_interval
+        }
+
+
+_live_feed = None
+_live_feed_lock = threading.Lock()
+
+
+def get_live_feed():
+    """
+    Renvoie le flux partagé des matchs en direct et démarre son thread de polling.
+    La cadence peut être réglée avec la variable d'environnement ARCANSHADOW_LIVE_POLL_INTERVAL.
+
+    Returns:
+        LiveFeed: Flux partagé
+    """
+    global _live_feed
+    if _live_feed is None:
+        with _live_feed_lock:
+            if _live_feed is None:
+                feed = LiveFeed(poll_interval=float(os.environ.get('ARCANSHADOW_LIVE_POLL_INTERVAL', 20)))
+                feed.start()
+                _live_feed = feed
+    return _live_feed
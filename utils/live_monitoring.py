@@ -5,59 +5,38 @@ import random
 from datetime import datetime, timedelta
 import time
 
+from utils.live_feed import get_live_feed
+from utils.match_event_log import get_match_event_log, FRENCH_LABELS
+
 def get_live_matches():
     """
     Récupère les matchs actuellement en direct.
-    Utilise désormais les données réelles de l'API Football.
+    Utilise le flux partagé des données réelles de l'API Football.
     
     Returns:
         list: Liste des matchs en direct avec les données réelles
     """
-    import os
-    import requests
-    import sys
-    
-    # Utilisation de l'API Football pour obtenir des données réelles
+    # Le flux partagé interroge l'API une seule fois pour toutes les sessions
     try:
-        # Récupérer la clé API des variables d'environnement
-        api_key = os.environ.get('FOOTBALL_API_KEY')
+        snapshot = get_live_feed().get_snapshot()
         
-        if not api_key:
-            print("Avertissement: Clé API Football non trouvée dans les variables d'environnement")
-            # Si nous n'avons pas de clé API, utiliser les données d'exemple
+        if snapshot is None or snapshot['status'] == 'no_api_key':
+            print("Avertissement: Clé API Football non trouvée ou flux des matchs en direct indisponible")
+            # Sans données réelles, utiliser les données d'exemple
             return get_sample_live_matches()
         
-        # Préparation de la requête à l'API Football
-        headers = {
-            'X-RapidAPI-Key': api_key,
-            'X-RapidAPI-Host': 'api-football-v1.p.rapidapi.com'
-        }
-        
-        # Récupérer les matchs en direct
-        url = "https://api-football-v1.p.rapidapi.com/v3/fixtures"
-        params = {"live": "all"}
-        
-        response = requests.get(url, headers=headers, params=params)
-        response.raise_for_status()  # Lever une exception si la réponse contient une erreur
+        if snapshot['status'] == 'error':
+            print(f"Erreur lors de la récupération des matchs en direct: {snapshot['error']}")
         
-        data = response.json()
-        
-        if not data.get('response'):
+        if not snapshot['matches']:
             print("Aucun match en direct trouvé via l'API")
             return get_sample_live_matches()
         
-        # Transformation des données de l'API au format attendu par l'application
+        # Transformation des données du flux au format attendu par l'application
         live_matches = []
         
-        for fixture in data.get('response', []):
-            fixture_data = fixture.get('fixture', {})
-            teams = fixture.get('teams', {})
-            goals = fixture.get('goals', {})
-            league = fixture.get('league', {})
-            
-            # Calculer la minute actuelle
-            status = fixture_data.get('status', {})
-            minute = status.get('elapsed', 0)
+        for match in snapshot['matches']:
+            minute = match['minute']
             
             # Période (1ère ou 2nde mi-temps)
             period = "1ère mi-temps" if minute <= 45 else "2nde mi-temps"
@@ -81,11 +60,11 @@ def get_live_matches():
             
             # Création de l'objet match
             match_data = {
-                'league': league.get('name', ''),
-                'home_team': teams.get('home', {}).get('name', ''),
-                'away_team': teams.get('away', {}).get('name', ''),
-                'home_score': goals.get('home', 0),
-                'away_score': goals.get('away', 0),
+                'league': match['league'],
+                'home_team': match['home_team'],
+                'away_team': match['away_team'],
+                'home_score': match['home_score'],
+                'away_score': match['away_score'],
                 'minute': minute,
                 'period': period,
                 'added_time': 0,
@@ -97,10 +76,6 @@ def get_live_matches():
             
             live_matches.append(match_data)
         
-        if not live_matches:
-            print("Aucun match en direct trouvé après traitement des données")
-            return get_sample_live_matches()
-        
         return live_matches
         
     except Exception as e:
@@ -315,8 +290,12 @@ def get_match_timeline(match_id, current_minute=45):
     Returns:
         dict: Chronologie du match
     """
-    # Dans un système réel, cela récupérerait les données de l'API
-    # Ici, nous générons des données simulées
+    # Chronologie réelle si les événements du match ont été journalisés
+    event_log = get_match_event_log()
+    if event_log.has_events(match_id):
+        return _timeline_from_event_log(event_log, match_id, current_minute)
+    
+    # Sans journal, nous générons des données simulées
     
     # Équipes (pour l'exemple)
     home_team = "Équipe Domicile"
@@ -478,6 +457,73 @@ def get_match_timeline(match_id, current_minute=45):
         }
     }
 
+def _timeline_from_event_log(event_log, match_id, current_minute):
+    """
+    Construit la chronologie d'un match à partir de son journal d'événements.
+    
+    Args:
+        event_log (MatchEventLog): Journal des événements
+        match_id (str): Identifiant du match
+        current_minute (int): Minute actuelle du match
+        
+    Returns:
+        dict: Chronologie du match, au même format que la chronologie simulée
+    """
+    match = event_log.get_meta(match_id)['match']
+    home_team = match.get('home_team', "Équipe Domicile")
+    away_team = match.get('away_team', "Équipe Extérieure")
+    
+    stats_keys = ('shots', 'shots_on_target', 'corners', 'fouls', 'yellow_cards', 'red_cards')
+    stats = {key: {'home': 0, 'away': 0} for key in stats_keys}
+    counted = {
+        'goal': ('shots', 'shots_on_target'), 'penalty_goal': ('shots', 'shots_on_target'),
+        'shot_on_target': ('shots', 'shots_on_target'), 'big_save': ('shots', 'shots_on_target'),
+        'missed_chance': ('shots',), 'missed_penalty': ('shots',), 'corner': ('corners',),
+        'foul': ('fouls',), 'yellow_card': ('yellow_cards',), 'second_yellow': ('red_cards',),
+        'red_card': ('red_cards',)
+    }
+    
+    events = []
+    last_score = "0-0"
+    for tick in event_log.iter_ticks(match_id, step='event'):
+        event = tick['new_events'][0]
+        if event['minute'] > current_minute:
+            break
+        side = event['side']
+        team = event['team'] or ''
+        entry = {
+            'minute': event['minute'],
+            'team': team,
+            'type': FRENCH_LABELS.get(event['type'], event['type'].replace('_', ' '))
+        }
+        if event['player']:
+            entry['player'] = event['player']
+        if event['type'] in ('goal', 'own_goal', 'penalty_goal'):
+            entry['score'] = f"{tick['score'][0]}-{tick['score'][1]}"
+        entry['description'] = f"{entry['type'].capitalize()} ({team})" if team else entry['type'].capitalize()
+        if side:
+            for key in counted.get(event['type'], ()):
+                stats[key][side] += 1
+        last_score = f"{tick['score'][0]}-{tick['score'][1]}"
+        events.append(entry)
+    
+    # Les plus récents en premier, comme la chronologie simulée
+    events.sort(key=lambda x: x['minute'], reverse=True)
+    
+    # La possession n'est pas journalisée
+    stats['possession'] = None
+    
+    return {
+        'match_id': match_id,
+        'home_team': home_team,
+        'away_team': away_team,
+        'current_score': last_score,
+        'current_minute': current_minute,
+        'events': events,
+        'stats': stats,
+        'source': 'event_log'
+    }
+
 def get_match_momentum(match_id):
     """
     Calcule l'indice de momentum pour chaque équipe dans un match.
@@ -0,0 +1,535 @@
+"""
+MatchEventLog - Journal persistant des événements live pour ArcanShadow
+Chaque match (fixture) dispose d'un journal sur disque, en ajout seul hors corrections : un enregistrement
+binaire compact de 9 octets par événement (minute, temps additionnel, code de type,
+équipe, identifiant joueur), accompagné d'un petit fichier JSON de métadonnées
+(équipes, date, noms des joueurs). Les journaux se relisent en un seul bloc NumPy et
+se rejouent minute par minute dans n'importe quel analyseur live, plus vite que le
+temps réel, pour régler les modules ou rejouer une journée complète.
+"""
+
+import json
+import logging
+import os
+import re
+import struct
+import threading
+
+import numpy as np
+
+from utils.team_ratings import normalize_team_name
+
+# Configuration du logger
+logging.basicConfig(
+    level=logging.INFO,
+    format='%(asctime)s - %(name)s - %(levelname)s - %(message)s'
+)
+logger = logging.getLogger('match_event_log')
+
+# Enregistrement d'un événement : minute, temps additionnel, type, équipe, joueur (little-endian, sans alignement)
+RECORD = struct.Struct('<HBBBI')
+RECORD_DTYPE = np.dtype([
+    ('minute', '<u2'),
+    ('added', 'u1'),
+    ('type', 'u1'),
+    ('side', 'u1'),
+    ('player', '<u4')
+])
+
+# Codes de type : l'ordre est figé (les journaux existants en dépendent), ajouter en fin de tuple
+EVENT_TYPES = (
+    'unknown', 'goal', 'own_goal', 'penalty_goal', 'missed_penalty', 'penalty_awarded',
+    'yellow_card', 'second_yellow', 'red_card', 'substitution', 'injury', 'var_review',
+    'missed_chance', 'shot_on_target', 'big_save', 'corner', 'foul', 'offside',
+    'dangerous_attack', 'kickoff', 'half_time', 'full_time'
+)
+EVENT_CODES = {name: code for code, name in enumerate(EVENT_TYPES)}
+
+# Variantes rencontrées dans les modules et les flux (anglais, français, API)
+EVENT_ALIASES = {
+    'but': 'goal',
+    'normal_goal': 'goal',
+    'penalty': 'penalty_goal',
+    'penalty_missed': 'missed_penalty',
+    'carton_jaune': 'yellow_card',
+    'yellow': 'yellow_card',
+    'carton_rouge': 'red_card',
+    'red': 'red_card',
+    'remplacement': 'substitution',
+    'subst': 'substitution',
+    'blessure': 'injury',
+    'var': 'var_review',
+    'occasion': 'missed_chance',
+    'faute': 'foul',
+    'hors_jeu': 'offside',
+}
+
+# Libellés d'affichage (anglais, tels que ceux d'ArcanSentinel) et français (chronologie live)
+EVENT_LABELS = {
+    'goal': 'Goal', 'own_goal': 'Own Goal', 'penalty_goal': 'Penalty Goal',
+    'missed_penalty': 'Missed Penalty', 'yellow_card': 'Yellow Card',
+    'second_yellow': 'Second Yellow', 'red_card': 'Red Card', 'substitution': 'Substitution'
+}
+FRENCH_LABELS = {
+    'goal': 'but', 'own_goal': 'but', 'penalty_goal': 'but', 'yellow_card': 'carton jaune',
+    'second_yellow': 'carton rouge', 'red_card': 'carton rouge', 'missed_chance': 'occasion',
+    'corner': 'corner', 'substitution': 'remplacement', 'foul': 'faute', 'offside': 'hors-jeu'
+}
+
+# Équipe d'un événement
+SIDE_HOME, SIDE_AWAY, SIDE_NONE = 0, 1, 2
+SIDES = ('home', 'away', None)
+
+# Identifiants attribués localement aux joueurs connus uniquement par leur nom
+LOCAL_PLAYER_BASE = 0xF0000000
+
+# Codes qui modifient le score (but pour l'équipe de l'événement, ou contre son camp)
+SCORING_CODES = frozenset((EVENT_CODES['goal'], EVENT_CODES['penalty_goal']))
+OWN_GOAL_CODE = EVENT_CODES['own_goal']
+
+
+def event_code(event_type):
+    """
+    Convertit un type d'événement (toutes variantes) en code compact.
+
+    Args:
+        event_type (str): Type d'événement ('Goal', 'carton jaune', 'red_card', ...)
+
+    Returns:
+        int: Code du type, 0 si le type est inconnu
+    """
+    key = re.sub(r'[\s\-]+', '_', str(event_type or '').strip().lower())
+    key = EVENT_ALIASES.get(key, key)
+    return EVENT_CODES.get(key, 0)
+
+
+class MatchEventLog:
+    """
+    Journal d'événements en ajout seul, un fichier binaire par match.
+    Les enregistrements ne sont jamais réécrits : l'ordre du fichier est l'ordre d'arrivée.
+    La position d'un enregistrement dans le fichier est son numéro de séquence : un suivi
+    relancé sur le même match (redémarrage, rechargement Streamlit) qui renvoie ses
+    événements depuis le début ne les écrit pas une seconde fois.
+    """
+
+    def __init__(self, base_dir=os.path.join("data", "match_events")):
+        """
+        Initialise le journal.
+
+        Args:
+            base_dir (str): Répertoire des journaux (.evl) et métadonnées (.json)
+        """
+        self.base_dir = base_dir
+        self._meta = {}
+        self._lock = threading.RLock()
+        os.makedirs(base_dir, exist_ok=True)
+
+    def _path(self, fixture_id, ext):
+        safe = re.sub(r'[^A-Za-z0-9_.-]+', '_', str(fixture_id))
+        return os.path.join(self.base_dir, f"{safe}.{ext}")
+
+    def _load_meta(self, fixture_id):
+        fixture_id = str(fixture_id)
+        meta = self._meta.get(fixture_id)
+        if meta is None:
+            path = self._path(fixture_id, 'json')
+            if os.path.exists(path):
+                try:
+                    with open(path, 'r', encoding='utf-8') as f:
+                        meta = json.load(f)
+                except Exception as e:
+                    logger.error(f"Métadonnées illisibles pour le match {fixture_id}: {e}")
+            if meta is None:
+                meta = {'fixture_id': fixture_id, 'match': {}, 'players': {}}
+            self._meta[fixture_id] = meta
+        return meta
+
+    def _save_meta(self, fixture_id, meta):
+        path = self._path(fixture_id, 'json')
+        tmp_path = path + '.tmp'
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump(meta, f, ensure_ascii=False, default=str)
+        os.replace(tmp_path, path)
+
+    def open_fixture(self, fixture_id, match_data):
+        """
+        Enregistre les métadonnées d'un match (équipes, date, compétition, cotes).
+
+        Args:
+            fixture_id (str): Identifiant du match
+            match_data (dict): Données du match
+
+        Returns:
+            str: Identifiant du match tel que stocké
+        """
+        fixture_id = str(fixture_id)
+        fields = ('home_team', 'away_team', 'date', 'league', 'sport', 'stadium',
+                  'home_odds', 'draw_odds', 'away_odds')
+        with self._lock:
+            meta = self._load_meta(fixture_id)
+            match = {k: match_data[k] for k in fields if match_data.get(k) is not None}
+            if match != meta['match']:
+                meta['match'].update(match)
+                self._save_meta(fixture_id, meta)
+        return fixture_id
+
+    def _side(self, event, meta):
+        team = event.get('side')
+        if team is None:
+            team = event.get('team')
+        if team in ('home', 0):
+            return SIDE_HOME
+        if team in ('away', 1):
+            return SIDE_AWAY
+        if team:
+            key = normalize_team_name(str(team))
+            match = meta['match']
+            if match.get('home_team') and key == normalize_team_name(match['home_team']):
+                return SIDE_HOME
+            if match.get('away_team') and key == normalize_team_name(match['away_team']):
+                return SIDE_AWAY
+        return SIDE_NONE
+
+    def _player_id(self, event, meta):
+        """Identifiant du joueur ; les joueurs sans identifiant reçoivent un identifiant local."""
+        players = meta['players']
+        name = event.get('player') or event.get('player_name')
+        player_id = event.get('player_id')
+        if player_id is not None:
+            player_id = int(player_id) & 0xFFFFFFFF
+            if name and players.get(str(player_id)) != name:
+                players[str(player_id)] = name
+                return player_id, True
+            return player_id, False
+        if not name:
+            return 0, False
+        for known_id, known_name in players.items():
+            if known_name == name:
+                return int(known_id), False
+        local_ids = [int(k) for k in players if int(k) >= LOCAL_PLAYER_BASE]
+        player_id = max(local_ids) + 1 if local_ids else LOCAL_PLAYER_BASE
+        players[str(player_id)] = name
+        return player_id, True
+
+    def append(self, fixture_id, event, seq=None):
+        """
+        Ajoute un événement au journal d'un match.
+
+        Args:
+            fixture_id (str): Identifiant du match
+            event (dict): Événement (minute, type, team ou side, player/player_id, added_time)
+            seq (int, optional): Numéro de séquence de l'événement dans le match (0 = premier)
+
+        Returns:
+            int: Nombre d'événements écrits (0 si déjà journalisé)
+        """
+        return self.append_events(fixture_id, [event], first_seq=seq)
+
+    def append_events(self, fixture_id, events, first_seq=None):
+        """
+        Ajoute un lot d'événements en une seule écriture.
+
+        Avec `first_seq`, le i-ème événement porte le numéro de séquence first_seq + i et
+        la position d'un enregistrement dans le journal reste égale à son numéro de
+        séquence : un événement déjà journalisé à l'identique est ignoré, un événement
+        corrigé (joueur, minute...) réécrit son enregistrement sur place. Seul un trou
+        dans la numérotation (séquence au-delà de la fin du journal) décale les positions.
+        Sans `first_seq`, tout est ajouté.
+
+        Args:
+            fixture_id (str): Identifiant du match
+            events (iterable): Événements à ajouter, dans l'ordre d'arrivée
+            first_seq (int, optional): Numéro de séquence du premier événement
+
+        Returns:
+            int: Nombre d'événements écrits
+        """
+        fixture_id = str(fixture_id)
+        path = self._path(fixture_id, 'evl')
+        with self._lock:
+            meta = self._load_meta(fixture_id)
+            existing = b''
+            if first_seq is not None and os.path.exists(path):
+                with open(path, 'rb') as f:
+                    existing = f.read()
+            written = len(existing) // RECORD.size
+            chunks = []
+            rewrites = {}
+            skipped = 0
+            meta_changed = False
+            for i, event in enumerate(events):
+                player_id, new_player = self._player_id(event, meta)
+                meta_changed = meta_changed or new_player
+                record = RECORD.pack(
+                    max(0, min(0xFFFF, int(event.get('minute', 0) or 0))),
+                    max(0, min(0xFF, int(event.get('added_time', 0) or 0))),
+                    event_code(event.get('type')),
+                    self._side(event, meta),
+                    player_id
+                )
+                if first_seq is not None:
+                    position = first_seq + i
+                    if position < written:
+                        offset = position * RECORD.size
+                        if existing[offset:offset + RECORD.size] == record:
+                            skipped += 1
+                        else:
+                            logger.info(f"Événement {position} du match {fixture_id} corrigé, réécrit sur place")
+                            rewrites[offset] = record
+                        continue
+                    if position < written + len(chunks):
+                        chunks[position - written] = record
+                        continue
+                    if position > written + len(chunks):
+                        logger.warning(f"Séquence {position} du match {fixture_id} au-delà de la fin du journal "
+                                       f"({written + len(chunks)} événements), ajoutée en fin")
+                chunks.append(record)
+            if skipped:
+                logger.debug(f"{skipped} événement(s) déjà journalisé(s) ignoré(s) pour le match {fixture_id}")
+            if not chunks and not rewrites:
+                if meta_changed:
+                    self._save_meta(fixture_id, meta)
+                return 0
+            with open(path, 'r+b' if rewrites else 'ab') as f:
+                for offset, record in rewrites.items():
+                    f.seek(offset)
+                    f.write(record)
+                if chunks:
+                    f.seek(0, os.SEEK_END)
+                    f.write(b''.join(chunks))
+            if meta_changed or not os.path.exists(self._path(fixture_id, 'json')):
+                self._save_meta(fixture_id, meta)
+        return len(chunks) + len(rewrites)
+
+    def read_records(self, fixture_id):
+        """
+        Lit le journal brut d'un match.
+
+        Args:
+            fixture_id (str): Identifiant du match
+
+        Returns:
+            numpy.ndarray: Tableau structuré de dtype RECORD_DTYPE, dans l'ordre d'arrivée
+        """
+        path = self._path(fixture_id, 'evl')
+        with self._lock:
+            if not os.path.exists(path):
+                return np.empty(0, dtype=RECORD_DTYPE)
+            with open(path, 'rb') as f:
+                data = f.read()
+        # Un enregistrement partiel (arrêt pendant une écriture) est ignoré
+        usable = len(data) - len(data) % RECORD.size
+        return np.frombuffer(data[:usable], dtype=RECORD_DTYPE)
+
+    def get_meta(self, fixture_id):
+        """
+        Renvoie les métadonnées d'un match.
+
+        Args:
+            fixture_id (str): Identifiant du match
+
+        Returns:
+            dict: fixture_id, match (équipes, date, ...), players (identifiant -> nom)
+        """
+        with self._lock:
+            meta = self._load_meta(fixture_id)
+            return {'fixture_id': meta['fixture_id'], 'match': dict(meta['match']),
+                    'players': dict(meta['players'])}
+
+    def get_events(self, fixture_id):
+        """
+        Décode les événements d'un match.
+
+        Args:
+            fixture_id (str): Identifiant du match
+
+        Returns:
+            list: Événements (minute, added_time, type, label, side, team, player_id, player)
+        """
+        meta = self.get_meta(fixture_id)
+        records = self.read_records(fixture_id)
+        return [self._decode(record, meta) for record in records.tolist()]
+
+    def _decode(self, record, meta):
+        minute, added, code, side, player_id = record
+        event_type = EVENT_TYPES[code] if code < len(EVENT_TYPES) else 'unknown'
+        side_name = SIDES[side] if side < len(SIDES) else None
+        match = meta['match']
+        team = match.get('home_team') if side == SIDE_HOME else match.get('away_team') if side == SIDE_AWAY else None
+        return {
+            'minute': minute,
+            'added_time': added,
+            'type': event_type,
+            'label': EVENT_LABELS.get(event_type, event_type.replace('_', ' ').title()),
+            'side': side_name,
+            'team': team or side_name,
+            'player_id': player_id or None,
+            'player': meta['players'].get(str(player_id)) if player_id else None
+        }
+
+    def has_events(self, fixture_id):
+        """
+        Indique si un journal non vide existe pour un match.
+
+        Args:
+            fixture_id (str): Identifiant du match
+
+        Returns:
+            bool: True si au moins un événement est enregistré
+        """
+        path = self._path(fixture_id, 'evl')
+        return os.path.exists(path) and os.path.getsize(path) >= RECORD.size
+
+    def list_fixtures(self, date=None):
+        """
+        Liste les matchs journalisés, éventuellement pour une journée donnée.
+
+        Args:
+            date (any, optional): Date de la journée (date, datetime ou chaîne ISO)
+
+        Returns:
+            list: Identifiants des matchs
+        """
+        day = str(date)[:10] if date is not None else None
+        fixtures = []
+        for name in sorted(os.listdir(self.base_dir)):
+            if not name.endswith('.json'):
+                continue
+            try:
+                with open(os.path.join(self.base_dir, name), 'r', encoding='utf-8') as f:
+                    meta = json.load(f)
+            except Exception:
+                continue
+            if day is None or str(meta.get('match', {}).get('date', ''))[:10] == day:
+                fixtures.append(meta['fixture_id'])
+        return fixtures
+
+    def iter_ticks(self, fixture_id, step='minute', end_minute=90):
+        """
+        Rejoue un match sous forme d'états live successifs.
+
+        La liste `key_events` est partagée entre les états et ne fait que croître,
+        comme pendant un suivi réel : les index incrémentaux des analyseurs restent valides.
+
+        Args:
+            fixture_id (str): Identifiant du match
+            step (str): 'minute' (un état par minute de jeu) ou 'event' (un état par événement)
+            end_minute (int): Dernière minute rejouée si aucun événement n'est plus tardif
+
+        Yields:
+            dict: Données du match + minute, current_minute, score, key_events, new_events
+        """
+        meta = self.get_meta(fixture_id)
+        rows = self.read_records(fixture_id).tolist()
+        events = [self._decode(row, meta) for row in rows]
+        last_minute = max((row[0] for row in rows), default=0)
+
+        key_events = []
+        score = [0, 0]
+
+        def state(minute, new_events):
+            tick = dict(meta['match'])
+            tick.update({
+                'fixture_id': meta['fixture_id'],
+                'minute': minute,
+                'current_minute': minute,
+                'score': list(score),
+                'key_events': key_events,
+                'new_events': new_events
+            })
+            return tick
+
+        def apply(event, code, side):
+            key_events.append(event)
+            if side < SIDE_NONE:
+                if code in SCORING_CODES:
+                    score[side] += 1
+                elif code == OWN_GOAL_CODE:
+                    score[1 - side] += 1
+
+        if step == 'event':
+            for event, row in zip(events, rows):
+                apply(event, row[2], row[3])
+                yield state(event['minute'], [event])
+            return
+
+        position = 0
+        for minute in range(0, max(end_minute, last_minute) + 1):
+            new_events = []
+            while position < len(events) and events[position]['minute'] <= minute:
+                row = rows[position]
+                apply(events[position], row[2], row[3])
+                new_events.append(events[position])
+                position += 1
+            yield state(minute, new_events)
+
+    def replay(self, fixture_id, analyser, step='minute', end_minute=90):
+        """
+        Rejoue un match dans un analyseur live.
+
+        Args:
+            fixture_id (str): Identifiant du match
+            analyser (callable): Fonction appelée avec chaque état (voir `iter_ticks`)
+            step (str): 'minute' ou 'event'
+            end_minute (int): Dernière minute rejouée
+
+        Returns:
+            list: Résultats successifs de l'analyseur
+        """
+        return [analyser(tick) for tick in self.iter_ticks(fixture_id, step, end_minute)]
+
+    def replay_matchday(self, analyser_factory, date=None, fixture_ids=None, step='minute'):
+        """
+        Rejoue tous les matchs d'une journée, chacun dans un analyseur neuf.
+
+        Args:
+            analyser_factory (callable): Fonction (métadonnées du match) -> analyseur
+            date (any, optional): Journée à rejouer
+            fixture_ids (list, optional): Matchs à rejouer (prioritaire sur `date`)
+            step (str): 'minute' ou 'event'
+
+        Returns:
+            dict: Identifiant du match -> résultats successifs de l'analyseur
+        """
+        if fixture_ids is None:
+            fixture_ids = self.list_fixtures(date)
+        results = {}
+        for fixture_id in fixture_ids:
+            analyser = analyser_factory(self.get_meta(fixture_id))
+            results[str(fixture_id)] = self.replay(fixture_id, analyser, step)
+        return results
+
+
+def fixture_key(match_data):
+    """
+    Renvoie l'identifiant de journal d'un match (identifiant API, sinon équipes et date).
+
+    Args:
+        match_data (dict): Données du match
+
+    Returns:
+        str: Identifiant du match dans le journal
+    """
+    for field in ('fixture_id', 'id', 'match_id'):
+        if match_data.get(field) is not None:
+            return str(match_data[field])
+    return f"{match_data.get('home_team', '')}_{match_data.get('away_team', '')}_{str(match_data.get('date', ''))[:10]}"
+
+
+_match_event_log = None
+_match_event_log_lock = threading.Lock()
+
+
+def get_match_event_log():
+    """
+    Renvoie l'instance partagée du journal d'événements.
+
+    Returns:
+        MatchEventLog: Journal partagé par les trackers live
+    """
+    global _match_event_log
+    if _match_event_log is None:
+        with _match_event_log_lock:
+            if _match_event_log is None:
+                _match_event_log = MatchEventLog()
+    return _match_event_log
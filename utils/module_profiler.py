@@ -0,0 +1,429 @@
+"""
+ModuleProfiler - Instrumentation légère des modules d'analyse d'ArcanShadow
+Ce module mesure le temps passé dans chaque point d'entrée public des analyseurs
+(méthodes analyze_* / predict_* des classes de modules/), le nombre d'appels, les
+erreurs et le taux de succès du cache de prédictions par module. Les durées sont
+rangées dans un histogramme à classes logarithmiques (pas de 5 %), ce qui donne
+les percentiles p50/p95/p99 en mémoire constante. Lorsque le profilage est désactivé,
+chaque appel instrumenté ne coûte qu'un test de booléen.
+
+Une capture détaillée (cProfile, ou pyinstrument s'il est installé) peut être
+demandée pour l'analyse d'un seul match.
+"""
+
+import cProfile
+import functools
+import inspect
+import io
+import json
+import logging
+import math
+import os
+import pstats
+import sys
+import threading
+import time
+from contextlib import contextmanager
+from datetime import datetime
+
+import numpy as np
+
+try:
+    from pyinstrument import Profiler as PyInstrumentProfiler
+    PYINSTRUMENT_AVAILABLE = True
+except ImportError:
+    PYINSTRUMENT_AVAILABLE = False
+
+# Configuration du logger
+logging.basicConfig(
+    level=logging.INFO,
+    format='%(asctime)s - %(name)s - %(levelname)s - %(message)s'
+)
+logger = logging.getLogger('module_profiler')
+
+# Histogramme logarithmique : de 1 µs à ~100 s par pas de 5 %
+HISTOGRAM_MIN_SECONDS = 1e-6
+HISTOGRAM_GROWTH = 1.05
+HISTOGRAM_BUCKETS = int(math.ceil(math.log(1e8) / math.log(HISTOGRAM_GROWTH))) + 1
+_LOG_GROWTH = math.log(HISTOGRAM_GROWTH)
+
+# Préfixes des points d'entrée instrumentés par défaut
+DEFAULT_ENTRY_PREFIXES = ('analyze', 'predict')
+
+# Variable d'environnement activant le profilage au démarrage
+PROFILING_ENV_VAR = 'ARCANSHADOW_PROFILING'
+
+
+class LatencyStats:
+    """Compteurs et histogramme des durées d'un point d'entrée."""
+
+    __slots__ = ('calls', 'errors', 'total', 'max', 'histogram')
+
+    def __init__(self):
+        self.calls = 0
+        self.errors = 0
+        self.total = 0.0
+        self.max = 0.0
+        self.histogram = np.zeros(HISTOGRAM_BUCKETS, dtype=np.int64)
+
+    def record(self, elapsed, failed=False):
+        """Enregistre une durée (secondes)."""
+        self.calls += 1
+        self.errors += failed
+        self.total += elapsed
+        if elapsed > self.max:
+            self.max = elapsed
+        if elapsed <= HISTOGRAM_MIN_SECONDS:
+            bucket = 0
+        else:
+            bucket = min(HISTOGRAM_BUCKETS - 1, int(math.log(elapsed / HISTOGRAM_MIN_SECONDS) / _LOG_GROWTH) + 1)
+        self.histogram[bucket] += 1
+
+    def percentiles(self, quantiles=(0.5, 0.95, 0.99)):
+        """
+        Estime des percentiles à partir de l'histogramme (borne haute de la classe).
+
+        Args:
+            quantiles (tuple): Quantiles recherchés dans [0, 1]
+
+        Returns:
+            list: Durées estimées en secondes
+        """
+        if not self.calls:
+            return [0.0 for _ in quantiles]
+        cumulative = np.cumsum(self.histogram)
+        buckets = np.searchsorted(cumulative, [q * self.calls for q in quantiles], side='left')
+        upper = HISTOGRAM_MIN_SECONDS * HISTOGRAM_GROWTH ** buckets.astype(float)
+        return [float(min(u, self.max)) for u in upper]
+
+
+class ModuleProfiler:
+    """
+    Registre des mesures de latence par (module, point d'entrée) et des accès cache par module.
+    """
+
+    def __init__(self, enabled=False):
+        """
+        Initialise le profileur.
+
+        Args:
+            enabled (bool): Activer les mesures dès la création
+        """
+        self.enabled = enabled
+        self._stats = {}
+        self._cache = {}
+        self._lock = threading.Lock()
+        self._instrumented = set()
+        self.started_at = datetime.now()
+
+    def enable(self, instrument_loaded=True):
+        """
+        Active les mesures.
+
+        Args:
+            instrument_loaded (bool): Instrumenter les classes des modules déjà importés
+        """
+        if instrument_loaded:
+            self.instrument_loaded_modules()
+        self.enabled = True
+        logger.info("Profilage des modules activé")
+
+    def disable(self):
+        """Désactive les mesures (les wrappers restent en place, sans coût notable)."""
+        self.enabled = False
+
+    def reset(self):
+        """Efface toutes les mesures."""
+        with self._lock:
+            self._stats.clear()
+            self._cache.clear()
+            self.started_at = datetime.now()
+
+    def record(self, module, entry_point, elapsed, failed=False):
+        """
+        Enregistre la durée d'un appel.
+
+        Args:
+            module (str): Nom du module
+            entry_point (str): Nom du point d'entrée
+            elapsed (float): Durée en secondes
+            failed (bool): L'appel a levé une exception
+        """
+        key = (module, entry_point)
+        with self._lock:
+            stats = self._stats.get(key)
+            if stats is None:
+                stats = self._stats[key] = LatencyStats()
+            stats.record(elapsed, failed)
+
+    def record_cache(self, module, hit):
+        """
+        Enregistre un accès au cache de prédictions pour un module.
+
+        Args:
+            module (str): Nom du module
+            hit (bool): Résultat trouvé en cache
+        """
+        with self._lock:
+            counters = self._cache.setdefault(module, [0, 0])
+            counters[0 if hit else 1] += 1
+
+    @contextmanager
+    def measure(self, module, entry_point):
+        """
+        Mesure un bloc de code.
+
+        Args:
+            module (str): Nom du module
+            entry_point (str): Nom du point d'entrée
+        """
+        if not self.enabled:
+            yield
+            return
+        started = time.perf_counter()
+        failed = True
+        try:
+            yield
+            failed = False
+        finally:
+            self.record(module, entry_point, time.perf_counter() - started, failed)
+
+    def wrap(self, function, module, entry_point=None):
+        """
+        Enveloppe une fonction pour en mesurer les appels.
+
+        Args:
+            function (callable): Fonction ou méthode à mesurer
+            module (str): Nom du module
+            entry_point (str, optional): Nom du point d'entrée (nom de la fonction par défaut)
+
+        Returns:
+            callable: Fonction instrumentée
+        """
+        if getattr(function, '__profiled__', False):
+            return function
+        entry_point = entry_point or function.__name__
+        profiler = self
+
+        @functools.wraps(function)
+        def wrapper(*args, **kwargs):
+            if not profiler.enabled:
+                return function(*args, **kwargs)
+            started = time.perf_counter()
+            failed = True
+            try:
+                result = function(*args, **kwargs)
+                failed = False
+                return result
+            finally:
+                profiler.record(module, entry_point, time.perf_counter() - started, failed)
+
+        wrapper.__profiled__ = True
+        return wrapper
+
+    def instrument_class(self, cls, module_name=None, prefixes=DEFAULT_ENTRY_PREFIXES):
+        """
+        Instrumente les méthodes publiques d'une classe dont le nom commence par un préfixe.
+
+        Args:
+            cls (type): Classe à instrumenter
+            module_name (str, optional): Nom du module (nom de la classe par défaut)
+            prefixes (tuple): Préfixes des points d'entrée
+
+        Returns:
+            int: Nombre de méthodes instrumentées
+        """
+        module_name = module_name or cls.__name__
+        count = 0
+        for name, attribute in list(vars(cls).items()):
+            if name.startswith('_') or not name.startswith(prefixes) or not inspect.isfunction(attribute):
+                continue
+            if getattr(attribute, '__profiled__', False):
+                continue
+            setattr(cls, name, self.wrap(attribute, module_name, name))
+            count += 1
+        return count
+
+    def instrument_loaded_modules(self, package='modules', prefixes=DEFAULT_ENTRY_PREFIXES):
+        """
+        Instrumente les classes définies dans les modules déjà importés d'un paquet.
+
+        Args:
+            package (str): Préfixe des modules Python à parcourir
+            prefixes (tuple): Préfixes des points d'entrée
+
+        Returns:
+            int: Nombre de méthodes instrumentées
+        """
+        count = 0
+        for module_name, module in list(sys.modules.items()):
+            if module is None or not (module_name == package or module_name.startswith(package + '.')):
+                continue
+            for _, cls in inspect.getmembers(module, inspect.isclass):
+                if cls.__module__ != module_name or cls in self._instrumented:
+                    continue
+                self._instrumented.add(cls)
+                count += self.instrument_class(cls, prefixes=prefixes)
+        if count:
+            logger.info(f"{count} points d'entrée instrumentés dans le paquet '{package}'")
+        return count
+
+    def get_report(self):
+        """
+        Construit le rapport des mesures, trié par temps total décroissant.
+
+        Returns:
+            dict: {'generated_at', 'since', 'enabled', 'entry_points': [...], 'cache': {...}}
+        """
+        with self._lock:
+            items = [(key, stats.calls, stats.errors, stats.total, stats.max, stats.percentiles())
+                     for key, stats in self._stats.items()]
+            cache = {module: list(counters) for module, counters in self._cache.items()}
+
+        entry_points = []
+        for (module, entry_point), calls, errors, total, maximum, (p50, p95, p99) in items:
+            hits, misses = cache.get(module, (0, 0))
+            entry_points.append({
+                'module': module,
+                'entry_point': entry_point,
+                'calls': calls,
+                'errors': errors,
+                'total_ms': round(total * 1000, 3),
+                'mean_ms': round(total * 1000 / calls, 3) if calls else 0.0,
+                'p50_ms': round(p50 * 1000, 3),
+                'p95_ms': round(p95 * 1000, 3),
+                'p99_ms': round(p99 * 1000, 3),
+                'max_ms': round(maximum * 1000, 3),
+                'cache_hit_ratio': round(hits / (hits + misses), 4) if hits + misses else None
+            })
+        entry_points.sort(key=lambda row: row['total_ms'], reverse=True)
+
+        return {
+            'generated_at': datetime.now().isoformat(),
+            'since': self.started_at.isoformat(),
+            'enabled': self.enabled,
+            'entry_points': entry_points,
+            'cache': {
+                module: {'hits': hits, 'misses': misses,
+                         'hit_ratio': round(hits / (hits + misses), 4) if hits + misses else 0.0}
+                for module, (hits, misses) in cache.items()
+            }
+        }
+
+    def export_json(self, path=None):
+        """
+        Exporte le rapport en JSON.
+
+        Args:
+            path (str, optional): Fichier de destination (chaîne renvoyée si None)
+
+        Returns:
+            str: Rapport JSON (ou chemin du fichier écrit)
+        """
+        payload = json.dumps(self.get_report(), ensure_ascii=False, indent=2)
+        if path is None:
+            return payload
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        with open(path, 'w', encoding='utf-8') as f:
+            f.write(payload)
+        return path
+
+    def capture(self, function, *args, engine='cprofile', top=30, **kwargs):
+        """
+        Exécute un appel unique sous profileur détaillé (ex: l'analyse d'un match).
+
+        Args:
+            function (callable): Fonction à exécuter
+            *args: Arguments positionnels
+            engine (str): 'cprofile' ou 'pyinstrument' (si installé)
+            top (int): Nombre de fonctions conservées dans le résumé
+            **kwargs: Arguments nommés
+
+        Returns:
+            dict: {'result', 'engine', 'elapsed_ms', 'report' (texte), 'functions' (cProfile)}
+        """
+        if engine == 'pyinstrument' and PYINSTRUMENT_AVAILABLE:
+            profiler = PyInstrumentProfiler()
+            started = time.perf_counter()
+            profiler.start()
+            try:
+                result = function(*args, **kwargs)
+            finally:
+                profiler.stop()
+            return {
+                'result': result,
+                'engine': 'pyinstrument',
+                'elapsed_ms': round((time.perf_counter() - started) * 1000, 3),
+                'report': profiler.output_text(unicode=True, color=False),
+                'functions': []
+            }
+
+        profile = cProfile.Profile()
+        started = time.perf_counter()
+        profile.enable()
+        try:
+            result = function(*args, **kwargs)
+        finally:
+            profile.disable()
+        elapsed = time.perf_counter() - started
+
+        stream = io.StringIO()
+        stats = pstats.Stats(profile, stream=stream).sort_stats('cumulative')
+        stats.print_stats(top)
+
+        functions = []
+        for (filename, line, name), (_, calls, own, cumulative, _) in stats.stats.items():
+            functions.append({
+                'function': f"{os.path.basename(filename)}:{line}({name})",
+                'calls': calls,
+                'own_ms': round(own * 1000, 3),
+                'cumulative_ms': round(cumulative * 1000, 3)
+            })
+        functions.sort(key=lambda row: row['cumulative_ms'], reverse=True)
+
+        return {
+            'result': result,
+            'engine': 'cprofile',
+            'elapsed_ms': round(elapsed * 1000, 3),
+            'report': stream.getvalue(),
+            'functions': functions[:top]
+        }
+
+
+_module_profiler = None
+_module_profiler_lock = threading.Lock()
+
+
+def get_module_profiler():
+    """
+    Renvoie l'instance partagée du profileur de modules (activée si la variable
+    d'environnement ARCANSHADOW_PROFILING vaut 1).
+
+    Returns:
+        ModuleProfiler: Profileur partagé
+    """
+    global _module_profiler
+    if _module_profiler is None:
+        with _module_profiler_lock:
+            if _module_profiler is None:
+                _module_profiler = ModuleProfiler(enabled=os.environ.get(PROFILING_ENV_VAR) == '1')
+    return _module_profiler
+
+
+def profiled(module_name=None, entry_point=None):
+    """
+    Décorateur mesurant les appels d'une méthode ou fonction.
+
+    Args:
+        module_name (str, optional): Nom du module (classe de la méthode par défaut)
+        entry_point (str, optional): Nom du point d'entrée (nom de la fonction par défaut)
+
+    Returns:
+        callable: Décorateur
+    """
+    def decorator(function):
+        module = module_name or function.__qualname__.split('.')[0]
+        return get_module_profiler().wrap(function, module, entry_point)
+    return decorator
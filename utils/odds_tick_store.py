@@ -0,0 +1,503 @@
+"""
+OddsTickStore - Stockage persistant des mouvements de cotes pour ArcanShadow
+Ce module conserve chaque variation de cote observée (match, marché, issue,
+horodatage, cote) dans une table SQLite en mode WAL, en ajout seul, indexée par
+match et par plage temporelle. Les détecteurs de mouvements (ShadowOdds+, BetTrapMap...)
+y lisent des séries réelles sous forme de tableaux NumPy au lieu de simuler
+un historique à chaque appel.
+"""
+
+import logging
+import os
+import sqlite3
+import threading
+import time
+import weakref
+from datetime import date, datetime
+
+import numpy as np
+
+# Configuration du logger
+logging.basicConfig(
+    level=logging.INFO,
+    format='%(asctime)s - %(name)s - %(levelname)s - %(message)s'
+)
+logger = logging.getLogger('odds_tick_store')
+
+# Enregistrement d'un tick tel que renvoyé par get_series : les colonnes
+# 'timestamp', 'price' et 'volume' sont des vues sur un unique tampon contigu.
+TICK_DTYPE = np.dtype([
+    ('timestamp', 'f8'),
+    ('price', 'f8'),
+    ('volume', 'f8')
+])
+
+# Ticks conservés en mémoire au plus si la base est inaccessible (les plus anciens sont abandonnés)
+MAX_BUFFERED_TICKS = 100000
+
+
+def to_epoch(value):
+    """
+    Convertit un horodatage (epoch, datetime, date ou chaîne ISO) en secondes epoch.
+
+    Args:
+        value (any): Horodatage à convertir (None pour l'instant présent)
+
+    Returns:
+        float: Secondes depuis l'epoch
+    """
+    if value is None:
+        return time.time()
+    if isinstance(value, (int, float, np.integer, np.floating)):
+        return float(value)
+    if isinstance(value, datetime):
+        return value.timestamp()
+    if isinstance(value, date):
+        return datetime(value.year, value.month, value.day).timestamp()
+    return datetime.fromisoformat(str(value).replace('Z', '+00:00')).timestamp()
+
+
+class OddsTickStore:
+    """
+    Magasin de ticks de cotes en ajout seul.
+    Les écritures sont tamponnées et insérées par lots dans une seule transaction,
+    ce qui permet d'absorber plusieurs milliers de ticks par seconde.
+    """
+    def __init__(self, db_path=os.path.join("data", "odds_ticks.db"), flush_size=500):
+        """
+        Initialise le magasin de ticks.
+
+        Args:
+            db_path (str): Chemin vers la base SQLite dédiée aux ticks
+            flush_size (int): Nombre de ticks tamponnés avant écriture sur disque
+        """
+        self.db_path = db_path
+        self.flush_size = flush_size
+
+        self._buffer = []
+        self._lock = threading.RLock()
+        self._local = threading.local()
+        self._listeners = []
+
+        self._init_db()
+
+    def _connect(self):
+        """Renvoie la connexion SQLite propre au thread courant."""
+        conn = getattr(self._local, 'conn', None)
+        if conn is None:
+            conn = sqlite3.connect(self.db_path)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            self._local.conn = conn
+        return conn
+
+    def _init_db(self):
+        """
+        Initialise la table des ticks et ses index.
+        """
+        try:
+            directory = os.path.dirname(self.db_path)
+            if directory:
+                os.makedirs(directory, exist_ok=True)
+
+            conn = self._connect()
+            conn.execute('''
+            CREATE TABLE IF NOT EXISTS odds_ticks (
+                match_id TEXT NOT NULL,
+                market TEXT NOT NULL,
+                outcome TEXT NOT NULL,
+                bookmaker TEXT NOT NULL DEFAULT 'consensus',
+                ts REAL NOT NULL,
+                price REAL NOT NULL,
+                volume REAL
+            )
+            ''')
+            # Index des séries (match, marché, issue) ordonnées dans le temps ; l'unicité
+            # rend idempotente la ré-ingestion d'un même historique scrapé
+            conn.execute(
+                "CREATE UNIQUE INDEX IF NOT EXISTS idx_odds_ticks_series "
+                "ON odds_ticks (match_id, market, outcome, ts, bookmaker)"
+            )
+            # Index des plages temporelles par match (historique complet d'un match)
+            conn.execute(
+                "CREATE INDEX IF NOT EXISTS idx_odds_ticks_match_ts ON odds_ticks (match_id, ts)"
+            )
+            conn.commit()
+        except Exception as e:
+            logger.error(f"Erreur lors de l'initialisation du magasin de ticks: {e}")
+
+    def add_listener(self, callback):
+        """
+        Abonne une fonction aux nouveaux ticks (détecteurs en flux).
+
+        Les méthodes liées sont référencées faiblement : l'abonnement disparaît avec
+        l'objet, sans retenir en mémoire les analyseurs recréés.
+
+        Args:
+            callback (callable): Appelée avec (match_id, market, outcome, price, timestamp,
+                bookmaker, volume) pour chaque tick ajouté
+        """
+        reference = weakref.WeakMethod(callback) if hasattr(callback, '__self__') else (lambda: callback)
+        with self._lock:
+            self._listeners = [ref for ref in self._listeners if ref() is not None] + [reference]
+
+    def _notify(self, rows):
+        """Transmet des ticks aux abonnés (hors verrou)."""
+        callbacks = [callback for callback in (ref() for ref in self._listeners) if callback is not None]
+        for callback in callbacks:
+            for match_id, market, outcome, bookmaker, ts, price, volume in rows:
+                try:
+                    callback(match_id, market, outcome, price, ts, bookmaker, volume)
+                except Exception as e:
+                    logger.error(f"Erreur d'un abonné aux ticks de cotes ({match_id}/{market}/{outcome}): {e}")
+
+    def append_tick(self, match_id, market, outcome, price, timestamp=None, bookmaker='consensus', volume=None,
+                    notify=True):
+        """
+        Ajoute un tick de cote (tamponné).
+
+        Args:
+            match_id (str): Identifiant du match
+            market (str): Marché (ex: '1X2', 'asian_handicap')
+            outcome (str): Issue ou ligne (ex: 'home', '-0.5')
+            price (float): Cote observée
+            timestamp (any, optional): Horodatage de l'observation (maintenant par défaut)
+            bookmaker (str): Bookmaker source
+            volume (float, optional): Volume de paris associé
+            notify (bool): Transmettre le tick aux abonnés (add_listener)
+        """
+        row = (str(match_id), str(market), str(outcome), str(bookmaker), to_epoch(timestamp), float(price),
+               None if volume is None else float(volume))
+        with self._lock:
+            self._buffer.append(row)
+            if len(self._buffer) >= self.flush_size:
+                self._flush_locked()
+        if notify:
+            self._notify([row])
+
+    def append_ticks(self, ticks):
+        """
+        Ajoute un lot de ticks en une seule transaction.
+
+        Args:
+            ticks (iterable): Dictionnaires avec les clés match_id, market, outcome, price
+                et optionnellement timestamp, bookmaker, volume
+
+        Returns:
+            int: Nombre de ticks écrits (les doublons déjà présents sont ignorés)
+        """
+        rows = [
+            (str(t['match_id']), str(t['market']), str(t['outcome']), str(t.get('bookmaker', 'consensus')),
+             to_epoch(t.get('timestamp')), float(t['price']),
+             None if t.get('volume') is None else float(t['volume']))
+            for t in ticks
+        ]
+        with self._lock:
+            self._buffer.extend(rows)
+            written = self._flush_locked()
+        # Ordre chronologique pour les détecteurs (les ticks déjà vus sont ignorés par ceux-ci)
+        self._notify(sorted(rows, key=lambda row: row[4]))
+        return written
+
+    def flush(self):
+        """
+        Écrit sur disque les ticks tamponnés.
+
+        Returns:
+            int: Nombre de ticks écrits
+        """
+        with self._lock:
+            return self._flush_locked()
+
+    def _flush_locked(self):
+        """Écrit le tampon en une transaction (le verrou doit être détenu)."""
+        if not self._buffer:
+            return 0
+        rows, self._buffer = self._buffer, []
+        try:
+            conn = self._connect()
+            with conn:
+                cursor = conn.executemany(
+                    "INSERT OR IGNORE INTO odds_ticks (match_id, market, outcome, bookmaker, ts, price, volume) "
+                    "VALUES (?, ?, ?, ?, ?, ?, ?)",
+                    rows
+                )
+            return cursor.rowcount
+        except Exception as e:
+            # Transaction annulée : les ticks restent tamponnés pour la prochaine écriture
+            self._buffer[:0] = rows
+            overflow = len(self._buffer) - MAX_BUFFERED_TICKS
+            if overflow > 0:
+                del self._buffer[:overflow]
+                logger.warning(f"{overflow} ticks de cotes abandonnés (tampon plein)")
+            logger.error(f"Erreur lors de l'écriture de {len(rows)} ticks de cotes (conservés en tampon): {e}")
+            return 0
+
+    def get_series(self, match_id, market, outcome, start=None, end=None, bookmaker=None):
+        """
+        Récupère la série temporelle d'une issue sur une plage de temps.
+
+        Les colonnes du tableau renvoyé (``series['timestamp']``, ``series['price']``,
+        ``series['volume']``) sont des vues sans copie sur le même tampon.
+
+        Args:
+            match_id (str): Identifiant du match
+            market (str): Marché
+            outcome (str): Issue
+            start (any, optional): Début de la plage (inclus)
+            end (any, optional): Fin de la plage (incluse)
+            bookmaker (str, optional): Restreindre à un bookmaker
+
+        Returns:
+            numpy.ndarray: Tableau structuré de dtype TICK_DTYPE trié par horodatage
+        """
+        self.flush()
+
+        query = "SELECT ts, price, COALESCE(volume, 0.0) FROM odds_ticks WHERE match_id = ? AND market = ? AND outcome = ?"
+        params = [str(match_id), str(market), str(outcome)]
+        if start is not None:
+            query += " AND ts >= ?"
+            params.append(to_epoch(start))
+        if end is not None:
+            query += " AND ts <= ?"
+            params.append(to_epoch(end))
+        if bookmaker is not None:
+            query += " AND bookmaker = ?"
+            params.append(bookmaker)
+        query += " ORDER BY ts"
+
+        try:
+            rows = self._connect().execute(query, params).fetchall()
+            return np.array(rows, dtype=TICK_DTYPE) if rows else np.empty(0, dtype=TICK_DTYPE)
+        except Exception as e:
+            logger.error(f"Erreur lors de la lecture de la série {match_id}/{market}/{outcome}: {e}")
+            return np.empty(0, dtype=TICK_DTYPE)
+
+    def get_ticks(self, match_id, start=None, end=None):
+        """
+        Récupère les ticks bruts d'un match, tous marchés et bookmakers, dans l'ordre du temps.
+
+        Args:
+            match_id (str): Identifiant du match
+            start (any, optional): Début de la plage (inclus)
+            end (any, optional): Fin de la plage (incluse)
+
+        Returns:
+            list: Ticks (market, outcome, bookmaker, ts, price, volume)
+        """
+        self.flush()
+
+        query = "SELECT market, outcome, bookmaker, ts, price, volume FROM odds_ticks WHERE match_id = ?"
+        params = [str(match_id)]
+        if start is not None:
+            query += " AND ts >= ?"
+            params.append(to_epoch(start))
+        if end is not None:
+            query += " AND ts <= ?"
+            params.append(to_epoch(end))
+        query += " ORDER BY ts"
+
+        try:
+            return self._connect().execute(query, params).fetchall()
+        except Exception as e:
+            logger.error(f"Erreur lors de la lecture des ticks du match {match_id}: {e}")
+            return []
+
+    def get_consensus_series(self, match_id, market, outcome, start=None, end=None):
+        """
+        Récupère la série de consensus d'une issue, tous bookmakers confondus.
+
+        À chaque horodatage, la cote est la moyenne des dernières cotes connues de chaque
+        bookmaker et le volume la somme de leurs derniers volumes ; une série mêlant les
+        ticks bruts de plusieurs bookmakers ferait apparaître leurs écarts comme des
+        mouvements de ligne.
+
+        Args:
+            match_id (str): Identifiant du match
+            market (str): Marché
+            outcome (str): Issue
+            start (any, optional): Début de la plage (incluse)
+            end (any, optional): Fin de la plage (incluse)
+
+        Returns:
+            numpy.ndarray: Tableau structuré de dtype TICK_DTYPE, un point par horodatage
+        """
+        self.flush()
+
+        query = ("SELECT ts, price, COALESCE(volume, 0.0), bookmaker FROM odds_ticks "
+                 "WHERE match_id = ? AND market = ? AND outcome = ?")
+        params = [str(match_id), str(market), str(outcome)]
+        if start is not None:
+            query += " AND ts >= ?"
+            params.append(to_epoch(start))
+        if end is not None:
+            query += " AND ts <= ?"
+            params.append(to_epoch(end))
+        query += " ORDER BY ts"
+
+        try:
+            rows = self._connect().execute(query, params).fetchall()
+        except Exception as e:
+            logger.error(f"Erreur lors de la lecture du consensus {match_id}/{market}/{outcome}: {e}")
+            rows = []
+        if not rows:
+            return np.empty(0, dtype=TICK_DTYPE)
+
+        timestamps = np.array([row[0] for row in rows], dtype='f8')
+        prices = np.array([row[1] for row in rows], dtype='f8')
+        volumes = np.array([row[2] for row in rows], dtype='f8')
+        books, book_index = np.unique([row[3] for row in rows], return_inverse=True)
+
+        if len(books) == 1:
+            consensus_price, consensus_volume = prices, volumes
+        else:
+            # Dernier tick de chaque bookmaker à chaque ligne (report vers l'avant)
+            positions = np.arange(len(rows))
+            last = np.maximum.accumulate(
+                np.where(book_index[None, :] == np.arange(len(books))[:, None], positions[None, :], -1), axis=1
+            )
+            known = last >= 0
+            book_prices = np.where(known, prices[last], np.nan)
+            consensus_price = np.nanmean(book_prices, axis=0)
+            consensus_volume = np.where(known, volumes[last], 0.0).sum(axis=0)
+
+        # Un point par horodatage : l'état après le dernier tick de cet instant
+        keep = np.append(timestamps[1:] != timestamps[:-1], True)
+        series = np.empty(int(keep.sum()), dtype=TICK_DTYPE)
+        series['timestamp'] = timestamps[keep]
+        series['price'] = consensus_price[keep]
+        series['volume'] = consensus_volume[keep]
+        return series
+
+    def get_markets(self, match_id):
+        """
+        Liste les marchés et issues disponibles pour un match.
+
+        Args:
+            match_id (str): Identifiant du match
+
+        Returns:
+            dict: {marché: [issues]}
+        """
+        self.flush()
+        markets = {}
+        try:
+            rows = self._connect().execute(
+                "SELECT DISTINCT market, outcome FROM odds_ticks WHERE match_id = ? ORDER BY market, outcome",
+                (str(match_id),)
+            ).fetchall()
+            for market, outcome in rows:
+                markets.setdefault(market, []).append(outcome)
+        except Exception as e:
+            logger.error(f"Erreur lors de la lecture des marchés du match {match_id}: {e}")
+        return markets
+
+    def has_ticks(self, match_id):
+        """
+        Indique si des ticks existent pour un match.
+
+        Args:
+            match_id (str): Identifiant du match
+
+        Returns:
+            bool: True si au moins un tick est enregistré
+        """
+        if match_id is None:
+            return False
+        self.flush()
+        try:
+            row = self._connect().execute(
+                "SELECT 1 FROM odds_ticks WHERE match_id = ? LIMIT 1", (str(match_id),)
+            ).fetchone()
+            return row is not None
+        except Exception as e:
+            logger.error(f"Erreur lors de la vérification des ticks du match {match_id}: {e}")
+            return False
+
+    def get_odds_history(self, match_id, start=None, end=None, bucket_seconds=3600):
+        """
+        Reconstruit un historique par instantanés, au format attendu par les détecteurs
+        de comportements (liste de {'timestamp', 'markets', 'volumes'}).
+
+        Chaque instantané porte la dernière cote de consensus connue de chaque issue à la
+        fin du créneau.
+
+        Args:
+            match_id (str): Identifiant du match
+            start (any, optional): Début de la plage
+            end (any, optional): Fin de la plage
+            bucket_seconds (int): Largeur des créneaux d'échantillonnage en secondes
+
+        Returns:
+            list: Historique des cotes, vide si aucun tick n'est disponible
+        """
+        markets = self.get_markets(match_id)
+        if not markets:
+            return []
+
+        series = {
+            (market, outcome): self.get_consensus_series(match_id, market, outcome, start, end)
+            for market, outcomes in markets.items()
+            for outcome in outcomes
+        }
+        series = {key: s for key, s in series.items() if len(s)}
+        if not series:
+            return []
+
+        all_ts = np.concatenate([s['timestamp'] for s in series.values()])
+        bucket_edges = np.unique(np.floor(all_ts / bucket_seconds) * bucket_seconds + bucket_seconds)
+
+        history = []
+        # Index de la dernière observation de chaque série avant chaque fin de créneau
+        positions = {key: np.searchsorted(s['timestamp'], bucket_edges, side='left') - 1 for key, s in series.items()}
+        for i, edge in enumerate(bucket_edges):
+            snapshot = {
+                'timestamp': datetime.fromtimestamp(min(edge, all_ts.max())).isoformat(),
+                'markets': {},
+                'volumes': {}
+            }
+            for (market, outcome), s in series.items():
+                pos = positions[(market, outcome)][i]
+                if pos < 0:
+                    continue
+                snapshot['markets'].setdefault(market, {})[outcome] = float(s['price'][pos])
+                snapshot['volumes'].setdefault(market, {})[outcome] = float(s['volume'][pos])
+            history.append(snapshot)
+
+        return history
+
+    def get_stats(self):
+        """
+        Récupère des statistiques sur le magasin de ticks.
+
+        Returns:
+            dict: Statistiques du magasin
+        """
+        self.flush()
+        try:
+            total_ticks, matches = self._connect().execute(
+                "SELECT COUNT(*), COUNT(DISTINCT match_id) FROM odds_ticks"
+            ).fetchone()
+            return {'total_ticks': total_ticks, 'matches': matches}
+        except Exception as e:
+            logger.error(f"Erreur lors de la récupération des statistiques des ticks: {e}")
+            return {}
+
+
+_odds_tick_store = None
+_odds_tick_store_lock = threading.Lock()
+
+
+def get_odds_tick_store():
+    """
+    Renvoie l'instance partagée du magasin de ticks.
+
+    Returns:
+        OddsTickStore: Magasin partagé par les scrapers et les détecteurs
+    """
+    global _odds_tick_store
+    if _odds_tick_store is None:
+        with _odds_tick_store_lock:
+            if _odds_tick_store is None:
+                _odds_tick_store = OddsTickStore()
+    return _odds_tick_store
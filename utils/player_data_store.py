@@ -0,0 +1,357 @@
+"""
+PlayerDataStore - Magasin clé/valeur partagé des données joueurs pour ArcanShadow
+Ce module remplace les fichiers JSON individuels (un par joueur ou manager) et les
+caches mémoire propres à chaque adaptateur par une table SQLite unique, partagée
+par PlayerDataEnrichment et TransfermarktAdapter. Les entrées sont sérialisées en
+JSON compact compressé, l'expiration est indexée, un LRU mémoire borné sert les
+lectures répétées et get_many charge une équipe complète en une seule requête.
+"""
+
+import copy
+import json
+import logging
+import os
+import sqlite3
+import threading
+import time
+import zlib
+from collections import OrderedDict
+from datetime import datetime
+
+# Configuration du logger
+logging.basicConfig(
+    level=logging.INFO,
+    format='%(asctime)s - %(name)s - %(levelname)s - %(message)s'
+)
+logger = logging.getLogger('player_data_store')
+
+# Taille maximale d'un lot de paramètres dans une requête IN (...)
+SQLITE_MAX_VARIABLES = 900
+
+
+def _encode(data):
+    """Sérialise une entrée en JSON compact compressé."""
+    payload = json.dumps(data, ensure_ascii=False, separators=(',', ':'), default=str)
+    return zlib.compress(payload.encode('utf-8'))
+
+
+def _decode(blob):
+    """Désérialise une entrée produite par _encode."""
+    return json.loads(zlib.decompress(blob).decode('utf-8'))
+
+
+class PlayerDataStore:
+    """
+    Magasin persistant des données joueurs, managers, clubs et compétitions.
+    Chaque entrée est identifiée par un espace de noms ('players', 'managers',
+    'transfermarkt_clubs'...) et un identifiant d'entité.
+    """
+    def __init__(self, db_path=os.path.join("data", "player_data.db"), max_memory_entries=4096):
+        """
+        Initialise le magasin de données joueurs.
+
+        Args:
+            db_path (str): Chemin vers la base SQLite du magasin
+            max_memory_entries (int): Nombre maximal d'entrées conservées en mémoire
+        """
+        self.db_path = db_path
+        self.max_memory_entries = max_memory_entries
+
+        self._memory = OrderedDict()
+        self._lock = threading.RLock()
+        self._local = threading.local()
+        self._stats = {'memory_hits': 0, 'disk_hits': 0, 'misses': 0, 'stores': 0}
+
+        self._init_db()
+
+    def _connect(self):
+        """Renvoie la connexion SQLite propre au thread courant."""
+        conn = getattr(self._local, 'conn', None)
+        if conn is None:
+            conn = sqlite3.connect(self.db_path)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            self._local.conn = conn
+        return conn
+
+    def _init_db(self):
+        """
+        Initialise la table des entités et son index d'expiration.
+        """
+        try:
+            directory = os.path.dirname(self.db_path)
+            if directory:
+                os.makedirs(directory, exist_ok=True)
+
+            conn = self._connect()
+            conn.execute('''
+            CREATE TABLE IF NOT EXISTS player_data (
+                namespace TEXT NOT NULL,
+                entity_id TEXT NOT NULL,
+                data BLOB NOT NULL,
+                expiry INTEGER NOT NULL,
+                updated_at INTEGER NOT NULL,
+                PRIMARY KEY (namespace, entity_id)
+            ) WITHOUT ROWID
+            ''')
+            conn.execute("CREATE INDEX IF NOT EXISTS idx_player_data_expiry ON player_data (expiry)")
+            conn.commit()
+        except Exception as e:
+            logger.error(f"Erreur lors de l'initialisation du magasin de données joueurs: {e}")
+
+    def _remember(self, key, value, expiry):
+        """Insère une entrée dans le LRU mémoire en évinçant la plus ancienne si nécessaire."""
+        with self._lock:
+            self._memory[key] = (value, expiry)
+            self._memory.move_to_end(key)
+            while len(self._memory) > self.max_memory_entries:
+                self._memory.popitem(last=False)
+
+    def _from_memory(self, key, now):
+        """Renvoie l'entrée mémoire valide pour une clé, ou None."""
+        entry = self._memory.get(key)
+        if entry is None:
+            return None
+        value, expiry = entry
+        if expiry <= now:
+            del self._memory[key]
+            return None
+        self._memory.move_to_end(key)
+        return value
+
+    def get(self, namespace, entity_id):
+        """
+        Récupère une entité (mémoire puis disque).
+
+        Args:
+            namespace (str): Espace de noms de l'entité
+            entity_id (str): Identifiant de l'entité
+
+        Returns:
+            any: Copie des données, ou None si absentes ou expirées
+        """
+        return self.get_many(namespace, [entity_id]).get(str(entity_id))
+
+    def get_many(self, namespace, entity_ids):
+        """
+        Récupère un lot d'entités en une seule lecture disque (ex: un effectif complet).
+
+        Args:
+            namespace (str): Espace de noms des entités
+            entity_ids (iterable): Identifiants des entités
+
+        Returns:
+            dict: {identifiant: données} pour les entités présentes et valides
+        """
+        now = time.time()
+        results = {}
+        missing = []
+
+        with self._lock:
+            for entity_id in dict.fromkeys(str(e) for e in entity_ids):
+                value = self._from_memory((namespace, entity_id), now)
+                if value is not None:
+                    results[entity_id] = copy.deepcopy(value)
+                    self._stats['memory_hits'] += 1
+                else:
+                    missing.append(entity_id)
+
+        if not missing:
+            return results
+
+        found = 0
+        try:
+            conn = self._connect()
+            for start in range(0, len(missing), SQLITE_MAX_VARIABLES):
+                chunk = missing[start:start + SQLITE_MAX_VARIABLES]
+                placeholders = ','.join('?' * len(chunk))
+                rows = conn.execute(
+                    f"SELECT entity_id, data, expiry FROM player_data "
+                    f"WHERE namespace = ? AND expiry > ? AND entity_id IN ({placeholders})",
+                    [namespace, int(now)] + chunk
+                ).fetchall()
+                for entity_id, blob, expiry in rows:
+                    value = _decode(blob)
+                    self._remember((namespace, entity_id), value, expiry)
+                    results[entity_id] = copy.deepcopy(value)
+                    found += 1
+        except Exception as e:
+            logger.error(f"Erreur lors de la lecture de {len(missing)} entités '{namespace}': {e}")
+
+        with self._lock:
+            self._stats['disk_hits'] += found
+            self._stats['misses'] += len(missing) - found
+        return results
+
+    def set(self, namespace, entity_id, data, ttl):
+        """
+        Stocke une entité.
+
+        Args:
+            namespace (str): Espace de noms de l'entité
+            entity_id (str): Identifiant de l'entité
+            data (any): Données sérialisables en JSON
+            ttl (int): Durée de validité en secondes
+
+        Returns:
+            bool: True si réussi, False sinon
+        """
+        return self.set_many(namespace, {entity_id: data}, ttl) == 1
+
+    def set_many(self, namespace, entities, ttl, updated_at=None):
+        """
+        Stocke un lot d'entités en une seule transaction.
+
+        Args:
+            namespace (str): Espace de noms des entités
+            entities (dict): {identifiant: données}
+            ttl (int): Durée de validité en secondes
+            updated_at (float, optional): Horodatage de mise à jour (maintenant par défaut)
+
+        Returns:
+            int: Nombre d'entités écrites
+        """
+        current_time = int(time.time() if updated_at is None else updated_at)
+        expiry = current_time + int(ttl)
+        rows = []
+        for entity_id, data in entities.items():
+            entity_id = str(entity_id)
+            value = copy.deepcopy(data)
+            self._remember((namespace, entity_id), value, expiry)
+            rows.append((namespace, entity_id, _encode(value), expiry, current_time))
+
+        with self._lock:
+            self._stats['stores'] += len(rows)
+
+        try:
+            conn = self._connect()
+            with conn:
+                conn.executemany(
+                    "INSERT OR REPLACE INTO player_data (namespace, entity_id, data, expiry, updated_at) "
+                    "VALUES (?, ?, ?, ?, ?)",
+                    rows
+                )
+            return len(rows)
+        except Exception as e:
+            logger.error(f"Erreur lors de l'écriture de {len(rows)} entités '{namespace}': {e}")
+            return 0
+
+    def delete(self, namespace, entity_id):
+        """
+        Supprime une entité.
+
+        Args:
+            namespace (str): Espace de noms de l'entité
+            entity_id (str): Identifiant de l'entité
+
+        Returns:
+            bool: True si une entrée a été supprimée
+        """
+        entity_id = str(entity_id)
+        with self._lock:
+            self._memory.pop((namespace, entity_id), None)
+        try:
+            conn = self._connect()
+            with conn:
+                cursor = conn.execute(
+                    "DELETE FROM player_data WHERE namespace = ? AND entity_id = ?", (namespace, entity_id)
+                )
+            return cursor.rowcount > 0
+        except Exception as e:
+            logger.error(f"Erreur lors de la suppression de l'entité {namespace}/{entity_id}: {e}")
+            return False
+
+    def clear_expired(self):
+        """
+        Supprime les entrées expirées (parcours de l'index d'expiration).
+
+        Returns:
+            int: Nombre d'entrées supprimées sur disque
+        """
+        now = time.time()
+        with self._lock:
+            for key in [k for k, (_, expiry) in self._memory.items() if expiry <= now]:
+                del self._memory[key]
+        try:
+            conn = self._connect()
+            with conn:
+                cursor = conn.execute("DELETE FROM player_data WHERE expiry <= ?", (int(now),))
+            return cursor.rowcount
+        except Exception as e:
+            logger.error(f"Erreur lors du nettoyage du magasin de données joueurs: {e}")
+            return 0
+
+    def import_json_directory(self, directory, ttl):
+        """
+        Importe les anciens fichiers de cache '<espace>_<identifiant>.json'.
+
+        L'expiration de chaque entrée est calculée à partir de son champ 'last_updated'
+        lorsqu'il est présent. Les fichiers sont laissés en place.
+
+        Args:
+            directory (str): Répertoire des fichiers JSON
+            ttl (int): Durée de validité en secondes
+
+        Returns:
+            int: Nombre d'entrées importées
+        """
+        if not os.path.isdir(directory):
+            return 0
+
+        imported = 0
+        for filename in os.listdir(directory):
+            if not filename.endswith('.json') or '_' not in filename:
+                continue
+            namespace, entity_id = filename[:-len('.json')].split('_', 1)
+            try:
+                with open(os.path.join(directory, filename), 'r', encoding='utf-8') as f:
+                    data = json.load(f)
+                updated_at = None
+                if isinstance(data, dict) and data.get('last_updated'):
+                    updated_at = datetime.fromisoformat(data['last_updated']).timestamp()
+                imported += self.set_many(namespace, {entity_id: data}, ttl, updated_at=updated_at)
+            except Exception as e:
+                logger.warning(f"Fichier de cache ignoré lors de l'import ({filename}): {e}")
+
+        if imported:
+            logger.info(f"{imported} entrées importées depuis {directory}")
+        return imported
+
+    def get_stats(self):
+        """
+        Récupère des statistiques sur le magasin.
+
+        Returns:
+            dict: Statistiques du magasin
+        """
+        with self._lock:
+            stats = dict(self._stats)
+            stats['memory_entries'] = len(self._memory)
+        lookups = stats['memory_hits'] + stats['disk_hits'] + stats['misses']
+        stats['hit_ratio'] = round((stats['memory_hits'] + stats['disk_hits']) / lookups, 4) if lookups else 0.0
+        try:
+            stats['entries_by_namespace'] = dict(self._connect().execute(
+                "SELECT namespace, COUNT(*) FROM player_data GROUP BY namespace"
+            ).fetchall())
+        except Exception as e:
+            logger.error(f"Erreur lors de la récupération des statistiques du magasin: {e}")
+        return stats
+
+
+_player_data_store = None
+_player_data_store_lock = threading.Lock()
+
+
+def get_player_data_store():
+    """
+    Renvoie l'instance partagée du magasin de données joueurs.
+
+    Returns:
+        PlayerDataStore: Magasin partagé par les adaptateurs de données joueurs
+    """
+    global _player_data_store
+    if _player_data_store is None:
+        with _player_data_store_lock:
+            if _player_data_store is None:
+                _player_data_store = PlayerDataStore()
+    return _player_data_store
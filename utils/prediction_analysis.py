@@ -4,6 +4,7 @@ Module pour l'analyse prédictive des matchs de football.
 import random
 from datetime import datetime
 from utils.football_data import get_team_form, get_head_to_head, get_team_stats
+from utils.score_matrix import price_match
 
 def get_prediction_data(match, all_matches=None):
     """
@@ -51,48 +52,20 @@ def get_prediction_data(match, all_matches=None):
     probabilities = [home_prob, draw_prob, away_prob]
     main_outcome = outcomes[probabilities.index(max(probabilities))]
     
-    # Trouver les trois scénarios de score les plus probables
-    possible_scores = []
-    
-    # Victoires à domicile
-    if home_prob > 20:
-        home_win_scores = ['1-0', '2-0', '2-1', '3-1']
-        weight_factor = home_prob / 100
-        for score in home_win_scores:
-            # Attribution aléatoire de probabilités, mais influencées par la probabilité générale
-            probability = int(random.uniform(0.5, 1.0) * weight_factor * 100)
-            possible_scores.append({
-                'score': score,
-                'probability': probability,
-                'outcome': 'Victoire à domicile'
-            })
-    
-    # Matchs nuls
-    if draw_prob > 10:
-        draw_scores = ['0-0', '1-1', '2-2']
-        weight_factor = draw_prob / 100
-        for score in draw_scores:
-            possible_scores.append({
-                'score': score,
-                'probability': int(random.uniform(0.5, 1.0) * weight_factor * 100),
-                'outcome': 'Match nul'
-            })
-    
-    # Victoires à l'extérieur
-    if away_prob > 20:
-        away_win_scores = ['0-1', '0-2', '1-2', '1-3']
-        weight_factor = away_prob / 100
-        for score in away_win_scores:
-            probability = int(random.uniform(0.5, 1.0) * weight_factor * 100)
-            possible_scores.append({
-                'score': score,
-                'probability': probability,
-                'outcome': 'Victoire à l\'extérieur'
-            })
-    
-    # Trier par probabilité et prendre les plus probables
-    possible_scores.sort(key=lambda x: x['probability'], reverse=True)
-    top_scores = possible_scores[:5]
+    # Matrice de scores du match : tous les marchés de buts en dérivent
+    home_xg, away_xg = _expected_goals(home_stats, away_stats)
+    markets = price_match(home_xg, away_xg)
+    
+    # Trouver les scénarios de score les plus probables
+    top_scores = []
+    for score, probability in markets['correct_score']:
+        home_goals, away_goals = (int(g) for g in score.split('-'))
+        top_scores.append({
+            'score': score,
+            'probability': int(round(probability * 100)),
+            'outcome': 'Victoire à domicile' if home_goals > away_goals else
+                       'Match nul' if home_goals == away_goals else 'Victoire à l\'extérieur'
+        })
     
     # Générer des scénarios alternatifs
     other_scenarios = []
@@ -100,28 +73,28 @@ def get_prediction_data(match, all_matches=None):
     # Scénario de but de chaque équipe
     other_scenarios.append({
         'name': 'Les deux équipes marquent',
-        'probability': _calculate_both_teams_score(home_stats, away_stats),
+        'probability': _calculate_both_teams_score(markets),
         'odds': round(1.5 + random.random() * 1, 2)
     })
     
     # Scénario de plus/moins de buts
     other_scenarios.append({
         'name': 'Plus de 2.5 buts',
-        'probability': _calculate_over_under_probability(home_stats, away_stats, 2.5, 'over'),
+        'probability': _calculate_over_under_probability(markets, 2.5, 'over'),
         'odds': round(1.8 + random.random() * 0.8, 2)
     })
     
     # Scénario de clean sheet
     other_scenarios.append({
         'name': f'Clean sheet pour {home_team}',
-        'probability': _calculate_clean_sheet_probability(home_stats, away_stats, True),
+        'probability': _calculate_clean_sheet_probability(markets, True),
         'odds': round(2.0 + random.random() * 1.5, 2)
     })
     
     # Scénario de victoire sans concéder
     other_scenarios.append({
         'name': f'{home_team} gagne sans concéder',
-        'probability': int(home_prob * _calculate_clean_sheet_probability(home_stats, away_stats, True) / 100),
+        'probability': _calculate_win_to_nil_probability(markets),
         'odds': round(home_odds * 1.5, 2)
     })
     
@@ -170,75 +143,38 @@ def get_prediction_data(match, all_matches=None):
             'away': away_stats
         },
         'other_scenarios': other_scenarios,
+        'goal_markets': markets,
         'narrative': narrative
     }
     
     return prediction_data
 
-def _calculate_both_teams_score(home_stats, away_stats):
+def _expected_goals(home_stats, away_stats):
+    """Estime les buts attendus de chaque équipe à partir de ses moyennes offensives et défensives."""
+    def _per_game(stats, key):
+        games = sum(stats['home_record'].values()) + sum(stats['away_record'].values())
+        return stats[key] / games if games else 1.3
+    
+    home_xg = (_per_game(home_stats, 'goals_scored') + _per_game(away_stats, 'goals_conceded')) / 2
+    away_xg = (_per_game(away_stats, 'goals_scored') + _per_game(home_stats, 'goals_conceded')) / 2
+    return home_xg, away_xg
+
+def _calculate_both_teams_score(markets):
     """Calcule la probabilité que les deux équipes marquent."""
-    # Utiliser les statistiques d'attaque et de défense pour estimer la probabilité
-    home_attack = home_stats['goals_scored'] / (home_stats['home_record']['wins'] + 
-                                               home_stats['home_record']['draws'] + 
-                                               home_stats['home_record']['losses'])
-    away_attack = away_stats['goals_scored'] / (away_stats['away_record']['wins'] + 
-                                               away_stats['away_record']['draws'] + 
-                                               away_stats['away_record']['losses'])
-    
-    # Normaliser pour obtenir une probabilité entre 40% et 90%
-    base_prob = (home_attack + away_attack) * 10
-    return max(40, min(90, int(base_prob)))
+    return int(round(markets['btts'] * 100))
 
-def _calculate_over_under_probability(home_stats, away_stats, line, direction='over'):
+def _calculate_over_under_probability(markets, line, direction='over'):
     """Calcule la probabilité de dépasser ou non une ligne de buts."""
-    # Calculer le nombre moyen de buts par match pour chaque équipe
-    home_avg_goals = home_stats['goals_scored'] / (home_stats['home_record']['wins'] + 
-                                                 home_stats['home_record']['draws'] + 
-                                                 home_stats['home_record']['losses'])
-    away_avg_goals = away_stats['goals_scored'] / (away_stats['away_record']['wins'] + 
-                                                 away_stats['away_record']['draws'] + 
-                                                 away_stats['away_record']['losses'])
-    
-    # Estimer le nombre total de buts attendus
-    expected_goals = home_avg_goals + away_avg_goals
-    
-    # Calculer la probabilité en fonction de la ligne et de la direction
-    if direction == 'over':
-        base_prob = 50 + (expected_goals - line) * 20
-    else:  # under
-        base_prob = 50 - (expected_goals - line) * 20
-    
-    # Limiter la probabilité entre 25% et 85%
-    return max(25, min(85, int(base_prob)))
+    return int(round(markets['over_under'][line][direction] * 100))
 
-def _calculate_clean_sheet_probability(home_stats, away_stats, is_home):
+def _calculate_clean_sheet_probability(markets, is_home):
     """Calcule la probabilité d'un clean sheet."""
-    if is_home:
-        # Probabilité de clean sheet pour l'équipe à domicile
-        clean_sheet_ratio = home_stats['clean_sheets'] / (home_stats['home_record']['wins'] + 
-                                                         home_stats['home_record']['draws'] + 
-                                                         home_stats['home_record']['losses'])
-        
-        # Ajuster en fonction de la capacité offensive de l'équipe adverse
-        away_attack_strength = away_stats['goals_scored'] / (away_stats['away_record']['wins'] + 
-                                                           away_stats['away_record']['draws'] + 
-                                                           away_stats['away_record']['losses'])
-    else:
-        # Probabilité de clean sheet pour l'équipe à l'extérieur
-        clean_sheet_ratio = away_stats['clean_sheets'] / (away_stats['away_record']['wins'] + 
-                                                         away_stats['away_record']['draws'] + 
-                                                         away_stats['away_record']['losses'])
-        
-        # Ajuster en fonction de la capacité offensive de l'équipe adverse
-        home_attack_strength = home_stats['goals_scored'] / (home_stats['home_record']['wins'] + 
-                                                           home_stats['home_record']['draws'] + 
-                                                           home_stats['home_record']['losses'])
-    
-    # Calculer la probabilité finale
-    base_prob = clean_sheet_ratio * 50
-    
-    # Limiter la probabilité entre 10% et 70%
-    return max(10, min(70, int(base_prob)))
+    return int(round(markets['clean_sheets']['home' if is_home else 'away'] * 100))
+
+def _calculate_win_to_nil_probability(markets):
+    """Calcule la probabilité que l'équipe à domicile gagne sans concéder."""
+    # Clean sheet à domicile moins le 0-0 (seul score d'un total inférieur à 0.5)
+    return int(round((markets['clean_sheets']['home'] - markets['over_under'][0.5]['under']) * 100))
 
 def _generate_match_narrative(home_team, away_team, home_form, away_form, h2h, 
                              home_stats, away_stats, prediction, score_prediction):
@@ -0,0 +1,406 @@
+"""
+PredictionCache - Cache de résultats adressé par contenu pour ArcanShadow
+Ce module mémorise les résultats complets des modules d'analyse sans état (ArcanX,
+ShadowOdds, Convergence...) sous une clé dérivée du nom du module,
+de sa version et d'une empreinte canonique des données du match (cotes incluses).
+Un même match analysé par plusieurs onglets ou lors d'un rechargement Streamlit
+n'est ainsi calculé qu'une seule fois, et toute modification des entrées
+(mouvement de cotes, changement de forme...) produit naturellement une nouvelle clé.
+"""
+
+import copy
+import functools
+import hashlib
+import json
+import logging
+import pickle
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+from datetime import date, datetime
+
+from utils.module_profiler import get_module_profiler
+
+# Configuration du logger
+logging.basicConfig(
+    level=logging.INFO,
+    format='%(asctime)s - %(name)s - %(levelname)s - %(message)s'
+)
+logger = logging.getLogger('prediction_cache')
+
+
+def _canonical_default(value):
+    """
+    Convertit les valeurs non sérialisables en JSON en une forme stable.
+
+    Args:
+        value (any): Valeur à convertir
+
+    Returns:
+        any: Représentation sérialisable et déterministe
+    """
+    if isinstance(value, (datetime, date)):
+        return value.isoformat()
+    if isinstance(value, (set, frozenset)):
+        return sorted(value, key=repr)
+    if hasattr(value, 'item'):
+        # Scalaires numpy
+        try:
+            return value.item()
+        except (TypeError, ValueError):
+            pass
+    if hasattr(value, 'tolist'):
+        # Tableaux numpy
+        return value.tolist()
+    # Pas de repr() : l'empreinte dépendrait de l'adresse de l'objet. L'appelant calcule sans cache.
+    raise TypeError(f"Valeur non canonisable: {type(value).__name__}")
+
+
+def match_fingerprint(*payloads):
+    """
+    Calcule l'empreinte canonique d'un ensemble d'entrées d'analyse.
+
+    Les dictionnaires sont sérialisés avec des clés triées, de sorte que deux matchs
+    identiques produisent la même empreinte quel que soit l'ordre de construction.
+
+    Args:
+        *payloads: Données du match et résultats amont éventuels
+
+    Returns:
+        str: Empreinte SHA-256 hexadécimale
+    """
+    canonical = json.dumps(payloads, sort_keys=True, default=_canonical_default, separators=(',', ':'))
+    return hashlib.sha256(canonical.encode('utf-8')).hexdigest()
+
+
+class PredictionCache:
+    """
+    Cache à deux niveaux pour les résultats d'analyse de matchs.
+    Niveau 1 : LRU en mémoire. Niveau 2 : table SQLite persistante partagée entre sessions.
+    """
+    def __init__(self, db_path="arcanshadow.db", max_memory_entries=1024, ttl=12 * 60 * 60):
+        """
+        Initialise le cache de prédictions.
+
+        Args:
+            db_path (str): Chemin vers la base de données SQLite (None pour désactiver le disque)
+            max_memory_entries (int): Nombre maximal d'entrées conservées en mémoire
+            ttl (int): Durée de validité des entrées en secondes
+        """
+        self.db_path = db_path
+        self.max_memory_entries = max_memory_entries
+        self.ttl = ttl
+        self.enabled = True
+
+        self._memory = OrderedDict()
+        self._lock = threading.RLock()
+        self._stats = {'memory_hits': 0, 'disk_hits': 0, 'misses': 0, 'stores': 0}
+
+        if self.db_path:
+            self._init_db()
+
+    def _init_db(self):
+        """
+        Initialise la table de cache de prédictions dans la base de données.
+        """
+        conn = None
+        try:
+            conn = sqlite3.connect(self.db_path)
+            cursor = conn.cursor()
+
+            cursor.execute('''
+            CREATE TABLE IF NOT EXISTS prediction_cache (
+                cache_key TEXT PRIMARY KEY,
+                module TEXT,
+                module_version TEXT,
+                data BLOB,
+                expiry INTEGER,
+                created_at INTEGER
+            )
+            ''')
+            cursor.execute(
+                "CREATE INDEX IF NOT EXISTS idx_prediction_cache_module ON prediction_cache (module, module_version)"
+            )
+
+            conn.commit()
+        except Exception as e:
+            logger.error(f"Erreur lors de l'initialisation du cache de prédictions: {e}")
+            self.db_path = None
+        finally:
+            if conn:
+                conn.close()
+
+    @staticmethod
+    def make_key(module_name, module_version, *payloads):
+        """
+        Construit la clé de cache d'une analyse.
+
+        Args:
+            module_name (str): Nom du module d'analyse
+            module_version (str): Version du module (change la clé à chaque évolution de l'algorithme)
+            *payloads: Entrées de l'analyse
+
+        Returns:
+            str: Clé de cache
+        """
+        return f"{module_name}:{module_version}:{match_fingerprint(*payloads)}"
+
+    def _remember(self, key, value):
+        """Insère une valeur dans le LRU mémoire en évinçant la plus ancienne si nécessaire."""
+        with self._lock:
+            self._memory[key] = (value, time.time() + self.ttl)
+            self._memory.move_to_end(key)
+            while len(self._memory) > self.max_memory_entries:
+                self._memory.popitem(last=False)
+
+    def get(self, key):
+        """
+        Récupère un résultat du cache (mémoire puis disque).
+
+        Args:
+            key (str): Clé de cache
+
+        Returns:
+            tuple: (trouvé, valeur) - la valeur est une copie indépendante du cache
+        """
+        if not self.enabled:
+            return False, None
+
+        now = time.time()
+        with self._lock:
+            entry = self._memory.get(key)
+            if entry is not None:
+                value, expiry = entry
+                if expiry > now:
+                    self._memory.move_to_end(key)
+                    self._stats['memory_hits'] += 1
+                    return True, copy.deepcopy(value)
+                del self._memory[key]
+
+        if self.db_path:
+            conn = None
+            try:
+                conn = sqlite3.connect(self.db_path)
+                cursor = conn.cursor()
+                cursor.execute(
+                    "SELECT data FROM prediction_cache WHERE cache_key = ? AND expiry > ?",
+                    (key, int(now))
+                )
+                row = cursor.fetchone()
+                if row:
+                    value = pickle.loads(row[0])
+                    self._remember(key, value)
+                    self._stats['disk_hits'] += 1
+                    return True, copy.deepcopy(value)
+            except Exception as e:
+                logger.error(f"Erreur lors de la lecture du cache de prédictions: {e}")
+            finally:
+                if conn:
+                    conn.close()
+
+        self._stats['misses'] += 1
+        return False, None
+
+    def set(self, key, value, module_name='default', module_version='0'):
+        """
+        Stocke un résultat dans les deux niveaux du cache.
+
+        Args:
+            key (str): Clé de cache
+            value (any): Résultat à stocker
+            module_name (str): Nom du module producteur
+            module_version (str): Version du module producteur
+
+        Returns:
+            bool: True si réussi, False sinon
+        """
+        if not self.enabled:
+            return False
+
+        value = copy.deepcopy(value)
+        self._remember(key, value)
+        self._stats['stores'] += 1
+
+        if not self.db_path:
+            return True
+
+        conn = None
+        try:
+            current_time = int(time.time())
+            conn = sqlite3.connect(self.db_path)
+            cursor = conn.cursor()
+            cursor.execute(
+                "INSERT OR REPLACE INTO prediction_cache (cache_key, module, module_version, data, expiry, created_at) "
+                "VALUES (?, ?, ?, ?, ?, ?)",
+                (key, module_name, str(module_version), pickle.dumps(value), current_time + self.ttl, current_time)
+            )
+            conn.commit()
+            return True
+        except Exception as e:
+            logger.error(f"Erreur lors de l'écriture du cache de prédictions: {e}")
+            return False
+        finally:
+            if conn:
+                conn.close()
+
+    def get_or_compute(self, module_name, module_version, payloads, compute):
+        """
+        Renvoie le résultat mémorisé pour ces entrées, ou le calcule et le mémorise.
+
+        Args:
+            module_name (str): Nom du module d'analyse
+            module_version (str): Version du module
+            payloads (tuple): Entrées de l'analyse servant à l'empreinte
+            compute (callable): Fonction sans argument réalisant l'analyse
+
+        Returns:
+            any: Résultat de l'analyse
+        """
+        if not self.enabled:
+            return compute()
+
+        try:
+            key = self.make_key(module_name, module_version, *payloads)
+        except Exception as e:
+            logger.warning(f"Empreinte impossible pour {module_name}, calcul sans cache: {e}")
+            return compute()
+
+        found, value = self.get(key)
+        profiler = get_module_profiler()
+        if profiler.enabled:
+            profiler.record_cache(module_name, found)
+        if found:
+            return value
+
+        value = compute()
+        self.set(key, value, module_name, module_version)
+        return value
+
+    def invalidate_module(self, module_name, module_version=None):
+        """
+        Invalide toutes les entrées d'un module (ou d'une version précise d'un module).
+
+        Args:
+            module_name (str): Nom du module
+            module_version (str, optional): Version à invalider (toutes si None)
+
+        Returns:
+            int: Nombre d'entrées supprimées sur disque
+        """
+        prefix = f"{module_name}:" if module_version is None else f"{module_name}:{module_version}:"
+        with self._lock:
+            for key in [k for k in self._memory if k.startswith(prefix)]:
+                del self._memory[key]
+
+        if not self.db_path:
+            return 0
+
+        conn = None
+        try:
+            conn = sqlite3.connect(self.db_path)
+            cursor = conn.cursor()
+            if module_version is None:
+                cursor.execute("DELETE FROM prediction_cache WHERE module = ?", (module_name,))
+            else:
+                cursor.execute(
+                    "DELETE FROM prediction_cache WHERE module = ? AND module_version = ?",
+                    (module_name, str(module_version))
+                )
+            conn.commit()
+            return cursor.rowcount
+        except Exception as e:
+            logger.error(f"Erreur lors de l'invalidation du cache de prédictions: {e}")
+            return 0
+        finally:
+            if conn:
+                conn.close()
+
+    def clear_expired(self):
+        """
+        Nettoie les entrées expirées des deux niveaux.
+
+        Returns:
+            int: Nombre d'entrées supprimées sur disque
+        """
+        now = time.time()
+        with self._lock:
+            for key in [k for k, (_, expiry) in self._memory.items() if expiry <= now]:
+                del self._memory[key]
+
+        if not self.db_path:
+            return 0
+
+        conn = None
+        try:
+            conn = sqlite3.connect(self.db_path)
+            cursor = conn.cursor()
+            cursor.execute("DELETE FROM prediction_cache WHERE expiry <= ?", (int(now),))
+            conn.commit()
+            return cursor.rowcount
+        except Exception as e:
+            logger.error(f"Erreur lors du nettoyage du cache de prédictions: {e}")
+            return 0
+        finally:
+            if conn:
+                conn.close()
+
+    def get_stats(self):
+        """
+        Récupère des statistiques sur le cache de prédictions.
+
+        Returns:
+            dict: Statistiques du cache
+        """
+        with self._lock:
+            stats = dict(self._stats)
+            stats['memory_entries'] = len(self._memory)
+        lookups = stats['memory_hits'] + stats['disk_hits'] + stats['misses']
+        stats['hit_ratio'] = round((stats['memory_hits'] + stats['disk_hits']) / lookups, 4) if lookups else 0.0
+        return stats
+
+
+_prediction_cache = None
+_prediction_cache_lock = threading.Lock()
+
+
+def get_prediction_cache():
+    """
+    Renvoie l'instance partagée du cache de prédictions.
+
+    Returns:
+        PredictionCache: Cache partagé par tous les modules et onglets
+    """
+    global _prediction_cache
+    if _prediction_cache is None:
+        with _prediction_cache_lock:
+            if _prediction_cache is None:
+                _prediction_cache = PredictionCache()
+    return _prediction_cache
+
+
+def cached_analysis(module_name):
+    """
+    Décorateur mémorisant le résultat d'une méthode d'analyse de match.
+
+    La version du module est lue dans l'attribut de classe ``CACHE_VERSION`` ; tous les
+    arguments positionnels et nommés entrent dans l'empreinte.
+
+    Args:
+        module_name (str): Nom du module utilisé dans la clé de cache
+
+    Returns:
+        callable: Décorateur
+    """
+    def decorator(method):
+        @functools.wraps(method)
+        def wrapper(self, *args, **kwargs):
+            version = getattr(self, 'CACHE_VERSION', '0')
+            return get_prediction_cache().get_or_compute(
+                module_name,
+                version,
+                (method.__name__, args, kwargs),
+                lambda: method(self, *args, **kwargs)
+            )
+        return wrapper
+    return decorator
@@ -2,75 +2,60 @@
 Module pour la surveillance en direct avec des données réelles de football.
 Ce module remplace l'ancienne surveillance simulée par des données réelles provenant de l'API Football.
 """
-import os
 import random
-import requests
 from datetime import datetime, timedelta
 import streamlit as st
 
+from utils.live_feed import get_live_feed
+
 def get_real_live_matches():
     """
-    Récupère les matchs en direct depuis l'API Football.
+    Récupère les matchs en direct depuis le flux partagé de l'API Football.
     
     Returns:
         list: Liste des matchs en direct au format adapté à l'interface ArcanSentinel
     """
     try:
-        # Récupérer la clé API des variables d'environnement
-        api_key = os.environ.get('FOOTBALL_API_KEY')
+        # Le flux partagé interroge l'API une seule fois pour toutes les sessions
+        snapshot = get_live_feed().get_snapshot()
         
-        if not api_key:
-            print("Erreur: Clé API Football non trouvée dans les variables d'environnement")
+        if snapshot is None:
+            print("Flux des matchs en direct indisponible")
             return []
         
-        # Préparation de la requête à l'API Football
-        headers = {
-            'X-RapidAPI-Key': api_key,
-            'X-RapidAPI-Host': 'api-football-v1.p.rapidapi.com'
-        }
-        
-        # Récupérer les matchs en direct
-        url = "https://api-football-v1.p.rapidapi.com/v3/fixtures"
-        params = {"live": "all"}
-        
-        response = requests.get(url, headers=headers, params=params)
-        response.raise_for_status()
+        if snapshot['status'] == 'no_api_key':
+            print("Erreur: Clé API Football non trouvée dans les variables d'environnement")
+            return []
         
-        data = response.json()
+        if snapshot['status'] == 'error':
+            print(f"Erreur lors de la récupération des matchs en direct: {snapshot['error']}")
         
-        if not data.get('response'):
+        if not snapshot['matches']:
             print("Aucun match en direct trouvé via l'API")
             return []
         
-        # Transformation des données de l'API au format attendu par l'interface
+        # Transformation des données du flux au format attendu par l'interface
         formatted_matches = []
         
-        for idx, fixture in enumerate(data.get('response', [])):
-            fixture_data = fixture.get('fixture', {})
-            teams = fixture.get('teams', {})
-            goals = fixture.get('goals', {})
-            league = fixture.get('league', {})
-            
-            # Calculer la minute actuelle
-            status = fixture_data.get('status', {})
-            minute = status.get('elapsed', 0)
+        for idx, match in enumerate(snapshot['matches']):
+            minute = match['minute']
             
             # Créer l'objet match au format attendu par l'interface
             match_data = {
                 "id": idx + 1,
-                "home": teams.get('home', {}).get('name', ''),
-                "away": teams.get('away', {}).get('name', ''),
-                "league": league.get('name', ''),
+                "home": match['home_team'],
+                "away": match['away_team'],
+                "league": match['league'],
                 "time": datetime.now().strftime("%H:%M"),
                 "status": "En direct",
                 "minute": f"{minute}'",
-                "score": f"{goals.get('home', 0)}-{goals.get('away', 0)}",
+                "score": f"{match['home_score']}-{match['away_score']}",
                 # Données supplémentaires pour l'analyse
-                "fixture_id": fixture_data.get('id'),
-                "home_score": goals.get('home', 0),
-                "away_score": goals.get('away', 0),
+                "fixture_id": match['fixture_id'],
+                "home_score": match['home_score'],
+                "away_score": match['away_score'],
                 "elapsed_minute": minute,
-                "league_id": league.get('id')
+                "league_id": match['league_id']
             }
             
             formatted_matches.append(match_data)
@@ -0,0 +1,490 @@
+"""
+ResultSettlement - Règlement groupé des prédictions à l'arrivée des résultats pour ArcanShadow
+Les résultats (fichier CSV/JSON/JSONL, archive openfootball ou flux en direct) sont
+mis en tampon puis réglés par lots : les prédictions en attente de la période sont
+chargées en une requête, indexées par (date, domicile, extérieur), et toutes les
+lignes ainsi que les agrégats de précision par module sont mis à jour dans une seule
+transaction. ArcanReflex reçoit ensuite le lot complet en un seul appel.
+"""
+
+import csv
+import json
+import logging
+import os
+import re
+import threading
+import time
+from datetime import datetime, timedelta
+
+from utils.team_ratings import normalize_team_name
+
+# Configuration du logger
+logging.basicConfig(
+    level=logging.INFO,
+    format='%(asctime)s - %(name)s - %(levelname)s - %(message)s'
+)
+logger = logging.getLogger('result_settlement')
+
+# Noms de colonnes acceptés pour chaque champ d'un résultat
+RESULT_FIELD_ALIASES = {
+    'date': ('date', 'match_date', 'Date', 'kickoff'),
+    'home_team': ('home_team', 'home', 'team1', 'HomeTeam', 'Home'),
+    'away_team': ('away_team', 'away', 'team2', 'AwayTeam', 'Away'),
+    'home_score': ('home_score', 'home_goals', 'FTHG', 'HG'),
+    'away_score': ('away_score', 'away_goals', 'FTAG', 'AG')
+}
+
+# Modules crédités lorsque la prédiction porte leurs indices de confiance
+CONFIDENCE_MODULES = {
+    'arcanx_confidence': 'ArcanX',
+    'shadow_odds_confidence': 'ShadowOdds'
+}
+
+DATE_FORMATS = ('%Y-%m-%d', '%d/%m/%Y', '%d/%m/%y', '%Y/%m/%d')
+
+
+def _parse_date(value):
+    """Convertit une date (datetime, ISO ou formats courants) en date."""
+    if isinstance(value, datetime):
+        return value.date()
+    text = str(value).strip()
+    try:
+        return datetime.fromisoformat(text[:19]).date()
+    except ValueError:
+        pass
+    for date_format in DATE_FORMATS:
+        try:
+            return datetime.strptime(text[:10], date_format).date()
+        except ValueError:
+            continue
+    raise ValueError(f"Date non reconnue: {value}")
+
+
+def normalize_result(record):
+    """
+    Normalise un résultat brut (feed, CSV, openfootball).
+
+    Args:
+        record (dict): Résultat brut
+
+    Returns:
+        dict: Résultat (date, home_team, away_team, home_score, away_score) ou None si incomplet
+    """
+    result = {}
+    for field, aliases in RESULT_FIELD_ALIASES.items():
+        for alias in aliases:
+            if record.get(alias) not in (None, ''):
+                result[field] = record[alias]
+                break
+
+    # Scores au format openfootball ({'ft': [2, 1]}) ou texte ("2-1")
+    score = record.get('score')
+    if 'home_score' not in result and score:
+        if isinstance(score, dict):
+            score = score.get('ft')
+        if isinstance(score, str):
+            score = re.findall(r'\d+', score)
+        if score and len(score) == 2:
+            result['home_score'], result['away_score'] = score
+
+    if len(result) < len(RESULT_FIELD_ALIASES):
+        return None
+    try:
+        result['date'] = _parse_date(result['date'])
+        result['home_score'] = int(result['home_score'])
+        result['away_score'] = int(result['away_score'])
+    except (TypeError, ValueError):
+        return None
+    return result
+
+
+def load_results_file(path):
+    """
+    Charge les résultats d'un fichier CSV, JSON (liste ou archive openfootball) ou JSONL.
+
+    Args:
+        path (str): Chemin du fichier
+
+    Returns:
+        list: Résultats normalisés
+    """
+    extension = os.path.splitext(path)[1].lower()
+    with open(path, 'r', encoding='utf-8') as f:
+        if extension == '.csv':
+            records = list(csv.DictReader(f))
+        elif extension == '.jsonl':
+            records = [json.loads(line) for line in f if line.strip()]
+        else:
+            data = json.load(f)
+            records = data.get('matches', []) if isinstance(data, dict) else data
+
+    results = [normalize_result(record) for record in records]
+    return [result for result in results if result is not None]
+
+
+def match_outcome(home_score, away_score):
+    """Issue 1X2 d'un score ('Home Win', 'Draw', 'Away Win')."""
+    if home_score > away_score:
+        return 'Home Win'
+    if home_score < away_score:
+        return 'Away Win'
+    return 'Draw'
+
+
+def evaluate_prediction(prediction, home_team, away_team, home_score, away_score):
+    """
+    Détermine si une prédiction est gagnante pour un score final.
+
+    Args:
+        prediction (str): Prédiction ('Home Win', 'X', 'Over 2.5', 'BTTS Yes', nom d'équipe...)
+        home_team (str): Équipe à domicile
+        away_team (str): Équipe à l'extérieur
+        home_score (int): Buts de l'équipe à domicile
+        away_score (int): Buts de l'équipe à l'extérieur
+
+    Returns:
+        bool: True si la prédiction est gagnante, None si le marché n'est pas reconnu
+    """
+    text = str(prediction or '').strip().lower()
+    outcome = match_outcome(home_score, away_score)
+    total = home_score + away_score
+    both_scored = home_score > 0 and away_score > 0
+
+    one_x_two = {
+        'home win': 'Home Win', 'home': 'Home Win', '1': 'Home Win', 'victoire domicile': 'Home Win',
+        'draw': 'Draw', 'x': 'Draw', 'nul': 'Draw', 'match nul': 'Draw',
+        'away win': 'Away Win', 'away': 'Away Win', '2': 'Away Win', 'victoire extérieur': 'Away Win'
+    }
+    if text in one_x_two:
+        return one_x_two[text] == outcome
+
+    double_chance = {'1x': ('Home Win', 'Draw'), 'x2': ('Draw', 'Away Win'), '12': ('Home Win', 'Away Win')}
+    if text in double_chance:
+        return outcome in double_chance[text]
+
+    goals = re.match(r'^(over|under|plus de|moins de)\s*(\d+(?:[.,]\d+)?)', text)
+    if goals:
+        line = float(goals.group(2).replace(',', '.'))
+        return total > line if goals.group(1) in ('over', 'plus de') else total < line
+
+    if text.startswith('btts') or 'both teams to score' in text or 'deux équipes marquent' in text:
+        negative = text.endswith('no') or text.endswith('non')
+        return both_scored != negative
+
+    # Prédiction exprimée par le nom de l'équipe gagnante
+    normalized = normalize_team_name(text)
+    if normalized and normalized == normalize_team_name(home_team):
+        return outcome == 'Home Win'
+    if normalized and normalized == normalize_team_name(away_team):
+        return outcome == 'Away Win'
+    return None
+
+
+class ResultSettlement:
+    """
+    Pipeline de règlement des prédictions en écriture différée.
+    Les résultats soumis sont mis en tampon et réglés par lots, soit lorsque le lot
+    est plein, soit après un délai maximal, soit sur demande (flush).
+    """
+    def __init__(self, database=None, arcan_reflex=None, batch_size=500, max_delay=5.0):
+        """
+        Initialise le pipeline de règlement.
+
+        Args:
+            database (Database, optional): Base des prédictions (instance partagée par défaut)
+            arcan_reflex (ArcanReflex, optional): Instance notifiée de chaque lot réglé
+            batch_size (int): Nombre de résultats déclenchant un règlement immédiat
+            max_delay (float): Délai maximal (secondes) avant le règlement d'un résultat en tampon
+        """
+        if database is None:
+            from utils.database import db as database
+        self.database = database
+        self.arcan_reflex = arcan_reflex
+        self.batch_size = batch_size
+        self.max_delay = max_delay
+
+        self._pending = {}
+        self._lock = threading.Lock()
+        self._flush_lock = threading.Lock()
+        self._wakeup = threading.Event()
+        self._closed = False
+        self._flusher = None
+        self._stats = {
+            'received': 0, 'batches': 0, 'settled': 0, 'correct': 0, 'unmatched': 0,
+            'already_settled': 0, 'unknown_markets': 0, 'errors': 0, 'last_batch_ms': 0.0
+        }
+
+    # ------------------------------------------------------------------
+    # Réception des résultats
+    # ------------------------------------------------------------------
+    def _ensure_flusher(self):
+        """Démarre le thread de règlement différé au premier résultat."""
+        if self._flusher is None or not self._flusher.is_alive():
+            self._flusher = threading.Thread(target=self._run_flusher, name='result-settlement', daemon=True)
+            self._flusher.start()
+
+    def _run_flusher(self):
+        """Règle périodiquement les résultats en tampon."""
+        while not self._closed:
+            self._wakeup.wait(self.max_delay)
+            self._wakeup.clear()
+            if self._pending:
+                try:
+                    self.flush()
+                except Exception:
+                    # Déjà journalisé ; les résultats restent en tampon
+                    pass
+
+    def submit(self, record):
+        """
+        Met un résultat en tampon pour le prochain règlement.
+
+        Args:
+            record (dict): Résultat brut (feed, CSV, openfootball)
+
+        Returns:
+            bool: True si le résultat a été accepté
+        """
+        return self.submit_many([record]) == 1
+
+    def submit_many(self, records):
+        """
+        Met plusieurs résultats en tampon. Un résultat déjà en tampon pour le même
+        match est remplacé par le plus récent.
+
+        Args:
+            records (list): Résultats bruts
+
+        Returns:
+            int: Nombre de résultats acceptés
+        """
+        accepted = 0
+        with self._lock:
+            for record in records:
+                result = normalize_result(record)
+                if result is None:
+                    continue
+                key = (result['date'], normalize_team_name(result['home_team']),
+                       normalize_team_name(result['away_team']))
+                self._pending[key] = result
+                accepted += 1
+            self._stats['received'] += accepted
+            batch_full = len(self._pending) >= self.batch_size
+
+        if batch_full:
+            self._wakeup.set()
+        if accepted and not self._closed:
+            self._ensure_flusher()
+        return accepted
+
+    def settle_file(self, path):
+        """
+        Règle immédiatement tous les résultats d'un fichier.
+
+        Args:
+            path (str): Fichier de résultats (CSV, JSON, JSONL, openfootball)
+
+        Returns:
+            dict: Bilan du règlement
+        """
+        results = load_results_file(path)
+        with self._lock:
+            for result in results:
+                key = (result['date'], normalize_team_name(result['home_team']),
+                       normalize_team_name(result['away_team']))
+                self._pending[key] = result
+            self._stats['received'] += len(results)
+        return self.flush()
+
+    # ------------------------------------------------------------------
+    # Règlement
+    # ------------------------------------------------------------------
+    def flush(self):
+        """
+        Règle tous les résultats en tampon en une transaction.
+
+        Returns:
+            dict: Bilan du lot (prédictions réglées, gagnantes, sans prédiction...)
+        """
+        with self._flush_lock:
+            with self._lock:
+                pending, self._pending = self._pending, {}
+            if not pending:
+                return {'results': 0, 'settled': 0, 'correct': 0, 'unmatched': 0, 'already_settled': 0}
+
+            started = time.perf_counter()
+            try:
+                summary = self._settle(pending)
+            except Exception as e:
+                # Les résultats sont remis en tampon pour la prochaine tentative
+                with self._lock:
+                    for key, result in pending.items():
+                        self._pending.setdefault(key, result)
+                    self._stats['errors'] += 1
+                logger.error(f"Erreur lors du règlement de {len(pending)} résultats: {e}")
+                raise
+
+            elapsed_ms = (time.perf_counter() - started) * 1000
+            with self._lock:
+                self._stats['batches'] += 1
+                self._stats['settled'] += summary['settled']
+                self._stats['correct'] += summary['correct']
+                self._stats['unmatched'] += summary['unmatched']
+                self._stats['already_settled'] += summary['already_settled']
+                self._stats['unknown_markets'] += summary['unknown_markets']
+                self._stats['last_batch_ms'] = round(elapsed_ms, 2)
+            summary['elapsed_ms'] = round(elapsed_ms, 2)
+            logger.info(f"Règlement: {summary['settled']} prédictions pour {summary['results']} résultats "
+                        f"en {elapsed_ms:.1f} ms")
+            return summary
+
+    def _settle(self, pending):
+        """Apparie les résultats aux prédictions en attente et écrit le lot."""
+        days = [key[0] for key in pending]
+        start = datetime.combine(min(days), datetime.min.time())
+        end = datetime.combine(max(days), datetime.min.time()) + timedelta(days=1)
+
+        # Index (date, domicile, extérieur) -> prédictions en attente
+        index = {}
+        for prediction in self.database.get_unsettled_predictions(start, end):
+            key = (prediction.date.date(), normalize_team_name(prediction.home_team),
+                   normalize_team_name(prediction.away_team))
+            index.setdefault(key, []).append(prediction)
+
+        matched = [(prediction, pending[key]) for key, predictions in index.items()
+                   if key in pending for prediction in predictions]
+        matched_keys = {key for key in index if key in pending}
+
+        # Résultats sans prédiction en attente : déjà réglés (résultat soumis à nouveau) ou sans prédiction
+        already_settled = 0
+        if len(matched_keys) < len(pending):
+            settled_keys = {
+                (date.date(), normalize_team_name(home_team), normalize_team_name(away_team))
+                for date, home_team, away_team in self.database.get_settled_fixtures(start, end)
+            }
+            already_settled = sum(1 for key in pending if key not in matched_keys and key in settled_keys)
+        modules_by_prediction = self.database.get_prediction_modules(
+            [prediction.id for prediction, _ in matched]) if matched else {}
+
+        updates, module_deltas, outcomes = [], {}, []
+        unknown_markets = 0
+        for prediction, result in matched:
+            home_score, away_score = result['home_score'], result['away_score']
+            correct = evaluate_prediction(prediction.prediction, prediction.home_team, prediction.away_team,
+                                          home_score, away_score)
+            updates.append({
+                'id': prediction.id,
+                'home_score': home_score,
+                'away_score': away_score,
+                'outcome': match_outcome(home_score, away_score),
+                'correct': correct
+            })
+            if correct is None:
+                unknown_markets += 1
+                continue
+
+            confidence = prediction.confidence or 0.0
+            confidence = confidence / 100.0 if confidence > 1 else confidence
+            modules = set(modules_by_prediction.get(prediction.id, ()))
+            modules.update(module for column, module in CONFIDENCE_MODULES.items()
+                           if getattr(prediction, column))
+            for module in modules:
+                delta = module_deltas.setdefault(
+                    module, {'settled': 0, 'correct': 0, 'confidence_sum': 0.0, 'brier_sum': 0.0})
+                delta['settled'] += 1
+                delta['correct'] += int(correct)
+                delta['confidence_sum'] += confidence
+                delta['brier_sum'] += (confidence - float(correct)) ** 2
+
+            outcomes.append({
+                'correct': correct,
+                'modules_used': sorted(modules),
+                'confidence': confidence,
+                'match_data': {'home_team': prediction.home_team, 'away_team': prediction.away_team,
+                               'league': prediction.league, 'date': result['date'].isoformat()}
+            })
+
+        self.database.settle_predictions(updates, module_deltas)
+
+        if self.arcan_reflex is not None and outcomes:
+            try:
+                self.arcan_reflex.track_prediction_outcomes(outcomes)
+            except Exception as e:
+                logger.error(f"Erreur lors de la transmission du lot à ArcanReflex: {e}")
+
+        return {
+            'results': len(pending),
+            'settled': len(updates),
+            'correct': sum(1 for outcome in outcomes if outcome['correct']),
+            'unmatched': len(pending) - len(matched_keys) - already_settled,
+            'already_settled': already_settled,
+            'unknown_markets': unknown_markets,
+            'modules_updated': len(module_deltas)
+        }
+
+    def close(self):
+        """Règle les résultats restants et arrête le thread de règlement différé."""
+        self._closed = True
+        self._wakeup.set()
+        if self._flusher is not None:
+            self._flusher.join(timeout=self.max_delay + 1)
+        return self.flush()
+
+    def get_stats(self):
+        """
+        Statistiques du pipeline de règlement.
+
+        Returns:
+            dict: Compteurs cumulés et taille du tampon
+        """
+        with self._lock:
+            return {**self._stats, 'pending': len(self._pending)}
+
+
+_result_settlement = None
+_result_settlement_lock = threading.Lock()
+_arcan_reflex = None
+
+
+def get_result_settlement():
+    """
+    Renvoie l'instance partagée du pipeline de règlement.
+
+    Returns:
+        ResultSettlement: Pipeline partagé, notifiant l'ArcanReflex attaché (attach_arcan_reflex)
+    """
+    global _result_settlement
+    if _result_settlement is None:
+        with _result_settlement_lock:
+            if _result_settlement is None:
+                _result_settlement = ResultSettlement(arcan_reflex=_arcan_reflex)
+    return _result_settlement
+
+
+def attach_arcan_reflex(arcan_reflex):
+    """
+    Associe l'ArcanReflex du système au pipeline partagé, qui lui transmet chaque lot réglé.
+
+    Args:
+        arcan_reflex (ArcanReflex): Instance à notifier
+    """
+    global _arcan_reflex
+    with _result_settlement_lock:
+        _arcan_reflex = arcan_reflex
+        if _result_settlement is not None:
+            _result_settlement.arcan_reflex = arcan_reflex
+
+
+def detach_arcan_reflex(arcan_reflex):
+    """
+    Retire un ArcanReflex du pipeline partagé s'il y est encore associé.
+
+    Args:
+        arcan_reflex (ArcanReflex): Instance à retirer
+    """
+    global _arcan_reflex
+    with _result_settlement_lock:
+        if _arcan_reflex is arcan_reflex:
+            _arcan_reflex = None
+            if _result_settlement is not None and _result_settlement.arcan_reflex is arcan_reflex:
+                _result_settlement.arcan_reflex = None
@@ -0,0 +1,373 @@
+"""
+ScoreMatrix - Moteur de marchés de buts par matrice de scores pour ArcanShadow
+Ce module construit, pour chaque match, la matrice des probabilités de scores exacts
+(Poisson indépendants corrigés par Dixon-Coles) et en dérive tous les marchés de buts
+par simples réductions de tableaux : 1X2, toutes les lignes Over/Under, BTTS,
+scores exacts, handicaps asiatiques et clean sheets.
+
+Les calculs sont vectorisés sur une journée complète : N matchs produisent un
+tenseur (N x 11 x 11) dont l'axe 1 porte les buts à domicile et l'axe 2 les buts
+à l'extérieur.
+"""
+
+import logging
+
+import numpy as np
+
+# Configuration du logger
+logging.basicConfig(
+    level=logging.INFO,
+    format='%(asctime)s - %(name)s - %(levelname)s - %(message)s'
+)
+logger = logging.getLogger('score_matrix')
+
+# Nombre maximal de buts par équipe représenté dans la matrice (0 à 10 inclus)
+MAX_GOALS = 10
+
+# Paramètre de dépendance Dixon-Coles (négatif : plus de 0-0 et 1-1 que sous Poisson indépendants)
+DEFAULT_RHO = -0.08
+
+# Lignes de buts et de handicaps calculées par défaut
+DEFAULT_TOTAL_LINES = (0.5, 1.5, 2.5, 3.5, 4.5, 5.5)
+DEFAULT_HANDICAP_LINES = tuple(np.arange(-2.5, 2.75, 0.25).round(2))
+
+# Bornes des espérances de buts acceptées
+MIN_EXPECTED_GOALS = 0.05
+MAX_EXPECTED_GOALS = 6.0
+
+_GOALS = np.arange(MAX_GOALS + 1)
+_LOG_FACTORIALS = np.concatenate(([0.0], np.cumsum(np.log(_GOALS[1:]))))
+# Grilles (buts domicile, buts extérieur) partagées par toutes les réductions
+_HOME_GRID, _AWAY_GRID = np.meshgrid(_GOALS, _GOALS, indexing='ij')
+_TOTAL_GRID = _HOME_GRID + _AWAY_GRID
+_DIFF_GRID = _HOME_GRID - _AWAY_GRID
+# Nombre de cases d'une matrice, explicite pour que les tenseurs vides (0 match) se remodèlent
+_CELLS = _HOME_GRID.size
+
+
+def _one_hot(grid, offset):
+    """Matrice (121, 21) associant chaque case de la grille à sa valeur entière."""
+    one_hot = np.zeros((grid.size, 2 * MAX_GOALS + 1))
+    one_hot[np.arange(grid.size), grid.ravel() + offset] = 1.0
+    return one_hot
+
+
+_TOTAL_ONE_HOT = _one_hot(_TOTAL_GRID, 0)
+_DIFF_ONE_HOT = _one_hot(_DIFF_GRID, MAX_GOALS)
+
+
+def poisson_pmf(expected_goals):
+    """
+    Calcule les probabilités de Poisson P(k buts) pour k = 0..MAX_GOALS.
+
+    Args:
+        expected_goals (array-like): Espérances de buts, forme (N,)
+
+    Returns:
+        numpy.ndarray: Probabilités de forme (N, MAX_GOALS + 1)
+    """
+    lam = np.clip(np.asarray(expected_goals, dtype=float), MIN_EXPECTED_GOALS, MAX_EXPECTED_GOALS)[:, None]
+    return np.exp(_GOALS * np.log(lam) - lam - _LOG_FACTORIALS)
+
+
+def build_score_matrices(home_expected_goals, away_expected_goals, rho=DEFAULT_RHO):
+    """
+    Construit les matrices de scores exacts d'un ensemble de matchs.
+
+    La correction de Dixon-Coles ajuste les quatre scores faibles (0-0, 1-0, 0-1, 1-1) ;
+    chaque matrice est ensuite renormalisée pour compenser la troncature à MAX_GOALS.
+
+    Args:
+        home_expected_goals (array-like): Buts attendus à domicile, forme (N,)
+        away_expected_goals (array-like): Buts attendus à l'extérieur, forme (N,)
+        rho (float | array-like): Paramètre de dépendance Dixon-Coles (0 pour des Poisson indépendants)
+
+    Returns:
+        numpy.ndarray: Tenseur de probabilités de forme (N, 11, 11)
+    """
+    home_xg = np.clip(np.atleast_1d(np.asarray(home_expected_goals, dtype=float)), MIN_EXPECTED_GOALS, MAX_EXPECTED_GOALS)
+    away_xg = np.clip(np.atleast_1d(np.asarray(away_expected_goals, dtype=float)), MIN_EXPECTED_GOALS, MAX_EXPECTED_GOALS)
+    rho = np.broadcast_to(np.asarray(rho, dtype=float), home_xg.shape)
+
+    matrices = poisson_pmf(home_xg)[:, :, None] * poisson_pmf(away_xg)[:, None, :]
+
+    # Facteurs tau de Dixon-Coles
+    matrices[:, 0, 0] *= 1 - home_xg * away_xg * rho
+    matrices[:, 0, 1] *= 1 + home_xg * rho
+    matrices[:, 1, 0] *= 1 + away_xg * rho
+    matrices[:, 1, 1] *= 1 - rho
+
+    np.clip(matrices, 0.0, None, out=matrices)
+    matrices /= matrices.sum(axis=(1, 2), keepdims=True)
+    return matrices
+
+
+def total_goals_distribution(matrices):
+    """
+    Distribution du nombre total de buts.
+
+    Args:
+        matrices (numpy.ndarray): Tenseur (N, 11, 11)
+
+    Returns:
+        numpy.ndarray: Probabilités de forme (N, 21), colonne t = P(total = t)
+    """
+    return matrices.reshape(len(matrices), _CELLS) @ _TOTAL_ONE_HOT
+
+
+def goal_difference_distribution(matrices):
+    """
+    Distribution de l'écart de buts (domicile - extérieur).
+
+    Args:
+        matrices (numpy.ndarray): Tenseur (N, 11, 11)
+
+    Returns:
+        numpy.ndarray: Probabilités de forme (N, 21), colonne d + 10 = P(écart = d)
+    """
+    return matrices.reshape(len(matrices), _CELLS) @ _DIFF_ONE_HOT
+
+
+def one_x_two(matrices):
+    """
+    Probabilités 1X2.
+
+    Args:
+        matrices (numpy.ndarray): Tenseur (N, 11, 11)
+
+    Returns:
+        dict: Tableaux (N,) 'home_win', 'draw', 'away_win'
+    """
+    return {
+        'home_win': (matrices * (_DIFF_GRID > 0)).sum(axis=(1, 2)),
+        'draw': np.trace(matrices, axis1=1, axis2=2),
+        'away_win': (matrices * (_DIFF_GRID < 0)).sum(axis=(1, 2))
+    }
+
+
+def over_under(matrices, lines=DEFAULT_TOTAL_LINES):
+    """
+    Probabilités Over/Under pour plusieurs lignes de buts.
+
+    Args:
+        matrices (numpy.ndarray): Tenseur (N, 11, 11)
+        lines (iterable): Lignes de buts (ex: 0.5, 1.5, 2.5)
+
+    Returns:
+        dict: {ligne: {'over': (N,), 'under': (N,)}}
+    """
+    totals = total_goals_distribution(matrices)
+    # under[:, t] = P(total <= t)
+    cumulative = np.cumsum(totals, axis=1)
+    markets = {}
+    for line in lines:
+        under = cumulative[:, int(np.floor(line))]
+        markets[float(line)] = {'over': 1.0 - under, 'under': under}
+    return markets
+
+
+def both_teams_to_score(matrices):
+    """
+    Probabilité que les deux équipes marquent.
+
+    Args:
+        matrices (numpy.ndarray): Tenseur (N, 11, 11)
+
+    Returns:
+        numpy.ndarray: Probabilités (N,)
+    """
+    return matrices[:, 1:, 1:].sum(axis=(1, 2))
+
+
+def clean_sheets(matrices):
+    """
+    Probabilités de clean sheet de chaque équipe.
+
+    Args:
+        matrices (numpy.ndarray): Tenseur (N, 11, 11)
+
+    Returns:
+        dict: Tableaux (N,) 'home' (l'extérieur ne marque pas) et 'away'
+    """
+    return {
+        'home': matrices[:, :, 0].sum(axis=1),
+        'away': matrices[:, 0, :].sum(axis=1)
+    }
+
+
+def asian_handicaps(matrices, lines=DEFAULT_HANDICAP_LINES):
+    """
+    Résultats des handicaps asiatiques pour l'équipe à domicile.
+
+    Les lignes en quart (ex: -0.75) sont réparties à parts égales sur les deux
+    demi-lignes voisines, comme chez les bookmakers.
+
+    Args:
+        matrices (numpy.ndarray): Tenseur (N, 11, 11)
+        lines (iterable): Handicaps appliqués à l'équipe à domicile
+
+    Returns:
+        dict: {ligne: {'win': (N,), 'push': (N,), 'lose': (N,)}} du point de vue domicile
+    """
+    diffs = goal_difference_distribution(matrices)
+    # Probabilités cumulées P(écart <= d) pour d = -10..10
+    cumulative = np.cumsum(diffs, axis=1)
+
+    zeros = np.zeros(len(diffs))
+
+    def _settle(line):
+        # Le pari domicile gagne si écart + ligne > 0 et est remboursé si écart + ligne == 0
+        threshold = -line
+        if float(threshold).is_integer():
+            idx = int(threshold) + MAX_GOALS
+            lose = cumulative[:, idx - 1] if idx > 0 else zeros
+            push = diffs[:, idx]
+            return 1.0 - lose - push, push, lose
+        lose = cumulative[:, int(np.floor(threshold)) + MAX_GOALS]
+        return 1.0 - lose, zeros, lose
+
+    markets = {}
+    for line in lines:
+        line = float(line)
+        if (line * 4) % 2:
+            # Ligne en quart : moitié de la mise sur chaque demi-ligne voisine
+            low, high = _settle(line - 0.25), _settle(line + 0.25)
+            win, push, lose = ((a + b) / 2 for a, b in zip(low, high))
+        else:
+            win, push, lose = _settle(line)
+        markets[line] = {'win': win, 'push': push, 'lose': lose}
+    return markets
+
+
+def correct_scores(matrices, top_n=5):
+    """
+    Scores exacts les plus probables de chaque match.
+
+    Args:
+        matrices (numpy.ndarray): Tenseur (N, 11, 11)
+        top_n (int): Nombre de scores à renvoyer par match
+
+    Returns:
+        list: Pour chaque match, liste de (score 'h-a', probabilité) triée
+    """
+    flat = matrices.reshape(len(matrices), _CELLS)
+    top_n = min(top_n, flat.shape[1])
+    candidates = np.argpartition(-flat, top_n - 1, axis=1)[:, :top_n]
+    order = np.take_along_axis(-flat, candidates, axis=1).argsort(axis=1)
+    best = np.take_along_axis(candidates, order, axis=1)
+    size = MAX_GOALS + 1
+    return [
+        [(f"{idx // size}-{idx % size}", float(flat[i, idx])) for idx in row]
+        for i, row in enumerate(best)
+    ]
+
+
+def derive_markets(matrices, total_lines=DEFAULT_TOTAL_LINES, handicap_lines=DEFAULT_HANDICAP_LINES, top_scores=5):
+    """
+    Dérive tous les marchés de buts d'un tenseur de matrices de scores.
+
+    Args:
+        matrices (numpy.ndarray): Tenseur (N, 11, 11)
+        total_lines (iterable): Lignes Over/Under
+        handicap_lines (iterable): Lignes de handicap asiatique
+        top_scores (int): Nombre de scores exacts par match
+
+    Returns:
+        dict: Marchés sous forme de tableaux (N,) indexés par match
+    """
+    return {
+        '1X2': one_x_two(matrices),
+        'over_under': over_under(matrices, total_lines),
+        'btts': both_teams_to_score(matrices),
+        'clean_sheets': clean_sheets(matrices),
+        'asian_handicap': asian_handicaps(matrices, handicap_lines),
+        'correct_score': correct_scores(matrices, top_scores),
+        'expected_goals': {
+            'home': (matrices.sum(axis=2) * _GOALS).sum(axis=1),
+            'away': (matrices.sum(axis=1) * _GOALS).sum(axis=1)
+        }
+    }
+
+
+def _select(value, i):
+    """Extrait le match i d'une structure de marchés vectorisée."""
+    if isinstance(value, dict):
+        return {key: _select(v, i) for key, v in value.items()}
+    if isinstance(value, np.ndarray):
+        return float(value[i])
+    return value[i]
+
+
+def price_slate(home_expected_goals, away_expected_goals, rho=DEFAULT_RHO, **kwargs):
+    """
+    Calcule tous les marchés de buts d'une journée complète en un seul passage.
+
+    Args:
+        home_expected_goals (array-like): Buts attendus à domicile, forme (N,)
+        away_expected_goals (array-like): Buts attendus à l'extérieur, forme (N,)
+        rho (float | array-like): Paramètre de dépendance Dixon-Coles
+        **kwargs: Options transmises à derive_markets
+
+    Returns:
+        list: Un dictionnaire de marchés (valeurs flottantes) par match
+    """
+    if np.size(home_expected_goals) == 0:
+        return []
+    matrices = build_score_matrices(home_expected_goals, away_expected_goals, rho)
+    markets = derive_markets(matrices, **kwargs)
+    return [_select(markets, i) for i in range(len(matrices))]
+
+
+# Grille d'espérances de buts utilisée pour ajuster (domicile, extérieur) sur des probabilités 1X2
+_FIT_STEP = 0.05
+_fit_grid = None
+
+
+def _expected_goals_grid():
+    """Probabilités 1X2 de toutes les paires d'espérances de la grille (calculées une fois)."""
+    global _fit_grid
+    if _fit_grid is None:
+        values = np.arange(0.2, 4.0 + _FIT_STEP / 2, _FIT_STEP)
+        home_xg, away_xg = (g.ravel() for g in np.meshgrid(values, values, indexing='ij'))
+        probs = one_x_two(build_score_matrices(home_xg, away_xg))
+        _fit_grid = (home_xg, away_xg, np.stack([probs['home_win'], probs['draw'], probs['away_win']], axis=1))
+    return _fit_grid
+
+
+def fit_expected_goals(home_win, draw, away_win):
+    """
+    Retrouve les buts attendus (domicile, extérieur) reproduisant au mieux des probabilités 1X2.
+
+    Utile pour construire la matrice de scores d'un match dont seules les cotes ou les
+    probabilités 1X2 sont connues. Les probabilités sont renormalisées avant l'ajustement.
+
+    Args:
+        home_win (array-like): Probabilités de victoire à domicile, forme (N,)
+        draw (array-like): Probabilités de match nul, forme (N,)
+        away_win (array-like): Probabilités de victoire à l'extérieur, forme (N,)
+
+    Returns:
+        tuple: (buts attendus domicile, buts attendus extérieur), tableaux (N,)
+    """
+    target = np.stack([np.atleast_1d(np.asarray(p, dtype=float)) for p in (home_win, draw, away_win)], axis=1)
+    target = target / target.sum(axis=1, keepdims=True)
+    home_xg, away_xg, grid = _expected_goals_grid()
+    errors = ((target[:, None, :] - grid[None, :, :]) ** 2).sum(axis=2)
+    best = errors.argmin(axis=1)
+    return home_xg[best], away_xg[best]
+
+
+def price_match(home_expected_goals, away_expected_goals, rho=DEFAULT_RHO, **kwargs):
+    """
+    Calcule tous les marchés de buts d'un match.
+
+    Args:
+        home_expected_goals (float): Buts attendus à domicile
+        away_expected_goals (float): Buts attendus à l'extérieur
+        rho (float): Paramètre de dépendance Dixon-Coles
+        **kwargs: Options transmises à derive_markets
+
+    Returns:
+        dict: Marchés du match (probabilités entre 0 et 1)
+    """
+    return price_slate([home_expected_goals], [away_expected_goals], rho, **kwargs)[0]
@@ -0,0 +1,617 @@
+"""
+SentimentEngine - Moteur de sentiment lexical par lots pour ArcanShadow
+Ce module analyse de vrais textes de supporters (posts, forums, articles) stockés
+localement en JSONL, en texte brut ou en HTML (extrait via trafilatura). Les textes
+sont tokenisés par lots, projetés sur un lexique d'émotions compilé en matrice creuse
+(produit document x terme · terme x émotion), puis agrégés de façon incrémentale dans
+des distributions d'émotions glissantes par équipe et par source, avec décroissance
+exponentielle dans le temps. Les profils produits ont la forme attendue par
+FanSentimentMonitor (données 'emotions' et métriques par source).
+"""
+
+import json
+import logging
+import math
+import os
+import re
+import threading
+import time
+from datetime import datetime
+
+import numpy as np
+
+try:
+    from scipy import sparse
+    SCIPY_AVAILABLE = True
+except ImportError:
+    SCIPY_AVAILABLE = False
+
+try:
+    import trafilatura
+    TRAFILATURA_AVAILABLE = True
+except ImportError:
+    TRAFILATURA_AVAILABLE = False
+
+# Configuration du logger
+logging.basicConfig(
+    level=logging.INFO,
+    format='%(asctime)s - %(name)s - %(levelname)s - %(message)s'
+)
+logger = logging.getLogger('sentiment_engine')
+
+# Émotions collectives suivies (mêmes noms que FanSentimentMonitor / version enrichie)
+EMOTIONS = [
+    'euphoria', 'anxiety', 'anger', 'confidence', 'desperation', 'nostalgia',
+    'anticipation', 'disappointment', 'skepticism', 'vindication', 'unity', 'admiration'
+]
+POSITIVE_EMOTIONS = {'euphoria', 'confidence', 'anticipation', 'vindication', 'unity', 'admiration'}
+NEGATIVE_EMOTIONS = {'anxiety', 'anger', 'desperation', 'disappointment', 'skepticism'}
+
+# Lexique d'émotions (français et anglais) : {émotion: {mot: poids}}
+EMOTION_LEXICON = {
+    'euphoria': {
+        'incroyable': 1.0, 'magique': 1.0, 'folie': 0.8, 'exploit': 0.9, 'historique': 0.7, 'champions': 0.8,
+        'extase': 1.0, 'fantastique': 0.9, 'génial': 0.8, 'amazing': 1.0, 'incredible': 1.0, 'unbelievable': 0.9,
+        'magic': 0.9, 'ecstatic': 1.0, 'scenes': 0.6, 'limbs': 0.7, 'buzzing': 0.8, 'glory': 0.8
+    },
+    'anxiety': {
+        'peur': 0.9, 'inquiet': 1.0, 'inquiétude': 1.0, 'stress': 0.9, 'nerveux': 0.9, 'angoisse': 1.0,
+        'tendu': 0.7, 'crainte': 0.9, 'worried': 1.0, 'nervous': 1.0, 'scared': 0.9, 'anxious': 1.0,
+        'fear': 0.9, 'tense': 0.7, 'dread': 1.0, 'squeaky': 0.6, 'bottle': 0.6, 'bottled': 0.7
+    },
+    'anger': {
+        'colère': 1.0, 'honte': 0.9, 'scandale': 1.0, 'inadmissible': 1.0, 'démission': 0.8, 'nul': 0.7,
+        'lamentable': 0.9, 'arbitre': 0.4, 'furious': 1.0, 'angry': 1.0, 'disgrace': 1.0, 'shambles': 0.9,
+        'sack': 0.8, 'robbed': 0.9, 'fuming': 1.0, 'rage': 1.0, 'clueless': 0.8
+    },
+    'confidence': {
+        'confiant': 1.0, 'confiance': 1.0, 'solide': 0.7, 'sereins': 0.8, 'serein': 0.8, 'maîtrise': 0.7,
+        'costaud': 0.7, 'victoire': 0.5, 'confident': 1.0, 'solid': 0.7, 'dominant': 0.8, 'comfortable': 0.7,
+        'easy': 0.6, 'strong': 0.6, 'believe': 0.7, 'win': 0.4, 'clinical': 0.7, 'form': 0.3
+    },
+    'desperation': {
+        'désespoir': 1.0, 'catastrophe': 0.9, 'relégation': 0.9, 'descente': 0.8, 'foutu': 1.0, 'fini': 0.6,
+        'abandon': 0.8, 'hopeless': 1.0, 'doomed': 1.0, 'relegation': 0.9, 'relegated': 1.0, 'finished': 0.6,
+        'disaster': 0.9, 'helpless': 0.9, 'pointless': 0.8
+    },
+    'nostalgia': {
+        'nostalgie': 1.0, 'époque': 0.7, 'souvenir': 0.8, 'souvenirs': 0.8, 'légende': 0.7, 'jadis': 0.8,
+        'autrefois': 0.8, 'nostalgia': 1.0, 'memories': 0.8, 'remember': 0.6, 'legend': 0.7, 'legends': 0.7,
+        'glory': 0.3, 'era': 0.7, 'vintage': 0.6
+    },
+    'anticipation': {
+        'hâte': 1.0, 'impatient': 0.9, 'attente': 0.6, 'demain': 0.4, 'derby': 0.6, 'choc': 0.6,
+        'affiche': 0.6, 'excited': 1.0, 'wait': 0.5, 'tomorrow': 0.4, 'countdown': 0.8,
+        'matchday': 0.7, 'hype': 0.9, 'upcoming': 0.6, 'forward': 0.3
+    },
+    'disappointment': {
+        'déçu': 1.0, 'déception': 1.0, 'dommage': 0.7, 'frustrant': 0.8, 'frustration': 0.8, 'raté': 0.7,
+        'dommageable': 0.5, 'disappointed': 1.0, 'disappointing': 1.0, 'gutted': 1.0, 'frustrating': 0.8,
+        'wasted': 0.7, 'missed': 0.6, 'letdown': 0.9, 'sloppy': 0.6, 'flat': 0.5
+    },
+    'skepticism': {
+        'doute': 1.0, 'doutes': 1.0, 'sceptique': 1.0, 'méfiance': 0.9, 'vraiment': 0.2, 'prouver': 0.6,
+        'douteux': 0.8, 'doubt': 1.0, 'doubts': 1.0, 'skeptical': 1.0, 'sceptical': 1.0, 'unconvinced': 1.0,
+        'questionable': 0.8, 'overrated': 0.8, 'fluke': 0.8, 'prove': 0.5
+    },
+    'vindication': {
+        'revanche': 1.0, 'raison': 0.5, 'prouvé': 0.8, 'vengeance': 0.9, 'réponse': 0.4, 'critiques': 0.5,
+        'vindicated': 1.0, 'revenge': 1.0, 'proved': 0.8, 'proven': 0.7, 'doubters': 0.9, 'haters': 0.8,
+        'told': 0.3, 'redemption': 0.9
+    },
+    'unity': {
+        'ensemble': 0.9, 'unis': 1.0, 'famille': 0.7, 'soutien': 0.8, 'derrière': 0.5, 'allez': 0.6,
+        'tifo': 0.7, 'together': 0.9, 'united': 0.6, 'family': 0.7, 'support': 0.7, 'behind': 0.5,
+        'walk': 0.3, 'alone': 0.3, 'ultras': 0.6, 'solidarity': 1.0
+    },
+    'admiration': {
+        'bravo': 0.9, 'chapeau': 0.9, 'génie': 1.0, 'classe': 0.8, 'idole': 0.9, 'merci': 0.6,
+        'talent': 0.7, 'masterclass': 1.0, 'genius': 1.0, 'class': 0.7, 'hero': 0.9, 'goat': 1.0,
+        'idol': 0.9, 'respect': 0.7, 'brilliant': 0.8, 'outstanding': 0.9
+    }
+}
+
+# Mots de négation : le mot d'émotion qui suit directement est ignoré
+NEGATIONS = {'pas', 'jamais', 'aucun', 'aucune', 'not', 'no', 'never', 'nobody', "isn't", "don't"}
+
+# Négations seulement dans la construction « ne ... plus » (« plus fier que jamais » reste positif) :
+# le mot compte comme négation si « ne » ou une forme élidée « n'… » le précède de peu
+NE_NEGATIONS = {'plus'}
+NE_WINDOW = 3
+
+# Formes des tokens (lettres, apostrophes internes)
+TOKEN_PATTERN = re.compile(r"[^\W\d_]+(?:'[^\W\d_]+)?")
+
+# Paramètres d'agrégation
+DEFAULT_HALF_LIFE_HOURS = 48.0
+DEFAULT_BATCH_SIZE = 20000
+EMOTION_SATURATION = 3.0      # Taux d'émotion par post -> score dans [0, 1]
+VOLUME_SCALE = 500.0          # Nombre de posts (pondérés) pour un volume de 0.63
+INTENSITY_SCALE = 10.0        # Part de tokens émotionnels -> intensité dans [0, 1]
+DEFAULT_CORPUS_DIR = os.path.join("data", "fan_corpus")
+
+# Noms des métriques attendues par source (métrique de la source -> mesure du moteur)
+SOURCE_METRIC_ALIASES = {
+    'social_media': {'volume': 'volume', 'sentiment_ratio': 'sentiment_ratio', 'emotional_intensity': 'intensity'},
+    'forum_discussions': {'post_volume': 'volume', 'topic_sentiment': 'sentiment_ratio',
+                          'comment_intensity': 'intensity'},
+    'news_media': {'article_volume': 'volume', 'coverage_sentiment': 'sentiment_ratio',
+                   'headline_tone': 'sentiment_ratio'},
+    'player_interviews': {'tone': 'sentiment_ratio'},
+    'manager_statements': {'tone': 'sentiment_ratio'},
+    'club_communications': {'tone': 'sentiment_ratio'}
+}
+
+
+def compile_lexicon(lexicon=None, emotions=None):
+    """
+    Compile un lexique {émotion: {mot: poids}} en vocabulaire et matrice terme x émotion.
+
+    Args:
+        lexicon (dict, optional): Lexique à compiler (EMOTION_LEXICON par défaut)
+        emotions (list, optional): Ordre des émotions (EMOTIONS par défaut)
+
+    Returns:
+        tuple: (vocabulaire {mot: ligne}, matrice (V, E) des poids)
+    """
+    lexicon = lexicon or EMOTION_LEXICON
+    emotions = emotions or EMOTIONS
+    vocabulary = {}
+    entries = []
+    for column, emotion in enumerate(emotions):
+        for word, weight in lexicon.get(emotion, {}).items():
+            row = vocabulary.setdefault(word.lower(), len(vocabulary))
+            entries.append((row, column, weight))
+
+    matrix = np.zeros((len(vocabulary), len(emotions)))
+    for row, column, weight in entries:
+        matrix[row, column] = max(matrix[row, column], weight)
+    return vocabulary, matrix
+
+
+def _group_sum(groups, values, n_groups):
+    """
+    Somme les lignes d'une matrice par groupe (produit creux indicateur x valeurs).
+
+    Args:
+        groups (np.ndarray): Groupe de chaque ligne
+        values (np.ndarray): Matrice (n, k) ou vecteur (n,) à sommer
+        n_groups (int): Nombre de groupes
+
+    Returns:
+        np.ndarray: Sommes (n_groups, k) ou (n_groups,)
+    """
+    if values.ndim == 1:
+        return np.bincount(groups, weights=values, minlength=n_groups)
+    if SCIPY_AVAILABLE:
+        indicator = sparse.csr_matrix(
+            (np.ones(len(groups)), (groups, np.arange(len(groups)))), shape=(n_groups, len(groups))
+        )
+        return np.asarray(indicator @ values)
+    return np.column_stack([
+        np.bincount(groups, weights=values[:, k], minlength=n_groups) for k in range(values.shape[1])
+    ]) if values.shape[1] else np.zeros((n_groups, 0))
+
+
+def _parse_timestamp(value, default):
+    """Convertit un horodatage (epoch ou ISO 8601) en secondes epoch."""
+    if value is None or value == '':
+        return default
+    if isinstance(value, (int, float)):
+        return float(value)
+    try:
+        return datetime.fromisoformat(str(value).replace('Z', '+00:00')).timestamp()
+    except ValueError:
+        return default
+
+
+class SentimentEngine:
+    """
+    Moteur de sentiment lexical : scoring par lots et distributions glissantes
+    d'émotions par (équipe, source).
+    """
+    def __init__(self, lexicon=None, half_life_hours=DEFAULT_HALF_LIFE_HOURS, batch_size=DEFAULT_BATCH_SIZE):
+        """
+        Initialise le moteur de sentiment.
+
+        Args:
+            lexicon (dict, optional): Lexique {émotion: {mot: poids}} (EMOTION_LEXICON par défaut)
+            half_life_hours (float): Demi-vie des observations en heures
+            batch_size (int): Nombre de textes traités par lot
+        """
+        self.emotions = list(EMOTIONS)
+        self.vocabulary, self.lexicon_matrix = compile_lexicon(lexicon, self.emotions)
+        self._lexicon_sparse = sparse.csr_matrix(self.lexicon_matrix) if SCIPY_AVAILABLE else None
+        self.decay_rate = math.log(2) / (half_life_hours * 3600.0)
+        self.batch_size = batch_size
+
+        self._positive = np.array([e in POSITIVE_EMOTIONS for e in self.emotions])
+        self._negative = np.array([e in NEGATIVE_EMOTIONS for e in self.emotions])
+
+        # État glissant : une ligne par (équipe, source)
+        self._keys = {}
+        self._emotion_mass = np.zeros((0, len(self.emotions)))
+        self._post_mass = np.zeros(0)
+        self._token_mass = np.zeros(0)
+        self._reference_time = np.zeros(0)
+        self._post_counts = np.zeros(0, dtype=np.int64)
+
+        self._lock = threading.RLock()
+        self._stats = {'texts_processed': 0, 'tokens_processed': 0, 'emotion_hits': 0, 'processing_seconds': 0.0}
+
+    @staticmethod
+    def _team_key(team):
+        """Normalise un nom d'équipe."""
+        return str(team).strip().lower()
+
+    def score_texts(self, texts):
+        """
+        Score un lot de textes contre le lexique compilé.
+
+        Args:
+            texts (list): Textes à analyser
+
+        Returns:
+            tuple: (matrice (n, E) des masses d'émotions, nombre de tokens par texte)
+        """
+        n = len(texts)
+        tokenized = [TOKEN_PATTERN.findall(text.lower()) if text else [] for text in texts]
+        lengths = np.fromiter((len(tokens) for tokens in tokenized), dtype=np.int64, count=n)
+        all_tokens = [token for tokens in tokenized for token in tokens]
+        if not all_tokens:
+            return np.zeros((n, len(self.emotions))), lengths
+
+        vocabulary = self.vocabulary
+        term_ids = np.fromiter((vocabulary.get(token, -1) for token in all_tokens),
+                               dtype=np.int64, count=len(all_tokens))
+        doc_ids = np.repeat(np.arange(n), lengths)
+
+        # Un mot d'émotion précédé d'une négation (dans le même texte) est ignoré
+        negated = np.zeros(len(all_tokens), dtype=bool)
+        is_negation = np.fromiter((token in NEGATIONS for token in all_tokens), dtype=bool, count=len(all_tokens))
+        is_ne_negation = np.fromiter((token in NE_NEGATIONS for token in all_tokens),
+                                     dtype=bool, count=len(all_tokens))
+        if is_ne_negation.any():
+            # « plus » ne nie que s'il suit « ne »/« n'… » à moins de NE_WINDOW mots, dans le même texte
+            is_ne = np.fromiter((token == 'ne' or token.startswith("n'") for token in all_tokens),
+                                dtype=bool, count=len(all_tokens))
+            ne_count = np.concatenate(([0], np.cumsum(is_ne)))
+            positions = np.arange(len(all_tokens))
+            doc_starts = np.repeat(np.cumsum(lengths) - lengths, lengths)
+            window_starts = np.maximum(positions - NE_WINDOW, doc_starts)
+            is_negation |= is_ne_negation & (ne_count[positions] > ne_count[window_starts])
+        negated[1:] = is_negation[:-1] & (doc_ids[1:] == doc_ids[:-1])
+
+        hits = (term_ids >= 0) & ~negated
+        hit_docs = doc_ids[hits]
+        hit_terms = term_ids[hits]
+
+        if SCIPY_AVAILABLE:
+            doc_term = sparse.csr_matrix(
+                (np.ones(len(hit_terms)), (hit_docs, hit_terms)), shape=(n, len(vocabulary))
+            )
+            scores = np.asarray((doc_term @ self._lexicon_sparse).todense())
+        else:
+            scores = _group_sum(hit_docs, self.lexicon_matrix[hit_terms], n)
+        return scores, lengths
+
+    def _rows_for(self, keys):
+        """Renvoie (en créant si besoin) les lignes d'état des clés (équipe, source)."""
+        rows = []
+        for key in keys:
+            row = self._keys.get(key)
+            if row is None:
+                row = self._keys[key] = len(self._keys)
+            rows.append(row)
+
+        missing = len(self._keys) - len(self._post_mass)
+        if missing > 0:
+            self._emotion_mass = np.vstack([self._emotion_mass, np.zeros((missing, len(self.emotions)))])
+            self._post_mass = np.concatenate([self._post_mass, np.zeros(missing)])
+            self._token_mass = np.concatenate([self._token_mass, np.zeros(missing)])
+            self._reference_time = np.concatenate([self._reference_time, np.zeros(missing)])
+            self._post_counts = np.concatenate([self._post_counts, np.zeros(missing, dtype=np.int64)])
+        return np.array(rows, dtype=np.int64)
+
+    def process_batch(self, texts, teams, sources, timestamps):
+        """
+        Score un lot de textes et l'intègre aux distributions glissantes.
+
+        Args:
+            texts (list): Textes
+            teams (list): Équipe de chaque texte
+            sources (list): Source de chaque texte ('social_media', 'news_media'...)
+            timestamps (list): Horodatage epoch de chaque texte
+
+        Returns:
+            int: Nombre de textes intégrés
+        """
+        if not texts:
+            return 0
+        started = time.time()
+        scores, lengths = self.score_texts(texts)
+        timestamps = np.asarray(timestamps, dtype=float)
+
+        with self._lock:
+            pair_keys = list(zip((self._team_key(t) for t in teams), sources))
+            unique_keys = list(dict.fromkeys(pair_keys))
+            key_rows = self._rows_for(unique_keys)
+            local = {key: i for i, key in enumerate(unique_keys)}
+            groups = np.fromiter((local[key] for key in pair_keys), dtype=np.int64, count=len(pair_keys))
+            n_groups = len(unique_keys)
+
+            # Nouvelle référence temporelle par ligne, décroissance de l'état existant
+            latest = np.full(n_groups, -np.inf)
+            np.maximum.at(latest, groups, timestamps)
+            new_reference = np.maximum(self._reference_time[key_rows], latest)
+            decay = np.exp(-self.decay_rate * (new_reference - self._reference_time[key_rows]))
+            decay[self._post_counts[key_rows] == 0] = 0.0
+
+            # Poids de chaque texte ramené à la référence de sa ligne
+            weights = np.exp(-self.decay_rate * (new_reference[groups] - timestamps))
+
+            self._emotion_mass[key_rows] = (self._emotion_mass[key_rows] * decay[:, None]
+                                            + _group_sum(groups, scores * weights[:, None], n_groups))
+            self._post_mass[key_rows] = self._post_mass[key_rows] * decay + _group_sum(groups, weights, n_groups)
+            self._token_mass[key_rows] = (self._token_mass[key_rows] * decay
+                                          + _group_sum(groups, lengths * weights, n_groups))
+            self._reference_time[key_rows] = new_reference
+            self._post_counts[key_rows] += np.bincount(groups, minlength=n_groups)
+
+            self._stats['texts_processed'] += len(texts)
+            self._stats['tokens_processed'] += int(lengths.sum())
+            self._stats['emotion_hits'] += int(np.count_nonzero(scores))
+            self._stats['processing_seconds'] += time.time() - started
+        return len(texts)
+
+    def ingest_records(self, records, default_team=None, default_source='social_media'):
+        """
+        Intègre des enregistrements {'text', 'team' ou 'teams', 'source', 'timestamp'} par lots.
+
+        Args:
+            records (iterable): Enregistrements (dict) ou textes bruts
+            default_team (str, optional): Équipe utilisée si l'enregistrement n'en précise pas
+            default_source (str): Source utilisée si l'enregistrement n'en précise pas
+
+        Returns:
+            int: Nombre de textes intégrés (un texte cité par deux équipes compte deux fois)
+        """
+        now = time.time()
+        texts, teams, sources, timestamps = [], [], [], []
+        processed = 0
+
+        for record in records:
+            if isinstance(record, str):
+                record = {'text': record}
+            text = record.get('text') or record.get('content') or record.get('body') or ''
+            record_teams = record.get('teams') or [record.get('team') or default_team]
+            if isinstance(record_teams, str):
+                record_teams = [record_teams]
+            source = record.get('source') or default_source
+            timestamp = _parse_timestamp(record.get('timestamp') or record.get('date'), now)
+
+            for team in record_teams:
+                if not team or not text:
+                    continue
+                texts.append(text)
+                teams.append(team)
+                sources.append(source)
+                timestamps.append(timestamp)
+
+            if len(texts) >= self.batch_size:
+                processed += self.process_batch(texts, teams, sources, timestamps)
+                texts, teams, sources, timestamps = [], [], [], []
+
+        processed += self.process_batch(texts, teams, sources, timestamps)
+        return processed
+
+    def ingest_jsonl(self, path, default_team=None, default_source='social_media'):
+        """
+        Intègre un fichier JSONL (un enregistrement par ligne).
+
+        Args:
+            path (str): Chemin du fichier
+            default_team (str, optional): Équipe par défaut
+            default_source (str): Source par défaut
+
+        Returns:
+            int: Nombre de textes intégrés
+        """
+        def records():
+            with open(path, 'r', encoding='utf-8') as f:
+                for line_number, line in enumerate(f, 1):
+                    line = line.strip()
+                    if not line:
+                        continue
+                    try:
+                        yield json.loads(line)
+                    except json.JSONDecodeError:
+                        logger.warning(f"Ligne JSON invalide ignorée ({path}:{line_number})")
+
+        return self.ingest_records(records(), default_team, default_source)
+
+    def ingest_text_file(self, path, team, source='forum_discussions', timestamp=None):
+        """
+        Intègre un fichier texte brut (un post par ligne non vide).
+
+        Args:
+            path (str): Chemin du fichier
+            team (str): Équipe concernée
+            source (str): Source des textes
+            timestamp (float, optional): Horodatage (date de modification du fichier par défaut)
+
+        Returns:
+            int: Nombre de textes intégrés
+        """
+        timestamp = timestamp if timestamp is not None else os.path.getmtime(path)
+        with open(path, 'r', encoding='utf-8') as f:
+            records = ({'text': line, 'timestamp': timestamp} for line in f if line.strip())
+            return self.ingest_records(records, team, source)
+
+    def ingest_html_file(self, path, team, source='news_media', timestamp=None):
+        """
+        Intègre un article HTML sauvegardé (texte principal extrait par trafilatura).
+
+        Args:
+            path (str): Chemin du fichier
+            team (str): Équipe concernée
+            source (str): Source du texte
+            timestamp (float, optional): Horodatage (date de modification du fichier par défaut)
+
+        Returns:
+            int: Nombre de textes intégrés
+        """
+        if not TRAFILATURA_AVAILABLE:
+            logger.warning(f"trafilatura non disponible, article ignoré: {path}")
+            return 0
+        with open(path, 'r', encoding='utf-8', errors='ignore') as f:
+            text = trafilatura.extract(f.read())
+        if not text:
+            return 0
+        timestamp = timestamp if timestamp is not None else os.path.getmtime(path)
+        return self.ingest_records([{'text': text, 'timestamp': timestamp}], team, source)
+
+    def ingest_path(self, path, team=None, source=None):
+        """
+        Intègre un fichier ou un répertoire (récursivement) selon l'extension :
+        .jsonl (enregistrements), .txt (un post par ligne), .html/.htm (article).
+        Pour les fichiers .txt et .html sans équipe explicite, le nom du fichier
+        '<équipe>__<source>.txt' est utilisé.
+
+        Args:
+            path (str): Fichier ou répertoire
+            team (str, optional): Équipe par défaut
+            source (str, optional): Source par défaut
+
+        Returns:
+            int: Nombre de textes intégrés
+        """
+        if os.path.isdir(path):
+            total = 0
+            for root, _, files in os.walk(path):
+                for filename in sorted(files):
+                    total += self.ingest_path(os.path.join(root, filename), team, source)
+            return total
+
+        stem, extension = os.path.splitext(os.path.basename(path))
+        extension = extension.lower()
+        file_team, _, file_source = stem.partition('__')
+        try:
+            if extension == '.jsonl':
+                return self.ingest_jsonl(path, team, source or 'social_media')
+            if extension == '.txt':
+                return self.ingest_text_file(path, team or file_team, source or file_source or 'forum_discussions')
+            if extension in ('.html', '.htm'):
+                return self.ingest_html_file(path, team or file_team, source or file_source or 'news_media')
+        except Exception as e:
+            logger.error(f"Erreur lors de l'intégration de {path}: {e}")
+        return 0
+
+    def has_team_data(self, team):
+        """
+        Indique si des textes ont été intégrés pour une équipe.
+
+        Args:
+            team (str): Nom de l'équipe
+
+        Returns:
+            bool: True si au moins une source dispose de données
+        """
+        key = self._team_key(team)
+        with self._lock:
+            return any(team_key == key for team_key, _ in self._keys)
+
+    def get_team_sentiment_data(self, team, now=None):
+        """
+        Renvoie le profil de sentiment courant d'une équipe, par source.
+
+        Args:
+            team (str): Nom de l'équipe
+            now (float, optional): Instant d'évaluation (epoch, maintenant par défaut)
+
+        Returns:
+            dict: {source: {'emotions', 'emotion_distribution', 'primary_emotion',
+                  'secondary_emotion', métriques...}} pour les sources disposant de textes
+        """
+        key = self._team_key(team)
+        now = time.time() if now is None else now
+        with self._lock:
+            rows = {source: row for (team_key, source), row in self._keys.items() if team_key == key}
+            if not rows:
+                return {}
+            row_ids = np.array(list(rows.values()), dtype=np.int64)
+            decay = np.exp(-self.decay_rate * np.maximum(0.0, now - self._reference_time[row_ids]))
+            emotion_mass = self._emotion_mass[row_ids]
+            post_mass = self._post_mass[row_ids]
+            token_mass = self._token_mass[row_ids]
+            post_counts = self._post_counts[row_ids]
+
+        rates = emotion_mass / np.maximum(post_mass, 1e-12)[:, None]
+        scores = 1.0 - np.exp(-EMOTION_SATURATION * rates)
+        hit_mass = emotion_mass.sum(axis=1)
+        positive = emotion_mass[:, self._positive].sum(axis=1)
+        negative = emotion_mass[:, self._negative].sum(axis=1)
+
+        profile = {}
+        for i, source in enumerate(rows):
+            distribution = emotion_mass[i] / hit_mass[i] if hit_mass[i] > 0 else np.zeros(len(self.emotions))
+            order = np.argsort(-distribution)
+            polar = positive[i] + negative[i]
+            measures = {
+                'volume': float(1.0 - math.exp(-post_mass[i] * decay[i] / VOLUME_SCALE)),
+                'sentiment_ratio': float(positive[i] / polar) if polar > 0 else 0.5,
+                'intensity': float(min(1.0, INTENSITY_SCALE * hit_mass[i] / max(token_mass[i], 1e-12)))
+            }
+            source_data = {
+                'emotions': {emotion: float(scores[i, k]) for k, emotion in enumerate(self.emotions)},
+                'emotion_distribution': {emotion: float(distribution[k]) for k, emotion in enumerate(self.emotions)},
+                'post_count': int(post_counts[i]),
+                'data_origin': 'text_corpus'
+            }
+            if hit_mass[i] > 0:
+                source_data['primary_emotion'] = self.emotions[order[0]]
+                source_data['secondary_emotion'] = self.emotions[order[1]]
+            for metric, measure in SOURCE_METRIC_ALIASES.get(source, {}).items():
+                source_data[metric] = measures[measure]
+            profile[source] = source_data
+        return profile
+
+    def get_stats(self):
+        """
+        Récupère des statistiques sur le moteur.
+
+        Returns:
+            dict: Statistiques (textes, tokens, débit, paires équipe/source suivies)
+        """
+        with self._lock:
+            stats = dict(self._stats)
+            stats['tracked_streams'] = len(self._keys)
+        seconds = stats['processing_seconds']
+        stats['texts_per_minute'] = round(stats['texts_processed'] * 60.0 / seconds) if seconds > 0 else 0
+        stats['vocabulary_size'] = len(self.vocabulary)
+        stats['sparse_backend'] = 'scipy' if SCIPY_AVAILABLE else 'numpy'
+        return stats
+
+
+_sentiment_engine = None
+_sentiment_engine_lock = threading.Lock()
+
+
+def get_sentiment_engine():
+    """
+    Renvoie l'instance partagée du moteur de sentiment. À la création, les corpus
+    présents dans data/fan_corpus sont intégrés.
+
+    Returns:
+        SentimentEngine: Moteur partagé par les modules de sentiment
+    """
+    global _sentiment_engine
+    if _sentiment_engine is None:
+        with _sentiment_engine_lock:
+            if _sentiment_engine is None:
+                engine = SentimentEngine()
+                if os.path.isdir(DEFAULT_CORPUS_DIR):
+                    count = engine.ingest_path(DEFAULT_CORPUS_DIR)
+                    logger.info(f"{count} textes de supporters intégrés depuis {DEFAULT_CORPUS_DIR}")
+                _sentiment_engine = engine
+    return _sentiment_engine
@@ -11,6 +11,8 @@ import random  # As fallback
 import time
 import logging
 from .cache_manager import CacheManager
+from .api_broker import get_api_broker, PRIORITY_UPCOMING, PRIORITY_BACKFILL
+from .result_settlement import get_result_settlement
 
 class SportsAPI:
     """
@@ -81,7 +83,9 @@ class SportsAPI:
         
         # Handle football data
         if sport == 'Football':
-            matches = self._get_football_matches(league, date)
+            # Past dates are historical backfill and must not eat into the live/upcoming quota
+            priority = PRIORITY_BACKFILL if date < datetime.now().date() else PRIORITY_UPCOMING
+            matches = self._get_football_matches(league, date, priority)
             
             # Cache the results
             if matches:
@@ -93,8 +97,8 @@ class SportsAPI:
         # For other sports, return None to use fallback data
         return None
         
-    def _get_football_matches(self, league, date):
-        """Get football matches for a specific league and date"""
+    def _get_football_matches(self, league, date, priority=PRIORITY_UPCOMING):
+        """Get football matches for a specific league and date through the API broker"""
         # Format date
         date_str = date.strftime('%Y-%m-%d')
         
@@ -119,12 +123,12 @@ class SportsAPI:
             
             try:
                 # Make the API request
-                response = requests.get(league_endpoint, params=params, headers=headers)
+                data = get_api_broker().get_json('football-data', league_endpoint, params=params,
+                                                 headers=headers, priority=priority,
+                                                 ttl=self.cache_duration)
                 
                 # Check if request was successful
-                if response.status_code == 200:
-                    data = response.json()
-                    
+                if data is not None:
                     # Process the matches
                     for match in data.get('matches', []):
                         match_dict = self._process_match_data(match, league)
@@ -134,8 +138,7 @@ class SportsAPI:
                         return league_matches
                     
                 else:
-                    print(f"League API request failed with status code: {response.status_code}")
-                    print(f"Response: {response.text}")
+                    print("League API request failed or quota exhausted")
                     
             except Exception as e:
                 print(f"Error fetching league-specific football matches: {e}")
@@ -152,11 +155,12 @@ class SportsAPI:
             }
             
             # Make the API request
-            response = requests.get(all_matches_endpoint, params=params, headers=headers)
+            data = get_api_broker().get_json('football-data', all_matches_endpoint, params=params,
+                                             headers=headers, priority=priority,
+                                             ttl=self.cache_duration)
             
             # Check if request was successful
-            if response.status_code == 200:
-                data = response.json()
+            if data is not None:
                 all_matches = []
                 
                 # Process all matches, filtering for the requested league
@@ -172,8 +176,7 @@ class SportsAPI:
                     return all_matches
                 
             else:
-                print(f"All matches API request failed with status code: {response.status_code}")
-                print(f"Response: {response.text}")
+                print("All matches API request failed or quota exhausted")
                 
         except Exception as e:
             print(f"Error fetching all football matches: {e}")
@@ -207,6 +210,13 @@ class SportsAPI:
             full_time = score.get('fullTime', {})
             match_dict['home_score'] = full_time.get('home')
             match_dict['away_score'] = full_time.get('away')
+            
+            # Règlement différé des prédictions portant sur ce match
+            if match_dict['home_score'] is not None and match_dict['away_score'] is not None:
+                try:
+                    get_result_settlement().submit(match_dict)
+                except Exception as e:
+                    self.logger.error(f"Error submitting result for settlement: {e}")
         
         # Add some randomly generated odds (since the API doesn't provide them)
         match_dict['home_odds'] = round(random.uniform(1.5, 4.0), 2)
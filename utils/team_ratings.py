@@ -0,0 +1,709 @@
+"""
+TeamRatingEngine - Classements Elo/Glicko des équipes calculés localement pour ArcanShadow
+Ce module rejoue une seule fois l'archive openfootball (data/football/<saison>/<code>.json)
+pour initialiser les classements, puis met à jour chaque équipe en O(1) à chaque nouveau
+résultat. La trajectoire de chaque équipe est conservée dans des tableaux compacts
+(array) triés par date : le classement d'avant-match à n'importe quelle date s'obtient
+par recherche dichotomique, sans appel réseau (ClubElo).
+"""
+
+import json
+import logging
+import math
+import os
+import re
+import threading
+import unicodedata
+from array import array
+from bisect import bisect_left
+from datetime import date, datetime
+
+# Configuration du logger
+logging.basicConfig(
+    level=logging.INFO,
+    format='%(asctime)s - %(name)s - %(levelname)s - %(message)s'
+)
+logger = logging.getLogger('team_ratings')
+
+DEFAULT_DATA_DIR = os.path.join("data", "football")
+
+# Paramètres Glicko : écart initial, écart minimal et inflation par jour d'inactivité
+GLICKO_Q = math.log(10) / 400
+INITIAL_RD = 350.0
+MIN_RD = 40.0
+RD_DAILY_INFLATION = 2.5
+
+# Mots ignorés lors de la normalisation des noms d'équipes
+TEAM_NAME_NOISE = {
+    'fc', 'afc', 'cf', 'sc', 'ac', 'as', 'ssc', 'sv', 'fk', 'cd', 'ud', 'rc', 'sd', 'ca',
+    'club', 'de', 'del', 'la', 'le', 'du', 'of', 'the', 'calcio', 'football', 'futbol',
+    '1', '1.', 'vfb', 'vfl', 'tsv', 'bv', 'bsc', 'sk', 'nk', 'if', 'bk', 'ec', 'se', 'cr'
+}
+
+# Noms usuels ou variantes de l'archive ramenés à une même équipe (clés normalisées)
+TEAM_NAME_ALIASES = {
+    'psg': 'paris saint germain',
+    'bayern munich': 'bayern munchen',
+    'inter': 'internazionale milano',
+    'inter milan': 'internazionale milano',
+    'man city': 'manchester city',
+    'man united': 'manchester united',
+    'spurs': 'tottenham hotspur'
+}
+
+
+def normalize_team_name(name):
+    """
+    Normalise un nom d'équipe (accents, casse, ponctuation, préfixes de club).
+
+    Args:
+        name (str): Nom de l'équipe
+
+    Returns:
+        str: Clé normalisée ('' si le nom est vide)
+    """
+    if not name:
+        return ''
+    text = unicodedata.normalize('NFKD', str(name))
+    text = ''.join(c for c in text if not unicodedata.combining(c)).lower()
+    tokens = [t for t in re.split(r'[^a-z0-9]+', text) if t and t not in TEAM_NAME_NOISE]
+    return ' '.join(tokens)
+
+
+def _to_ordinal(value):
+    """Convertit une date (date, datetime, chaîne ISO ou None) en ordinal."""
+    if value is None:
+        return None
+    if isinstance(value, datetime):
+        return value.date().toordinal()
+    if isinstance(value, date):
+        return value.toordinal()
+    return datetime.fromisoformat(str(value)[:10]).date().toordinal()
+
+
+def _league_tier(league_code):
+    """Niveau d'un championnat d'après son code openfootball ('en.2' -> 2)."""
+    match = re.search(r'\.(\d+)$', league_code or '')
+    return int(match.group(1)) if match else 1
+
+
+class _TeamTrack:
+    """
+    Trajectoire compacte d'une équipe : une entrée par match joué, triée par date.
+    Les classements stockés sont ceux d'après-match.
+    """
+    __slots__ = ('name', 'initial_elo', 'days', 'elo', 'rd', 'goals_for', 'goals_against',
+                 'opponents', 'home')
+
+    def __init__(self, name, initial_elo):
+        self.name = name
+        self.initial_elo = initial_elo
+        self.days = array('i')
+        self.elo = array('f')
+        self.rd = array('f')
+        self.goals_for = array('B')
+        self.goals_against = array('B')
+        self.opponents = array('I')
+        self.home = array('b')
+
+    def current(self):
+        """Classement courant (elo, rd, dernier jour joué)."""
+        if not self.days:
+            return self.initial_elo, INITIAL_RD, None
+        return self.elo[-1], self.rd[-1], self.days[-1]
+
+    def before(self, ordinal):
+        """Index du premier match joué à la date donnée ou après (recherche dichotomique)."""
+        return len(self.days) if ordinal is None else bisect_left(self.days, ordinal)
+
+
+class TeamRatingEngine:
+    """
+    Moteur de classement Elo/Glicko des équipes alimenté par les résultats de matchs.
+    Chaque résultat met à jour les deux équipes en temps constant ; les trajectoires
+    permettent de retrouver le classement d'avant-match à n'importe quelle date.
+    """
+    def __init__(self, data_dir=DEFAULT_DATA_DIR, base_rating=1500.0, k_factor=20.0,
+                 home_advantage=65.0, tier_gap=100.0):
+        """
+        Initialise le moteur de classement.
+
+        Args:
+            data_dir (str): Répertoire de l'archive openfootball
+            base_rating (float): Classement initial d'une équipe de premier niveau
+            k_factor (float): Facteur K de la mise à jour Elo
+            home_advantage (float): Avantage du terrain en points Elo
+            tier_gap (float): Écart de classement initial entre deux niveaux de championnat
+        """
+        self.data_dir = data_dir
+        self.base_rating = base_rating
+        self.k_factor = k_factor
+        self.home_advantage = home_advantage
+        self.tier_gap = tier_gap
+
+        self._tracks = []
+        self._team_ids = {}
+        self._raw_ids = {}
+        self._resolve_cache = {}
+        self._seen_matches = set()
+        self._lock = threading.RLock()
+        self._listeners = []
+        self._stats = {'results': 0, 'duplicates': 0, 'out_of_order': 0, 'files': 0}
+
+    # ------------------------------------------------------------------
+    # Équipes
+    # ------------------------------------------------------------------
+    def _team_id(self, name, tier=1):
+        """Renvoie l'identifiant d'une équipe, en la créant si nécessaire."""
+        team_id = self._raw_ids.get(name)
+        if team_id is not None:
+            return team_id
+        key = normalize_team_name(name)
+        key = TEAM_NAME_ALIASES.get(key, key)
+        team_id = self._team_ids.get(key)
+        if team_id is None:
+            team_id = len(self._tracks)
+            self._team_ids[key] = team_id
+            self._tracks.append(_TeamTrack(name, self.base_rating - self.tier_gap * (tier - 1)))
+            self._resolve_cache.clear()
+        self._raw_ids[name] = team_id
+        return team_id
+
+    def resolve_team(self, name):
+        """
+        Retrouve l'équipe correspondant à un nom (exact normalisé, puis par mots communs).
+
+        Args:
+            name (str): Nom de l'équipe tel qu'utilisé par l'application
+
+        Returns:
+            int: Identifiant de l'équipe ou None si elle est inconnue ou ambiguë
+        """
+        key = normalize_team_name(name)
+        key = TEAM_NAME_ALIASES.get(key, key)
+        if not key:
+            return None
+        with self._lock:
+            if key in self._team_ids:
+                return self._team_ids[key]
+            if key in self._resolve_cache:
+                return self._resolve_cache[key]
+
+            tokens = set(key.split())
+            candidates = [
+                team_id for team_key, team_id in self._team_ids.items()
+                if tokens <= set(team_key.split()) or set(team_key.split()) <= tokens
+            ]
+            # En cas d'ambiguïté, retenir l'équipe ayant joué le plus de matchs
+            team_id = None
+            if candidates:
+                ranked = sorted(candidates, key=lambda c: len(self._tracks[c].days), reverse=True)
+                if len(ranked) == 1 or len(self._tracks[ranked[0]].days) > 2 * len(self._tracks[ranked[1]].days):
+                    team_id = ranked[0]
+            self._resolve_cache[key] = team_id
+            return team_id
+
+    # ------------------------------------------------------------------
+    # Mises à jour
+    # ------------------------------------------------------------------
+    @staticmethod
+    def _inflate_rd(rd, last_day, day):
+        """Augmente l'écart Glicko selon la durée d'inactivité."""
+        if last_day is None:
+            return rd
+        idle = max(0, day - last_day)
+        return min(INITIAL_RD, math.sqrt(rd * rd + RD_DAILY_INFLATION ** 2 * idle))
+
+    @staticmethod
+    def _glicko_update(rating, rd, opponent_rating, opponent_rd, score):
+        """Mise à jour Glicko-1 d'une équipe pour un match."""
+        g = 1.0 / math.sqrt(1.0 + 3.0 * GLICKO_Q ** 2 * opponent_rd ** 2 / math.pi ** 2)
+        expected = 1.0 / (1.0 + 10 ** (-g * (rating - opponent_rating) / 400.0))
+        d_squared = 1.0 / (GLICKO_Q ** 2 * g ** 2 * expected * (1.0 - expected))
+        new_rd = math.sqrt(1.0 / (1.0 / (rd * rd) + 1.0 / d_squared))
+        return max(MIN_RD, new_rd)
+
+    def expected_score(self, home_elo, away_elo, neutral=False):
+        """
+        Espérance de résultat de l'équipe à domicile (1 victoire, 0.5 nul).
+
+        Args:
+            home_elo (float): Classement de l'équipe à domicile
+            away_elo (float): Classement de l'équipe à l'extérieur
+            neutral (bool): Terrain neutre (pas d'avantage du terrain)
+
+        Returns:
+            float: Espérance entre 0 et 1
+        """
+        advantage = 0.0 if neutral else self.home_advantage
+        return 1.0 / (1.0 + 10 ** ((away_elo - home_elo - advantage) / 400.0))
+
+    def add_result(self, home_team, away_team, home_goals, away_goals, match_date, tier=1, neutral=False):
+        """
+        Intègre un résultat et met à jour les classements des deux équipes en O(1).
+
+        Args:
+            home_team (str): Équipe à domicile
+            away_team (str): Équipe à l'extérieur
+            home_goals (int): Buts de l'équipe à domicile
+            away_goals (int): Buts de l'équipe à l'extérieur
+            match_date (date|datetime|str): Date du match
+            tier (int): Niveau du championnat (classement initial des nouvelles équipes)
+            neutral (bool): Match sur terrain neutre
+
+        Returns:
+            dict: Classements d'après-match ou None si le résultat est ignoré
+        """
+        day = _to_ordinal(match_date)
+        home_goals, away_goals = int(home_goals), int(away_goals)
+
+        with self._lock:
+            home_id = self._team_id(home_team, tier)
+            away_id = self._team_id(away_team, tier)
+            if home_id == away_id:
+                return None
+
+            match_key = (day, home_id, away_id)
+            if match_key in self._seen_matches:
+                self._stats['duplicates'] += 1
+                return None
+
+            home_track, away_track = self._tracks[home_id], self._tracks[away_id]
+            home_elo, home_rd, home_last = home_track.current()
+            away_elo, away_rd, away_last = away_track.current()
+            if (home_last is not None and day < home_last) or (away_last is not None and day < away_last):
+                # Les trajectoires sont triées : un résultat antérieur ne peut pas être rejoué
+                self._stats['out_of_order'] += 1
+                logger.warning(f"Résultat ignoré (antérieur au dernier match connu): {home_team} - {away_team} {match_date}")
+                return None
+            self._seen_matches.add(match_key)
+
+            home_rd = self._inflate_rd(home_rd, home_last, day)
+            away_rd = self._inflate_rd(away_rd, away_last, day)
+
+            # Elo avec multiplicateur d'écart de buts
+            score = 1.0 if home_goals > away_goals else 0.5 if home_goals == away_goals else 0.0
+            expected = self.expected_score(home_elo, away_elo, neutral)
+            goal_diff = abs(home_goals - away_goals)
+            multiplier = 1.0 if goal_diff <= 1 else 1.5 if goal_diff == 2 else (11.0 + goal_diff) / 8.0
+            delta = self.k_factor * multiplier * (score - expected)
+
+            # L'incertitude Glicko accélère l'ajustement des équipes peu connues
+            home_weight = 1.0 + (home_rd - MIN_RD) / INITIAL_RD
+            away_weight = 1.0 + (away_rd - MIN_RD) / INITIAL_RD
+            advantage = 0.0 if neutral else self.home_advantage
+            new_home_rd = self._glicko_update(home_elo + advantage, home_rd, away_elo, away_rd, score)
+            new_away_rd = self._glicko_update(away_elo, away_rd, home_elo + advantage, home_rd, 1.0 - score)
+            new_home_elo = home_elo + delta * home_weight
+            new_away_elo = away_elo - delta * away_weight
+
+            for track, elo, rd, gf, ga, opponent, is_home in (
+                (home_track, new_home_elo, new_home_rd, home_goals, away_goals, away_id, 1),
+                (away_track, new_away_elo, new_away_rd, away_goals, home_goals, home_id, 0)
+            ):
+                track.days.append(day)
+                track.elo.append(elo)
+                track.rd.append(rd)
+                track.goals_for.append(min(gf, 255))
+                track.goals_against.append(min(ga, 255))
+                track.opponents.append(opponent)
+                track.home.append(is_home)
+
+            self._stats['results'] += 1
+            listeners = list(self._listeners)
+            update = {
+                'home': {'team': home_track.name, 'elo': round(new_home_elo, 1), 'rd': round(new_home_rd, 1)},
+                'away': {'team': away_track.name, 'elo': round(new_away_elo, 1), 'rd': round(new_away_rd, 1)},
+                'home_expected': round(expected, 4)
+            }
+
+        # Notifier hors verrou : les abonnés (caches dérivés) peuvent relire le moteur
+        for callback in listeners:
+            try:
+                callback(home_track.name, away_track.name, home_goals, away_goals, day)
+            except Exception as e:
+                logger.error(f"Erreur dans un abonné aux résultats: {e}")
+        return update
+
+    def subscribe(self, callback):
+        """
+        Abonne une fonction aux nouveaux résultats intégrés.
+
+        Args:
+            callback (callable): Appelée avec (home, away, home_goals, away_goals, jour ordinal)
+        """
+        with self._lock:
+            if callback not in self._listeners:
+                self._listeners.append(callback)
+
+    def unsubscribe(self, callback):
+        """
+        Désabonne une fonction des nouveaux résultats.
+
+        Args:
+            callback (callable): Fonction précédemment abonnée
+        """
+        with self._lock:
+            if callback in self._listeners:
+                self._listeners.remove(callback)
+
+    def load_archive(self, data_dir=None):
+        """
+        Rejoue l'archive openfootball dans l'ordre chronologique.
+
+        Args:
+            data_dir (str, optional): Répertoire de l'archive (celui du moteur par défaut)
+
+        Returns:
+            int: Nombre de résultats intégrés
+        """
+        data_dir = data_dir or self.data_dir
+        if not os.path.isdir(data_dir):
+            logger.warning(f"Archive de résultats introuvable: {data_dir}")
+            return 0
+
+        fixtures = []
+        for season in sorted(os.listdir(data_dir)):
+            season_dir = os.path.join(data_dir, season)
+            if not os.path.isdir(season_dir):
+                continue
+            for filename in sorted(os.listdir(season_dir)):
+                if not filename.endswith('.json'):
+                    continue
+                try:
+                    with open(os.path.join(season_dir, filename), 'r', encoding='utf-8') as f:
+                        league = json.load(f)
+                except (OSError, ValueError) as e:
+                    logger.warning(f"Fichier ignoré {season}/{filename}: {e}")
+                    continue
+                tier = _league_tier(filename[:-len('.json')])
+                self._stats['files'] += 1
+                for match in league.get('matches', []):
+                    full_time = (match.get('score') or {}).get('ft')
+                    if not full_time or not match.get('date'):
+                        continue
+                    fixtures.append((match['date'], match.get('time', ''), match['team1'], match['team2'],
+                                     full_time[0], full_time[1], tier))
+
+        fixtures.sort(key=lambda fixture: (fixture[0], fixture[1]))
+        integrated = 0
+        for match_date, _, home_team, away_team, home_goals, away_goals, tier in fixtures:
+            if self.add_result(home_team, away_team, home_goals, away_goals, match_date, tier) is not None:
+                integrated += 1
+
+        logger.info(f"Archive {data_dir}: {integrated} résultats intégrés pour {len(self._tracks)} équipes")
+        return integrated
+
+    # ------------------------------------------------------------------
+    # Lectures
+    # ------------------------------------------------------------------
+    def _track(self, team):
+        """Renvoie la trajectoire d'une équipe (nom ou identifiant) ou None."""
+        team_id = team if isinstance(team, int) else self.resolve_team(team)
+        return None if team_id is None else self._tracks[team_id]
+
+    def get_rating(self, team, match_date=None):
+        """
+        Classement d'avant-match d'une équipe à une date donnée.
+
+        Args:
+            team (str): Nom de l'équipe
+            match_date (date|datetime|str, optional): Date du match (dernier classement si None)
+
+        Returns:
+            dict: Classement (elo, rd, force, matchs joués) ou None si l'équipe est inconnue
+        """
+        with self._lock:
+            track = self._track(team)
+            if track is None:
+                return None
+            day = _to_ordinal(match_date)
+            index = track.before(day)
+            if index == 0:
+                elo, rd, last_day = track.initial_elo, INITIAL_RD, None
+            else:
+                elo, rd, last_day = track.elo[index - 1], track.rd[index - 1], track.days[index - 1]
+                if day is not None:
+                    rd = self._inflate_rd(rd, last_day, day)
+            return {
+                'team': track.name,
+                'elo': round(float(elo), 1),
+                'rd': round(float(rd), 1),
+                'strength': round(self.strength(elo), 4),
+                'games': index,
+                'last_match': date.fromordinal(last_day).isoformat() if last_day else None
+            }
+
+    def strength(self, elo):
+        """
+        Force d'une équipe entre 0 et 1 (espérance face à une équipe de référence).
+
+        Args:
+            elo (float): Classement Elo
+
+        Returns:
+            float: Force normalisée
+        """
+        return 1.0 / (1.0 + 10 ** ((self.base_rating - elo) / 400.0))
+
+    def get_recent_results(self, team, match_date=None, limit=5):
+        """
+        Derniers résultats d'une équipe avant une date.
+
+        Args:
+            team (str): Nom de l'équipe
+            match_date (date|datetime|str, optional): Date de référence
+            limit (int): Nombre de résultats
+
+        Returns:
+            list: Résultats du plus ancien au plus récent
+        """
+        with self._lock:
+            track = self._track(team)
+            if track is None:
+                return []
+            end = track.before(_to_ordinal(match_date))
+            results = []
+            for i in range(max(0, end - limit), end):
+                goals_for, goals_against = track.goals_for[i], track.goals_against[i]
+                results.append({
+                    'date': date.fromordinal(track.days[i]).isoformat(),
+                    'opponent': self._tracks[track.opponents[i]].name,
+                    'venue': 'home' if track.home[i] else 'away',
+                    'goals_for': goals_for,
+                    'goals_against': goals_against,
+                    'result': 'W' if goals_for > goals_against else 'D' if goals_for == goals_against else 'L'
+                })
+            return results
+
+    def get_form(self, team, match_date=None, limit=5):
+        """
+        Forme d'une équipe : points des derniers matchs normalisés (1 victoire, 0.5 nul, 0 défaite).
+
+        Args:
+            team (str): Nom de l'équipe
+            match_date (date|datetime|str, optional): Date de référence
+            limit (int): Nombre de matchs
+
+        Returns:
+            list: Valeurs entre 0 et 1 du plus ancien au plus récent
+        """
+        points = {'W': 1.0, 'D': 0.5, 'L': 0.0}
+        return [points[r['result']] for r in self.get_recent_results(team, match_date, limit)]
+
+    def get_trajectory(self, team, start=None, end=None):
+        """
+        Trajectoire du classement d'une équipe entre deux dates.
+
+        Args:
+            team (str): Nom de l'équipe
+            start (date|datetime|str, optional): Début (inclus)
+            end (date|datetime|str, optional): Fin (exclue)
+
+        Returns:
+            list: Points (date, elo, rd) d'après-match
+        """
+        with self._lock:
+            track = self._track(team)
+            if track is None:
+                return []
+            first = 0 if start is None else track.before(_to_ordinal(start))
+            last = track.before(_to_ordinal(end))
+            return [
+                {'date': date.fromordinal(track.days[i]).isoformat(),
+                 'elo': round(float(track.elo[i]), 1),
+                 'rd': round(float(track.rd[i]), 1)}
+                for i in range(first, last)
+            ]
+
+    def get_match_context(self, home_team, away_team, match_date=None, form_length=5, goals_window=10):
+        """
+        Contexte d'avant-match calculé depuis les résultats : classements, espérance,
+        forme, moyennes de buts et confrontations directes.
+
+        Args:
+            home_team (str): Équipe à domicile
+            away_team (str): Équipe à l'extérieur
+            match_date (date|datetime|str, optional): Date du match
+            form_length (int): Nombre de matchs pour la forme
+            goals_window (int): Nombre de matchs pour les moyennes de buts
+
+        Returns:
+            dict: Contexte du match ou None si une des équipes est inconnue
+        """
+        with self._lock:
+            home_rating = self.get_rating(home_team, match_date)
+            away_rating = self.get_rating(away_team, match_date)
+            if home_rating is None or away_rating is None:
+                return None
+
+            context = {
+                'home_elo': home_rating['elo'],
+                'away_elo': away_rating['elo'],
+                'elo_diff': round(home_rating['elo'] - away_rating['elo'], 1),
+                'home_rd': home_rating['rd'],
+                'away_rd': away_rating['rd'],
+                'home_strength': home_rating['strength'],
+                'away_strength': away_rating['strength'],
+                'home_expected': round(self.expected_score(home_rating['elo'], away_rating['elo']), 4),
+                'home_form': self.get_form(home_team, match_date, form_length),
+                'away_form': self.get_form(away_team, match_date, form_length)
+            }
+
+            for side, team in (('home', home_team), ('away', away_team)):
+                recent = self.get_recent_results(team, match_date, goals_window)
+                if recent:
+                    context[f'{side}_goals_per_match'] = round(sum(r['goals_for'] for r in recent) / len(recent), 3)
+                    context[f'{side}_goals_conceded_per_match'] = round(
+                        sum(r['goals_against'] for r in recent) / len(recent), 3)
+
+            # Confrontations directes, du point de vue de l'équipe à domicile
+            home_track, away_id = self._track(home_team), self.resolve_team(away_team)
+            end = home_track.before(_to_ordinal(match_date))
+            wins = draws = losses = 0
+            for i in range(end):
+                if home_track.opponents[i] != away_id:
+                    continue
+                if home_track.goals_for[i] > home_track.goals_against[i]:
+                    wins += 1
+                elif home_track.goals_for[i] == home_track.goals_against[i]:
+                    draws += 1
+                else:
+                    losses += 1
+            context.update({'h2h_home_wins': wins, 'h2h_draws': draws, 'h2h_away_wins': losses})
+            return context
+
+    def get_result_sequences(self, limit=None):
+        """
+        Séquences de résultats de toutes les équipes, du plus ancien au plus récent.
+
+        Args:
+            limit (int, optional): Nombre maximal de derniers résultats par équipe
+
+        Returns:
+            dict: Nom d'équipe -> liste de (jour ordinal, adversaire, buts pour, buts contre)
+        """
+        sequences = {}
+        with self._lock:
+            for track in self._tracks:
+                start = 0 if limit is None else max(0, len(track.days) - limit)
+                sequences[track.name] = [
+                    (track.days[i], self._tracks[track.opponents[i]].name,
+                     track.goals_for[i], track.goals_against[i])
+                    for i in range(start, len(track.days))
+                ]
+        return sequences
+
+    def get_home_results(self):
+        """
+        Résultats à domicile de toutes les équipes, du plus ancien au plus récent.
+
+        Returns:
+            dict: Nom d'équipe -> liste de (jour ordinal, adversaire, buts pour, buts contre)
+        """
+        results = {}
+        with self._lock:
+            for track in self._tracks:
+                results[track.name] = [
+                    (track.days[i], self._tracks[track.opponents[i]].name,
+                     track.goals_for[i], track.goals_against[i])
+                    for i in range(len(track.days)) if track.home[i]
+                ]
+        return results
+
+    def get_head_to_head(self, team1, team2, match_date=None, limit=20):
+        """
+        Confrontations directes entre deux équipes avant une date.
+
+        Args:
+            team1 (str): Première équipe
+            team2 (str): Deuxième équipe
+            match_date (date|datetime|str, optional): Date de référence
+            limit (int): Nombre maximal de confrontations
+
+        Returns:
+            list: Confrontations du plus ancien au plus récent (date, home_team, away_team,
+                home_goals, away_goals)
+        """
+        with self._lock:
+            track, opponent_id = self._track(team1), self.resolve_team(team2)
+            if track is None or opponent_id is None:
+                return []
+            opponent = self._tracks[opponent_id].name
+            meetings = []
+            for i in range(track.before(_to_ordinal(match_date))):
+                if track.opponents[i] != opponent_id:
+                    continue
+                is_home = bool(track.home[i])
+                meetings.append({
+                    'date': date.fromordinal(track.days[i]).isoformat(),
+                    'home_team': track.name if is_home else opponent,
+                    'away_team': opponent if is_home else track.name,
+                    'home_goals': track.goals_for[i] if is_home else track.goals_against[i],
+                    'away_goals': track.goals_against[i] if is_home else track.goals_for[i]
+                })
+            return meetings[-limit:]
+
+    def get_season_series(self, min_seasons=1, min_matches=10):
+        """
+        Points par match de chaque équipe, saison par saison (saison commençant en juillet).
+
+        Args:
+            min_seasons (int): Nombre minimal de saisons retenues par équipe
+            min_matches (int): Nombre minimal de matchs pour retenir une saison
+
+        Returns:
+            dict: Nom d'équipe -> (années de début de saison, points par match normalisés 0-1)
+        """
+        series = {}
+        with self._lock:
+            for track in self._tracks:
+                points = {}
+                for i in range(len(track.days)):
+                    day = date.fromordinal(track.days[i])
+                    season = day.year if day.month >= 7 else day.year - 1
+                    goals_for, goals_against = track.goals_for[i], track.goals_against[i]
+                    earned = 3 if goals_for > goals_against else 1 if goals_for == goals_against else 0
+                    total, played = points.get(season, (0, 0))
+                    points[season] = (total + earned, played + 1)
+                seasons = sorted(season for season, (_, played) in points.items() if played >= min_matches)
+                if len(seasons) >= min_seasons:
+                    series[track.name] = (seasons, [points[season][0] / (3.0 * points[season][1])
+                                                    for season in seasons])
+        return series
+
+    def get_stats(self):
+        """
+        Statistiques du moteur de classement.
+
+        Returns:
+            dict: Nombre d'équipes, de résultats et de résultats ignorés
+        """
+        with self._lock:
+            return {
+                **self._stats,
+                'teams': len(self._tracks),
+                'stored_points': sum(len(track.days) for track in self._tracks)
+            }
+
+
+_team_rating_engine = None
+_team_rating_engine_lock = threading.Lock()
+
+
+def get_team_rating_engine():
+    """
+    Renvoie l'instance partagée du moteur de classement, initialisée depuis l'archive
+    openfootball au premier appel.
+
+    Returns:
+        TeamRatingEngine: Moteur de classement partagé
+    """
+    global _team_rating_engine
+    if _team_rating_engine is None:
+        with _team_rating_engine_lock:
+            if _team_rating_engine is None:
+                engine = TeamRatingEngine()
+                engine.load_archive()
+                _team_rating_engine = engine
+    return _team_rating_engine
@@ -0,0 +1,521 @@
+"""
+VenueProfileStore - Profils de stades et rivalités précalculés pour ArcanShadow
+Ce module construit une seule fois, à partir de l'archive de résultats et de l'index des
+équipes du moteur de classement, une base résidente en mémoire partagée entre modules :
+bilans à domicile par stade et par saison, paires de derbies dans un ensemble haché et
+taux de remplissage a priori. L'archive ne contient pas de stades : un stade est identifié
+par son équipe résidente, et les noms de stades connus ou déjà rencontrés y sont rattachés.
+Les analyses de stade (StadiumSpirit, CrowdPressureIndex, ClutchTimeScanner) deviennent de
+simples lectures au lieu d'être recalculées à chaque match et à chaque minute en direct.
+"""
+
+import logging
+import threading
+from collections import OrderedDict
+from datetime import date
+
+from utils.team_ratings import normalize_team_name
+
+# Configuration du logger
+logging.basicConfig(
+    level=logging.INFO,
+    format='%(asctime)s - %(name)s - %(levelname)s - %(message)s'
+)
+logger = logging.getLogger('venue_profiles')
+
+# Derbies reconnus même lorsque les noms ne partagent aucune ville
+KNOWN_DERBIES = [
+    ('Manchester United', 'Manchester City'),
+    ('Liverpool', 'Everton'),
+    ('Arsenal', 'Tottenham'),
+    ('AC Milan', 'Inter Milan'),
+    ('Real Madrid', 'Atletico Madrid'),
+    ('Barcelona', 'Espanyol'),
+    ('Boca Juniors', 'River Plate'),
+    ('Roma', 'Lazio'),
+    ('Celtic', 'Rangers'),
+    ('Sevilla', 'Real Betis'),
+    ('Benfica', 'Sporting CP'),
+    ('Galatasaray', 'Fenerbahce')
+]
+
+# Stades connus rattachés à leur équipe résidente (clés normalisées)
+KNOWN_STADIUMS = {
+    'anfield': 'Liverpool',
+    'old trafford': 'Manchester United',
+    'etihad stadium': 'Manchester City',
+    'emirates stadium': 'Arsenal',
+    'stamford bridge': 'Chelsea',
+    'tottenham hotspur stadium': 'Tottenham Hotspur',
+    'goodison park': 'Everton',
+    'parc des princes': 'Paris Saint-Germain',
+    'santiago bernabeu': 'Real Madrid',
+    'camp nou': 'Barcelona',
+    'allianz arena': 'Bayern München',
+    'signal iduna park': 'Borussia Dortmund',
+    'allianz stadium': 'Juventus',
+    'johan cruijff arena': 'Ajax'
+}
+
+# Mots trop courants pour signaler une ville commune : types de club, pays, régions,
+# points cardinaux et noms de clubs portés dans plusieurs villes
+GENERIC_NAME_TOKENS = {
+    'real', 'united', 'city', 'town', 'athletic', 'atletico', 'sporting', 'racing', 'borussia',
+    'olympique', 'olympic', 'dynamo', 'dinamo', 'union', 'royal', 'stade', 'deportivo', 'club',
+    'county', 'rovers', 'wanderers', 'albion', 'hotspur', 'young', 'boys', 'sport', 'esporte',
+    'clube', 'nacional', 'internacional', 'universidad', 'inter', 'saint', 'sankt', 'foot',
+    'juniors', 'central', 'victory', 'victoria', 'viktoria', 'fortuna', 'eintracht', 'kickers',
+    'wacker', 'virtus', 'vitoria', 'martin', 'sparta', 'slavia', 'bohemians', 'rapid', 'spartak',
+    'lokomotiv', 'torpedo', 'hapoel', 'maccabi', 'beitar', 'belediyespor',
+    'austria', 'west', 'western', 'north', 'northern', 'south', 'southern', 'east', 'eastern'
+}
+
+# Pondérations a priori (en matchs fictifs) pour lisser les petits échantillons
+HOME_RATE_PRIOR_WEIGHT = 10
+ATTENDANCE_PRIOR_WEIGHT = 5
+
+# Nombre maximal de valeurs dérivées conservées par espace de noms (les plus anciennes sont évincées)
+MAX_SHARED_ENTRIES = 1024
+
+# Calendrier des saisons : une saison commence en juillet
+SEASON_START_MONTH = 7
+
+
+def _season(day):
+    """Année de début de saison d'un jour ordinal."""
+    played = date.fromordinal(day)
+    return played.year if played.month >= SEASON_START_MONTH else played.year - 1
+
+
+def _share_city(name1, name2):
+    """Deux noms normalisés partagent-ils un mot de ville significatif (hors années de fondation) ?"""
+    tokens1 = {t for t in name1.split() if len(t) > 3 and not t.isdigit() and t not in GENERIC_NAME_TOKENS}
+    tokens2 = {t for t in name2.split() if len(t) > 3 and not t.isdigit() and t not in GENERIC_NAME_TOKENS}
+    return bool(tokens1 & tokens2)
+
+
+class VenueProfileStore:
+    """
+    Base résidente des profils de stades : bilans à domicile par stade et saison,
+    ensemble haché des derbies et taux de remplissage a priori, maintenus à jour
+    à chaque nouveau résultat du moteur de classement.
+    """
+
+    def __init__(self, rating_engine=None, max_shared_entries=MAX_SHARED_ENTRIES):
+        """
+        Initialise la base (construite au premier accès).
+
+        Args:
+            rating_engine (TeamRatingEngine, optional): Source des résultats (moteur partagé par défaut)
+            max_shared_entries (int): Taille maximale de chaque espace de noms de `cached`
+        """
+        self._rating_engine = rating_engine
+        self.max_shared_entries = max_shared_entries
+        self._seasons = {}
+        self._home_results = {}
+        self._derbies = set()
+        self._pair_cache = {}
+        self._key_cache = {}
+        self._stadiums = {}
+        self._attendance = {}
+        self._attendance_seen = set()
+        self._profiles = {}
+        self._shared = {}
+        self._league_home_rates = (0.45, 0.27, 0.28)
+        self._built = False
+        self._lock = threading.RLock()
+
+    @property
+    def rating_engine(self):
+        """Moteur de classement servant d'index des équipes."""
+        if self._rating_engine is None:
+            from utils.team_ratings import get_team_rating_engine
+            self._rating_engine = get_team_rating_engine()
+        return self._rating_engine
+
+    def build(self):
+        """Construit la base en une passe sur l'archive et s'abonne aux nouveaux résultats."""
+        if self._built:
+            return
+        with self._lock:
+            if self._built:
+                return
+            engine = self.rating_engine
+            totals = [0, 0, 0]
+            for venue, results in engine.get_home_results().items():
+                self._home_results[venue] = list(results)
+                for day, opponent, goals_for, goals_against in results:
+                    self._count(venue, day, goals_for, goals_against)
+                    totals[0 if goals_for > goals_against else 1 if goals_for == goals_against else 2] += 1
+                    pair = frozenset((venue, opponent))
+                    if pair not in self._pair_cache:
+                        self._pair_cache[pair] = _share_city(normalize_team_name(venue),
+                                                             normalize_team_name(opponent))
+                        if self._pair_cache[pair]:
+                            self._derbies.add(pair)
+            played = sum(totals)
+            if played:
+                self._league_home_rates = tuple(count / played for count in totals)
+
+            for team1, team2 in KNOWN_DERBIES:
+                pair = frozenset((self._team_key(team1), self._team_key(team2)))
+                self._pair_cache[pair] = True
+                self._derbies.add(pair)
+            for stadium, team in KNOWN_STADIUMS.items():
+                self._stadiums[stadium] = self._team_key(team)
+
+            engine.subscribe(self._on_result)
+            self._built = True
+            logger.info(f"Base des stades: {len(self._seasons)} stades, {len(self._derbies)} derbies")
+
+    def _count(self, venue, day, goals_for, goals_against):
+        row = self._seasons.setdefault(venue, {}).setdefault(_season(day), [0, 0, 0, 0, 0, 0, 0])
+        row[0] += 1
+        row[1 if goals_for > goals_against else 2 if goals_for == goals_against else 3] += 1
+        row[4] += goals_for
+        row[5] += goals_against
+        row[6] += goals_against == 0
+
+    def _on_result(self, home_team, away_team, home_goals, away_goals, day):
+        """Intègre un nouveau résultat au bilan du stade de l'équipe à domicile."""
+        with self._lock:
+            if not self._built:
+                return
+            self._count(home_team, day, home_goals, away_goals)
+            self._home_results.setdefault(home_team, []).append((day, away_team, home_goals, away_goals))
+            self._profiles.pop(home_team, None)
+
+    def _team_key(self, team_name):
+        """Clé d'équipe : nom de l'index du moteur, sinon nom normalisé."""
+        key = self._key_cache.get(team_name)
+        if key is None:
+            rating = self.rating_engine.get_rating(team_name) if team_name else None
+            key = rating['team'] if rating else normalize_team_name(team_name)
+            self._key_cache[team_name] = key
+        return key
+
+    # ------------------------------------------------------------------
+    # Lectures
+    # ------------------------------------------------------------------
+    def register_venue(self, stadium_name, home_team):
+        """
+        Rattache un nom de stade à son équipe résidente.
+
+        Args:
+            stadium_name (str): Nom du stade
+            home_team (str): Équipe jouant à domicile dans ce stade
+        """
+        if not stadium_name or not home_team:
+            return
+        self.build()
+        with self._lock:
+            self._stadiums.setdefault(normalize_team_name(stadium_name), self._team_key(home_team))
+
+    def resolve_venue(self, stadium_name=None, home_team=None):
+        """
+        Identifie un stade par son équipe résidente.
+
+        Args:
+            stadium_name (str, optional): Nom du stade
+            home_team (str, optional): Équipe à domicile
+
+        Returns:
+            str: Équipe résidente de l'archive ou None si le stade est inconnu
+        """
+        self.build()
+        with self._lock:
+            if home_team:
+                venue = self._team_key(home_team)
+                if venue in self._home_results:
+                    return venue
+            venue = self._stadiums.get(normalize_team_name(stadium_name)) if stadium_name else None
+            return venue if venue in self._home_results else None
+
+    def is_derby(self, home_team, away_team):
+        """
+        Le match est-il un derby ? (ensemble haché, calcul au plus une fois par paire)
+
+        Args:
+            home_team (str): Équipe à domicile
+            away_team (str): Équipe à l'extérieur
+
+        Returns:
+            bool: True pour un derby connu ou entre deux équipes d'une même ville
+        """
+        if not home_team or not away_team:
+            return False
+        self.build()
+        with self._lock:
+            pair = frozenset((self._team_key(home_team), self._team_key(away_team)))
+            derby = self._pair_cache.get(pair)
+            if derby is None:
+                derby = _share_city(normalize_team_name(home_team), normalize_team_name(away_team))
+                self._pair_cache[pair] = derby
+                if derby:
+                    self._derbies.add(pair)
+            return derby
+
+    def get_rivals(self, team_name):
+        """
+        Rivaux de derby d'une équipe.
+
+        Args:
+            team_name (str): Nom de l'équipe
+
+        Returns:
+            list: Noms des équipes formant un derby avec elle
+        """
+        self.build()
+        with self._lock:
+            key = self._team_key(team_name)
+            return sorted(next(iter(pair - {key})) for pair in self._derbies if key in pair and len(pair) == 2)
+
+    def home_record(self, venue, season=None):
+        """
+        Bilan à domicile d'un stade, pour une saison ou toutes.
+
+        Args:
+            venue (str): Équipe résidente (voir resolve_venue)
+            season (int, optional): Année de début de saison
+
+        Returns:
+            dict: played, wins, draws, losses, goals_for, goals_against, clean_sheets
+        """
+        self.build()
+        fields = ('played', 'wins', 'draws', 'losses', 'goals_for', 'goals_against', 'clean_sheets')
+        with self._lock:
+            seasons = self._seasons.get(venue, {})
+            if season is not None:
+                row = seasons.get(season, [0] * len(fields))
+            else:
+                row = [sum(column) for column in zip(*seasons.values())] or [0] * len(fields)
+            return dict(zip(fields, row))
+
+    def home_rates(self, venue, season=None):
+        """
+        Taux de victoires, nuls et défaites à domicile lissés vers la moyenne de l'archive.
+
+        Args:
+            venue (str): Équipe résidente
+            season (int, optional): Année de début de saison
+
+        Returns:
+            tuple: (victoires, nuls, défaites)
+        """
+        record = self.home_record(venue, season)
+        weight = HOME_RATE_PRIOR_WEIGHT
+        total = record['played'] + weight
+        prior_win, prior_draw, prior_loss = self._league_home_rates
+        return ((record['wins'] + weight * prior_win) / total,
+                (record['draws'] + weight * prior_draw) / total,
+                (record['losses'] + weight * prior_loss) / total)
+
+    def attendance_prior(self, home_team, away_team=None):
+        """
+        Taux de remplissage attendu d'un match.
+
+        Args:
+            home_team (str): Équipe à domicile
+            away_team (str, optional): Équipe à l'extérieur (bonus de derby)
+
+        Returns:
+            float: Taux de remplissage entre 0 et 1
+        """
+        self.build()
+        with self._lock:
+            venue = self._team_key(home_team) if home_team else None
+            rating = self.rating_engine.get_rating(venue) if venue else None
+            # A priori : les équipes les mieux classées remplissent davantage leur stade
+            prior = 0.55 + 0.4 * rating['strength'] if rating else 0.5
+            observed = self._attendance.get(venue)
+            if observed:
+                total, count = observed
+                prior = (prior * ATTENDANCE_PRIOR_WEIGHT + total) / (ATTENDANCE_PRIOR_WEIGHT + count)
+        if away_team and self.is_derby(home_team, away_team):
+            prior += 0.1
+        return min(0.98, prior)
+
+    def record_attendance(self, home_team, attendance, capacity, match_date=None):
+        """
+        Intègre une affluence observée (une seule fois par match).
+
+        Args:
+            home_team (str): Équipe à domicile
+            attendance (int): Nombre de spectateurs
+            capacity (int): Capacité du stade
+            match_date (str, optional): Date du match
+        """
+        if not home_team or not capacity:
+            return
+        self.build()
+        with self._lock:
+            venue = self._team_key(home_team)
+            match_key = (venue, str(match_date)[:10])
+            if match_key in self._attendance_seen:
+                return
+            self._attendance_seen.add(match_key)
+            total, count = self._attendance.get(venue, (0.0, 0))
+            self._attendance[venue] = (total + min(1.0, attendance / capacity), count + 1)
+
+    def get_venue_profile(self, stadium_name=None, home_team=None):
+        """
+        Profil historique d'un stade (mis en cache jusqu'au prochain résultat du stade).
+
+        Args:
+            stadium_name (str, optional): Nom du stade
+            home_team (str, optional): Équipe à domicile
+
+        Returns:
+            dict: Bilans, taux lissés, saisons, événements marquants et rivaux, ou None
+                si le stade est inconnu de l'archive
+        """
+        venue = self.resolve_venue(stadium_name, home_team)
+        if venue is None:
+            return None
+        with self._lock:
+            profile = self._profiles.get(venue)
+            if profile is None:
+                profile = self._build_profile(venue)
+                self._profiles[venue] = profile
+            return profile
+
+    def _build_profile(self, venue):
+        results = self._home_results.get(venue, [])
+        record = self.home_record(venue)
+        win_rate, draw_rate, loss_rate = self.home_rates(venue)
+        seasons = sorted(self._seasons.get(venue, {}))
+        played = max(record['played'], 1)
+
+        events = []
+        last_by_season = {}
+        for index, (day, opponent, goals_for, goals_against) in enumerate(results):
+            last_by_season[_season(day)] = index
+            margin = goals_for - goals_against
+            derby = self._pair_cache.get(frozenset((venue, opponent)), False)
+            if derby:
+                event_type, significance = 'derby_outcome', min(1.0, 0.75 + 0.05 * abs(margin))
+            elif margin >= 4:
+                event_type, significance = 'legendary_performance', min(1.0, 0.6 + 0.05 * margin)
+            elif margin <= -3:
+                event_type, significance = 'tragic_incident', min(1.0, 0.6 + 0.05 * -margin)
+            else:
+                continue
+            events.append((day, opponent, goals_for, goals_against, event_type, significance))
+        for index in last_by_season.values():
+            day, opponent, goals_for, goals_against = results[index]
+            events.append((day, opponent, goals_for, goals_against, 'season_finale', 0.65))
+        if results:
+            day, opponent, goals_for, goals_against = results[0]
+            events.append((day, opponent, goals_for, goals_against, 'first_match', 0.6))
+
+        descriptions = {
+            'derby_outcome': "Derby {home} vs {away} ({score})",
+            'legendary_performance': "Large victoire de {home} contre {away} ({score})",
+            'tragic_incident': "Lourde défaite de {home} contre {away} ({score})",
+            'season_finale': "Dernier match à domicile de la saison contre {away} ({score})",
+            'first_match': "Premier match archivé dans ce stade contre {away} ({score})"
+        }
+        significant_events = []
+        for day, opponent, goals_for, goals_against, event_type, significance in events:
+            charge = 'positive' if goals_for > goals_against else 'negative' if goals_for < goals_against else 'mixed'
+            if event_type == 'derby_outcome' and abs(goals_for - goals_against) >= 3:
+                charge = 'euphoric' if goals_for > goals_against else 'tragic'
+            significant_events.append({
+                'date': date.fromordinal(day).isoformat(),
+                'event_type': event_type,
+                'home_team': venue,
+                'away_team': opponent,
+                'score': f"{goals_for}-{goals_against}",
+                'description': descriptions[event_type].format(home=venue, away=opponent,
+                                                               score=f"{goals_for}-{goals_against}"),
+                'significance': significance,
+                'emotional_charge': charge,
+                'historical_impact': significance
+            })
+        significant_events.sort(key=lambda e: e['date'])
+
+        meetings = {}
+        for _, opponent, _, _ in results:
+            meetings[opponent] = meetings.get(opponent, 0) + 1
+        most_met = max(meetings.values()) if meetings else 1
+        rivalry_level = {
+            opponent: 0.9 if self._pair_cache.get(frozenset((venue, opponent))) else 0.1 + 0.6 * count / most_met
+            for opponent, count in meetings.items()
+        }
+
+        return {
+            'venue': venue,
+            'seasons': seasons,
+            'total_matches': record['played'],
+            'home_win_rate': win_rate,
+            'home_draw_rate': draw_rate,
+            'home_loss_rate': loss_rate,
+            'goals_scored_avg': record['goals_for'] / played,
+            'goals_conceded_avg': record['goals_against'] / played,
+            'clean_sheets_rate': record['clean_sheets'] / played,
+            'significant_events': significant_events,
+            'rivalry_level': rivalry_level,
+            'attendance_prior': self.attendance_prior(venue)
+        }
+
+    def cached(self, namespace, key, factory):
+        """
+        Valeur dérivée partagée entre modules, calculée une seule fois par clé.
+
+        Chaque espace de noms est un LRU limité à `max_shared_entries` valeurs : les clés
+        par match ('atmosphere') ne s'accumulent pas au fil des journées.
+
+        Args:
+            namespace (str): Espace de noms (par exemple 'stadium', 'atmosphere')
+            key (hashable): Clé dans l'espace de noms
+            factory (callable): Fonction sans argument produisant la valeur
+
+        Returns:
+            object: Valeur en cache
+        """
+        with self._lock:
+            values = self._shared.setdefault(namespace, OrderedDict())
+            if key in values:
+                values.move_to_end(key)
+                return values[key]
+            value = factory()
+            values[key] = value
+            while len(values) > self.max_shared_entries:
+                values.popitem(last=False)
+            return value
+
+    def get_stats(self):
+        """
+        Statistiques de la base.
+
+        Returns:
+            dict: venues, venue_seasons, derbies, stadiums, profiles, shared (taille par espace de noms)
+        """
+        with self._lock:
+            return {
+                'venues': len(self._home_results),
+                'venue_seasons': sum(len(seasons) for seasons in self._seasons.values()),
+                'derbies': len(self._derbies),
+                'stadiums': len(self._stadiums),
+                'profiles': len(self._profiles),
+                'shared': {namespace: len(values) for namespace, values in self._shared.items()}
+            }
+
+
+_venue_profile_store = None
+_venue_profile_store_lock = threading.Lock()
+
+
+def get_venue_profile_store():
+    """
+    Renvoie l'instance partagée de la base des stades.
+
+    Returns:
+        VenueProfileStore: Base partagée
+    """
+    global _venue_profile_store
+    if _venue_profile_store is None:
+        with _venue_profile_store_lock:
+            if _venue_profile_store is None:
+                _venue_profile_store = VenueProfileStore()
+    return _venue_profile_store
@@ -30,6 +30,9 @@ from api.football_adapter import (
     get_available_leagues
 )
 
+# Classements Elo/Glicko calculés localement depuis l'archive de résultats
+from utils.team_ratings import get_team_rating_engine
+
 # Importer notre nouveau module de sélecteur de date amélioré
 from mobile_time_selector import generate_enhanced_date_selector, generate_standard_date_selector
 
@@ -121,6 +124,24 @@ class AdvancedPredictionEngine:
         
         return xgb.XGBClassifier(**params)
     
+    def _get_rating_context(self, match_data):
+        """
+        Récupère le contexte d'avant-match calculé depuis l'archive de résultats
+        
+        Args:
+            match_data (dict): Données du match
+            
+        Returns:
+            dict: Contexte (forme, moyennes de buts, confrontations) ou dictionnaire vide
+        """
+        try:
+            context = get_team_rating_engine().get_match_context(
+                match_data.get('home_team'), match_data.get('away_team'), match_data.get('date'))
+            return context or {}
+        except Exception as e:
+            logger.warning(f"Classements locaux indisponibles: {e}")
+            return {}
+    
     def _prepare_features(self, match_data):
         """
         Prépare les caractéristiques pour la prédiction à partir des données du match
@@ -138,9 +159,12 @@ class AdvancedPredictionEngine:
         # Ajouter des caractéristiques simulées pour la démonstration
         # Dans un modèle réel, ces données viendraient de l'API et seraient prétraitées
         
+        # Contexte d'avant-match issu des classements locaux (forme, buts, confrontations)
+        rating_context = self._get_rating_context(match_data)
+        
         # Forme des équipes (5 derniers matchs) - normalisée entre 0 et 1
-        home_form = match_data.get('home_form', [random.uniform(0.4, 0.8) for _ in range(5)])
-        away_form = match_data.get('away_form', [random.uniform(0.3, 0.7) for _ in range(5)])
+        home_form = match_data.get('home_form') or rating_context.get('home_form') or [random.uniform(0.4, 0.8) for _ in range(5)]
+        away_form = match_data.get('away_form') or rating_context.get('away_form') or [random.uniform(0.3, 0.7) for _ in range(5)]
         
         features['home_form_avg'] = sum(home_form) / len(home_form)
         features['away_form_avg'] = sum(away_form) / len(away_form)
@@ -156,9 +180,9 @@ class AdvancedPredictionEngine:
         features['value_ratio'] = home_value / (away_value + 1)  # Éviter la division par zéro
         
         # Historique des confrontations directes
-        h2h_home_wins = match_data.get('h2h_home_wins', random.randint(0, 5))
-        h2h_draws = match_data.get('h2h_draws', random.randint(0, 3))
-        h2h_away_wins = match_data.get('h2h_away_wins', random.randint(0, 5))
+        h2h_home_wins = match_data.get('h2h_home_wins', rating_context.get('h2h_home_wins', random.randint(0, 5)))
+        h2h_draws = match_data.get('h2h_draws', rating_context.get('h2h_draws', random.randint(0, 3)))
+        h2h_away_wins = match_data.get('h2h_away_wins', rating_context.get('h2h_away_wins', random.randint(0, 5)))
         h2h_total = h2h_home_wins + h2h_draws + h2h_away_wins
         
         if h2h_total > 0:
@@ -174,10 +198,10 @@ class AdvancedPredictionEngine:
         features['is_home'] = 1.0  # Toujours 1 pour l'équipe à domicile
         
         # Stats d'attaque et défense (buts marqués/encaissés par match)
-        features['home_attack'] = match_data.get('home_goals_per_match', random.uniform(1.0, 2.5))
-        features['home_defense'] = match_data.get('home_goals_conceded_per_match', random.uniform(0.8, 1.8))
-        features['away_attack'] = match_data.get('away_goals_per_match', random.uniform(0.8, 2.0))
-        features['away_defense'] = match_data.get('away_goals_conceded_per_match', random.uniform(1.0, 2.0))
+        features['home_attack'] = match_data.get('home_goals_per_match', rating_context.get('home_goals_per_match', random.uniform(1.0, 2.5)))
+        features['home_defense'] = match_data.get('home_goals_conceded_per_match', rating_context.get('home_goals_conceded_per_match', random.uniform(0.8, 1.8)))
+        features['away_attack'] = match_data.get('away_goals_per_match', rating_context.get('away_goals_per_match', random.uniform(0.8, 2.0)))
+        features['away_defense'] = match_data.get('away_goals_conceded_per_match', rating_context.get('away_goals_conceded_per_match', random.uniform(1.0, 2.0)))
         
         # Calculer les ratios d'attaque/défense
         features['attack_ratio'] = features['home_attack'] / (features['away_attack'] + 0.1)